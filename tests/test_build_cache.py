@@ -0,0 +1,178 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Append the internal modules into the system paths, as in vessmorphovis.py
+sys.path.append('%s/../vmv/interface/cli' % os.path.dirname(os.path.realpath(__file__)))
+sys.path.append('%s/../vmv/file/ops' % os.path.dirname(os.path.realpath(__file__)))
+
+# Internal imports
+import arguments_parser
+import build_cache
+import file_ops
+
+
+####################################################################################################
+# @TestBuildCache
+####################################################################################################
+class TestBuildCache(unittest.TestCase):
+    """Checks which artifacts of a morphology file the build cache reports as outdated.
+    """
+
+    ################################################################################################
+    # @setUp
+    ################################################################################################
+    def setUp(self):
+        """Creates the output tree, a morphology file and the arguments of the batch.
+        """
+
+        # The output tree
+        self.directory = tempfile.mkdtemp()
+        self.output_directory = '%s/output' % self.directory
+        file_ops.create_output_tree(self.output_directory)
+
+        # The morphology file
+        self.morphology_file = '%s/vessels.swc' % self.directory
+        with open(self.morphology_file, 'w') as file_handle:
+            file_handle.write('1 0 0.0 0.0 0.0 1.0 -1\n2 0 1.0 0.0 0.0 1.0 1\n')
+
+        # The arguments
+        self.arguments = arguments_parser.parse_command_line_arguments([
+            '--input=directory', '--morphology-directory=%s' % self.directory,
+            '--output-directory=%s' % self.output_directory, '--analyze-morphology',
+            '--export-vascular-mesh-ply'])
+
+    ################################################################################################
+    # @tearDown
+    ################################################################################################
+    def tearDown(self):
+        """Removes the temporary directory.
+        """
+
+        shutil.rmtree(self.directory)
+
+    ################################################################################################
+    # @write_outputs
+    ################################################################################################
+    def write_outputs(self,
+                      artifact):
+        """Writes empty output files for an artifact, as the pipeline would.
+
+        :param artifact:
+            The name of the artifact.
+        """
+
+        for output in build_cache.get_artifact_outputs(
+                self.output_directory, self.morphology_file, self.arguments, artifact):
+            open(output, 'w').close()
+
+    ################################################################################################
+    # @test_recorded_artifacts
+    ################################################################################################
+    def test_recorded_artifacts(self):
+        """Checks that the recorded artifacts are up to date, until the options change.
+        """
+
+        # Nothing is recorded
+        cache = build_cache.BuildCache(self.output_directory)
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments),
+                         ['analysis', 'mesh'])
+
+        # Record the artifacts and reload the manifest
+        self.write_outputs('analysis')
+        self.write_outputs('mesh')
+        cache.record_artifacts(self.morphology_file, self.arguments, ['analysis', 'mesh'])
+        cache.save()
+        cache = build_cache.BuildCache(self.output_directory)
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments), [])
+
+        # The mesh options changed, the analysis does not depend on them
+        self.arguments.tessellation_level = 0.5
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments),
+                         ['mesh'])
+
+    ################################################################################################
+    # @test_missing_outputs
+    ################################################################################################
+    def test_missing_outputs(self):
+        """Checks that the recorded artifacts whose output files are missing are outdated.
+        """
+
+        # Record the artifacts, only the analysis is written
+        cache = build_cache.BuildCache(self.output_directory)
+        self.write_outputs('analysis')
+        cache.record_artifacts(self.morphology_file, self.arguments, ['analysis', 'mesh'])
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments),
+                         ['mesh'])
+
+        # The mesh is written, then the analysis is removed
+        self.write_outputs('mesh')
+        os.remove('%s/analysis/vessels.txt' % self.output_directory)
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments),
+                         ['analysis'])
+        self.assertEqual(build_cache.get_artifact_outputs(
+            self.output_directory, self.morphology_file, self.arguments, 'mesh'),
+            ['%s/meshes/vessels.ply' % self.output_directory])
+
+    ################################################################################################
+    # @test_pending_artifacts
+    ################################################################################################
+    def test_pending_artifacts(self):
+        """Checks that the pending artifacts of a submitted job are recorded only once its status
+        file reports that it succeeded.
+        """
+
+        # The job is submitted and has not finished
+        status_file = '%s/vessels.status' % self.directory
+        cache = build_cache.BuildCache(self.output_directory)
+        cache.add_pending_artifacts(self.morphology_file, self.arguments, ['analysis', 'mesh'],
+                                    status_file)
+        cache.save()
+        cache = build_cache.BuildCache(self.output_directory)
+        cache.record_pending_artifacts(self.arguments)
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments),
+                         ['analysis', 'mesh'])
+
+        # The job failed after writing the analysis
+        self.write_outputs('analysis')
+        with open(status_file, 'w') as status_handle:
+            status_handle.write('1\n')
+        cache.record_pending_artifacts(self.arguments)
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments),
+                         ['analysis', 'mesh'])
+
+        # The job is submitted again and succeeds
+        self.write_outputs('mesh')
+        cache.add_pending_artifacts(self.morphology_file, self.arguments, ['analysis', 'mesh'],
+                                    status_file)
+        with open(status_file, 'w') as status_handle:
+            status_handle.write('0\n')
+        cache.record_pending_artifacts(self.arguments)
+        self.assertEqual(cache.get_outdated_artifacts(self.morphology_file, self.arguments), [])
+
+
+####################################################################################################
+# @ Run the tests if invoked from the command line.
+####################################################################################################
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import unittest
+import collections
+
+# Append the internal modules into the system paths, the engine only needs numpy
+sys.path.append('%s/../vmv/mesh/ops' % os.path.dirname(os.path.realpath(__file__)))
+
+# Internal imports
+import numpy
+import implicit_surface_ops
+
+
+####################################################################################################
+# @create_random_network
+####################################################################################################
+def create_random_network(seed,
+                          number_sections=3,
+                          number_samples=10):
+    """Creates a random network of sections, where every section starts at a sample of the
+    previous one.
+
+    :param seed:
+        The seed of the random generator.
+    :param number_sections:
+        The number of the sections.
+    :param number_samples:
+        The number of the samples of every section.
+    :return:
+        A tuple of (points [N, 3], radii [N], offsets [S + 1]).
+    """
+
+    random = numpy.random.RandomState(seed)
+    points, radii, offsets = list(), list(), [0]
+    start = numpy.zeros(3)
+    for _ in range(number_sections):
+        section_points = start + numpy.cumsum(random.uniform(-1, 1, (number_samples, 3)), axis=0)
+        points.append(section_points)
+        radii.append(random.uniform(0.2, 0.6, number_samples))
+        offsets.append(offsets[-1] + number_samples)
+        start = section_points[random.randint(number_samples)]
+    return numpy.concatenate(points), numpy.concatenate(radii), numpy.array(offsets)
+
+
+####################################################################################################
+# @TestImplicitSurface
+####################################################################################################
+class TestImplicitSurface(unittest.TestCase):
+    """Checks that the implicit surfaces are closed, oriented 2-manifolds.
+    """
+
+    ################################################################################################
+    # @assert_closed_manifold
+    ################################################################################################
+    def assert_closed_manifold(self,
+                               vertices,
+                               faces):
+        """Asserts that a triangle mesh is a closed, consistently oriented 2-manifold with outward
+        normals.
+
+        :param vertices:
+            The vertices of the mesh [V, 3].
+        :param faces:
+            The triangles of the mesh [F, 3].
+        """
+
+        # Not empty, and all the vertices are used
+        self.assertGreater(len(faces), 0)
+        self.assertEqual(len(numpy.unique(faces)), len(vertices))
+
+        # Every directed edge is used once and its opposite once, i.e. every edge is shared by
+        # two faces with opposite orientations
+        directed_edges = collections.Counter(
+            (int(a), int(b)) for face in faces for a, b in zip(face, numpy.roll(face, -1)))
+        for (a, b), count in directed_edges.items():
+            self.assertEqual(count, 1)
+            self.assertIn((b, a), directed_edges)
+
+        # The faces around every vertex form a single fan, i.e. no pinched vertices
+        fans = collections.defaultdict(dict)
+        for a, b, c in faces:
+            fans[a][b] = c
+            fans[b][c] = a
+            fans[c][a] = b
+        for fan in fans.values():
+            start = next(iter(fan))
+            vertex, length = fan[start], 1
+            while vertex != start:
+                vertex, length = fan[vertex], length + 1
+            self.assertEqual(length, len(fan))
+
+        # The normals point outwards, i.e. the enclosed volume is positive
+        a, b, c = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+        self.assertGreater(numpy.einsum('ij,ij->i', a, numpy.cross(b, c)).sum(), 0.0)
+
+    ################################################################################################
+    # @test_single_capsule
+    ################################################################################################
+    def test_single_capsule(self):
+        """A single capsule is a sphere, with the Euler characteristic 2 and its volume.
+        """
+
+        # A capsule with equal radii
+        points = numpy.array([[0.0, 0.0, 0.0], [4.0, 0.0, 0.0]])
+        radii = numpy.array([1.0, 1.0])
+        vertices, faces = implicit_surface_ops.mesh_capsules_implicit_surface(
+            points, radii, numpy.array([0, 2]), voxel_size=0.2, block_size=8)
+        self.assert_closed_manifold(vertices, faces)
+
+        # Euler characteristic
+        number_edges = len(faces) * 3 // 2
+        self.assertEqual(len(vertices) - number_edges + len(faces), 2)
+
+        # The volume of a cylinder and a sphere, within a few percent
+        a, b, c = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+        volume = numpy.einsum('ij,ij->i', a, numpy.cross(b, c)).sum() / 6.0
+        self.assertAlmostEqual(volume / (numpy.pi * 4.0 + 4.0 / 3.0 * numpy.pi), 1.0, delta=0.02)
+
+    ################################################################################################
+    # @test_random_networks
+    ################################################################################################
+    def test_random_networks(self):
+        """Random networks with ambiguous cells are closed manifolds at different resolutions.
+        """
+
+        for seed in range(8):
+            points, radii, offsets = create_random_network(seed)
+            for voxel_size, block_size in [(0.4, 8), (0.25, 8), (0.6, 4)]:
+                with self.subTest(seed=seed, voxel_size=voxel_size, block_size=block_size):
+                    vertices, faces = implicit_surface_ops.mesh_capsules_implicit_surface(
+                        points, radii, offsets, voxel_size=voxel_size, block_size=block_size)
+                    self.assert_closed_manifold(vertices, faces)
+
+    ################################################################################################
+    # @test_parallel_blocks
+    ################################################################################################
+    def test_parallel_blocks(self):
+        """The blocks that are meshed in a process pool give the same mesh.
+        """
+
+        points, radii, offsets = create_random_network(0)
+        serial = implicit_surface_ops.mesh_capsules_implicit_surface(
+            points, radii, offsets, voxel_size=0.4, block_size=4, workers=1)
+        parallel = implicit_surface_ops.mesh_capsules_implicit_surface(
+            points, radii, offsets, voxel_size=0.4, block_size=4, workers=2)
+        self.assertTrue(numpy.allclose(serial[0], parallel[0]))
+        self.assertTrue(numpy.array_equal(serial[1], parallel[1]))
+
+
+####################################################################################################
+# @ Run the tests if invoked from the command line.
+####################################################################################################
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Append the internal modules into the system paths, as in vessmorphovis.py
+sys.path.append('%s/../vmv/interface/cli' % os.path.dirname(os.path.realpath(__file__)))
+
+# Internal imports
+import job_scheduler
+
+
+####################################################################################################
+# @TestJobScheduler
+####################################################################################################
+class TestJobScheduler(unittest.TestCase):
+    """Runs the local scheduler end-to-end with stub shell commands instead of Blender.
+    """
+
+    ################################################################################################
+    # @setUp
+    ################################################################################################
+    def setUp(self):
+        """Creates the output tree and the morphology files of the jobs.
+        """
+
+        # The output tree
+        self.directory = tempfile.mkdtemp()
+        self.scripts_directory = '%s/slurm' % self.directory
+        self.jobs_directory = '%s/slurm/jobs' % self.directory
+        self.logs_directory = '%s/slurm/logs' % self.directory
+        for directory in [self.scripts_directory, self.jobs_directory, self.logs_directory]:
+            os.makedirs(directory, exist_ok=True)
+
+        # The morphology files, with different numbers of samples
+        self.morphology_files = dict()
+        for name, number_samples in [('a', 10), ('b', 4000), ('c', 200), ('d', 3000),
+                                     ('e', 50), ('f', 1000)]:
+            morphology_file = '%s/%s.swc' % (self.directory, name)
+            with open(morphology_file, 'w') as file_handle:
+                file_handle.write('# A stub morphology\n')
+                for i in range(number_samples):
+                    file_handle.write('%d 0 0.0 0.0 %d.0 1.0 %d\n' % (i + 1, i, i))
+            self.morphology_files[name] = morphology_file
+
+        # The trace of the concurrent jobs
+        self.trace_file = '%s/trace.txt' % self.directory
+
+    ################################################################################################
+    # @tearDown
+    ################################################################################################
+    def tearDown(self):
+        """Removes the output tree.
+        """
+
+        shutil.rmtree(self.directory)
+
+    ################################################################################################
+    # @create_scheduler
+    ################################################################################################
+    def create_scheduler(self,
+                         number_tasks,
+                         number_workers,
+                         failing_jobs=()):
+        """Creates a local scheduler with a stub job per morphology file.
+
+        :param number_tasks:
+            The maximum number of array tasks.
+        :param number_workers:
+            The size of the pool.
+        :param failing_jobs:
+            The names of the jobs that fail.
+        :return:
+            The scheduler.
+        """
+
+        # The scheduler
+        scheduler = job_scheduler.LocalScheduler(
+            number_tasks=number_tasks, scripts_directory=self.scripts_directory,
+            jobs_directory=self.jobs_directory, logs_directory=self.logs_directory,
+            number_workers=number_workers)
+
+        # A job per file, that traces its start and end and fails if requested
+        for name, morphology_file in sorted(self.morphology_files.items()):
+            shell_commands = ['echo + >> %s' % self.trace_file, 'sleep 0.2',
+                              'echo - >> %s' % self.trace_file,
+                              'exit 3' if name in failing_jobs else 'echo done']
+            scheduler.add_job(job_scheduler.Job(
+                name=name, morphology_file=morphology_file, shell_commands=shell_commands))
+
+        # Return the scheduler
+        return scheduler
+
+    ################################################################################################
+    # @get_maximum_concurrency
+    ################################################################################################
+    def get_maximum_concurrency(self):
+        """Gets the maximum number of jobs that ran at the same time from the trace.
+
+        :return:
+            The maximum number of concurrent jobs.
+        """
+
+        # Replay the trace
+        running, maximum = 0, 0
+        with open(self.trace_file, 'r') as trace_handle:
+            for line in trace_handle:
+                running += 1 if line.strip() == '+' else -1
+                maximum = max(maximum, running)
+        return maximum
+
+    ################################################################################################
+    # @test_sample_count
+    ################################################################################################
+    def test_sample_count(self):
+        """The samples of the .swc files are counted without the comments.
+        """
+
+        self.assertEqual(job_scheduler.count_morphology_samples(self.morphology_files['b']), 4000)
+
+    ################################################################################################
+    # @test_packing
+    ################################################################################################
+    def test_packing(self):
+        """Every job is packed once and the costs of the tasks are balanced.
+        """
+
+        # Pack the jobs
+        scheduler = self.create_scheduler(number_tasks=3, number_workers=3)
+        tasks = job_scheduler.pack_jobs(scheduler.jobs, 3)
+
+        # Every job is in a single task
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(sorted(job.name for jobs in tasks for job in jobs),
+                         sorted(self.morphology_files.keys()))
+
+        # The difference between the tasks is less than the most expensive job
+        tasks_costs = [sum(job.cost for job in jobs) for jobs in tasks]
+        self.assertLessEqual(max(tasks_costs) - min(tasks_costs),
+                             max(job.cost for job in scheduler.jobs))
+
+        # The most expensive jobs are in different tasks
+        expensive_jobs = ['b', 'd', 'f']
+        self.assertEqual(len(set(job_tasks for job_tasks, jobs in enumerate(tasks)
+                                 for job in jobs if job.name in expensive_jobs)), 3)
+
+    ################################################################################################
+    # @test_local_run
+    ################################################################################################
+    def test_local_run(self):
+        """The local scheduler runs all the jobs, bounded by the pool, and reports the failed
+        ones in the status files and the manifest.
+        """
+
+        # Run a task per job in a pool of two processes
+        scheduler = self.create_scheduler(number_tasks=6, number_workers=2, failing_jobs=['c'])
+        number_failed_jobs = scheduler.run()
+
+        # A single job failed
+        self.assertEqual(number_failed_jobs, 1)
+
+        # The status files have the exit codes of the jobs
+        for name in self.morphology_files:
+            with open('%s/%s.status' % (self.logs_directory, name), 'r') as status_handle:
+                self.assertEqual(int(status_handle.read()), 3 if name == 'c' else 0)
+
+        # The pool is not exceeded
+        self.assertLessEqual(self.get_maximum_concurrency(), 2)
+
+        # The manifest has every job with its task and exit code
+        manifest_file = '%s/manifest.json' % self.scripts_directory
+        scheduler.write_manifest(manifest_file)
+        with open(manifest_file, 'r') as manifest_handle:
+            manifest = json.load(manifest_handle)
+        self.assertEqual(manifest['backend'], 'LocalScheduler')
+        self.assertEqual(manifest['number_tasks'], 6)
+        self.assertEqual(len(manifest['jobs']), 6)
+        for job in manifest['jobs']:
+            self.assertEqual(job['exit_code'], 3 if job['name'] == 'c' else 0)
+            self.assertTrue(0 <= job['task'] < 6)
+            self.assertTrue(os.path.isfile(job['log_file']))
+
+
+####################################################################################################
+# @ Run the tests if invoked from the command line.
+####################################################################################################
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Append the internal modules into the system paths, as in vessmorphovis.py
+sys.path.append('%s/../vmv/interface/cli' % os.path.dirname(os.path.realpath(__file__)))
+
+# Internal imports
+import worker_pool
+
+
+####################################################################################################
+# @TestWorkerPool
+####################################################################################################
+class TestWorkerPool(unittest.TestCase):
+    """Runs the pool of persistent workers with a Blender executable that cannot be started.
+    """
+
+    ################################################################################################
+    # @setUp
+    ################################################################################################
+    def setUp(self):
+        """Creates the directory of the logs.
+        """
+
+        self.logs_directory = tempfile.mkdtemp()
+
+    ################################################################################################
+    # @tearDown
+    ################################################################################################
+    def tearDown(self):
+        """Removes the directory of the logs.
+        """
+
+        shutil.rmtree(self.logs_directory)
+
+    ################################################################################################
+    # @test_missing_blender
+    ################################################################################################
+    def test_missing_blender(self):
+        """Checks that all the jobs fail, and are reported, if Blender cannot be started.
+        """
+
+        # A pool with a missing Blender executable
+        pool = worker_pool.PersistentWorkerPool(
+            blender='%s/blender' % self.logs_directory, number_workers=2,
+            logs_directory=self.logs_directory)
+        for name in ['a', 'b', 'c']:
+            pool.add_job(name=name, morphology_file='%s.swc' % name, arguments=list())
+
+        # All the jobs fail
+        self.assertEqual(pool.run(), 3)
+
+        # The summary has a failed result for every job
+        summary = pool.get_summary()
+        self.assertEqual(summary['number_failed_jobs'], 3)
+        self.assertEqual([job['name'] for job in summary['jobs']], ['a', 'b', 'c'])
+        self.assertTrue(all(job['exit_code'] == -1 for job in summary['jobs']))
+
+        # The error is written to the logs of the workers
+        with open('%s/worker_0.log' % self.logs_directory, 'r') as log_file:
+            self.assertIn('could NOT be started', log_file.read())
+
+
+####################################################################################################
+# @ Run the tests if invoked from the command line.
+####################################################################################################
+if __name__ == '__main__':
+    unittest.main()
@@ -28,6 +28,8 @@ __status__      = "Production"
 # System imports
 import os
 import sys
+import copy
+import shlex
 import subprocess
 
 # Append the internal modules into the system paths to avoid Blender importing conflicts
@@ -37,7 +39,11 @@ for import_path in import_paths:
     
 # Internal imports
 import arguments_parser
+import batch_scheduler
+import build_cache
 import file_ops
+import job_scheduler
+import worker_pool
 
 
 ####################################################################################################
@@ -69,36 +75,19 @@ def create_shell_commands_for_local_execution(arguments,
 
     shell_commands = list()
 
-    # Retrieve the path to the CLIs
+    # Retrieve the path to the pipeline CLI, that loads the morphology once and runs all the tasks
     cli_interface_path = os.path.dirname(os.path.realpath(__file__)) + '/vmv/interface/cli'
-    cli_morphology_reconstruction = '%s/morphology_reconstruction.py' % cli_interface_path
-    cli_morphology_analysis = '%s/morphology_analysis.py' % cli_interface_path
-    cli_mesh_reconstruction = '%s/mesh_reconstruction.py' % cli_interface_path
+    cli_pipeline = '%s/pipeline.py' % cli_interface_path
 
-    # Morphology analysis task
-    if arguments.analyze_morphology:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_analysis, arguments_string))
-
-        # Return a list of commands
-        return shell_commands
-
-    # Morphology reconstruction task: call the @cli_morphology_reconstruction interface
-    if arguments.reconstruct_morphology_skeleton or         \
+    # Run the pipeline if any task is requested
+    if arguments.analyze_morphology or                      \
+       arguments.reconstruct_morphology_skeleton or         \
        arguments.render_vascular_morphology or              \
        arguments.render_vascular_morphology_360 or          \
        arguments.export_morphology_vmv or                   \
        arguments.export_morphology_h5 or                    \
-       arguments.export_morphology_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_reconstruction, arguments_string))
-
-    # Neuron mesh reconstruction related task: call the @cli_mesh_reconstruction interface
-    if arguments.reconstruct_vascular_mesh or               \
+       arguments.export_morphology_blend or                 \
+       arguments.reconstruct_vascular_mesh or               \
        arguments.render_vascular_mesh or                    \
        arguments.render_vascular_mesh_360 or                \
        arguments.export_vascular_mesh_ply or                \
@@ -106,14 +95,73 @@ def create_shell_commands_for_local_execution(arguments,
        arguments.export_vascular_mesh_stl or                \
        arguments.export_vascular_mesh_blend:
 
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_mesh_reconstruction, arguments_string))
+        # Add this command to the list, the errors in the pipeline are reported in the exit code
+        shell_commands.append('%s -b --verbose 0 --python-exit-code 1 --python %s -- %s' %
+                              (arguments.blender, cli_pipeline, arguments_string))
 
     # Return a list of commands
     return shell_commands
 
 
+####################################################################################################
+# @verify_morphology_labels
+####################################################################################################
+def verify_morphology_labels(morphology_files):
+    """Verifies that no two morphology files have the same name without the extension, such as
+    a.h5 and a.swc, otherwise exits with an error, since their jobs and outputs would collide.
+
+    :param morphology_files:
+        A list of the names or the paths of the morphology files.
+    """
+
+    # Get the duplicate labels
+    duplicate_labels = file_ops.get_duplicate_morphology_labels(morphology_files)
+
+    # Exit with an error if there are any
+    if len(duplicate_labels) > 0:
+        print('ERROR: More than one morphology file is named %s with different extensions, '
+              'keep a single file of each name' % duplicate_labels)
+        exit(1)
+
+
+####################################################################################################
+# @get_outdated_file_arguments
+####################################################################################################
+def get_outdated_file_arguments(arguments,
+                                cache,
+                                morphology_path):
+    """Gets the arguments of the job of a morphology file, that request only the outputs that
+    are outdated in the build cache, unless everything is rebuilt.
+
+    :param arguments:
+        Command line arguments.
+    :param cache:
+        The build cache of the output directory.
+    :param morphology_path:
+        The path to the morphology file.
+    :return:
+        A tuple of the arguments of the job and the list of the outdated artifacts, that is empty
+        if all the outputs of the file are up to date.
+    """
+
+    # The requested outputs that are outdated, unless everything is rebuilt
+    file_arguments = copy.copy(arguments)
+    if arguments.ignore_build_cache:
+        outdated_artifacts = [artifact for artifact in build_cache.ARTIFACTS
+                              if build_cache.is_artifact_requested(arguments, artifact)]
+    else:
+        outdated_artifacts = cache.get_outdated_artifacts(morphology_path, arguments)
+
+    # Do not request the outputs that are up to date
+    for artifact, flags in build_cache.ARTIFACTS.items():
+        if artifact not in outdated_artifacts:
+            for flag in flags:
+                setattr(file_arguments, flag, False)
+
+    # Return the arguments and the outdated artifacts
+    return file_arguments, outdated_artifacts
+
+
 ####################################################################################################
 # @run_local_vessmorphovis
 ####################################################################################################
@@ -147,43 +195,98 @@ def run_local_vessmorphovis(arguments):
             print('RUNNING: ' + shell_command)
             subprocess.call(shell_command, shell=True)
 
-    # Load a directory morphology files (.H5 or .SWC)
+    # Load a directory morphology files (.H5, .SWC or .VMV)
     elif arguments.input == 'directory':
 
         # Get all the morphology files in this directory
-        # TODO: Verify the installation of H5Py before running the workflow
-        # TODO: Add the support to load .SWC files from a directory at the same time
-        morphology_files = file_ops.get_files_in_directory(arguments.morphology_directory, '.h5')
+        morphology_files = file_ops.get_morphology_files_in_directory(
+            arguments.morphology_directory)
 
         # If the directory is empty, give an error message
         if len(morphology_files) == 0:
             print('ERROR: The directory [%s] does NOT contain any morphology files' %
                   arguments.morphology_directory)
+            exit(0)
 
-        # A list of all the commands to be executed
-        shell_commands = list()
+        # The outputs are named after the files without their extensions, so they must be unique
+        verify_morphology_labels(morphology_files)
 
-        # Construct the commands for every individual morphology file
+        # The output tree and its build cache, that records the outputs that are up to date
+        file_ops.create_output_tree(arguments.output_directory)
+        cache = build_cache.BuildCache(arguments.output_directory)
+
+        # The logs of the jobs and the manifest
+        batch_directory = '%s/%s' % (arguments.output_directory, file_ops.Paths.BATCH_FOLDER)
+        batch_logs_directory = '%s/%s' % (
+            arguments.output_directory, file_ops.Paths.BATCH_LOGS_FOLDER)
+        file_ops.create_directory(batch_directory)
+        file_ops.create_directory(batch_logs_directory)
+
+        # Persistent workers, that run the pipeline of many files in the same Blender session
+        if arguments.batch_mode == 'persistent':
+            scheduler = worker_pool.PersistentWorkerPool(
+                blender=arguments.blender, number_workers=arguments.batch_workers,
+                logs_directory=batch_logs_directory)
+
+        # A new Blender process per file
+        else:
+            scheduler = batch_scheduler.BatchScheduler(
+                number_workers=arguments.batch_workers,
+                memory_budget=int(arguments.batch_memory * 1024 ** 3)
+                if arguments.batch_memory > 0 else None)
+
+        # Create a job for every individual morphology file
+        job_artifacts = dict()
         for morphology_file in morphology_files:
+            morphology_label = os.path.splitext(morphology_file)[0]
+            morphology_path = '%s/%s' % (arguments.morphology_directory, morphology_file)
 
-            # Get the argument string for an individual file
-            arguments_string = arguments_parser.get_arguments_string_for_individual_file(
-                arguments=arguments, morphology_file=morphology_file)
-
-            # Construct the shell command to run the workflow
-            shell_commands.extend(
-                create_shell_commands_for_local_execution(arguments, arguments_string))
+            # Request only the outputs that are outdated
+            file_arguments, outdated_artifacts = get_outdated_file_arguments(
+                arguments, cache, morphology_path)
 
-        # Parallel execution
-        from joblib import Parallel, delayed
-        #import multiprocessing
-        #Parallel(n_jobs=6)(
-        #    delayed(execute_shell_command)(command) for command in shell_commands)
+            # Skip the file if all its outputs are up to date
+            if len(outdated_artifacts) == 0:
+                print('SKIPPING: [%s] is up to date' % morphology_file)
+                continue
+            job_artifacts[morphology_label] = (morphology_path, outdated_artifacts)
 
-        # Run VessMorphoVis from Blender in the background mode
-        for shell_command in shell_commands:
-            # print('RUNNING: ' + shell_command)
-            subprocess.call(shell_command, shell=True)
+            # Get the argument string for an individual file
+            arguments_string = arguments_parser.get_arguments_string_for_individual_file(
+                arguments=file_arguments, morphology_file=morphology_file)
+
+            # Add the job
+            if arguments.batch_mode == 'persistent':
+                scheduler.add_job(name=morphology_label, morphology_file=morphology_path,
+                                  arguments=shlex.split(arguments_string))
+            else:
+                scheduler.add_job(batch_scheduler.BatchJob(
+                    name=morphology_label,
+                    morphology_file=morphology_path,
+                    shell_commands=create_shell_commands_for_local_execution(
+                        file_arguments, arguments_string),
+                    log_file='%s/%s.log' % (batch_logs_directory, morphology_file)))
+
+        # Run the jobs in parallel
+        number_failed_jobs = scheduler.run()
+
+        # Record the artifacts of the successful jobs in the build cache, a job exits with zero
+        # only if all its stages succeeded, and an artifact is recorded only if all its output
+        # files were written
+        for job in scheduler.get_summary()['jobs']:
+            if job['exit_code'] == 0:
+                morphology_path, artifacts = job_artifacts[job['name']]
+                written_artifacts = build_cache.get_written_artifacts(
+                    arguments.output_directory, morphology_path, arguments, artifacts)
+                cache.record_artifacts(morphology_path, arguments, written_artifacts)
+        cache.save()
+
+        # Write the summary manifest
+        manifest_file = '%s/manifest.json' % batch_directory
+        scheduler.write_manifest(manifest_file)
+        print('Batch done: [%d] jobs, [%d] failed, [%d] up to date, see [%s]' %
+              (len(job_artifacts), number_failed_jobs,
+               len(morphology_files) - len(job_artifacts), manifest_file))
 
     else:
         print('ERROR: Input data source, use \'file, gid, target or directory\'')
@@ -194,35 +297,124 @@ def run_local_vessmorphovis(arguments):
 # @run_cluster_vessmorphovis
 ####################################################################################################
 def run_cluster_vessmorphovis(arguments):
-    """Run the VessMorphoVis framework on the BBP visualization cluster using SLURM.
+    """Run the VessMorphoVis framework on a cluster. The jobs are packed by their estimated cost
+    into the tasks of a job array, that is submitted to the batch system or run on the local node.
 
     :param arguments:
         Command line arguments.
     """
 
-    # Use the morphology file (.H5 or .VMV)
+    # Use the morphology file (.H5, .SWC or .VMV)
     if arguments.input == 'file':
-
-        # Get the arguments string list
-        arguments_string = arguments_parser.get_arguments_string(arguments=arguments)
-
-        # Run the job on the cluster
-        slurm.run_morphology_files_jobs_on_cluster(
-            arguments=arguments, morphology_files=arguments.morphology_file)
+        morphology_paths = [arguments.morphology_file]
 
     # Operate on a directory
     elif arguments.input == 'directory':
+        morphology_paths = ['%s/%s' % (arguments.morphology_directory, morphology_file)
+                            for morphology_file in file_ops.get_morphology_files_in_directory(
+                                arguments.morphology_directory)]
 
-        # Get all the morphology files in this directory
-        morphology_files = file_ops.get_files_in_directory(arguments.morphology_directory, '.h5')
+    else:
+        print('ERROR: Input data source, use [file or directory]')
+        exit(0)
+
+    # If there are no files, give an error message
+    if len(morphology_paths) == 0:
+        print('ERROR: The directory [%s] does NOT contain any morphology files' %
+              arguments.morphology_directory)
+        exit(0)
+
+    # The outputs, the logs and the status files are named after the files without their
+    # extensions, so they must be unique
+    verify_morphology_labels(morphology_paths)
 
-        # Run the jobs on the cluster
-        slurm.run_morphology_files_jobs_on_cluster(
-            arguments=arguments, morphology_files=morphology_files)
+    # A task per file with a high granularity, otherwise a task per core
+    number_tasks = len(morphology_paths) if arguments.job_granularity == 'high' \
+        else arguments.number_cores
 
+    # The scripts and the logs of the jobs
+    scripts_directory = '%s/%s' % (arguments.output_directory, file_ops.Paths.SLURM_FOLDER)
+    jobs_directory = '%s/%s' % (arguments.output_directory, file_ops.Paths.SLURM_JOBS_FOLDER)
+    logs_directory = '%s/%s' % (arguments.output_directory, file_ops.Paths.SLURM_LOGS_FOLDER)
+
+    # Run the tasks as processes on the local node
+    if arguments.cluster_scheduler == 'local':
+        scheduler = job_scheduler.LocalScheduler(
+            number_tasks=number_tasks, scripts_directory=scripts_directory,
+            jobs_directory=jobs_directory, logs_directory=logs_directory,
+            number_workers=arguments.batch_workers if arguments.batch_workers > 0 else None)
+
+    # Submit the job array to the batch system
     else:
-        print('ERROR: Input data source, use [file, gid, target or directory]')
-        exit(0)
+        scheduler = job_scheduler.BatchScriptScheduler(
+            number_tasks=number_tasks, scripts_directory=scripts_directory,
+            jobs_directory=jobs_directory, logs_directory=logs_directory,
+            submit_command=arguments.submit_command)
+
+    # The build cache, the artifacts of the jobs that were submitted by a previous run are
+    # recorded once their status files report that they succeeded
+    cache = build_cache.BuildCache(arguments.output_directory)
+    cache.record_pending_artifacts(arguments)
+
+    # Create a job for every individual morphology file whose outputs are outdated
+    job_artifacts = dict()
+    for morphology_path in morphology_paths:
+        morphology_label = os.path.splitext(os.path.basename(morphology_path))[0]
+
+        # Request only the outputs that are outdated
+        file_arguments, outdated_artifacts = get_outdated_file_arguments(
+            arguments, cache, morphology_path)
+
+        # Skip the file if all its outputs are up to date
+        if len(outdated_artifacts) == 0:
+            print('SKIPPING: [%s] is up to date' % os.path.basename(morphology_path))
+            continue
+
+        # Get the argument string for an individual file, a given file keeps the arguments
+        if arguments.input == 'file':
+            arguments_string = arguments_parser.get_arguments_string(arguments=file_arguments)
+        else:
+            arguments_string = arguments_parser.get_arguments_string_for_individual_file(
+                arguments=file_arguments, morphology_file=os.path.basename(morphology_path))
+
+        # Add the job
+        job = job_scheduler.Job(
+            name=morphology_label, morphology_file=os.path.abspath(morphology_path),
+            shell_commands=create_shell_commands_for_local_execution(
+                file_arguments, arguments_string))
+        scheduler.add_job(job)
+        job_artifacts[morphology_label] = (job, morphology_path, outdated_artifacts)
+
+    # Run or submit the jobs
+    number_failed_jobs = scheduler.run()
+
+    # The jobs finished, record the artifacts of the successful ones in the build cache
+    if number_failed_jobs is not None:
+        for job in scheduler.get_summary()['jobs']:
+            if job['exit_code'] == 0:
+                _, morphology_path, artifacts = job_artifacts[job['name']]
+                written_artifacts = build_cache.get_written_artifacts(
+                    arguments.output_directory, morphology_path, arguments, artifacts)
+                cache.record_artifacts(morphology_path, arguments, written_artifacts)
+
+    # The jobs were submitted, their artifacts are recorded by the next run once they finish
+    else:
+        for job, morphology_path, artifacts in job_artifacts.values():
+            cache.add_pending_artifacts(morphology_path, arguments, artifacts,
+                                        scheduler.get_status_file(job))
+    cache.save()
+
+    # Write the summary manifest
+    manifest_file = '%s/%s/manifest.json' % (
+        arguments.output_directory, file_ops.Paths.SLURM_FOLDER)
+    scheduler.write_manifest(manifest_file)
+    if number_failed_jobs is None:
+        print('Scheduled: [%d] jobs, [%d] up to date, see [%s]' %
+              (len(job_artifacts), len(morphology_paths) - len(job_artifacts), manifest_file))
+    else:
+        print('Cluster done: [%d] jobs, [%d] failed, [%d] up to date, see [%s]' %
+              (len(job_artifacts), number_failed_jobs,
+               len(morphology_paths) - len(job_artifacts), manifest_file))
 
 
 ####################################################################################################
@@ -247,6 +439,6 @@ if __name__ == "__main__":
     if arguments.execution_node == 'local':
         run_local_vessmorphovis(arguments=arguments)
 
-    # BBP CLUSTER EXECUTION: Create the SLURM scripts and run them on the cluster (only @ BBP)
+    # CLUSTER EXECUTION: Create the job array scripts and submit them or run them locally
     else:
         run_cluster_vessmorphovis(arguments=arguments)
@@ -492,22 +492,77 @@ def compute_number_of_components(sections_list):
 # @analyze_morphology
 ####################################################################################################
 def analyze_morphology(morphology_object):
+    """Analyzes a morphology skeleton and reports its statistics, as in the analysis panel.
 
-    import time
-    analysis_stated = time.time()
-
-    import vmv.analysis
-
-    # Analysis string
+    :param morphology_object:
+        A given morphology object.
+    :return:
+        A tuple of a flag, True if the morphology is analyzed, and a string of the analysis
+        results with one 'name: value' entry per line.
+    """
 
-    # Morphology total length
-    morphology_total_length = vmv.analysis.compute_total_morphology_length(
-        morphology_object.sections_list)
-    print(morphology_total_length)
+    # The cached metrics of the morphology
+    metrics = morphology_object.get_metrics()
 
-    # Total number of samples
-    vmv.logger.info('Samples')
-    total_number_samples = vmv.analysis.compute_total_number_samples_from_sections_list(
-        morphology_object.sections_list)
+    # Nothing to analyze
+    if len(metrics.sections_number_samples) == 0:
+        return False, ''
 
+    # The results, in the same order of the analysis panel
+    results = list()
 
+    # Morphology total length
+    results.append(('Total Length', float(metrics.sections_lengths.sum())))
+
+    # Total number of samples, segments and sections
+    results.append(('Number of Samples', metrics.get_number_samples()))
+    results.append(('Number of Segments', metrics.get_number_segments()))
+    results.append(('Number of Sections', len(metrics.sections_number_samples)))
+
+    # Sections with two samples
+    results.append(('Sections with Two Samples',
+                    int((metrics.sections_number_samples == 2).sum())))
+
+    # Number of short sections, i.e. shorter than the sum of their terminal diameters
+    non_empty = metrics.sections_number_samples > 1
+    diameters_sums = 2.0 * (metrics.radii[metrics.offsets[:-1][non_empty]] +
+                            metrics.radii[metrics.offsets[1:][non_empty] - 1])
+    results.append(('Short Sections',
+                    int((metrics.sections_lengths[non_empty] < diameters_sums).sum())))
+
+    # Samples radius stats.
+    results.append(('Minimum Sample Radius', float(metrics.radii.min())))
+    results.append(('Maximum Sample Radius', float(metrics.radii.max())))
+    results.append(('Average Sample Radius', float(metrics.radii.mean())))
+    results.append(('Zero-radius Samples', int((metrics.radii < 0.0001).sum())))
+
+    # Segments length stats.
+    results.append(('Minimum Segment Length', float(metrics.segments_lengths.min())))
+    results.append(('Maximum Segment Length', float(metrics.segments_lengths.max())))
+    results.append(('Average Segment Length', float(metrics.segments_lengths.mean())))
+
+    # Section length stats.
+    results.append(('Minimum Section Length', float(metrics.sections_lengths.min())))
+    results.append(('Maximum Section Length', float(metrics.sections_lengths.max())))
+    results.append(('Average Section Length', float(metrics.sections_lengths.mean())))
+
+    # Loops and components
+    results.append(('Number of Loops',
+                    compute_number_of_loops(morphology_object.sections_list)))
+    results.append(('Number of Components',
+                    compute_number_of_components(morphology_object.sections_list)))
+
+    # Bounding box data
+    if morphology_object.bounding_box is None:
+        morphology_object.bounding_box = morphology_object.compute_bounding_box()
+    bounding_box = morphology_object.bounding_box
+    results.append(('Bounding Box Center', '%f %f %f' % tuple(bounding_box.center[:3])))
+    results.append(('Bounding Box Bounds', '%f %f %f' % tuple(bounding_box.bounds[:3])))
+    results.append(('Bounding Box pMin', '%f %f %f' % tuple(bounding_box.p_min[:3])))
+    results.append(('Bounding Box pMax', '%f %f %f' % tuple(bounding_box.p_max[:3])))
+
+    # Format the results
+    analysis_string = ''.join('%s: %s\n' % (name, str(value)) for name, value in results)
+
+    # Done
+    return True, analysis_string
@@ -0,0 +1,213 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import time
+import numpy
+
+# Blender imports
+import bpy
+
+# Internal modules
+import vmv
+import vmv.consts
+import vmv.file
+import vmv.mesh
+import vmv.skeleton
+import vmv.scene
+import vmv.shading
+
+
+####################################################################################################
+# @ImplicitBuilder
+####################################################################################################
+class ImplicitBuilder:
+    """Mesh builder that creates watertight meshes from the implicit surface of the capsules of the
+    segments of the morphology, without using the meta objects of Blender."""
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 morphology,
+                 options):
+        """Constructor
+
+        :param morphology:
+            A given morphology skeleton to create the mesh for.
+        :param options:
+            Loaded options from VessMorphoVis.
+        """
+
+        # Morphology
+        self.morphology = morphology
+
+        # Loaded options from VessMorphoVis
+        self.options = options
+
+        # The reconstructed mesh object
+        self.mesh = None
+
+        # The vertices and the faces of the reconstructed mesh
+        self.vertices = None
+        self.faces = None
+
+        # A list of all the materials that will be assigned to the reconstructed mesh
+        self.materials = list()
+
+    ################################################################################################
+    # @create_skeleton_materials
+    ################################################################################################
+    def create_skeleton_materials(self):
+        """Create the materials of the mesh.
+        """
+
+        for material in bpy.data.materials:
+            if 'mesh_material' in material.name:
+                material.user_clear()
+                bpy.data.materials.remove(material)
+
+        # Create the materials
+        self.materials = list()
+        for i in range(2):
+            self.materials.append(vmv.shading.create_material(
+                name='mesh_material_color_%d' % i, color=self.options.mesh.color,
+                material_type=self.options.mesh.material))
+
+        # Create an illumination specific for the given material
+        vmv.shading.create_material_specific_illumination(
+            material_type=self.options.mesh.material, camera_view=self.options.mesh.camera_view)
+
+    ################################################################################################
+    # @build_mesh_arrays
+    ################################################################################################
+    def build_mesh_arrays(self):
+        """Reconstructs the vertices and the faces of the mesh, without creating any objects.
+
+        :return:
+            A tuple of (vertices [V, 3], faces [F, 3]).
+        """
+
+        # Apply the radius policy to all the samples at once
+        metrics = self.morphology.get_metrics()
+        radii = vmv.skeleton.ops.apply_morphology_radii_policy(
+            radii=metrics.radii, options=self.options)
+
+        # The size of the voxel, half the smallest radius of this morphology if it is set
+        # automatically, the options are not changed to keep it automatic for the next ones
+        voxel_size = self.options.mesh.implicit_voxel_size
+        if voxel_size <= 0.0:
+            voxel_size = max(0.5 * float(radii.min()), vmv.consts.Meshing.MIN_IMPLICIT_VOXEL_SIZE)
+        vmv.logger.info('Voxel size: [%f]' % voxel_size)
+
+        # Number of the workers
+        number_workers = self.options.mesh.implicit_workers
+        if number_workers < 1:
+            number_workers = os.cpu_count()
+
+        # Mesh the implicit surface
+        self.vertices, self.faces = vmv.mesh.mesh_capsules_implicit_surface(
+            points=metrics.points, radii=radii, offsets=metrics.offsets, voxel_size=voxel_size,
+            block_size=vmv.consts.Meshing.IMPLICIT_BLOCK_SIZE, workers=number_workers)
+
+        # Return the arrays
+        return self.vertices, self.faces
+
+    ################################################################################################
+    # @assign_material_to_mesh
+    ################################################################################################
+    def assign_material_to_mesh(self):
+        """Assign the material to the reconstructed mesh.
+        """
+
+        # Assign the material to the mesh
+        vmv.shading.set_material_to_object(self.mesh, self.materials[0])
+
+        # Activate the mesh object
+        vmv.scene.ops.deselect_all()
+        self.mesh.select_set(True)
+        bpy.context.view_layer.objects.active = self.mesh
+
+    ################################################################################################
+    # @build_mesh
+    ################################################################################################
+    def build_mesh(self):
+        """Reconstructs the vascular mesh from the implicit surface of the morphology.
+        """
+
+        vmv.logger.header('Mesh reconstruction with implicit surfaces')
+
+        # Reconstruct the mesh
+        start = time.time()
+        vmv.logger.info('Meshing the implicit surface')
+        vertices, faces = self.build_mesh_arrays()
+
+        # Link the mesh to the scene
+        vmv.logger.info('Linking [%d] vertices and [%d] faces' % (len(vertices), len(faces)))
+        self.mesh = vmv.mesh.create_mesh_object_from_arrays(
+            name=self.morphology.name + vmv.consts.Meshing.MESH_SUFFIX, vertices=vertices,
+            loops=faces.ravel(), loops_totals=numpy.full(len(faces), faces.shape[1]))
+        end = time.time()
+
+        # Time
+        vmv.logger.info('Building time [ %f ]' % (end - start))
+
+        # Tessellate the mesh
+        if 0.01 < self.options.mesh.tessellation_level < 1.0:
+            vmv.mesh.ops.decimate_mesh_object(
+                mesh_object=self.mesh, decimation_ratio=self.options.mesh.tessellation_level)
+
+        # Assign the material
+        vmv.logger.info('Assigning material')
+        self.create_skeleton_materials()
+        self.assign_material_to_mesh()
+
+        # Mission done
+        vmv.logger.header('Done!')
+
+        # Return a reference to the created mesh
+        return self.mesh
+
+    ################################################################################################
+    # @export_mesh_to_ply
+    ################################################################################################
+    def export_mesh_to_ply(self,
+                           output_directory,
+                           output_file_name=None):
+        """Writes the reconstructed mesh directly to a .ply file.
+
+        :param output_directory:
+            The output directory where the mesh will be saved.
+        :param output_file_name:
+            The name of the file, by default the name of the mesh.
+        :return:
+            The path to the written file.
+        """
+
+        # Reconstruct the mesh if it was not reconstructed before
+        if self.vertices is None:
+            self.build_mesh_arrays()
+
+        # By default, the file is named after the mesh
+        if output_file_name is None:
+            output_file_name = self.morphology.name + vmv.consts.Meshing.MESH_SUFFIX
+
+        # Write the mesh
+        return vmv.file.write_mesh_arrays_to_ply_file(
+            vertices=self.vertices, faces=self.faces, output_directory=output_directory,
+            output_file_name=output_file_name)
@@ -17,7 +17,13 @@
 
 
 # System imports
+import os
 import time
+import shutil
+import tempfile
+import subprocess
+import concurrent.futures
+import numpy
 
 # Blender imports
 import bpy
@@ -26,6 +32,7 @@ from mathutils import Vector
 # Internal modules
 import vmv
 import vmv.builders
+import vmv.consts
 import vmv.enums
 import vmv.mesh
 import vmv.skeleton
@@ -129,192 +136,90 @@ class MetaBuilder:
             material_type=self.options.mesh.material, camera_view=self.options.mesh.camera_view)
 
     ################################################################################################
-    # @create_meta_segment
+    # @create_meta_elements
     ################################################################################################
-    def create_meta_segment(self,
-                            p1,
-                            p2,
-                            r1,
-                            r2):
-        """Constructs a segment that is composed of two points with a meta object.
-
-        :param p1:
-            First point coordinate.
-        :param p2:
-            Second point coordinate.
-        :param r1:
-            First point radius.
-        :param r2:
-            Second point radius.
+    def create_meta_elements(self,
+                             centers,
+                             radii):
+        """Creates all the meta elements of the meta skeleton in bulk.
+
+        :param centers:
+            An array of the centers of the elements [M, 3].
+        :param radii:
+            An array of the radii of the elements [M].
         """
 
-        # Segment vector
-        segment = p2 - p1
-        segment_length = segment.length
+        # Allocate the elements
+        elements = self.meta_skeleton.elements
+        for _ in range(len(radii)):
+            elements.new()
 
-        # Make sure that the segment length is not zero
-        # TODO: Verify this when the radii are greater than the distance
-        if segment_length < 0.001:
-            return
-
-        # Verify the radii, or fix them
-        if r1 < 0.001 * segment_length:
-            r1 = 0.001 * segment_length
-        if r2 < 0.001 * segment_length:
-            r2 = 0.001 * segment_length
-
-        if r1 < self.smallest_radius:
-            self.smallest_radius = r1
-        if r2 < self.smallest_radius:
-            self.smallest_radius = r2
-
-        # Compute the deltas between the first and last points along the segments
-        dr = r2 - r1
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        dz = p2[2] - p1[2]
-
-        # Keep track on the distance traveled along the segment while building, initially 0
-        travelled_distance = 0.0
-
-        # Local points, initially at the first point
-        r = r1
-        x = p1[0]
-        y = p1[1]
-        z = p1[2]
-
-        # Construct the meta elements along the segment
-        i = 0
-        while travelled_distance < segment_length:
-
-            # Make a meta ball (or sphere) at this point
-            meta_element = self.meta_skeleton.elements.new()
-
-            # Set its radius
-            if i == 0:
-                meta_element.radius = r * 0.90
-            else:
-                meta_element.radius = r
-
-            # Update its coordinates
-            meta_element.co = (x, y, z)
-
-            # Proceed to the next point
-            travelled_distance += 0.5 * r
-
-            r = r1 + (travelled_distance * dr / segment_length)
-
-            # Get the next point
-            x = p1[0] + (travelled_distance * dx / segment_length)
-            y = p1[1] + (travelled_distance * dy / segment_length)
-            z = p1[2] + (travelled_distance * dz / segment_length)
-
-            i += 1
+        # Update the data of all the elements at once
+        elements.foreach_set('co', numpy.ascontiguousarray(centers, dtype=numpy.float32).ravel())
+        elements.foreach_set('radius', numpy.ascontiguousarray(radii, dtype=numpy.float32))
 
     ################################################################################################
-    # @create_meta_section
+    # @compute_meta_elements
     ################################################################################################
-    def create_meta_section(self,
-                            section):
-        """Create a section with meta objects.
+    def compute_meta_elements(self):
+        """Computes the centers and the radii of all the meta elements of the morphology.
 
-        :param section:
-            A given section to extrude a mesh around it.
+        :return:
+            A tuple of (centers [M, 3], radii [M]).
         """
 
-        # Get the list of samples
-        samples = section.samples
-
-        # Ensure that the section has at least two samples, otherwise it will give an error
-        if len(samples) < 2:
-            return
-
-        # Fixed radii
-        if self.options.morphology.radii == vmv.enums.Morphology.Radii.FIXED:
-
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
-
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=self.options.morphology.sections_fixed_radii_value * self.magic_scale_factor,
-                    r2=self.options.morphology.sections_fixed_radii_value * self.magic_scale_factor)
-
-        # Scaled radii
-        elif self.options.morphology.radii == vmv.enums.Morphology.Radii.SCALED:
-
-            # Get the scale value
-            scale = self.options.morphology.sections_radii_scale
-
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=samples[i].radius * self.magic_scale_factor * scale,
-                    r2=samples[i + 1].radius * self.magic_scale_factor * scale)
-
-        # Minimum threshold
-        elif self.options.morphology.radii == vmv.enums.Morphology.Radii.MINIMUM:
-
-            # Get the scale value
-            value = self.options.morphology.sections_radii_minimum
+        # Apply the radius policy and the magic scale factor to all the samples at once
+        metrics = self.morphology.get_metrics()
+        radii = vmv.skeleton.ops.apply_morphology_radii_policy(
+            radii=metrics.radii, options=self.options) * self.magic_scale_factor
 
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
+        # Compute the meta elements along all the segments of the morphology
+        centers, elements_radii, smallest_radius = vmv.skeleton.ops.compute_meta_elements_arrays(
+            points=metrics.points, radii=radii, offsets=metrics.offsets)
 
-                if samples[i].radius < value:
-                    r1 = value
-                else:
-                    r1 = samples[i].radius
+        # The radius of the smallest sample
+        if smallest_radius is not None:
+            self.smallest_radius = smallest_radius
 
-                if samples[i + 1].radius < value:
-                    r2 = value
-                else:
-                    r2 = samples[i + 1].radius
-
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=r1 * self.magic_scale_factor,
-                    r2=r2 * self.magic_scale_factor)
-
-        # Default radii as specified in the morphology file
-        else:
-
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
-
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=samples[i].radius * self.magic_scale_factor,
-                    r2=samples[i + 1].radius * self.magic_scale_factor)
+        # Return the elements
+        return centers, elements_radii
 
     ################################################################################################
-    # @initialize_meta_object
+    # @build_meta_object
     ################################################################################################
     def build_meta_object(self):
         """Builds the meta object of the sections.
         """
 
-        # For every section, in the morphology, create a meta-section
-        for i, section in enumerate(self.morphology.sections_list):
+        # Compute the meta elements along all the segments of the morphology
+        centers, radii = self.compute_meta_elements()
 
-            # Current iteration
-            vmv.utilities.show_progress('\t\t* Progress', i, len(self.morphology.sections_list))
+        # Create the elements
+        vmv.logger.info('Creating [%d] meta elements' % len(radii))
+        self.create_meta_elements(centers=centers, radii=radii)
 
-            # Create the section
-            self.create_meta_section(section)
+    ################################################################################################
+    # @update_meta_resolution
+    ################################################################################################
+    def update_meta_resolution(self):
+        """Updates the resolution of the meta object, either automatically from the smallest
+        radius in the morphology or as given by the user.
 
-        # Process done
-        vmv.utilities.show_progress('\t\t* Progress', len(self.morphology.sections_list),
-                                    len(self.morphology.sections_list), True)
+        :return:
+            The resolution of the meta object.
+        """
+
+        if self.options.mesh.meta_auto_resolution:
+            resolution = self.smallest_radius * 0.9
+        else:
+            resolution = self.options.mesh.meta_resolution
+
+        # Update the interface
+        vmv.logger.info('MetaBall resolution: [%f]' % resolution)
+        self.options.mesh.meta_resolution = resolution
+
+        # Return the resolution
+        return resolution
 
     ################################################################################################
     # @initialize_meta_object
@@ -348,14 +253,8 @@ class MetaBuilder:
         # Header
         # vmv.logger.header('Meshing the Meta Object')
 
-        if self.options.mesh.meta_auto_resolution:
-            self.meta_skeleton.resolution = self.smallest_radius * 0.9
-        else:
-            self.meta_skeleton.resolution = self.options.mesh.meta_resolution
-
-        # Update the interface
-        vmv.logger.info('MetaBall resolution: [%f]' % self.meta_skeleton.resolution)
-        self.options.mesh.meta_resolution = self.meta_skeleton.resolution
+        # Set the resolution of the meta object
+        self.meta_skeleton.resolution = self.update_meta_resolution()
 
         # Deselect all objects
         vmv.scene.ops.deselect_all()
@@ -422,27 +321,208 @@ class MetaBuilder:
             # Adjust the texture mapping
             vmv.shading.adjust_material_uv(mesh_object=self.meta_mesh)
 
+    ################################################################################################
+    # @create_meta_tiles
+    ################################################################################################
+    def create_meta_tiles(self,
+                          centers,
+                          radii,
+                          resolution,
+                          directory):
+        """Partitions the meta elements into overlapping spatial tiles and writes the data of each
+        tile into a file to be meshed by a separate process.
+
+        :param centers:
+            An array of the centers of the meta elements [M, 3].
+        :param radii:
+            An array of the radii of the meta elements [M].
+        :param resolution:
+            The resolution of the meta object, shared by all the tiles.
+        :param directory:
+            The directory where the files of the tiles will be written.
+        :return:
+            A list of the paths of the files of the tiles.
+        """
+
+        # Partition the elements into tiles
+        tiles_bounds = vmv.skeleton.ops.compute_meta_tiles_bounds(
+            centers=centers, radii=radii, number_tiles=self.options.mesh.meta_tiles,
+            resolution=resolution)
+
+        # Write the tiles
+        tiles_files = list()
+        for i, (p_min, p_max) in enumerate(tiles_bounds):
+
+            # The elements that influence the tile and a margin of two cells around it
+            indices = vmv.skeleton.ops.get_meta_tile_elements_indices(
+                centers=centers, radii=radii, p_min=p_min, p_max=p_max, margin=2 * resolution)
+
+            # Write the tile
+            tile_file = '%s/tile_%d.npz' % (directory, i)
+            numpy.savez(tile_file, centers=centers[indices], radii=radii[indices],
+                        resolution=resolution, p_min=p_min, p_max=p_max)
+            tiles_files.append(tile_file)
+
+        # Return the list of the files
+        return tiles_files
+
+    ################################################################################################
+    # @mesh_meta_tiles
+    ################################################################################################
+    def mesh_meta_tiles(self,
+                        tiles_files):
+        """Meshes the tiles in parallel, each in a separate headless Blender process that writes
+        its output to a log file next to the file of the tile.
+
+        :param tiles_files:
+            A list of the paths of the files of the tiles.
+        :return:
+            A tuple (success, meshes) where success is False if any of the tiles could not be
+            meshed, and meshes is a list of the arrays (vertices, loops, loops totals) of the
+            meshes of the tiles.
+        """
+
+        # The CLI that meshes a single tile
+        cli_meta_tile_meshing = '%s/../../interface/cli/meta_tile_meshing.py' % \
+            os.path.dirname(os.path.realpath(__file__))
+
+        # Mesh a single tile, the worker exits with an error if the script fails
+        def mesh_meta_tile(tile_file):
+            mesh_file = tile_file.replace('.npz', '_mesh.npz')
+            log_file_path = tile_file.replace('.npz', '.log')
+            with open(log_file_path, 'w') as log_file:
+                worker = subprocess.run([bpy.app.binary_path, '-b', '--verbose', '0',
+                                         '--python-exit-code', '1',
+                                         '--python', cli_meta_tile_meshing, '--',
+                                         '--tile', tile_file, '--output', mesh_file],
+                                        stdout=log_file, stderr=subprocess.STDOUT)
+            return mesh_file, worker.returncode, log_file_path
+
+        # Number of the workers
+        number_workers = self.options.mesh.meta_tiles_workers
+        if number_workers < 1:
+            number_workers = os.cpu_count()
+
+        # Mesh all the tiles, each thread waits for a single Blender process
+        with concurrent.futures.ThreadPoolExecutor(max_workers=number_workers) as executor:
+            tiles_results = list(executor.map(mesh_meta_tile, tiles_files))
+
+        # Load the meshes of the tiles
+        success = True
+        meshes_arrays = list()
+        for mesh_file, return_code, log_file_path in tiles_results:
+
+            # The tile could not be meshed, report the log of its worker before it is removed
+            if return_code != 0 or not os.path.isfile(mesh_file):
+                vmv.logger.log('ERROR: The tile [%s] could NOT be meshed, exit code [%d]' %
+                               (mesh_file, return_code))
+                with open(log_file_path, 'r') as log_file:
+                    for line in log_file.read().splitlines()[-20:]:
+                        vmv.logger.log('    %s' % line)
+                success = False
+                continue
+
+            # Load the mesh
+            mesh_data = numpy.load(mesh_file)
+            meshes_arrays.append(
+                (mesh_data['vertices'], mesh_data['loops'], mesh_data['loops_totals']))
+
+        # Return the meshes
+        return success, meshes_arrays
+
+    ################################################################################################
+    # @build_mesh_in_tiles
+    ################################################################################################
+    def build_mesh_in_tiles(self):
+        """Reconstructs the mesh in overlapping spatial tiles that are meshed in parallel and then
+        stitched together into a single mesh, to use all the cores and bound the memory.
+
+        :return:
+            True if all the tiles are meshed and stitched, otherwise False.
+        """
+
+        # Compute the meta elements along all the segments of the morphology
+        vmv.logger.info('Computing meta elements')
+        centers, radii = self.compute_meta_elements()
+
+        # The resolution must be the same for all the tiles to align their polygonization grids
+        resolution = self.update_meta_resolution()
+
+        # A temporary directory for the data of the tiles, removed even if the meshing fails
+        directory = tempfile.mkdtemp(prefix='vmv_meta_tiles_')
+        try:
+
+            # Partition the elements into tiles
+            tiles_files = self.create_meta_tiles(
+                centers=centers, radii=radii, resolution=resolution, directory=directory)
+
+            # Mesh the tiles
+            vmv.logger.info('Meshing [%d] tiles' % len(tiles_files))
+            success, meshes_arrays = self.mesh_meta_tiles(tiles_files=tiles_files)
+
+        # Clean the temporary data
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        # A partial mesh would have holes
+        if not success:
+            vmv.logger.log('ERROR: The mesh is NOT built, some tiles could NOT be meshed')
+            return False
+
+        # Stitch the tiles into a single mesh
+        vmv.logger.info('Stitching tiles')
+        vertices, loops, loops_totals = vmv.mesh.concatenate_mesh_arrays(meshes_arrays)
+        self.meta_mesh = vmv.mesh.create_mesh_object_from_arrays(
+            name=self.morphology.name + vmv.consts.Meshing.MESH_SUFFIX,
+            vertices=vertices, loops=loops, loops_totals=loops_totals)
+
+        # Weld the vertices along the borders of the tiles, which are cut identically in the tiles
+        vmv.mesh.remove_double_points(mesh_object=self.meta_mesh, threshold=1e-3 * resolution)
+
+        # Tessellate Mesh
+        self.tessellate_mesh()
+
+        # Set the mesh to be the active object
+        self.meta_mesh.select_set(True)
+        bpy.context.view_layer.objects.active = self.meta_mesh
+
+        # Done
+        return True
+
     ################################################################################################
     # @build
     ################################################################################################
     def build_mesh(self):
         """Reconstructs the vascular mesh using meta objects.
+
+        :return:
+            A reference to the reconstructed mesh, or None if the mesh could not be built.
         """
 
         vmv.logger.header('Mesh reconstruction with MetaBalls')
 
-        # Initialize the meta object
         start = time.time()
-        vmv.logger.info('Initialization')
-        self.initialize_meta_object()
 
-        # Build the meta object
-        vmv.logger.info('Building meta object')
-        self.build_meta_object()
+        # Mesh the meta object in spatial tiles
+        if self.options.mesh.meta_tiles > 1:
+            if not self.build_mesh_in_tiles():
+                return None
+
+        # Mesh the whole meta object at once
+        else:
+
+            # Initialize the meta object
+            vmv.logger.info('Initialization')
+            self.initialize_meta_object()
+
+            # Build the meta object
+            vmv.logger.info('Building meta object')
+            self.build_meta_object()
+
+            # Finalize the meta object and create the actual mesh
+            vmv.logger.info('Reconstructing mesh')
+            self.finalize_meta_object()
 
-        # Finalize the meta object and create the actual mesh
-        vmv.logger.info('Reconstructing mesh')
-        self.finalize_meta_object()
         end = time.time()
 
         # Time
@@ -458,3 +538,6 @@ class MetaBuilder:
 
         # Mission done
         vmv.logger.header('Done!')
+
+        # Return a reference to the mesh
+        return self.meta_mesh
@@ -26,6 +26,7 @@ from mathutils import Vector
 # Internal modules
 import vmv
 import vmv.builders
+import vmv.consts
 import vmv.enums
 import vmv.mesh
 import vmv.skeleton
@@ -154,7 +155,8 @@ class PolylineBuilder:
     # @build
     ################################################################################################
     def build_mesh(self):
-        """Reconstructs the neuronal mesh using meta objects.
+        """Reconstructs the vascular mesh by sweeping a circular cross-section along each section,
+        where each section is a closed tube.
         """
 
         # Verify and repair the morphology
@@ -162,14 +164,20 @@ class PolylineBuilder:
 
         self.center = self.morphology.bounding_box.center
 
-        # Create an instance of the morphology builder
-        morphology_builder = vmv.builders.ConnectedSectionsBuilder(self.morphology, self.options)
+        # Apply the radius policy to all the samples at once
+        metrics = self.morphology.get_metrics()
+        radii = vmv.skeleton.ops.apply_morphology_radii_policy(
+            radii=metrics.radii, options=self.options)
 
-        # Build the skeleton and return a reference to it
-        morphology_skeleton = morphology_builder.build_skeleton()
+        # Sweep the cross-section along all the sections at once
+        vertices, loops, loops_totals = vmv.mesh.compute_swept_tubes_arrays(
+            points=metrics.points, radii=radii, offsets=metrics.offsets,
+            sides=self.options.morphology.bevel_object_sides)
 
-        # Convert it to a mesh
-        self.mesh = vmv.scene.convert_object_to_mesh(morphology_skeleton)
+        # Create the mesh in bulk
+        self.mesh = vmv.mesh.create_mesh_object_from_arrays(
+            name=self.morphology.name + vmv.consts.Meshing.MESH_SUFFIX, vertices=vertices,
+            loops=loops, loops_totals=loops_totals, smooth_shading=True)
 
         # We can here create the materials at the end to avoid any issues
         self.create_skeleton_materials()
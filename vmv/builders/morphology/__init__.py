@@ -21,3 +21,4 @@ from .connected_sections_builder import *
 from .disconnected_sections_builder import *
 from .disconnected_segments_builder import *
 from .samples_builder import *
+from .progressive_builder import *
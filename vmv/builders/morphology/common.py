@@ -23,6 +23,7 @@ import vmv
 import vmv.shading
 import vmv.consts
 import vmv.skeleton
+import vmv.utilities
 
 
 ####################################################################################################
@@ -47,3 +48,39 @@ def create_skeleton_materials(builder):
     builder.materials = vmv.skeleton.ops.create_skeleton_materials(
         name='morphology_skeleton', material_type=builder.options.morphology.material,
         color=builder.options.morphology.color)
+
+
+####################################################################################################
+# @update_color_map_values_in_ui
+####################################################################################################
+def update_color_map_values_in_ui(builder,
+                                  values,
+                                  minimum,
+                                  maximum):
+    """Updates the minimum and maximum values of the color-map in the UI and the values of its
+    colors, if the builder is called from the UI.
+
+    :param builder:
+        A reference to the builder that is used to create the skeleton.
+    :param values:
+        An array of the values that are mapped to the color-map.
+    :param minimum:
+        The minimum value of the color-map.
+    :param maximum:
+        The maximum value of the color-map.
+    """
+
+    # The builder is not called from the UI
+    if builder.context is None:
+        return
+
+    # The minimum and maximum values
+    builder.context.scene.MinimumValue = str(minimum)
+    builder.context.scene.MaximumValue = str(maximum)
+
+    # The values of the colors of the color-map, based on the normalization
+    colors_values = vmv.utilities.compute_color_map_values(
+        values=values, number_values=vmv.consts.Color.NUMBER_COLORS_UI, minimum=minimum,
+        maximum=maximum, normalization=builder.options.morphology.color_map_normalization)
+    for i, value in enumerate(colors_values):
+        setattr(builder.context.scene, 'Value%d' % i, float(value))
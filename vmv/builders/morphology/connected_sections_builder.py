@@ -29,6 +29,7 @@ import vmv.consts
 import vmv.geometry
 import vmv.mesh
 import vmv.scene
+import vmv.shading
 import vmv.skeleton
 import vmv.builders
 
@@ -52,8 +53,12 @@ class ConnectedSectionsBuilder:
             A given morphology.
         """
 
-        # Morphology
-        self.morphology = morphology
+        # The loaded morphology and the level of detail the skeleton is built from
+        self.source_morphology = morphology
+        self.level_of_detail = options.morphology.level_of_detail
+
+        # Morphology, at the level of detail requested in the options
+        self.morphology = morphology.get_level_of_detail_morphology(level=self.level_of_detail)
 
         # All the options of the project
         self.options = options
@@ -78,250 +83,38 @@ class ConnectedSectionsBuilder:
         # A list of the colors/materials of the skeleton
         self.materials = None
 
-        self.object = None
-
-        self.components = list()
-
-        # Build the materials
-        #vmv.builders.create_skeleton_materials(builder=self)
-
-        # Create a static bevel object that you can use to scale the samples along the arbors
-        # of the morphology
-        self.bevel_object = vmv.mesh.create_bezier_circle(radius=1.0, vertices=16, name='bevel')
-
         # UI context 
         self.context = None
 
-    def get_number_components(self):
-        return  len(self.components)
-
-
-    def build_component(self, component_index):
-        """Builds each component and reflect the change to the UI.
-
-        :return:
-        """
-        # Draw the poly-line from the data
-        poly_line = vmv.geometry.ops.draw_poly_line(
-            poly_line_data=self.components[component_index], name='line', material=None,
-            bevel_object=self.bevel_object)
-
-        if self.object is None:
-            self.object = poly_line
-        else:
-            self.object = vmv.scene.join_objects([self.object, poly_line])
-
-
-
     ################################################################################################
-    # @build_section
+    # @get_connected_paths_poly_lines_batch
     ################################################################################################
-    def build_section(self,
-                      section):
-        """Build section, connected with one of the parent and one of the children to make a smooth
-        continuation between the sections.
+    def get_connected_paths_poly_lines_batch(self):
+        """Gets a batch of poly-lines, one per connected path from the roots to the leaves of the
+        morphology, where every section is drawn only once.
 
-        :param section:
-            A given section to build.
         :return:
-            Returns a reference to the created sections, just in case if we need to use them to
-            reconstruct the mesh.
+            A PolyLinesBatch of all the connected paths in the entire morphology.
         """
-        '''
-        # A list to keep the connectivity data to draw the poly-lines of the connected sections
-        sections_data = list()
-
-        # If the section has any parents and any children
-        if len(section.parents) > 0 and len(section.children) > 0:
-
-            # Make a connected section between each parent and this section
-            for parent in section.parents:
-
-                # Extend the connectivity from the section to each child
-                for child in section.children:
-
-                    # Get the section data
-                    section_data = vmv.skeleton.ops.get_connectivity_poly_line_from_parent_to_child(
-                        section=section, parent=parent, child=child, center=self.center)
-
-                    # Add the data to the list
-                    sections_data.append(section_data)
-
-        # If the section has no parents but has some children
-        if len(section.parents) == 0 and len(section.children) > 0:
-
-            # Make a connected section between this section and each child
-            for child in section.children:
-
-                # Get the section data
-                section_data = vmv.skeleton.ops.get_connectivity_poly_line_from_section_to_child(
-                        section=section, child=child, center=self.center)
-
-                # Add the data to the list
-                sections_data.append(section_data)
-
-        # If the section has some parent and no children
-        if len(section.parents) > 0 and len(section.children) == 0:
 
-            # Make a connected section between each parent and this section
-            for parent in section.parents:
+        # All the paths share the same material
+        return vmv.skeleton.ops.get_connected_paths_poly_lines_batch(
+            morphology=self.morphology, material_index=0)
 
-                # Get the section data
-                section_data = vmv.skeleton.ops.get_connectivity_poly_line_from_parent_to_section(
-                    section=section, parent=parent, center=self.center)
-
-                # Add the data to the list
-                sections_data.append(section_data)
-
-        # If the section is an orphan, or has no parents and no children
-        if len(section.parents) == 0 and len(section.children) == 0:
-
-            # Get the section data of this section only
-            section_data = vmv.skeleton.ops.get_section_poly_line(
-                section=section, center=self.center)
-
-            # Add the data to the list
-            sections_data.append(section_data)
-
-        # A list that will keep references to the drawn poly-lines
-        drawn_poly_lines = list()
-
-        # Draw the poly-lines
-        for section_data in sections_data:
-
-            # Draw the poly-line from the data
-            poly_line = vmv.geometry.ops.draw_poly_line(
-                poly_line_data=section_data, name='line', material=self.materials[0],
-                bevel_object=self.bevel_object)
-
-            # Add the poly-line to the list
-            drawn_poly_lines.append(poly_line)
-    '''
-    '''
     ################################################################################################
-    # @build_section
+    # @prepare_poly_lines
     ################################################################################################
-    def build_section(self,
-                      section):
-        """Build section, connected with one of the parent and one of the children to make a smooth
-        continuation between the sections.
-
-        :param section:
-            A given section to build.
+    def prepare_poly_lines(self,
+                           context=None):
+        """Clears the scene and prepares the poly-lines of the skeleton with the assets needed to
+        draw them, without drawing anything. This allows drawing the poly-lines at once or in
+        several batches.
+
+        :param context:
+            Blender context, or None.
         :return:
-            Returns a reference to the created sections, just in case if we need to use them to
-            reconstruct the mesh.
+            A tuple of (poly-lines batch, color-map, bevel object).
         """
-        
-        # A list to keep the connectivity data to draw the poly-lines of the connected sections
-        sections_data = list()
-
-        # If the section has any parents and any children
-        if len(section.parents) > 0 and len(section.children) > 0:
-
-            # Make a connected section between each parent and this section
-            for parent in section.parents:
-
-                # Extend the connectivity from the section to each child
-                for child in section.children:
-
-                    # Get the section data
-                    section_data = vmv.skeleton.ops.get_connectivity_poly_line_from_parent_to_child(
-                        section=section, parent=parent, child=child, center=self.center)
-
-                    # Add the data to the list
-                    sections_data.append(section_data)
-
-        # If the section has no parents but has some children
-        if len(section.parents) == 0 and len(section.children) > 0:
-
-            # Make a connected section between this section and each child
-            for child in section.children:
-
-                # Get the section data
-                section_data = vmv.skeleton.ops.get_connectivity_poly_line_from_section_to_child(
-                        section=section, child=child, center=self.center)
-
-                # Add the data to the list
-                sections_data.append(section_data)
-
-        # If the section has some parent and no children
-        if len(section.parents) > 0 and len(section.children) == 0:
-
-            # Make a connected section between each parent and this section
-            for parent in section.parents:
-
-                # Get the section data
-                section_data = vmv.skeleton.ops.get_connectivity_poly_line_from_parent_to_section(
-                    section=section, parent=parent, center=self.center)
-
-                # Add the data to the list
-                sections_data.append(section_data)
-
-        # If the section is an orphan, or has no parents and no children
-        if len(section.parents) == 0 and len(section.children) == 0:
-
-            # Get the section data of this section only
-            section_data = vmv.skeleton.ops.get_section_poly_line(
-                section=section, center=self.center)
-
-            # Add the data to the list
-            sections_data.append(section_data)
-
-        # A list that will keep references to the drawn poly-lines
-        drawn_poly_lines = list()
-
-        # Draw the poly-lines
-        for section_data in sections_data:
-
-            # Draw the poly-line from the data
-            poly_line = vmv.geometry.ops.draw_poly_line(
-                poly_line_data=section_data, name='line', material=self.materials[0],
-                bevel_object=self.bevel_object)
-
-            # Add the poly-line to the list
-            drawn_poly_lines.append(poly_line)
-    '''
-
-    ################################################################################################
-    # @get_sections_poly_lines_data
-    ################################################################################################
-    def get_connected_sections_poly_lines_data(self):
-        """Gets a list of the data of all the poly-lines that correspond to the sections in the
-        morphology.
-
-        NOTE: Each entry in the the poly-lines list has the following format:
-            * poly_lines_data[0]: a list of all the samples (points and their radii)
-            * poly_lines_data[0]: the material index
-
-        :return:
-            A list of all the poly-lines that correspond to the sections in the entire morphology.
-        """
-
-        # A list of all the poly-lines
-        poly_lines_data = list()
-
-        # Get the poly-line data of each section
-        for section in self.morphology.sections_list:
-
-            # Poly-line samples
-            poly_lines = vmv.skeleton.ops.get_connected_sections_poly_lines(section=section)
-
-            # Poly-line material index (we use two colors to highlight the sections)
-            poly_lines_data.extend(poly_lines)
-
-        # Return the poly-lines list
-        return poly_lines_data
-
-    ################################################################################################
-    # @build_skeleton
-    ################################################################################################
-    def build_skeleton(self, 
-                       context=None):
-        """Draws the morphology skeleton using fast reconstruction and drawing method.
-        """
-
-        vmv.logger.header('Building skeleton: ConnectedSectionsBuilder')
 
         # Get the context 
         self.context = context 
@@ -342,49 +135,69 @@ class ConnectedSectionsBuilder:
         bevel_object = vmv.mesh.create_bezier_circle(
             radius=1.0, vertices=self.options.morphology.bevel_object_sides, name='bevel')
 
-        # Construct sections poly-lines
+        # Construct the connected paths poly-lines
         vmv.logger.log('Constructing poly-lines')
-        poly_lines_data = self.get_connected_sections_poly_lines_data()
+        poly_lines_batch = self.get_connected_paths_poly_lines_batch()
 
         # Pre-process the radii
         vmv.logger.detail('Adjusting radii')
-        vmv.skeleton.update_poly_lines_radii(poly_lines=poly_lines_data, options=self.options)
-
-        # Construct the final object and add it to the morphology
-        vmv.logger.log('Drawing object')
-        return vmv.geometry.create_poly_lines_object_from_poly_lines_data(
-            poly_lines_data, material=self.options.morphology.material, color_map=color_map,
-            name=self.morphology.name, bevel_object=bevel_object)
-
+        vmv.skeleton.update_poly_lines_batch_radii(
+            poly_lines_batch=poly_lines_batch, options=self.options)
 
-    def build_skeletonxx(self):
-        """Builds a list of connected sections with only a single traversal per section
+        # Return the poly-lines and the assets
+        return poly_lines_batch, color_map, bevel_object
 
-        :return:
-            A list of connected sections.
+    ################################################################################################
+    # @build_skeleton
+    ################################################################################################
+    def build_skeleton(self,
+                       context=None):
+        """Draws the morphology skeleton using fast reconstruction and drawing method.
         """
 
-        # For every root in the morphology
-        for root in self.morphology.roots:
+        vmv.logger.header('Building skeleton: ConnectedSectionsBuilder')
 
-            poly_line_data = list()
-            poly_lines_data = list()
+        # Prepare the poly-lines and the assets
+        poly_lines_batch, color_map, bevel_object = self.prepare_poly_lines(context=context)
 
-            # Get the section data
-            vmv.skeleton.ops.get_connectivity_poly_lines_from_this_section_to_leaf(
-                root, poly_line_data, poly_lines_data, center=self.morphology.bounding_box.center)
+        # Construct the final object, all the paths are splines of a single curve object
+        vmv.logger.log('Drawing object')
+        return vmv.geometry.create_poly_lines_object_from_poly_lines_batch(
+            poly_lines_batch, material=self.options.morphology.material, color_map=color_map,
+            name=self.morphology.name, bevel_object=bevel_object)
+
+    ################################################################################################
+    # @recolor_skeleton
+    ################################################################################################
+    def recolor_skeleton(self,
+                         skeleton_object,
+                         context=None):
+        """Updates the color of a skeleton that was already built by this builder. All the paths
+        share a single material, so only the material of the object is replaced.
+
+        :param skeleton_object:
+            The poly-lines object of the skeleton.
+        :param context:
+            Blender context, or None.
+        :return:
+            True if the skeleton was recolored, or False if it must be rebuilt.
+        """
 
-            self.components.extend(poly_lines_data)
+        # Get the context
+        self.context = context
 
-            for i, poly_line in enumerate(poly_lines_data):
+        # The skeleton must be the poly-lines object
+        if skeleton_object.type != 'CURVE':
+            return False
 
-                # Draw the poly-line from the data
-                p = vmv.geometry.ops.draw_poly_line(
-                    poly_line_data=poly_line, name='line', material=None,
-                    bevel_object=self.bevel_object)
+        # Update the material
+        vmv.logger.info('Updating materials')
+        vmv.shading.set_object_color_map_materials(
+            skeleton_object, color_map=[self.options.mesh.color],
+            material_type=self.options.morphology.material)
 
-        # Reset the traversal state
-        self.morphology.reset_traversal_states()
+        # Done
+        return True
 
     ################################################################################################
     # @build
@@ -18,15 +18,18 @@
 # System imports
 import sys
 import copy
+import numpy
 
 # Blender imports
 import bpy
 
 # Internal imports
 import vmv
+import vmv.builders
 import vmv.geometry
 import vmv.mesh
 import vmv.scene
+import vmv.shading
 import vmv.skeleton
 
 
@@ -52,8 +55,12 @@ class DisconnectedSectionsBuilder:
             System options.
         """
 
-        # Clone the original morphology to morphology before the pre=processing
-        self.morphology = morphology
+        # The loaded morphology and the level of detail the skeleton is built from
+        self.source_morphology = morphology
+        self.level_of_detail = options.morphology.level_of_detail
+
+        # Morphology, at the level of detail requested in the options
+        self.morphology = morphology.get_level_of_detail_morphology(level=self.level_of_detail)
 
         # All the options of the project
         self.options = options
@@ -65,205 +72,68 @@ class DisconnectedSectionsBuilder:
         self.context=None
 
     ################################################################################################
-    # @get_poly_lines_data_colored_with_single_color
-    ################################################################################################
-    def get_poly_lines_data_colored_with_single_color(self):
-
-        # Get the poly-line data of each section
-        poly_lines_data = [
-            vmv.skeleton.ops.get_color_coded_section_poly_line_with_single_color(section=section) 
-                for section in self.morphology.sections_list] 
-        
-        # Return the list 
-        return poly_lines_data 
-
-
-    ################################################################################################
-    # @get_poly_lines_data_colored_with_alternating_colors
-    ################################################################################################
-    def get_poly_lines_data_colored_with_alternating_colors(self):
-
-        # Get the poly-line data of each section
-        poly_lines_data = [
-            vmv.skeleton.ops.get_color_coded_section_poly_line_with_alternating_colors(
-                section=section)
-                    for section in self.morphology.sections_list] 
-        
-        # Return the list 
-        return poly_lines_data 
-
-    ################################################################################################
-    # @get_poly_lines_data_colored_based_on_radius
+    # @get_sections_material_indices
     ################################################################################################
-    def get_poly_lines_data_colored_based_on_radius(self):
-        """Gets a list of poly-lines that are color-coded based on the average radii of the 
-        sections.
+    def get_sections_material_indices(self):
+        """Computes the material indices of all the sections at once based on the color-coding
+        scheme.
 
-        :return: 
-            A list of poly-lines that are color-coded based on the average radii of the 
-            sections.
+        :return:
+            An array of material indices, one per section.
         """
 
-        # Get minimum and maximum (average-radii) of the sections in the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_sections_average_radii(
-            self.morphology)
-
-        # Update the interface with the minimum and maximum values for the color-mapping  
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
-
-        # Get the poly-line data of each section
-        poly_lines_data = [vmv.skeleton.ops.get_color_coded_section_poly_line_based_on_radius(
-                    section=section, minimum=minimum, maximum=maximum, 
-                    color_map_resolution=self.options.morphology.color_map_resolution) \
-                        for section in self.morphology.sections_list] 
-        
-        # Return the list 
-        return poly_lines_data
-
-    ################################################################################################
-    # @get_poly_lines_data_colored_based_on_length
-    ################################################################################################
-    def get_poly_lines_data_colored_based_on_length(self):
-        """Gets a list of poly-line that are color-coded based on the lengths of the sections.
-
-        :return: 
-            A list of poly-line that are color-coded based on the lengths of the sections.
-        """
+        # The cached metrics of the morphology
+        metrics = self.morphology.get_metrics()
 
-        # Get minimum and maximum lengths of the sections in the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_sections_lengths(
-            self.morphology)
-
-        # Update the interface with the minimum and maximum values for the color-mapping  
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
-
-        # Get the poly-line data of each section
-        poly_lines_data = [vmv.skeleton.ops.get_color_coded_section_poly_line_based_on_length(
-            section=section, minimum=minimum, maximum=maximum, 
-            color_map_resolution=self.options.morphology.color_map_resolution) 
-                for section in self.morphology.sections_list] 
-        
-        # Return the list 
-        return poly_lines_data
-
-    ################################################################################################
-    # @get_poly_lines_data_colored_based_on_surface_area
-    ################################################################################################
-    def get_poly_lines_data_colored_based_on_surface_area(self):
-        """Gets a list of poly-line that are color-coded based on the areas of the sections.
-
-        :return: 
-            A list of poly-line that are color-coded based on the areas of the sections.
-        """
-
-        # Get minimum and maximum surface areas of the sections in the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_sections_surface_areas(
-            self.morphology)
-
-        # Update the interface with the minimum and maximum values for the color-mapping  
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
-
-        # Get the poly-line data of each section
-        poly_lines_data = [vmv.skeleton.ops.get_color_coded_section_poly_line_based_on_surface_area(
-            section=section, minimum=minimum, maximum=maximum, 
-            color_map_resolution=self.options.morphology.color_map_resolution) 
-                for section in self.morphology.sections_list] 
-        
-        # Return the list 
-        return poly_lines_data
+        # Alternating colors
+        if self.options.morphology.color_coding == vmv.enums.ColorCoding.ALTERNATING_COLORS:
+            return numpy.fromiter((section.index % 2 for section in self.morphology.sections_list),
+                                  dtype=numpy.int32, count=len(self.morphology.sections_list))
 
-    ################################################################################################
-    # @get_poly_lines_data_colored_based_on_volume
-    ################################################################################################
-    def get_poly_lines_data_colored_based_on_volume(self):
-        """Gets a list of poly-line that are color-coded based on the volumes of the sections.
+        # Based on a metric of the sections
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_RADIUS:
+            values = metrics.sections_average_radii
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_LENGTH:
+            values = metrics.sections_lengths
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_AREA:
+            values = metrics.sections_surface_areas
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_VOLUME:
+            values = metrics.sections_volumes
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_NUMBER_SAMPLES:
+            values = metrics.sections_number_samples
 
-        :return: 
-            A list of poly-line that are color-coded based on the volumes of the sections.
-        """
+        # Single color
+        else:
+            return numpy.zeros(len(self.morphology.sections_list), dtype=numpy.int32)
 
-        # Get minimum and maximum volumes of the sections in the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_sections_volumes(self.morphology)
+        # Get minimum and maximum values of the metric
+        minimum = float(values.min())
+        maximum = float(values.max())
 
-        # Update the interface with the minimum and maximum values for the color-mapping  
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
+        # Update the interface with the values of the color-map
+        vmv.builders.update_color_map_values_in_ui(
+            builder=self, values=values, minimum=minimum, maximum=maximum)
 
-        # Get the poly-line data of each section
-        poly_lines_data = [vmv.skeleton.ops.get_color_coded_section_poly_line_based_on_volume(
-            section=section, minimum=minimum, maximum=maximum,
-            color_map_resolution=self.options.morphology.color_map_resolution) 
-                for section in self.morphology.sections_list] 
-        
-        # Return the list 
-        return poly_lines_data
+        # Compute the indices
+        return vmv.skeleton.ops.compute_color_map_indices(
+            values=values, minimum=minimum, maximum=maximum,
+            color_map_resolution=self.options.morphology.color_map_resolution,
+            normalization=self.options.morphology.color_map_normalization)
 
     ################################################################################################
-    # @get_poly_lines_data_colored_based_on_number_samples_in_section
+    # @get_sections_poly_lines_batch
     ################################################################################################
-    def get_poly_lines_data_colored_based_on_number_samples_in_section(self):
-        """Gets a list of poly-line that are color-coded based on the number of samples in the 
-        sections.
+    def get_sections_poly_lines_batch(self):
+        """Gets a batch of poly-lines, one per section, color-coded based on the color-coding
+        scheme.
 
-        :return: 
-            A list of poly-line that are color-coded based on the number of samples in the sections.
+        :return:
+            A PolyLinesBatch.
         """
 
-        # Get minimum and maximum volumes of the sections in the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_sections_number_samples(
-            self.morphology)
-
-        # Update the interface with the minimum and maximum values for the color-mapping  
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
-
-        # Get the poly-line data of each section
-        poly_lines_data = [
-            vmv.skeleton.ops.get_color_coded_section_poly_line_based_on_number_samples(
-                section=section, minimum=minimum, maximum=maximum,
-                color_map_resolution=self.options.morphology.color_map_resolution) 
-                    for section in self.morphology.sections_list] 
-        
-        # Return the list 
-        return poly_lines_data
-
-    ################################################################################################
-    # @get_sections_poly_lines_data
-    ################################################################################################
-    def get_sections_poly_lines_data(self):
-
-        # A list of all the poly-lines
-        poly_lines_data = list()
-        
-        # Get the data based on the color-coding scheme  
-        if self.options.morphology.color_coding == vmv.enums.ColorCoding.SINGLE_COLOR:
-            return self.get_poly_lines_data_colored_with_single_color()   
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.ALTERNATING_COLORS:
-            return self.get_poly_lines_data_colored_with_alternating_colors()
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_RADIUS:
-            return self.get_poly_lines_data_colored_based_on_radius() 
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_LENGTH:
-            return self.get_poly_lines_data_colored_based_on_length() 
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_AREA:
-            return self.get_poly_lines_data_colored_based_on_surface_area()
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_VOLUME:
-            return self.get_poly_lines_data_colored_based_on_volume() 
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_NUMBER_SAMPLES:
-            return self.get_poly_lines_data_colored_based_on_number_samples_in_section() 
-        else:
-            return self.get_poly_lines_data_colored_with_single_color()   
+        return vmv.skeleton.ops.get_sections_poly_lines_batch(
+            morphology=self.morphology, material_indices=self.get_sections_material_indices())
 
-        return poly_lines_data 
-    
-    
     ################################################################################################
     # @create_color_map
     ################################################################################################
@@ -291,14 +161,20 @@ class DisconnectedSectionsBuilder:
                  number_colors=self.options.morphology.color_map_resolution)
 
     ################################################################################################
-    # @build_skeleton
+    # @prepare_poly_lines
     ################################################################################################
-    def build_skeleton(self, context=None):
-        """Draws the morphology skeleton using fast reconstruction and drawing method.
+    def prepare_poly_lines(self,
+                           context=None):
+        """Clears the scene and prepares the poly-lines of the skeleton with the assets needed to
+        draw them, without drawing anything. This allows drawing the poly-lines at once or in
+        several batches.
+
+        :param context:
+            Blender context, or None.
+        :return:
+            A tuple of (poly-lines batch, color-map, bevel object).
         """
 
-        vmv.logger.header('Building skeleton: DisconnectedSectionsBuilder')
-
         # Get the context 
         self.context = context
 
@@ -320,19 +196,70 @@ class DisconnectedSectionsBuilder:
 
         # Construct sections poly-lines
         vmv.logger.info('Constructing poly-lines')
-        poly_lines_data = self.get_sections_poly_lines_data()
+        poly_lines_batch = self.get_sections_poly_lines_batch()
 
         # Pre-process the radii
         vmv.logger.info('Adjusting radii')
-        vmv.skeleton.update_poly_lines_radii(poly_lines=poly_lines_data, options=self.options)
+        vmv.skeleton.update_poly_lines_batch_radii(
+            poly_lines_batch=poly_lines_batch, options=self.options)
+
+        # Return the poly-lines and the assets
+        return poly_lines_batch, color_map, bevel_object
+
+    ################################################################################################
+    # @build_skeleton
+    ################################################################################################
+    def build_skeleton(self,
+                       context=None):
+        """Draws the morphology skeleton using fast reconstruction and drawing method.
+        """
+
+        vmv.logger.header('Building skeleton: DisconnectedSectionsBuilder')
 
-        # Adaptively resampling the reconstructed sections
-        if self.options.morphology.adaptive_resampling:
-            vmv.logger.info('Re-sampling poly-lines')
-            vmv.skeleton.resample_poly_lines_adaptively(poly_lines=poly_lines_data)
+        # Prepare the poly-lines and the assets
+        poly_lines_batch, color_map, bevel_object = self.prepare_poly_lines(context=context)
 
         # Construct the final object and add it to the morphology
         vmv.logger.info('Drawing object')
-        return vmv.geometry.create_poly_lines_object_from_poly_lines_data(
-            poly_lines_data, material=self.options.morphology.material, color_map=color_map,
+        return vmv.geometry.create_poly_lines_object_from_poly_lines_batch(
+            poly_lines_batch, material=self.options.morphology.material, color_map=color_map,
             name=self.morphology.name, bevel_object=bevel_object)
+
+    ################################################################################################
+    # @recolor_skeleton
+    ################################################################################################
+    def recolor_skeleton(self,
+                         skeleton_object,
+                         context=None):
+        """Updates the colors of a skeleton that was already built by this builder, where only the
+        material indices of the poly-lines and the materials of the color-map are updated and the
+        geometry is kept as is.
+
+        :param skeleton_object:
+            The poly-lines object of the skeleton.
+        :param context:
+            Blender context, or None.
+        :return:
+            True if the skeleton was recolored, or False if it must be rebuilt.
+        """
+
+        # Get the context
+        self.context = context
+
+        # Only the sections that have samples are drawn
+        non_empty = self.morphology.get_metrics().sections_number_samples > 0
+
+        # Update the material indices of the poly-lines
+        vmv.logger.info('Updating material indices')
+        if not vmv.geometry.set_poly_lines_material_indices(
+                skeleton_object, self.get_sections_material_indices()[non_empty]):
+            return False
+
+        # Update the materials of the color-map
+        vmv.logger.info('Updating materials')
+        vmv.shading.set_object_color_map_materials(
+            skeleton_object, color_map=self.create_color_map(),
+            material_type=self.options.morphology.material)
+
+        # Done
+        return True
@@ -17,6 +17,7 @@
 
 # System imports
 import random, copy
+import numpy
 
 # Blender imports
 import bpy
@@ -24,9 +25,11 @@ from mathutils import Vector
 
 # Internal imports
 import vmv
+import vmv.builders
 import vmv.geometry
 import vmv.mesh
 import vmv.scene
+import vmv.shading
 import vmv.skeleton
 import vmv.utilities
 
@@ -53,8 +56,12 @@ class DisconnectedSegmentsBuilder:
             System options.
         """
 
-        # Morphology
-        self.morphology = morphology
+        # The loaded morphology and the level of detail the skeleton is built from
+        self.source_morphology = morphology
+        self.level_of_detail = options.morphology.level_of_detail
+
+        # Morphology, at the level of detail requested in the options
+        self.morphology = morphology.get_level_of_detail_morphology(level=self.level_of_detail)
 
         # All the options of the project
         self.options = options
@@ -66,185 +73,66 @@ class DisconnectedSegmentsBuilder:
         self.context = None
 
     ################################################################################################
-    # @get_poly_line_data_colored_with_single_color
-    ################################################################################################
-    def get_poly_line_data_colored_with_single_color(self):
-
-        # The poly-lines data list 
-        poly_lines_data = list() 
-
-        # Get the poly-line data of each section
-        for section in self.morphology.sections_list:
-            poly_lines_data.extend(
-                vmv.skeleton.ops.get_color_coded_segments_poly_lines_with_single_color(
-                    section=section))
-
-        # Return the list 
-        return poly_lines_data
-
-    ################################################################################################
-    # @get_poly_line_data_colored_with_single_color
-    ################################################################################################
-    def get_poly_line_data_colored_with_alternating_colors(self):
-
-        # The poly-lines data list 
-        poly_lines_data = list() 
-        
-        # Get the poly-line data of each section
-        for section in self.morphology.sections_list:
-            poly_lines_data.extend(
-                vmv.skeleton.ops.get_color_coded_segments_poly_lines_with_alternating_colors(
-                    section=section))
-
-        # Return the list 
-        return poly_lines_data
-
-    ################################################################################################
-    # @get_poly_line_data_based_on_radius
+    # @get_segments_material_indices
     ################################################################################################
-    def get_poly_line_data_based_on_radius(self):
-        """Gets a poly-lines data list based on radius.
+    def get_segments_material_indices(self):
+        """Computes the material indices of all the segments at once based on the color-coding
+        scheme.
 
-        :return: 
-            A poly-lines data list based on the radius of the segments in the morphology. 
+        :return:
+            An array of material indices, one per segment.
         """
-        
-        # The poly-lines data list 
-        poly_lines_data = list() 
-
-        # Get minimum and maximum radii of the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_samples_radii(self.morphology)
-
-        # Update the interface with the minimum and maximum values for the color-mapping
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
-
-        # Get the poly-line data of each section
-        for section in self.morphology.sections_list:
-            poly_lines_data.extend(
-                vmv.skeleton.ops.get_color_coded_segments_poly_lines_based_on_radius(
-                    section=section, minimum=minimum, maximum=maximum, 
-                    color_map_resolution=self.options.morphology.color_map_resolution))
 
-        # Return the list 
-        return poly_lines_data
+        # The cached metrics of the morphology
+        metrics = self.morphology.get_metrics()
 
-    ################################################################################################
-    # @get_poly_line_data_based_on_radius
-    ################################################################################################
-    def get_poly_line_data_based_on_length(self):
-        """Gets a poly-lines data list based on length.
-
-        :return: 
-            A poly-lines data list based on the length of the segments in the morphology. 
-        """
-        
-        # The poly-lines data list 
-        poly_lines_data = list() 
+        # Alternating colors, based on the index of the segment along its section
+        if self.options.morphology.color_coding == vmv.enums.ColorCoding.ALTERNATING_COLORS:
+            return vmv.skeleton.ops.get_samples_local_indices(metrics.segments_offsets) % 2
 
-        # Get minimum and maximum radii of the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_segments_length(self.morphology)
-        
-        # Update the interface with the minimum and maximum values for the color-mapping
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
-
-        # Get the poly-line data of each section
-        for section in self.morphology.sections_list:
-            poly_lines_data.extend(
-                vmv.skeleton.ops.get_color_coded_segments_poly_lines_based_on_length(
-                    section=section, minimum=minimum, maximum=maximum,
-                    color_map_resolution=self.options.morphology.color_map_resolution))
-
-        # Return the list 
-        return poly_lines_data
-
-    ################################################################################################
-    # @get_poly_line_data_based_on_surface_area
-    ################################################################################################
-    def get_poly_line_data_based_on_surface_area(self):
-        """Gets a poly-lines data list based on surface area.
+        # Based on the radius, the range is defined by the radii of the samples
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_RADIUS:
+            values = metrics.segments_average_radii
+            minimum, maximum = vmv.skeleton.get_minumum_and_maximum_samples_radii(self.morphology)
 
-        :return: 
-            A poly-lines data list based on the surface area of the segments in the morphology. 
-        """
-        
-        # The poly-lines data list 
-        poly_lines_data = list() 
+        # Based on a metric of the segments
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_LENGTH:
+            values = metrics.segments_lengths
+            minimum, maximum = float(values.min()), float(values.max())
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_AREA:
+            values = metrics.segments_surface_areas
+            minimum, maximum = float(values.min()), float(values.max())
+        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_VOLUME:
+            values = metrics.segments_volumes
+            minimum, maximum = float(values.min()), float(values.max())
 
-        # Get minimum and maximum radii of the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_segments_surface_area(
-            self.morphology)
-        
-        # Update the interface with the minimum and maximum values for the color-mapping
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
+        # Single color
+        else:
+            return numpy.zeros(metrics.get_number_segments(), dtype=numpy.int32)
 
-        # Get the poly-line data of each section
-        for section in self.morphology.sections_list:
-            poly_lines_data.extend(
-                vmv.skeleton.ops.get_color_coded_segments_poly_lines_based_on_surface_area(
-                    section=section, minimum=minimum, maximum=maximum,
-                    color_map_resolution=self.options.morphology.color_map_resolution))
+        # Update the interface with the values of the color-map
+        vmv.builders.update_color_map_values_in_ui(
+            builder=self, values=values, minimum=minimum, maximum=maximum)
 
-        # Return the list 
-        return poly_lines_data
+        # Compute the indices
+        return vmv.skeleton.ops.compute_color_map_indices(
+            values=values, minimum=minimum, maximum=maximum,
+            color_map_resolution=self.options.morphology.color_map_resolution,
+            normalization=self.options.morphology.color_map_normalization)
 
     ################################################################################################
-    # @get_poly_line_data_based_on_volume
+    # @get_segments_poly_lines_batch
     ################################################################################################
-    def get_poly_line_data_based_on_volume(self):
-        """Gets a poly-lines data list based on surface area.
+    def get_segments_poly_lines_batch(self):
+        """Gets a batch of poly-lines, one per segment, color-coded based on the color-coding
+        scheme.
 
-        :return: 
-            A poly-lines data list based on the surface area of the segments in the morphology. 
+        :return:
+            A PolyLinesBatch.
         """
-        
-        # The poly-lines data list 
-        poly_lines_data = list() 
 
-        # Get minimum and maximum radii of the morphology
-        minimum, maximum = vmv.skeleton.get_minumum_and_maximum_segments_volume(
-            self.morphology)
-        
-        # Update the interface with the minimum and maximum values for the color-mapping
-        if self.context is not None:
-            self.context.scene.MinimumValue = str(minimum)
-            self.context.scene.MaximumValue = str(maximum)
-
-        # Get the poly-line data of each section
-        for section in self.morphology.sections_list:
-            poly_lines_data.extend(
-                vmv.skeleton.ops.get_color_coded_segments_poly_lines_based_on_volume(
-                    section=section, minimum=minimum, maximum=maximum,
-                    color_map_resolution=self.options.morphology.color_map_resolution))
-
-        # Return the list 
-        return poly_lines_data
-
-    ################################################################################################
-    # @get_segments_poly_lines_data
-    ################################################################################################
-    def get_segments_poly_lines_data(self):
-
-        # Get the data based on the color-coding scheme  
-        if self.options.morphology.color_coding == vmv.enums.ColorCoding.SINGLE_COLOR:
-            return self.get_poly_line_data_colored_with_single_color()   
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.ALTERNATING_COLORS:
-            return self.get_poly_line_data_colored_with_alternating_colors()
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_RADIUS:
-            return self.get_poly_line_data_based_on_radius() 
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_LENGTH:
-            return self.get_poly_line_data_based_on_length() 
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_AREA:
-            return self.get_poly_line_data_based_on_surface_area()
-        elif self.options.morphology.color_coding == vmv.enums.ColorCoding.BY_VOLUME:
-            return self.get_poly_line_data_based_on_volume() 
-        else:
-            return self.get_poly_line_data_colored_with_single_color() 
+        return vmv.skeleton.ops.get_segments_poly_lines_batch(
+            morphology=self.morphology, material_indices=self.get_segments_material_indices())
 
     ################################################################################################
     # @create_color_map
@@ -273,14 +161,80 @@ class DisconnectedSegmentsBuilder:
                 number_colors=self.options.morphology.color_map_resolution)
 
     ################################################################################################
-    # @build_skeleton
+    # @build_skeleton_as_mesh
     ################################################################################################
-    def build_skeleton(self, 
-                       context=None):
-        """Draws the morphology skeleton using fast reconstruction and drawing method.
+    def build_skeleton_as_mesh(self,
+                               context=None):
+        """Draws all the segments as a single tube mesh, where the sections are swept at once and
+        the faces of every segment are assigned the material of the segment. This gives the same
+        per-segment color-coding as the splines with a single object.
+
+        :param context:
+            Blender context, or None.
+        :return:
+            A reference to the created mesh object.
         """
 
-        vmv.logger.header('Building skeleton: DisconnectedSegmentsBuilder')
+        # Get the context
+        self.context = context
+
+        # Clear the scene
+        vmv.logger.info('Clearing scene')
+        vmv.scene.ops.clear_scene()
+
+        # Clear the materials
+        vmv.logger.info('Clearing assets')
+        vmv.scene.ops.clear_scene_materials()
+
+        # Create the color-map
+        vmv.logger.info('Creating assets')
+        color_map = self.create_color_map()
+
+        # The cached metrics of the morphology with the radii adjusted
+        metrics = self.morphology.get_metrics()
+        radii = vmv.skeleton.ops.apply_morphology_radii_policy(
+            radii=metrics.radii, options=self.options)
+
+        # Sweep the cross-section along all the sections at once
+        vmv.logger.info('Sweeping sections')
+        sides = self.options.morphology.bevel_object_sides
+        vertices, loops, loops_totals = vmv.mesh.compute_swept_tubes_arrays(
+            points=metrics.points, radii=radii, offsets=metrics.offsets, sides=sides)
+
+        # The material of every face is the material of its segment
+        faces_segments = vmv.mesh.get_swept_tubes_faces_segments(
+            offsets=metrics.offsets, sides=sides)
+        material_indices = self.get_segments_material_indices()[faces_segments]
+
+        # Create the mesh in bulk
+        vmv.logger.info('Drawing mesh')
+        mesh_object = vmv.mesh.create_mesh_object_from_arrays(
+            name=self.morphology.name, vertices=vertices, loops=loops, loops_totals=loops_totals,
+            smooth_shading=True, material_indices=material_indices)
+
+        # Create the materials from the color-map and add them to the mesh
+        for i, color in enumerate(color_map):
+            mesh_object.data.materials.append(vmv.shading.get_cached_material(
+                name='%s_color_%d' % ('material', i), color=color,
+                material_type=self.options.morphology.material))
+
+        # Return a reference to the mesh object
+        return mesh_object
+
+    ################################################################################################
+    # @prepare_poly_lines
+    ################################################################################################
+    def prepare_poly_lines(self,
+                           context=None):
+        """Clears the scene and prepares the poly-lines of the skeleton with the assets needed to
+        draw them, without drawing anything. This allows drawing the poly-lines at once or in
+        several batches.
+
+        :param context:
+            Blender context, or None.
+        :return:
+            A tuple of (poly-lines batch, color-map, bevel object).
+        """
 
         # Get the context 
         self.context = context 
@@ -301,16 +255,84 @@ class DisconnectedSegmentsBuilder:
         bevel_object = vmv.mesh.create_bezier_circle(
             radius=1.0, vertices=self.options.morphology.bevel_object_sides, name='bevel')
 
-        # Construct sections poly-lines
+        # Construct segments poly-lines
         vmv.logger.info('Constructing poly-lines')
-        poly_lines_data = self.get_segments_poly_lines_data()
+        poly_lines_batch = self.get_segments_poly_lines_batch()
 
         # Pre-process the radii
         vmv.logger.info('Adjusting radii')
-        vmv.skeleton.update_poly_lines_radii(poly_lines=poly_lines_data, options=self.options)
+        vmv.skeleton.update_poly_lines_batch_radii(
+            poly_lines_batch=poly_lines_batch, options=self.options)
+
+        # Return the poly-lines and the assets
+        return poly_lines_batch, color_map, bevel_object
+
+    ################################################################################################
+    # @build_skeleton
+    ################################################################################################
+    def build_skeleton(self,
+                       context=None):
+        """Draws the morphology skeleton using fast reconstruction and drawing method.
+        """
+
+        vmv.logger.header('Building skeleton: DisconnectedSegmentsBuilder')
+
+        # Draw the segments as a single mesh
+        if self.options.morphology.segments_as_mesh:
+            return self.build_skeleton_as_mesh(context=context)
+
+        # Prepare the poly-lines and the assets
+        poly_lines_batch, color_map, bevel_object = self.prepare_poly_lines(context=context)
 
         # Construct the final object and add it to the morphology
         vmv.logger.info('Drawing poly-lines')
-        return vmv.geometry.create_poly_lines_object_from_poly_lines_data(
-            poly_lines_data, material=self.options.morphology.material, color_map=color_map,
-            name=self.morphology.name, bevel_object=bevel_object)
\ No newline at end of file
+        return vmv.geometry.create_poly_lines_object_from_poly_lines_batch(
+            poly_lines_batch, material=self.options.morphology.material, color_map=color_map,
+            name=self.morphology.name, bevel_object=bevel_object)
+
+    ################################################################################################
+    # @recolor_skeleton
+    ################################################################################################
+    def recolor_skeleton(self,
+                         skeleton_object,
+                         context=None):
+        """Updates the colors of a skeleton that was already built by this builder, where only the
+        material indices of the poly-lines, or of the faces if the segments are drawn as a mesh,
+        and the materials of the color-map are updated and the geometry is kept as is.
+
+        :param skeleton_object:
+            The poly-lines or the mesh object of the skeleton.
+        :param context:
+            Blender context, or None.
+        :return:
+            True if the skeleton was recolored, or False if it must be rebuilt.
+        """
+
+        # Get the context
+        self.context = context
+
+        # The material indices of the segments
+        vmv.logger.info('Updating material indices')
+        material_indices = self.get_segments_material_indices()
+
+        # The segments are drawn as a single mesh, where every face has the index of its segment
+        if self.options.morphology.segments_as_mesh:
+            faces_segments = vmv.mesh.get_swept_tubes_faces_segments(
+                offsets=self.morphology.get_metrics().offsets,
+                sides=self.options.morphology.bevel_object_sides)
+            if not vmv.mesh.set_mesh_faces_material_indices(
+                    skeleton_object, material_indices[faces_segments]):
+                return False
+
+        # The segments are drawn as poly-lines
+        elif not vmv.geometry.set_poly_lines_material_indices(skeleton_object, material_indices):
+            return False
+
+        # Update the materials of the color-map
+        vmv.logger.info('Updating materials')
+        vmv.shading.set_object_color_map_materials(
+            skeleton_object, color_map=self.create_color_map(),
+            material_type=self.options.morphology.material)
+
+        # Done
+        return True
@@ -0,0 +1,171 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Internal imports
+import vmv
+import vmv.geometry
+
+
+####################################################################################################
+# @ProgressiveBuilder
+####################################################################################################
+class ProgressiveBuilder:
+    """Draws the poly-lines of a skeleton builder progressively, a chunk of poly-lines per step,
+    into a single curve object that is created before the first step. Once all the steps are
+    done, the object is identical to the one created by the build_skeleton() function of the
+    builder. This is used to keep the UI responsive while drawing large skeletons.
+
+    NOTE: The builder must implement prepare_poly_lines().
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 builder,
+                 chunk_size):
+        """Constructor
+
+        :param builder:
+            A skeleton builder that prepares its poly-lines in a PolyLinesBatch.
+        :param chunk_size:
+            The number of poly-lines that are drawn per step.
+        """
+
+        # The skeleton builder
+        self.builder = builder
+
+        # The number of poly-lines per step
+        self.chunk_size = max(1, int(chunk_size))
+
+        # The poly-lines of the skeleton, prepared when the build starts
+        self.poly_lines_batch = None
+
+        # The curve object that all the poly-lines are drawn into
+        self.object = None
+
+        # The index of the next poly-line that will be drawn
+        self.next_poly_line = 0
+
+    ################################################################################################
+    # @start
+    ################################################################################################
+    def start(self,
+              context=None):
+        """Prepares the poly-lines of the builder and creates the empty curve object.
+
+        :param context:
+            Blender context, or None.
+        :return:
+            A reference to the created curve object.
+        """
+
+        # Prepare the poly-lines and the assets
+        self.poly_lines_batch, color_map, bevel_object = \
+            self.builder.prepare_poly_lines(context=context)
+
+        # Create the object with the same parameters of the blocking build
+        vmv.logger.info('Drawing poly-lines progressively')
+        self.object = vmv.geometry.create_empty_poly_lines_object(
+            name=self.builder.morphology.name,
+            material=self.builder.options.morphology.material, color_map=color_map,
+            bevel_object=bevel_object)
+
+        # Start from the first poly-line
+        self.next_poly_line = 0
+
+        # Return a reference to the object
+        return self.object
+
+    ################################################################################################
+    # @step
+    ################################################################################################
+    def step(self):
+        """Draws the next chunk of poly-lines.
+
+        :return:
+            True if all the poly-lines are drawn, False otherwise.
+        """
+
+        # The range of the poly-lines of this chunk
+        number_poly_lines = self.poly_lines_batch.get_number_poly_lines()
+        last_poly_line = min(self.next_poly_line + self.chunk_size, number_poly_lines)
+
+        # Append the chunk to the object
+        if last_poly_line > self.next_poly_line:
+            vmv.geometry.append_poly_lines_batch_to_poly_lines_object(
+                poly_lines_object=self.object.data,
+                poly_lines_batch=self.poly_lines_batch.get_poly_lines_range(
+                    self.next_poly_line, last_poly_line))
+
+        # Move to the next chunk
+        self.next_poly_line = last_poly_line
+
+        # Done or not
+        return self.is_done()
+
+    ################################################################################################
+    # @is_done
+    ################################################################################################
+    def is_done(self):
+        """Checks if all the poly-lines are drawn.
+
+        :return:
+            True or False.
+        """
+
+        return self.next_poly_line >= self.poly_lines_batch.get_number_poly_lines()
+
+    ################################################################################################
+    # @get_progress
+    ################################################################################################
+    def get_progress(self):
+        """Returns the fraction of the poly-lines that are drawn.
+
+        :return:
+            A value in the range [0, 1].
+        """
+
+        # Nothing to draw
+        number_poly_lines = self.poly_lines_batch.get_number_poly_lines()
+        if number_poly_lines == 0:
+            return 1.0
+
+        return self.next_poly_line / float(number_poly_lines)
+
+    ################################################################################################
+    # @build
+    ################################################################################################
+    def build(self,
+              context=None):
+        """Draws all the chunks in a blocking loop.
+
+        :param context:
+            Blender context, or None.
+        :return:
+            A reference to the created curve object.
+        """
+
+        # Start
+        self.start(context=context)
+
+        # Draw all the chunks
+        while not self.step():
+            pass
+
+        # Return a reference to the object
+        return self.object
@@ -24,6 +24,7 @@ import bpy
 
 # Internal imports
 import vmv
+import vmv.consts
 import vmv.geometry
 import vmv.mesh
 import vmv.bmeshi
@@ -52,8 +53,12 @@ class SamplesBuilder:
             System options.
         """
 
-        # Clone the original morphology to morphology before the pre=processing
-        self.morphology = morphology
+        # The loaded morphology and the level of detail the skeleton is built from
+        self.source_morphology = morphology
+        self.level_of_detail = options.morphology.level_of_detail
+
+        # Morphology, at the level of detail requested in the options
+        self.morphology = morphology.get_level_of_detail_morphology(level=self.level_of_detail)
 
         # All the options of the project
         self.options = options
@@ -85,6 +90,26 @@ class SamplesBuilder:
             output.append(sphere)
         return output
 
+    ################################################################################################
+    # @draw_samples_as_spheres
+    ################################################################################################
+    @staticmethod
+    def draw_samples_as_spheres(points,
+                                radii):
+        """Draw a flat array of samples as a set of spheres.
+
+        :param points:
+            An array of the positions of the samples.
+        :param radii:
+            An array of the radii of the samples, after applying the radius policy.
+        :return:
+            List of spheres of the samples.
+        """
+
+        # Create a sphere for each sample
+        return [vmv.bmeshi.create_ico_sphere(radius=radius, location=point, subdivisions=1)
+                for point, radius in zip(points.tolist(), radii.tolist())]
+
     ################################################################################################
     # @link_and_shade_spheres
     ################################################################################################
@@ -116,6 +141,52 @@ class SamplesBuilder:
         # Append the sphere mesh to the morphology objects
         self.morphology_objects.append(sphere_mesh)
 
+    ################################################################################################
+    # @instance_and_shade_spheres
+    ################################################################################################
+    def instance_and_shade_spheres(self,
+                                   points,
+                                   radii,
+                                   materials_list,
+                                   prefix):
+        """Instances a single shared sphere on all the samples, where each instance is scaled by
+        the radius of its sample. The memory and the time required to build the skeleton are
+        proportional to the number of samples and not to the number of vertices of the spheres.
+
+        :param points:
+            An array of the positions of the samples.
+        :param radii:
+            An array of the radii of the samples, after applying the radius policy.
+        :param materials_list:
+            A list of materials to be applied to the shared sphere.
+        :param prefix:
+            Prefix to name the created objects.
+        """
+
+        # Create the shared unit sphere and link it to the scene
+        sphere_bmesh = vmv.bmeshi.create_ico_sphere(
+            radius=1.0, location=(0, 0, 0),
+            subdivisions=vmv.consts.Skeleton.SAMPLES_INSTANCE_SUBDIVISIONS)
+        sphere_mesh = vmv.bmeshi.ops.link_to_new_object_in_scene(sphere_bmesh, '%s_sphere' % prefix)
+
+        # Smooth shading
+        vmv.mesh.shade_smooth_object(sphere_mesh)
+
+        # Assign the material
+        vmv.shading.set_material_to_object(sphere_mesh, materials_list[0])
+
+        # Create the instancing object, with a face per sample, in bulk
+        instancing_mesh = vmv.mesh.create_instancing_mesh_object(
+            name=prefix, points=points, scales=radii)
+
+        # Instance the sphere on the samples
+        vmv.mesh.instance_object_on_faces(
+            instancing_object=instancing_mesh, instanced_object=sphere_mesh)
+
+        # Append the objects to the morphology objects
+        self.morphology_objects.append(instancing_mesh)
+        self.morphology_objects.append(sphere_mesh)
+
     ################################################################################################
     # @get_sections_poly_lines_data
     ################################################################################################
@@ -173,20 +244,31 @@ class SamplesBuilder:
             name='axon_skeleton', material_type=self.options.morphology.material,
             color=self.options.morphology.color)
 
-        # Pre-process the radii
+        # Pre-process the radii, without modifying the samples of the morphology
         vmv.logger.info('Adjusting radii')
-        vmv.skeleton.update_skeleton_radii(morphology=self.morphology, options=self.options)
+        metrics = self.morphology.get_metrics()
+        radii = vmv.skeleton.ops.apply_morphology_radii_policy(
+            radii=metrics.radii, options=self.options)
+
+        # Instance a single shared sphere on all the samples
+        if self.options.morphology.samples_instancing:
+
+            # Construct the instancing object and add it to the morphology
+            vmv.logger.info('Instancing spheres')
+            self.instance_and_shade_spheres(points=metrics.points, radii=radii,
+                                            materials_list=self.materials,
+                                            prefix='samples')
 
-        # Construct the final object and add it to the morphology
-        vmv.logger.info('Constructing object')
+        # Draw a sphere per sample
+        else:
 
-        spheres = list()
-        for section in self.morphology.sections_list:
-            spheres.extend(self.draw_section_samples_as_spheres(section))
+            # Construct the final object and add it to the morphology
+            vmv.logger.info('Constructing object')
+            spheres = self.draw_samples_as_spheres(points=metrics.points, radii=radii)
 
-        # Construct the final object and add it to the morphology
-        vmv.logger.info('Linking spheres')
+            # Construct the final object and add it to the morphology
+            vmv.logger.info('Linking spheres')
 
-        self.link_and_shade_spheres(sphere_list=spheres,
-                                    materials_list=self.materials,
-                                    prefix='samples')
+            self.link_and_shade_spheres(sphere_list=spheres,
+                                        materials_list=self.materials,
+                                        prefix='samples')
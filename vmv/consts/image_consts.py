@@ -56,5 +56,14 @@ class Image:
     # Default full view resolution
     FULL_VIEW_RESOLUTION = 1024
 
+    # Default number of workers that render the frames of a 360 sequence
+    DEFAULT_RENDERING_WORKERS = 1
+
+    # Maximum number of workers that render the frames of a 360 sequence (for sliders)
+    MAX_RENDERING_WORKERS = 64
+
+    # Default width and height of the tiles of a tiled image, in pixels
+    DEFAULT_TILE_SIZE = 2048
+
     # The bounding box increment that will clean the edges around the images
     GAP_DELTA = 5.0
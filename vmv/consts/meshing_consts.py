@@ -47,5 +47,17 @@ class Meshing:
     # Minimum meta ball resolution
     MAX_META_BALL_RESOLUTION = 10.0
 
+    # Maximum number of tiles along each axis in the tiled meta balls meshing
+    MAX_META_BALL_TILES = 16
+
+    # Number of voxels along each axis of a block of the implicit surface grid
+    IMPLICIT_BLOCK_SIZE = 16
+
+    # Minimum voxel size of the implicit surface grid
+    MIN_IMPLICIT_VOXEL_SIZE = 0.01
+
+    # Maximum voxel size of the implicit surface grid
+    MAX_IMPLICIT_VOXEL_SIZE = 10.0
+
     # The suffix that is added to any reconstructed mesh to be able to search for it
     MESH_SUFFIX = '_vmv_mesh'
\ No newline at end of file
@@ -62,6 +62,18 @@ class Paths:
     # The folder where SLURM log files will be generated
     SLURM_LOGS_FOLDER = '%s/logs' % SLURM_FOLDER
 
+    # The folder where the summary manifest of the local batch jobs will be generated
+    BATCH_FOLDER = 'batch'
+
+    # The folder where the log files of the local batch jobs will be generated
+    BATCH_LOGS_FOLDER = '%s/logs' % BATCH_FOLDER
+
+    # The manifest in the output directory that records the artifacts that are up to date
+    BUILD_CACHE_FILE = 'build_cache.json'
+
+    # The extensions of the morphology files that can be loaded
+    MORPHOLOGY_EXTENSIONS = ['.h5', '.swc', '.vmv']
+
     # Keep a reference to the current directory
     current_directory = os.path.dirname(os.path.realpath(__file__))
 
@@ -78,4 +78,19 @@ class Skeleton:
     SWC_END_POINT_SAMPLE_TYPE = 6
 
     # The index of a custom sample in an SWC file
-    SWC_CUSTOM_SAMPLE_TYPE = 7
\ No newline at end of file
+    SWC_CUSTOM_SAMPLE_TYPE = 7
+
+    # The maximum number of levels in the level-of-detail pyramid of the skeleton
+    LOD_NUMBER_LEVELS = 6
+
+    # The relative radius deviation above which a sample is kept in the level-of-detail pyramid
+    LOD_RADIUS_TOLERANCE = 0.25
+
+    # The number of subdivisions of the sphere that is instanced on the samples
+    SAMPLES_INSTANCE_SUBDIVISIONS = 2
+
+    # The default number of poly-lines that are drawn per step of a progressive build
+    PROGRESSIVE_BUILD_CHUNK_SIZE = 10000
+
+    # The maximum number of poly-lines that are drawn per step of a progressive build
+    MAX_PROGRESSIVE_BUILD_CHUNK_SIZE = 1000000
@@ -185,4 +185,65 @@ class ColorCoding:
         
 
 
+####################################################################################################
+# @ColorMapNormalization
+####################################################################################################
+class ColorMapNormalization:
+    """Color-map normalization enumerators, i.e. how the values are mapped to the color-map
+    """
 
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self):
+        pass
+
+    # The values are mapped linearly between the minimum and the maximum
+    LINEAR = 'COLOR_MAP_NORMALIZATION_LINEAR'
+
+    # The values are mapped logarithmically, which spreads the small values over more colors
+    LOG = 'COLOR_MAP_NORMALIZATION_LOG'
+
+    # The values are mapped by their rank, so every color is used by the same number of items
+    QUANTILE = 'COLOR_MAP_NORMALIZATION_QUANTILE'
+
+    ################################################################################################
+    # Normalization items to be added to the interface list
+    ################################################################################################
+    NORMALIZATION_ITEMS = [
+
+        # Linear
+        (LINEAR,
+         'Linear',
+         'Map the values linearly between the minimum and the maximum values'),
+
+        # Log
+        (LOG,
+         'Log',
+         'Map the values logarithmically between the minimum and the maximum values to show '
+         'the variations of the small values'),
+
+        # Quantile
+        (QUANTILE,
+         'Quantile',
+         'Map the values based on their rank, where every color is assigned to the same number '
+         'of components')
+    ]
+
+    ################################################################################################
+    # @get_enum
+    ################################################################################################
+    @staticmethod
+    def get_enum(argument):
+
+        # Log
+        if argument == 'log':
+            return ColorMapNormalization.LOG
+
+        # Quantile
+        elif argument == 'quantile':
+            return ColorMapNormalization.QUANTILE
+
+        # By default use linear
+        else:
+            return ColorMapNormalization.LINEAR
@@ -42,6 +42,9 @@ class Meshing:
         # Meta balls-based meshing
         META_BALLS = 'MESHING_TECHNIQUE_META_BALLS'
 
+        # Implicit surface-based meshing
+        IMPLICIT_SURFACE = 'MESHING_TECHNIQUE_IMPLICIT_SURFACE'
+
         ############################################################################################
         # @__init__
         ############################################################################################
@@ -62,6 +65,10 @@ class Meshing:
             elif argument == 'meta-balls':
                 return Meshing.Technique.META_BALLS
 
+            # Implicit surface
+            elif argument == 'implicit-surface':
+                return Meshing.Technique.IMPLICIT_SURFACE
+
             # By default use piecewise-watertight
             else:
                 return Meshing.Technique.PIECEWISE_WATERTIGHT
@@ -78,7 +85,11 @@ class Meshing:
              'Meta Balls',
              'Creates watertight mesh models using the meta balls algorithm. '
              'This method is SLOW and can take few hours to make a mesh based on the resolution '
-             'and setting')
+             'and setting'),
+            (IMPLICIT_SURFACE,
+             'Implicit Surface',
+             'Creates watertight mesh models from the implicit surface of the segments, which is '
+             'evaluated only near the vessels and meshed in parallel on all the cores')
         ]
 
     class MetaBalls:
@@ -16,3 +16,4 @@
 ####################################################################################################
 
 from .file_ops import *
+from .build_cache import *
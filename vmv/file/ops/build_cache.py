@@ -0,0 +1,438 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import json
+import hashlib
+
+# Internal imports
+sys.path.append('%s/../../consts' % os.path.dirname(os.path.realpath(__file__)))
+from path_consts import *
+
+
+# The arguments that do not change the generated artifacts
+IGNORED_ARGUMENTS = ['input', 'morphology_file', 'morphology_directory', 'output_directory',
+                     'blender', 'execution_node', 'number_cores', 'job_granularity',
+                     'batch_workers', 'batch_memory', 'batch_mode', 'ignore_build_cache',
+                     'rendering_workers', 'rendering_tile_size', 'cluster_scheduler',
+                     'submit_command']
+
+# The artifacts of the pipeline that are cached, each with the arguments that request them. The
+# analysis depends only on the input file, the other artifacts on all the remaining options
+ARTIFACTS = {
+    'analysis': ['analyze_morphology'],
+    'morphology': ['reconstruct_morphology_skeleton', 'render_vascular_morphology',
+                   'render_vascular_morphology_360', 'export_morphology_vmv',
+                   'export_morphology_h5', 'export_morphology_blend'],
+    'mesh': ['reconstruct_vascular_mesh', 'render_vascular_mesh', 'render_vascular_mesh_360',
+             'export_vascular_mesh_ply', 'export_vascular_mesh_obj', 'export_vascular_mesh_stl',
+             'export_vascular_mesh_blend']}
+
+# The artifacts that depend only on the input file
+INPUT_ONLY_ARTIFACTS = ['analysis']
+
+# The number of frames of a 360 sequence rendered from the command line
+SEQUENCE_FRAMES = 360
+
+
+####################################################################################################
+# @compute_file_hash
+####################################################################################################
+def compute_file_hash(file_path):
+    """Computes the SHA-256 hash of the content of a file, reading it in chunks.
+
+    :param file_path:
+        The path to the file.
+    :return:
+        The hexadecimal digest of the file.
+    """
+
+    # Hash the file in chunks of 1 MB
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file_handle:
+        for chunk in iter(lambda: file_handle.read(1024 * 1024), b''):
+            file_hash.update(chunk)
+
+    # Return the digest
+    return file_hash.hexdigest()
+
+
+####################################################################################################
+# @compute_options_hash
+####################################################################################################
+def compute_options_hash(arguments,
+                         artifact):
+    """Computes the hash of the options that affect an artifact.
+
+    :param arguments:
+        The parsed command line arguments.
+    :param artifact:
+        The name of the artifact, a key in ARTIFACTS.
+    :return:
+        The hexadecimal digest of the options.
+    """
+
+    # The flags that request the other artifacts are not relevant to this one
+    other_flags = [flag for name, flags in ARTIFACTS.items() if name != artifact
+                   for flag in flags]
+
+    # The relevant options
+    if artifact in INPUT_ONLY_ARTIFACTS:
+        options = [(flag, getattr(arguments, flag, None)) for flag in ARTIFACTS[artifact]]
+    else:
+        options = [(name, value) for name, value in sorted(vars(arguments).items())
+                   if name not in IGNORED_ARGUMENTS and name not in other_flags]
+
+    # Return the digest
+    return hashlib.sha256(json.dumps(options, default=str).encode('utf-8')).hexdigest()
+
+
+####################################################################################################
+# @is_artifact_requested
+####################################################################################################
+def is_artifact_requested(arguments,
+                          artifact):
+    """Checks if an artifact is requested by the arguments.
+
+    :param arguments:
+        The parsed command line arguments.
+    :param artifact:
+        The name of the artifact, a key in ARTIFACTS.
+    :return:
+        True if any of the flags of the artifact is set, otherwise False.
+    """
+
+    return any(getattr(arguments, flag, False) for flag in ARTIFACTS[artifact])
+
+
+####################################################################################################
+# @get_artifact_outputs
+####################################################################################################
+def get_artifact_outputs(output_directory,
+                         morphology_file,
+                         arguments,
+                         artifact):
+    """Gets the paths of the files that the pipeline writes for an artifact of a morphology file,
+    with the same names that the pipeline uses.
+
+    :param output_directory:
+        The output directory.
+    :param morphology_file:
+        The path to the morphology file.
+    :param arguments:
+        The parsed command line arguments.
+    :param artifact:
+        The name of the artifact, a key in ARTIFACTS.
+    :return:
+        A list of the paths of the output files of the artifact.
+    """
+
+    # The outputs are named after the morphology file, without the extension
+    label = os.path.splitext(os.path.basename(morphology_file))[0]
+
+    # The frames of a 360 sequence
+    def get_sequence_frames(suffix):
+        return ['%s/%s/%s_%s/%05d.png' % (output_directory, Paths.SEQUENCES_FOLDER, label, suffix,
+                                          frame) for frame in range(SEQUENCE_FRAMES)]
+
+    # The outputs of the requested flags
+    outputs = list()
+    if artifact == 'analysis':
+        if arguments.analyze_morphology:
+            outputs.append('%s/%s/%s.txt' % (output_directory, Paths.ANALYSIS_FOLDER, label))
+
+    elif artifact == 'morphology':
+        if arguments.render_vascular_morphology:
+            outputs.append('%s/%s/MORPHOLOGY_FRONT_%s.png' % (
+                output_directory, Paths.IMAGES_FOLDER, label))
+        if arguments.render_vascular_morphology_360:
+            outputs.extend(get_sequence_frames('morphology_360'))
+        if arguments.export_morphology_blend:
+            outputs.append('%s/%s/%s.blend' % (
+                output_directory, Paths.MORPHOLOGIES_FOLDER, label))
+
+    elif artifact == 'mesh':
+        if arguments.render_vascular_mesh:
+            view = arguments.camera_view.upper() if arguments.camera_view in ['side', 'top'] \
+                else 'FRONT'
+            outputs.append('%s/%s/MESH_%s_%s.png' % (
+                output_directory, Paths.IMAGES_FOLDER, view, label))
+        if arguments.render_vascular_mesh_360:
+            outputs.extend(get_sequence_frames('mesh_360'))
+        for extension in ['ply', 'obj', 'stl', 'blend']:
+            if getattr(arguments, 'export_vascular_mesh_%s' % extension):
+                outputs.append('%s/%s/%s.%s' % (
+                    output_directory, Paths.MESHES_FOLDER, label, extension))
+
+    # Return the outputs
+    return outputs
+
+
+####################################################################################################
+# @get_written_artifacts
+####################################################################################################
+def get_written_artifacts(output_directory,
+                          morphology_file,
+                          arguments,
+                          artifacts):
+    """Gets the artifacts of a morphology file whose output files were all written.
+
+    :param output_directory:
+        The output directory.
+    :param morphology_file:
+        The path to the morphology file.
+    :param arguments:
+        The parsed command line arguments.
+    :param artifacts:
+        A list of the names of the artifacts.
+    :return:
+        A list of the names of the artifacts whose output files all exist.
+    """
+
+    return [artifact for artifact in artifacts if all(
+        os.path.isfile(output) for output in get_artifact_outputs(
+            output_directory, morphology_file, arguments, artifact))]
+
+
+####################################################################################################
+# @BuildCache
+####################################################################################################
+class BuildCache:
+    """The build cache manifest in the output directory. For every morphology file it records the
+    hash of the input file and the hash of the options of every generated artifact, so the
+    artifacts that are up to date are skipped when the same directory is processed again.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 output_directory):
+        """Constructor
+
+        :param output_directory:
+            The output directory, where the manifest is created by create_output_tree.
+        """
+
+        # The output directory, where the artifacts are written
+        self.output_directory = output_directory
+
+        # The path to the manifest
+        self.manifest_file = '%s/%s' % (output_directory, Paths.BUILD_CACHE_FILE)
+
+        # The entries of the manifest, per morphology file
+        self.entries = dict()
+        if os.path.isfile(self.manifest_file):
+            try:
+                with open(self.manifest_file, 'r') as manifest_handle:
+                    self.entries = json.load(manifest_handle)
+
+            # A corrupted manifest is ignored, i.e. everything is rebuilt
+            except ValueError:
+                print('WARNING: The build cache [%s] is corrupted and ignored' %
+                      self.manifest_file)
+
+    ################################################################################################
+    # @get_input_hash
+    ################################################################################################
+    def get_input_hash(self,
+                       morphology_file):
+        """Gets the hash of a morphology file. The recorded hash is reused if the size and the
+        modification time of the file did not change, otherwise the file is hashed again.
+
+        :param morphology_file:
+            The path to the morphology file.
+        :return:
+            The hexadecimal digest of the file.
+        """
+
+        # The size and the modification time of the file
+        file_stat = os.stat(morphology_file)
+        entry = self.entries.get(os.path.realpath(morphology_file), dict())
+
+        # Reuse the recorded hash
+        if entry.get('size') == file_stat.st_size and entry.get('mtime') == file_stat.st_mtime:
+            return entry['input_hash']
+
+        # Hash the file
+        return compute_file_hash(morphology_file)
+
+    ################################################################################################
+    # @get_outdated_artifacts
+    ################################################################################################
+    def get_outdated_artifacts(self,
+                               morphology_file,
+                               arguments):
+        """Gets the requested artifacts of a morphology file that are not up to date, i.e. the
+        input or the options changed since they were generated, or any of their output files is
+        missing.
+
+        :param morphology_file:
+            The path to the morphology file.
+        :param arguments:
+            The parsed command line arguments.
+        :return:
+            A list of the names of the artifacts that must be generated.
+        """
+
+        # The recorded entry of the file
+        entry = self.entries.get(os.path.realpath(morphology_file), dict())
+        input_hash = self.get_input_hash(morphology_file)
+
+        # Collect the outdated artifacts
+        outdated_artifacts = list()
+        for artifact in ARTIFACTS:
+
+            # Not requested
+            if not is_artifact_requested(arguments, artifact):
+                continue
+
+            # The input or the options changed since the artifact was generated
+            if entry.get('input_hash') != input_hash or \
+                    entry.get('artifacts', dict()).get(artifact) != \
+                    compute_options_hash(arguments, artifact):
+                outdated_artifacts.append(artifact)
+
+            # Any of the output files was removed
+            elif not all(os.path.isfile(output) for output in get_artifact_outputs(
+                    self.output_directory, morphology_file, arguments, artifact)):
+                outdated_artifacts.append(artifact)
+
+        # Return the outdated artifacts
+        return outdated_artifacts
+
+    ################################################################################################
+    # @record_artifacts
+    ################################################################################################
+    def record_artifacts(self,
+                         morphology_file,
+                         arguments,
+                         artifacts):
+        """Records that the artifacts of a morphology file were generated successfully.
+
+        :param morphology_file:
+            The path to the morphology file.
+        :param arguments:
+            The parsed command line arguments that were used to generate the artifacts.
+        :param artifacts:
+            A list of the names of the generated artifacts.
+        """
+
+        # The entry of the file
+        file_stat = os.stat(morphology_file)
+        input_hash = self.get_input_hash(morphology_file)
+        entry = self.entries.setdefault(os.path.realpath(morphology_file), dict())
+
+        # The artifacts of an older input are outdated
+        if entry.get('input_hash') != input_hash:
+            entry['artifacts'] = dict()
+
+        # Update the entry
+        entry['input_hash'] = input_hash
+        entry['size'] = file_stat.st_size
+        entry['mtime'] = file_stat.st_mtime
+        for artifact in artifacts:
+            entry.setdefault('artifacts', dict())[artifact] = \
+                compute_options_hash(arguments, artifact)
+
+    ################################################################################################
+    # @add_pending_artifacts
+    ################################################################################################
+    def add_pending_artifacts(self,
+                              morphology_file,
+                              arguments,
+                              artifacts,
+                              status_file):
+        """Records that the artifacts of a morphology file are generated by a submitted job that
+        has not finished yet. They are recorded by record_pending_artifacts in a later run, once
+        the status file of the job reports that it succeeded.
+
+        :param morphology_file:
+            The path to the morphology file.
+        :param arguments:
+            The parsed command line arguments that are used to generate the artifacts.
+        :param artifacts:
+            A list of the names of the artifacts.
+        :param status_file:
+            The path to the file where the job writes its exit code.
+        """
+
+        # The pending artifacts replace the ones of any older submission
+        entry = self.entries.setdefault(os.path.realpath(morphology_file), dict())
+        entry['pending'] = {
+            'input_hash': self.get_input_hash(morphology_file),
+            'status_file': status_file,
+            'artifacts': {artifact: compute_options_hash(arguments, artifact)
+                          for artifact in artifacts}}
+
+    ################################################################################################
+    # @record_pending_artifacts
+    ################################################################################################
+    def record_pending_artifacts(self,
+                                 arguments):
+        """Records the pending artifacts of the submitted jobs that succeeded and drops the ones
+        of the jobs that failed. The artifacts of the jobs that have not finished stay pending.
+
+        :param arguments:
+            The parsed command line arguments of the current run, the pending artifacts that were
+            generated with other options are not recorded.
+        """
+
+        for morphology_file, entry in self.entries.items():
+
+            # Nothing is pending
+            pending = entry.get('pending')
+            if pending is None:
+                continue
+
+            # The exit code of the job, the status file is written when it finishes
+            try:
+                with open(pending['status_file'], 'r') as status_handle:
+                    exit_code = int(status_handle.read().strip())
+            except (IOError, ValueError):
+                continue
+
+            # The job finished
+            del entry['pending']
+            if exit_code != 0:
+                continue
+
+            # The input changed since the job was submitted
+            if not os.path.isfile(morphology_file) or \
+                    self.get_input_hash(morphology_file) != pending['input_hash']:
+                continue
+
+            # Record the artifacts that were written with the current options
+            self.record_artifacts(morphology_file, arguments, get_written_artifacts(
+                self.output_directory, morphology_file, arguments, [
+                    artifact for artifact, options_hash in pending['artifacts'].items()
+                    if options_hash == compute_options_hash(arguments, artifact)]))
+
+    ################################################################################################
+    # @save
+    ################################################################################################
+    def save(self):
+        """Writes the manifest, replacing the old one at once to avoid corrupting it.
+        """
+
+        # Write to a temporary file and replace the manifest
+        temporary_file = '%s.tmp' % self.manifest_file
+        with open(temporary_file, 'w') as manifest_handle:
+            json.dump(self.entries, manifest_handle, indent=4, sort_keys=True)
+        os.replace(temporary_file, self.manifest_file)
@@ -17,6 +17,7 @@
 
 # System imports
 import sys, os, shutil
+import collections
 
 # Internal imports
 sys.path.append('%s/../../consts' % os.path.dirname(os.path.realpath(__file__)))
@@ -95,6 +96,50 @@ def get_files_in_directory(directory,
     return files
 
 
+####################################################################################################
+# @get_morphology_files_in_directory
+####################################################################################################
+def get_morphology_files_in_directory(directory):
+    """Gets all the morphology files in a directory that have one of the supported extensions.
+
+    :param directory:
+        Given directory.
+    :return:
+        A sorted list of the names of the morphology files.
+    """
+
+    # Collect the files of all the supported extensions
+    files = list()
+    for extension in Paths.MORPHOLOGY_EXTENSIONS:
+        files.extend(get_files_in_directory(directory, extension))
+
+    # Return the list
+    return sorted(files)
+
+
+####################################################################################################
+# @get_duplicate_morphology_labels
+####################################################################################################
+def get_duplicate_morphology_labels(morphology_files):
+    """Gets the labels, i.e. the names without the extensions, that are shared by more than one
+    morphology file, for example a.h5 and a.swc. The outputs of a morphology are named after its
+    label, so such files would overwrite the outputs of each other.
+
+    :param morphology_files:
+        A list of the names or the paths of the morphology files.
+    :return:
+        A sorted list of the duplicate labels.
+    """
+
+    # Count the files of every label
+    labels_counts = collections.Counter(
+        os.path.splitext(os.path.basename(morphology_file))[0]
+        for morphology_file in morphology_files)
+
+    # Return the labels of more than one file
+    return sorted(label for label, count in labels_counts.items() if count > 1)
+
+
 ####################################################################################################
 # @write_batch_job_string_to_file
 ####################################################################################################
@@ -165,6 +210,16 @@ def create_output_tree(output_directory):
     sequences_directory = '%s/%s' % (output_directory, Paths.SEQUENCES_FOLDER)
     create_directory(sequences_directory)
 
+    # Analysis directory
+    analysis_directory = '%s/%s' % (output_directory, Paths.ANALYSIS_FOLDER)
+    create_directory(analysis_directory)
+
+    # An empty build cache manifest, if it does not exist, see build_cache.py
+    build_cache_file = '%s/%s' % (output_directory, Paths.BUILD_CACHE_FILE)
+    if not os.path.isfile(build_cache_file):
+        with open(build_cache_file, 'w') as build_cache_handle:
+            build_cache_handle.write('{}\n')
+
 
 ####################################################################################################
 # @path_exists
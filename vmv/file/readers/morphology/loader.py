@@ -124,7 +124,7 @@ def create_morphology_reader(morphology_file_path):
 # @read_morphology_from_file
 ####################################################################################################
 def read_morphology_from_file(options):
-    """Loads a morphology object from file. This loader mainly supports .h5 file format.
+    """Loads a morphology object from file using the reader of its extension, .h5, .swc or .vmv.
 
     :param options:
         A reference to the system options.
@@ -136,40 +136,27 @@ def read_morphology_from_file(options):
     # The morphology file path is available from the system options
     morphology_file_path = options.morphology.morphology_file_path
 
-    # Get the extension from the file path
-    morphology_prefix, morphology_extension = os.path.splitext(morphology_file_path)
-
-    # If it is a .h5 file, use the h5 loader
-    if '.h5' in morphology_extension:
-
-        # Load the .h5 file
-        try:
-            morphology_object = read_h5_morphology(morphology_file_path)
-
-        # Cannot read the file for some reason
-        except ValueError:
-            vmv.logger.log('ERROR: The morphology file [%s] could NOT be read' %
-                           morphology_file_path)
-            return False, None
-
-    # If it is a .mat file, use the Matlab loader
-    elif '.mat' in morphology_extension:
+    # If the path is not valid
+    if not os.path.isfile(morphology_file_path):
+        vmv.logger.log('ERROR: The morphology path [%s] is invalid' % morphology_file_path)
+        return False, None
 
-        # Load the .mat file
-        try:
-            morphology_object = read_mat_morphology(morphology_file_path)
+    # Create a morphology reader based on the extension, as in the IO panel
+    morphology_reader = create_morphology_reader(morphology_file_path)
+    if morphology_reader is None:
+        return False, None
 
-        # Cannot read the file for some reason
-        except ValueError:
-            vmv.logger.log('ERROR: The morphology file [%s] could NOT be read' %
-                           morphology_file_path)
-            return False, None
-    else:
+    # Load the morphology file
+    try:
+        morphology_object = morphology_reader.construct_morphology_object(
+            center_at_origin=options.io.center_morphology_at_origin,
+            resample_morphology=options.io.resample_morphology)
 
-        # Issue an error, wrong extension
-        vmv.logger.log('ERROR: The morphology extension [%s] is NOT SUPPORTED' %
-                       morphology_extension)
-        return False
+    # Cannot read the file for some reason
+    except (ValueError, IOError):
+        vmv.logger.log('ERROR: The morphology file [%s] could NOT be read' %
+                       morphology_file_path)
+        return False, None
 
     # If the morphology object is None, return False
     if morphology_object is None:
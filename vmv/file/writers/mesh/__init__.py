@@ -16,4 +16,4 @@
 ####################################################################################################
 
 from .exporters import *
-
+from .ply_writer import *
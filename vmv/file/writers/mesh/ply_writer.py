@@ -0,0 +1,75 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# @write_mesh_arrays_to_ply_file
+####################################################################################################
+def write_mesh_arrays_to_ply_file(vertices,
+                                  faces,
+                                  output_directory,
+                                  output_file_name):
+    """Writes a mesh that is given as vertex and face arrays directly to a binary .ply file,
+    without creating any objects in Blender.
+
+    :param vertices:
+        An array of vertices [V, 3].
+    :param faces:
+        An array of faces [F, K], where all the faces have the same number of vertices K.
+    :param output_directory:
+        The output directory where the mesh will be saved.
+    :param output_file_name:
+        The name of the output mesh.
+    :return:
+        The path to the written file.
+    """
+
+    # Construct the name of the exported mesh
+    output_file_path = '%s/%s.ply' % (output_directory, str(output_file_name))
+
+    # Faces
+    faces = numpy.asarray(faces)
+    number_face_vertices = faces.shape[1] if faces.ndim == 2 else 3
+
+    # Each face is written as a list of indices, prefixed by their count
+    faces_records = numpy.zeros(
+        len(faces), dtype=[('count', 'u1'), ('indices', '<i4', (number_face_vertices,))])
+    faces_records['count'] = number_face_vertices
+    faces_records['indices'] = faces
+
+    # Header
+    header = 'ply\n' \
+             'format binary_little_endian 1.0\n' \
+             'element vertex %d\n' \
+             'property float x\n' \
+             'property float y\n' \
+             'property float z\n' \
+             'element face %d\n' \
+             'property list uchar int vertex_indices\n' \
+             'end_header\n' % (len(vertices), len(faces))
+
+    # Write the file
+    with open(output_file_path, 'wb') as ply_file:
+        ply_file.write(header.encode('ascii'))
+        ply_file.write(numpy.ascontiguousarray(vertices, dtype='<f4').tobytes())
+        ply_file.write(faces_records.tobytes())
+
+    # Return the path
+    return output_file_path
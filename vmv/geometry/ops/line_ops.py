@@ -16,6 +16,9 @@
 # MA 02110-1301 USA.
 ####################################################################################################
 
+# System imports
+import numpy
+
 # Blender imports
 import bpy
 from mathutils import Vector, Matrix
@@ -309,14 +312,11 @@ def append_poly_line_to_poly_lines_object(poly_lines_object,
     # Define the material for this poly-line
     poly_line_object.material_index = poly_line_data.color_index
 
-    # Add the points (or the samples) and their radii to the poly-line curve object
-    for i, poly_line_sample in enumerate(poly_line_data.samples):
-
-        # Sample coordinates
-        poly_line_object.points[i].co = poly_line_sample[0]
-
-        # Sample radius
-        poly_line_object.points[i].radius = poly_line_sample[1]
+    # Add the points (or the samples) and their radii to the poly-line curve object in bulk
+    poly_line_object.points.foreach_set(
+        'co', [coordinate for sample in poly_line_data.samples for coordinate in sample[0]])
+    poly_line_object.points.foreach_set(
+        'radius', [sample[1] for sample in poly_line_data.samples])
 
 
 ####################################################################################################
@@ -359,36 +359,143 @@ def create_poly_lines_object_from_poly_lines_data(poly_lines_data,
         A poly-lines object linked to the scene.
     """
 
+    # Convert the poly-lines into flat arrays to draw them in bulk
+    poly_lines_batch = vmv.skeleton.ops.get_poly_lines_batch_from_poly_lines_data(poly_lines_data)
+
+    # Create the object from the batch
+    aggregate_poly_lines_object = create_poly_lines_object_from_poly_lines_batch(
+        poly_lines_batch=poly_lines_batch, poly_line_type=poly_line_type, name=name,
+        material=material, color_map=color_map, bevel_object=bevel_object, caps=caps,
+        texture_size=texture_size, center=center)
+
+    # Return a reference to the created poly-lines object
+    return aggregate_poly_lines_object
+
+
+####################################################################################################
+# @append_poly_lines_batch_to_poly_lines_object
+####################################################################################################
+def append_poly_lines_batch_to_poly_lines_object(poly_lines_object,
+                                                 poly_lines_batch,
+                                                 poly_line_type='POLY'):
+    """Appends all the poly-lines of a given batch to an existing poly-lines object. The samples
+    are copied from the flat arrays of the batch without creating any Python object per sample.
+
+    :param poly_lines_object:
+        A previously created poly-lines object.
+    :param poly_lines_batch:
+        A PolyLinesBatch with the data of all the poly-lines.
+    :param poly_line_type:
+        The type of the poly-line: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
+    """
+
+    # The number of poly-lines and the number of samples of each of them
+    number_poly_lines = poly_lines_batch.get_number_poly_lines()
+    counts = poly_lines_batch.get_poly_lines_counts()
+    offsets = poly_lines_batch.offsets
+
+    # The index of the first poly-line to be added to the object
+    first_poly_line = len(poly_lines_object.splines)
+
+    # First, create and size all the poly-lines
+    # NOTE: Use n-1 points because once the poly-line is created it has already one point
+    for count in counts.tolist():
+        poly_lines_object.splines.new(poly_line_type).points.add(count - 1)
+
+    # The created poly-lines
+    splines = poly_lines_object.splines
+
+    # Define the materials of all the poly-lines at once
+    if first_poly_line == 0:
+        splines.foreach_set('material_index', poly_lines_batch.material_indices)
+    else:
+        for i in range(number_poly_lines):
+            splines[first_poly_line + i].material_index = \
+                int(poly_lines_batch.material_indices[i])
+
+    # Then, fill the coordinates and the radii from the flat buffers
+    co = poly_lines_batch.co.ravel()
+    radius = poly_lines_batch.radius
+    for i in range(number_poly_lines):
+        points = splines[first_poly_line + i].points
+        points.foreach_set('co', co[4 * offsets[i]:4 * offsets[i + 1]])
+        points.foreach_set('radius', radius[offsets[i]:offsets[i + 1]])
+
+
+####################################################################################################
+# @set_poly_lines_material_indices
+####################################################################################################
+def set_poly_lines_material_indices(poly_lines_object,
+                                    material_indices):
+    """Updates the material indices of all the poly-lines of an existing poly-lines object in a
+    single step, without changing the geometry.
+
+    :param poly_lines_object:
+        A poly-lines object in the scene.
+    :param material_indices:
+        An array of material indices, one per poly-line in the object.
+    :return:
+        True if the indices were updated, or False if the object is not a curve or the number of
+        indices does not match the number of poly-lines.
+    """
+
+    # The object must be a curve with a poly-line per index
+    if poly_lines_object.type != 'CURVE' or \
+            len(poly_lines_object.data.splines) != len(material_indices):
+        return False
+
+    # Update the indices in bulk
+    poly_lines_object.data.splines.foreach_set(
+        'material_index', numpy.ascontiguousarray(material_indices, dtype=numpy.int32))
+
+    # Done
+    return True
+
+
+####################################################################################################
+# @create_empty_poly_lines_object
+####################################################################################################
+def create_empty_poly_lines_object(name='poly_lines_object',
+                                   material=None,
+                                   color_map=None,
+                                   bevel_object=None,
+                                   caps=True,
+                                   texture_size=5,
+                                   center=Vector((0.0, 0.0, 0.0))):
+    """Creates an empty poly-lines object with the materials of a given color-map and links it to
+    the scene. The poly-lines can then be appended to the data of the object in one or more
+    batches.
+
+    :param name:
+        Poly-line object name.
+    :param material:
+        Material type, see enums:shading_enums:Shading.
+    :param color_map:
+        A color-map list used to color-code the skeleton.
+    :param bevel_object:
+        A given bevel object used to solidify the poly-line.
+    :param caps:
+        A flag indicating whether the caps will be closed or open.
+    :param texture_size:
+        The size of the bump map of the assigned texture.
+    :param center:
+        Object center, by default origin.
+    :return:
+        A poly-lines object linked to the scene.
+    """
+
     # Create the base object
     poly_lines_object = create_poly_lines_object_base(
         name=name, bevel_object=bevel_object, caps=caps, texture_size=texture_size)
 
-    # Creates the materials list from the color-map 
-    materials_list = list()
-
-    # Create the material and append it to the list
+    # Create the materials from the color-map and add them to the object
     for i, color in enumerate(color_map):
-        materials = vmv.shading.create_material(
-            name='%s_color_%d' % ('material', i), color=color, material_type=material)
-        materials_list.append(materials)
-
-    # Add the materials to the object
-    for material in materials_list:
-        poly_lines_object.materials.append(material)
-
-    # For each poly-line in the poly-lines list, create an object and append it to the aggregate one
-    for poly_line_data in poly_lines_data:
-        append_poly_line_to_poly_lines_object(
-            poly_lines_object=poly_lines_object, poly_line_data=poly_line_data,
-            poly_line_type=poly_line_type)
+        poly_lines_object.materials.append(vmv.shading.get_cached_material(
+            name='%s_color_%d' % ('material', i), color=color, material_type=material))
 
-    # Create the aggregate object to be linked to the scene later
+    # Create the aggregate object to be linked to the scene
     aggregate_poly_lines_object = bpy.data.objects.new(str(name), poly_lines_object)
 
-    if poly_line_type == 'NURBS':
-        aggregate_poly_lines_object.data.splines[0].order_u = 6
-        aggregate_poly_lines_object.data.splines[0].use_endpoint_u = True
-
     # Link this object to the scene
     bpy.context.scene.collection.objects.link(aggregate_poly_lines_object)
 
@@ -399,6 +506,60 @@ def create_poly_lines_object_from_poly_lines_data(poly_lines_data,
     return aggregate_poly_lines_object
 
 
+####################################################################################################
+# @create_poly_lines_object_from_poly_lines_batch
+####################################################################################################
+def create_poly_lines_object_from_poly_lines_batch(poly_lines_batch,
+                                                   poly_line_type='POLY',
+                                                   name='poly_lines_object',
+                                                   material=None,
+                                                   color_map=None,
+                                                   bevel_object=None,
+                                                   caps=True,
+                                                   texture_size=5,
+                                                   center=Vector((0.0, 0.0, 0.0))):
+    """Creates an aggregate poly-lines object from a PolyLinesBatch.
+
+    :param poly_lines_batch:
+        A PolyLinesBatch with the data of all the poly-lines.
+    :param poly_line_type:
+        The type of the poly-line: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
+    :param name:
+        Poly-line object name.
+    :param material:
+        Material type, see enums:shading_enums:Shading.
+    :param color_map:
+        A color-map list used to color-code the skeleton.
+    :param bevel_object:
+        A given bevel object used to solidify the poly-line.
+    :param caps:
+        A flag indicating whether the caps will be closed or open.
+    :param texture_size:
+        The size of the bump map of the assigned texture.
+    :param center:
+        Object center, by default origin.
+    :return:
+        A poly-lines object linked to the scene.
+    """
+
+    # Create an empty object with the materials
+    aggregate_poly_lines_object = create_empty_poly_lines_object(
+        name=name, material=material, color_map=color_map, bevel_object=bevel_object, caps=caps,
+        texture_size=texture_size, center=center)
+
+    # Append all the poly-lines of the batch
+    append_poly_lines_batch_to_poly_lines_object(
+        poly_lines_object=aggregate_poly_lines_object.data, poly_lines_batch=poly_lines_batch,
+        poly_line_type=poly_line_type)
+
+    if poly_line_type == 'NURBS':
+        aggregate_poly_lines_object.data.splines[0].order_u = 6
+        aggregate_poly_lines_object.data.splines[0].use_endpoint_u = True
+
+    # Return a reference to the created poly-lines object
+    return aggregate_poly_lines_object
+
+
 def draw_poly_line(poly_line_data,
                    format='SOLID',
                    name='poly_line',
@@ -480,10 +641,10 @@ def draw_poly_line(poly_line_data,
     poly_line_strip = line_data.splines.new('POLY')
     poly_line_strip.points.add(len(poly_line_data) - 1)
 
-    # Add the points (or the samples) and their radii to the poly-line curve
-    for i, point in enumerate(poly_line_data):
-        poly_line_strip.points[i].co = point[0]
-        poly_line_strip.points[i].radius = point[1]
+    # Add the points (or the samples) and their radii to the poly-line curve in bulk
+    poly_line_strip.points.foreach_set(
+        'co', [coordinate for point in poly_line_data for coordinate in point[0]])
+    poly_line_strip.points.foreach_set('radius', [point[1] for point in poly_line_data])
 
     # Create a curve that uses the curve_data.
     line_strip = bpy.data.objects.new(str(name), line_data)
@@ -28,12 +28,15 @@ from argums import *
 ####################################################################################################
 # @parse_command_line_arguments
 ####################################################################################################
-def parse_command_line_arguments():
+def parse_command_line_arguments(arguments=None):
     """Parse the command line arguments.
 
     NOTE: We do not define a destination to facilitate printing to a string and doing another
     iteration of parsing for blender.
 
+    :param arguments:
+        An optional list of arguments to parse instead of the command line, for example the
+        arguments of a job that is given to a persistent worker.
     :return:
         A structure with all the system options.
     """
@@ -186,6 +189,32 @@ def parse_command_line_arguments():
         action='store', type=int, default=16,
         help=arg_help)
 
+    # Morphology level of detail (0 is the original skeleton, higher levels are coarser)
+    arg_help = 'The level of detail of the morphology skeleton. \n' \
+               'Each level has roughly half the samples of the previous one. \n' \
+               'Default 0 (original skeleton)'
+    skeletonization_args.add_argument(
+        Args.MORPHOLOGY_LEVEL_OF_DETAIL,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # Instance a single shared sphere on the samples (samples reconstruction method only)
+    arg_help = 'Instance a single sphere on all the samples instead of creating a sphere per ' \
+               'sample. \nValid only if --morphology-reconstruction-algorithm = samples.'
+    skeletonization_args.add_argument(
+        Args.MORPHOLOGY_INSTANCE_SAMPLES,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Draw the segments as a single mesh (disconnected segments reconstruction method only)
+    arg_help = 'Draw all the segments as a single tube mesh colored per segment instead of a ' \
+               'spline per segment. \nValid only if --morphology-reconstruction-algorithm = ' \
+               'disconnected-segments.'
+    skeletonization_args.add_argument(
+        Args.MORPHOLOGY_SEGMENTS_AS_MESH,
+        action='store_true', default=False,
+        help=arg_help)
+
 
     ################################################################################################
     # Materials and colors arguments
@@ -235,7 +264,7 @@ def parse_command_line_arguments():
         help=arg_help)
 
     # Meshing algorithm
-    arg_options = ['(piecewise-watertight)', 'skinning', 'meta-balls']
+    arg_options = ['(piecewise-watertight)', 'skinning', 'meta-balls', 'implicit-surface']
     arg_help = 'Meshing algorithm. \n' \
                'Options: %s' % arg_options
     meshing_args.add_argument(
@@ -287,6 +316,39 @@ def parse_command_line_arguments():
         action='store', type=float, default=2.0,
         help=arg_help)
 
+    # MetaBalls tiles
+    arg_help = 'Number of spatial tiles along each axis of the MetaBalls object. Each tile is \n' \
+               'meshed in a separate Blender process and the tiles are stitched together.\n' \
+               'Default 1 (the whole object is meshed at once).'
+    meshing_args.add_argument(
+        Args.META_BALLS_TILES,
+        action='store', type=int, default=1,
+        help=arg_help)
+
+    # MetaBalls tiles workers
+    arg_help = 'Number of Blender processes that mesh the MetaBalls tiles in parallel.\n' \
+               'Default 0 (all the available cores).'
+    meshing_args.add_argument(
+        Args.META_BALLS_TILES_WORKERS,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # Implicit surface voxel size
+    arg_help = 'The voxel size of the implicit surface grid.\n' \
+               'Default 0 (half the radius of the smallest sample).'
+    meshing_args.add_argument(
+        Args.IMPLICIT_SURFACE_VOXEL_SIZE,
+        action='store', type=float, default=0.0,
+        help=arg_help)
+
+    # Implicit surface workers
+    arg_help = 'Number of processes that mesh the blocks of the implicit surface in parallel.\n' \
+               'Default 0 (all the available cores).'
+    meshing_args.add_argument(
+        Args.IMPLICIT_SURFACE_WORKERS,
+        action='store', type=int, default=0,
+        help=arg_help)
+
     ################################################################################################
     # Geometry export arguments
     ################################################################################################
@@ -435,6 +497,24 @@ def parse_command_line_arguments():
         action='store', type=float, default=1.0,
         help=arg_help)
 
+    # Rendering workers
+    arg_help = 'The number of headless Blender workers that render the 360 sequences in \n' \
+               'parallel, where every worker renders a subset of the frames. \n' \
+               'Default 1, i.e. the frames are rendered in the same process.'
+    rendering_args.add_argument(
+        Args.RENDERING_WORKERS,
+        action='store', type=int, default=1,
+        help=arg_help)
+
+    # Rendering tile size
+    arg_help = 'Renders the images to scale in tiles of this size (in pixels) that are \n' \
+               'rendered by the rendering workers and stitched into a single image. \n' \
+               'Default 0, i.e. the image is rendered at once.'
+    rendering_args.add_argument(
+        Args.RENDERING_TILE_SIZE,
+        action='store', type=int, default=0,
+        help=arg_help)
+
     ################################################################################################
     # Execution arguments
     ################################################################################################
@@ -466,8 +546,66 @@ def parse_command_line_arguments():
         action='store', default='low',
         help=arg_help)
 
+    # Batch workers
+    arg_help = 'The maximum number of morphology files that are processed at the same time \n' \
+               'on a local node when the input is a directory, or the maximum number of \n' \
+               'array tasks that run at the same time with the local cluster scheduler. \n' \
+               'Default 0, i.e. the number of cores of the node.'
+    execution_args.add_argument(
+        Args.BATCH_WORKERS,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # Batch memory
+    arg_help = 'The memory budget in GB of the morphology files that are processed at the same \n' \
+               'time on a local node. The memory of every file is estimated from its size. \n' \
+               'Default 0, i.e. 80 percent of the physical memory of the node.'
+    execution_args.add_argument(
+        Args.BATCH_MEMORY,
+        action='store', type=float, default=0,
+        help=arg_help)
+
+    # Batch mode
+    arg_options = ['(process)', 'persistent']
+    arg_help = 'Process every morphology file in a new Blender process, or in persistent \n' \
+               'Blender workers that are started once and run many files, which is faster \n' \
+               'for many small files. \n' \
+               'Options: %s' % arg_options
+    execution_args.add_argument(
+        Args.BATCH_MODE,
+        action='store', default='process',
+        help=arg_help)
+
+    # Ignore the build cache
+    arg_help = 'Rebuild all the outputs of a directory, even the ones that the build cache \n' \
+               'of the output directory marks as up to date.'
+    execution_args.add_argument(
+        Args.IGNORE_BUILD_CACHE,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Cluster scheduler
+    arg_options = ['(batch-script)', 'local']
+    arg_help = 'The scheduler of the cluster jobs. The jobs are packed by their estimated cost \n' \
+               'into array tasks, and a job array script is submitted to the batch system, \n' \
+               'or its tasks are run as processes on the local node. \n' \
+               'Options: %s' % arg_options
+    execution_args.add_argument(
+        Args.CLUSTER_SCHEDULER,
+        action='store', default='batch-script',
+        help=arg_help)
+
+    # Submit command
+    arg_help = 'The command that submits the job array script to the batch system. \n' \
+               'If it is not available, the scripts are only written. \n' \
+               'Default sbatch.'
+    execution_args.add_argument(
+        Args.SUBMIT_COMMAND,
+        action='store', default='sbatch',
+        help=arg_help)
+
     # Parse the arguments, and return a list of them
-    return parser.parse_args()
+    return parser.parse_args(arguments)
 
 
 ####################################################################################################
@@ -593,43 +731,29 @@ def create_shell_commands(arguments,
 
     shell_commands = list()
 
-    # Retrieve the path to the CLIs
+    # Retrieve the path to the pipeline CLI, that loads the morphology once and runs all the tasks
     cli_interface_path = os.path.dirname(os.path.realpath(__file__))
-    cli_morphology_reconstruction = '%s/morphology_reconstruction.py' % cli_interface_path
-    cli_morphology_analysis = '%s/analysis.py' % cli_interface_path
-    cli_mesh_reconstruction = '%s/mesh_reconstruction.py' % cli_interface_path
-
-    # Morphology analysis task: call the @cli_morphology_analysis interface
-    if arguments.analyze_morphology:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_analysis, arguments_string))
+    cli_pipeline = '%s/pipeline.py' % cli_interface_path
 
-    # Morphology reconstruction task: call the @cli_morphology_reconstruction interface
-    if arguments.reconstruct_morphology_skeleton or         \
-       arguments.render_vascular_morphology or                \
-       arguments.render_vascular_morphology_360 or            \
+    # Run the pipeline if any task is requested
+    if arguments.analyze_morphology or                      \
+       arguments.reconstruct_morphology_skeleton or         \
+       arguments.render_vascular_morphology or              \
+       arguments.render_vascular_morphology_360 or          \
        arguments.export_morphology_vmv or                   \
        arguments.export_morphology_h5 or                    \
-       arguments.export_morphology_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_morphology_reconstruction, arguments_string))
-        
-    # Neuron mesh reconstruction related task: call the @cli_mesh_reconstruction interface
-    if arguments.reconstruct_neuron_mesh or                 \
-       arguments.render_neuron_mesh or                      \
-       arguments.render_neuron_mesh_360 or                  \
-       arguments.export_neuron_mesh_ply or                  \
-       arguments.export_neuron_mesh_obj or                  \
-       arguments.export_neuron_mesh_stl or                  \
-       arguments.export_neuron_mesh_blend:
-
-        # Add this command to the list
-        shell_commands.append('%s -b --verbose 0 --python %s -- %s' %
-                              (arguments.blender, cli_mesh_reconstruction, arguments_string))
+       arguments.export_morphology_blend or                 \
+       arguments.reconstruct_vascular_mesh or               \
+       arguments.render_vascular_mesh or                    \
+       arguments.render_vascular_mesh_360 or                \
+       arguments.export_vascular_mesh_ply or                \
+       arguments.export_vascular_mesh_obj or                \
+       arguments.export_vascular_mesh_stl or                \
+       arguments.export_vascular_mesh_blend:
+
+        # Add this command to the list, the errors in the pipeline are reported in the exit code
+        shell_commands.append('%s -b --verbose 0 --python-exit-code 1 --python %s -- %s' %
+                              (arguments.blender, cli_pipeline, arguments_string))
 
     # Return a list of commands
     return shell_commands
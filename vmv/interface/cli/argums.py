@@ -86,6 +86,15 @@ class Args:
     # Morphology bevel object sides
     MORPHOLOGY_BEVEL_SIDES = '--bevel-sides'
 
+    # Morphology level of detail
+    MORPHOLOGY_LEVEL_OF_DETAIL = '--level-of-detail'
+
+    # Instance the samples of the morphology
+    MORPHOLOGY_INSTANCE_SAMPLES = '--instance-samples'
+
+    # Draw the segments of the morphology as a single mesh
+    MORPHOLOGY_SEGMENTS_AS_MESH = '--segments-as-mesh'
+
     ################################################################################################
     # Materials and colors arguments
     ################################################################################################
@@ -123,6 +132,18 @@ class Args:
     # MetaBalls resolution value
     META_BALLS_RESOLUTION = '--meta-balls-resolution'
 
+    # MetaBalls tiles along each axis
+    META_BALLS_TILES = '--meta-balls-tiles'
+
+    # MetaBalls tiles workers
+    META_BALLS_TILES_WORKERS = '--meta-balls-tiles-workers'
+
+    # Implicit surface voxel size
+    IMPLICIT_SURFACE_VOXEL_SIZE = '--implicit-surface-voxel-size'
+
+    # Implicit surface workers
+    IMPLICIT_SURFACE_WORKERS = '--implicit-surface-workers'
+
     ################################################################################################
     # Geometry export arguments
     ################################################################################################
@@ -183,6 +204,12 @@ class Args:
     # Scale factor for increasing the resolution of the to-scale images
     RESOLUTION_SCALE_FACTOR = '--resolution-scale-factor'
 
+    # The number of Blender workers that render the 360 sequences in parallel
+    RENDERING_WORKERS = '--rendering-workers'
+
+    # The size of the tiles of the images rendered to scale
+    RENDERING_TILE_SIZE = '--rendering-tile-size'
+
     ################################################################################################
     # Execution arguments
     ################################################################################################
@@ -194,3 +221,21 @@ class Args:
 
     # Job granularity
     JOB_GRANULARITY = '--job-granularity'
+
+    # Number of local batch jobs that run at the same time
+    BATCH_WORKERS = '--batch-workers'
+
+    # The memory budget of the local batch jobs in GB
+    BATCH_MEMORY = '--batch-memory'
+
+    # Run the local batch jobs in a new Blender process per file or in persistent workers
+    BATCH_MODE = '--batch-mode'
+
+    # Rebuild all the outputs of a directory, even if the build cache marks them up to date
+    IGNORE_BUILD_CACHE = '--ignore-build-cache'
+
+    # The scheduler of the cluster jobs, a batch system or the local node
+    CLUSTER_SCHEDULER = '--cluster-scheduler'
+
+    # The command that submits the job array script to the batch system
+    SUBMIT_COMMAND = '--submit-command'
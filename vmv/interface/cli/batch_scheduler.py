@@ -0,0 +1,342 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import time
+import json
+import subprocess
+
+# The memory that is used by a Blender process before loading any morphology, in bytes
+BLENDER_BASE_MEMORY = 512 * 1024 * 1024
+
+# The ratio between the memory that is used to load and process a morphology and its file size
+MORPHOLOGY_MEMORY_FACTOR = 64
+
+# The ratio of the physical memory that is used by the batch jobs, if no budget is given
+PHYSICAL_MEMORY_RATIO = 0.8
+
+# The interval between two checks of the running jobs, in seconds
+POLLING_INTERVAL = 0.5
+
+
+####################################################################################################
+# @get_physical_memory
+####################################################################################################
+def get_physical_memory():
+    """Gets the physical memory of the machine.
+
+    :return:
+        The physical memory in bytes, or None if it cannot be queried on this system.
+    """
+
+    # Query the number and the size of the memory pages
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+
+    # Not available, for example on Windows
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+####################################################################################################
+# @estimate_job_memory
+####################################################################################################
+def estimate_job_memory(morphology_file):
+    """Estimates the memory of a job that processes a morphology file from the size of the file.
+
+    :param morphology_file:
+        The path to the morphology file.
+    :return:
+        The estimated memory of the job in bytes.
+    """
+
+    # Probe the size of the file
+    try:
+        file_size = os.path.getsize(morphology_file)
+    except OSError:
+        file_size = 0
+
+    # A Blender session and the loaded data
+    return BLENDER_BASE_MEMORY + MORPHOLOGY_MEMORY_FACTOR * file_size
+
+
+####################################################################################################
+# @BatchJob
+####################################################################################################
+class BatchJob:
+    """A batch job that runs the shell commands of a single morphology file in a separate process
+    and keeps its log, exit code and runtime.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 name,
+                 morphology_file,
+                 shell_commands,
+                 log_file):
+        """Constructor
+
+        :param name:
+            The name of the job, the morphology label.
+        :param morphology_file:
+            The path to the morphology file.
+        :param shell_commands:
+            A list of the shell commands of the job, executed in sequence.
+        :param log_file:
+            The path to the log file of the job.
+        """
+
+        # The job data
+        self.name = name
+        self.morphology_file = morphology_file
+        self.shell_commands = shell_commands
+        self.log_file = log_file
+
+        # The estimated memory of the job, used for the admission
+        self.memory = estimate_job_memory(morphology_file)
+
+        # The process and its log, while running
+        self.process = None
+        self.log_handle = None
+
+        # The results
+        self.exit_code = None
+        self.start_time = None
+        self.end_time = None
+
+    ################################################################################################
+    # @start
+    ################################################################################################
+    def start(self):
+        """Starts the job in a new process.
+        """
+
+        # The commands run in sequence and stop at the first failure
+        shell_command = ' && '.join(self.shell_commands)
+
+        # Start the process
+        self.log_handle = open(self.log_file, 'w')
+        self.log_handle.write('RUNNING: %s\n' % shell_command)
+        self.log_handle.flush()
+        self.start_time = time.time()
+        self.process = subprocess.Popen(
+            shell_command, shell=True, stdout=self.log_handle, stderr=subprocess.STDOUT)
+
+    ################################################################################################
+    # @poll
+    ################################################################################################
+    def poll(self):
+        """Checks if the job is finished, and keeps its exit code.
+
+        :return:
+            True if the job is finished, otherwise False.
+        """
+
+        # Still running
+        if self.process.poll() is None:
+            return False
+
+        # Finished
+        self.end_time = time.time()
+        self.exit_code = self.process.returncode
+        self.log_handle.close()
+        return True
+
+    ################################################################################################
+    # @get_summary
+    ################################################################################################
+    def get_summary(self):
+        """Gets the summary of the job that is written to the manifest.
+
+        :return:
+            A dictionary of the job data and results.
+        """
+
+        # The runtime, if the job was run
+        runtime = None
+        if self.start_time is not None and self.end_time is not None:
+            runtime = self.end_time - self.start_time
+
+        # Return the summary
+        return {'name': self.name,
+                'morphology_file': self.morphology_file,
+                'estimated_memory': self.memory,
+                'exit_code': self.exit_code,
+                'runtime': runtime,
+                'log_file': self.log_file}
+
+
+####################################################################################################
+# @BatchScheduler
+####################################################################################################
+class BatchScheduler:
+    """Runs batch jobs on the local machine with a limited number of workers. A job is admitted
+    only if its estimated memory fits into the budget next to the running jobs, so large files get
+    fewer concurrent slots. The largest jobs are started first and the smaller ones fill the gaps.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 number_workers=None,
+                 memory_budget=None):
+        """Constructor
+
+        :param number_workers:
+            The maximum number of jobs that run at the same time. If None, the number of cores.
+        :param memory_budget:
+            The memory that can be used by all the running jobs in bytes. If None, a ratio of the
+            physical memory is used, if known, otherwise the memory is not limited.
+        """
+
+        # The number of workers
+        self.number_workers = number_workers if number_workers else (os.cpu_count() or 1)
+
+        # The memory budget
+        if memory_budget is None:
+            physical_memory = get_physical_memory()
+            if physical_memory is not None:
+                memory_budget = int(PHYSICAL_MEMORY_RATIO * physical_memory)
+        self.memory_budget = memory_budget
+
+        # All the jobs
+        self.jobs = list()
+
+        # The time when the jobs were started and finished
+        self.start_time = None
+        self.end_time = None
+
+    ################################################################################################
+    # @add_job
+    ################################################################################################
+    def add_job(self,
+                job):
+        """Adds a job to the scheduler.
+
+        :param job:
+            A BatchJob.
+        """
+
+        # Add the job
+        self.jobs.append(job)
+
+    ################################################################################################
+    # @can_admit
+    ################################################################################################
+    def can_admit(self,
+                  job,
+                  running_jobs):
+        """Checks if a job can be started next to the running jobs.
+
+        :param job:
+            A pending job.
+        :param running_jobs:
+            A list of the running jobs.
+        :return:
+            True if the job can be started, otherwise False.
+        """
+
+        # All the workers are busy
+        if len(running_jobs) >= self.number_workers:
+            return False
+
+        # A job is always started if nothing is running, even if it exceeds the budget
+        if len(running_jobs) == 0 or self.memory_budget is None:
+            return True
+
+        # The estimated memory must fit into the budget
+        return sum(running_job.memory for running_job in running_jobs) + job.memory <= \
+            self.memory_budget
+
+    ################################################################################################
+    # @run
+    ################################################################################################
+    def run(self):
+        """Runs all the jobs and waits until they are finished.
+
+        :return:
+            The number of failed jobs.
+        """
+
+        # The largest jobs first
+        pending_jobs = sorted(self.jobs, key=lambda job: job.memory, reverse=True)
+        running_jobs = list()
+        number_finished_jobs = 0
+
+        # Run the jobs
+        self.start_time = time.time()
+        while len(pending_jobs) > 0 or len(running_jobs) > 0:
+
+            # Start all the pending jobs that can be admitted
+            for job in list(pending_jobs):
+                if self.can_admit(job, running_jobs):
+                    print('RUNNING: [%s]' % job.name)
+                    job.start()
+                    running_jobs.append(job)
+                    pending_jobs.remove(job)
+
+            # Wait and collect the finished jobs
+            time.sleep(POLLING_INTERVAL)
+            for job in list(running_jobs):
+                if job.poll():
+                    running_jobs.remove(job)
+                    number_finished_jobs += 1
+                    print('FINISHED: [%s] with exit code [%d] in [%f] seconds (%d/%d)' %
+                          (job.name, job.exit_code, job.end_time - job.start_time,
+                           number_finished_jobs, len(self.jobs)))
+        self.end_time = time.time()
+
+        # Return the number of failed jobs
+        return len([job for job in self.jobs if job.exit_code != 0])
+
+    ################################################################################################
+    # @get_summary
+    ################################################################################################
+    def get_summary(self):
+        """Gets the summary of all the jobs with their exit codes and runtimes.
+
+        :return:
+            A dictionary of the summary, that is written to the manifest.
+        """
+
+        # Return the summary
+        return {'number_workers': self.number_workers,
+                'memory_budget': self.memory_budget,
+                'number_jobs': len(self.jobs),
+                'number_failed_jobs': len([job for job in self.jobs if job.exit_code != 0]),
+                'runtime': self.end_time - self.start_time
+                if self.start_time is not None and self.end_time is not None else None,
+                'jobs': [job.get_summary() for job in self.jobs]}
+
+    ################################################################################################
+    # @write_manifest
+    ################################################################################################
+    def write_manifest(self,
+                       manifest_file):
+        """Writes a summary manifest of all the jobs with their exit codes and runtimes.
+
+        :param manifest_file:
+            The path to the .json manifest file.
+        """
+
+        # Write the manifest
+        with open(manifest_file, 'w') as manifest_handle:
+            json.dump(self.get_summary(), manifest_handle, indent=4)
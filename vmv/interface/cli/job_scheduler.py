@@ -0,0 +1,626 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import abc
+import json
+import time
+import heapq
+import shlex
+import shutil
+import subprocess
+
+# The cost of a job before processing any sample, i.e. starting Blender, in samples
+JOB_BASE_COST = 10000
+
+# The cost of every byte of the morphology file that is not covered by the samples, in samples
+BYTE_COST = 0.01
+
+# The average size of a sample in a morphology file, used if the samples cannot be counted
+BYTES_PER_SAMPLE = 64
+
+# The interval between two checks of the running array tasks, in seconds
+POLLING_INTERVAL = 0.5
+
+
+####################################################################################################
+# @count_morphology_samples
+####################################################################################################
+def count_morphology_samples(morphology_file):
+    """Counts the samples of a morphology file without loading it. The .swc files are counted
+    line by line, the .vmv files from their header and the .h5 files from their points dataset
+    if h5py is available.
+
+    :param morphology_file:
+        The path to the morphology file.
+    :return:
+        The number of samples, or None if they cannot be counted.
+    """
+
+    # Get the extension of the file
+    extension = os.path.splitext(morphology_file)[1].lower()
+
+    try:
+
+        # Every line that is not empty or a comment is a sample
+        if extension == '.swc':
+            with open(morphology_file, 'r') as file_handle:
+                return sum(1 for line in file_handle
+                           if line.strip() and not line.lstrip().startswith('#'))
+
+        # The number of vertices is given in the header
+        elif extension == '.vmv':
+            with open(morphology_file, 'r') as file_handle:
+                for line in file_handle:
+                    if 'NUM_VERTS' in line:
+                        return int(line.split()[1])
+                    if '$VERT_LIST_BEGIN' in line:
+                        break
+
+        # The points dataset of the vasculature format
+        elif extension == '.h5':
+            import h5py
+            with h5py.File(morphology_file, 'r') as file_handle:
+                return file_handle['points'].shape[0]
+
+    # The file cannot be read or h5py is not available, the cost is estimated from the size
+    except (ImportError, IOError, OSError, KeyError, ValueError, IndexError):
+        pass
+
+    # Cannot count the samples
+    return None
+
+
+####################################################################################################
+# @estimate_job_cost
+####################################################################################################
+def estimate_job_cost(morphology_file):
+    """Estimates the relative cost of a job that processes a morphology file from its sample count
+    and file size, in samples.
+
+    :param morphology_file:
+        The path to the morphology file.
+    :return:
+        The estimated cost of the job.
+    """
+
+    # Probe the size of the file
+    try:
+        file_size = os.path.getsize(morphology_file)
+    except OSError:
+        file_size = 0
+
+    # Count the samples, otherwise estimate them from the size
+    number_samples = count_morphology_samples(morphology_file)
+    if number_samples is None:
+        number_samples = file_size // BYTES_PER_SAMPLE
+
+    # The base cost, the samples and the rest of the file, e.g. the connectivity
+    return JOB_BASE_COST + number_samples + BYTE_COST * file_size
+
+
+####################################################################################################
+# @pack_jobs
+####################################################################################################
+def pack_jobs(jobs,
+              number_bins):
+    """Packs the jobs into bins with balanced costs. Every job, starting from the most expensive
+    one, is added to the bin with the lowest total cost so far.
+
+    :param jobs:
+        A list of the jobs, each with a cost.
+    :param number_bins:
+        The maximum number of bins.
+    :return:
+        A list of bins, each is a list of jobs. Empty bins are not returned.
+    """
+
+    # The bins, in a heap of (cost, index)
+    number_bins = max(1, min(number_bins, len(jobs)))
+    bins = [list() for _ in range(number_bins)]
+    heap = [(0.0, index) for index in range(number_bins)]
+
+    # Add the most expensive jobs first
+    for job in sorted(jobs, key=lambda job: job.cost, reverse=True):
+        cost, index = heapq.heappop(heap)
+        bins[index].append(job)
+        heapq.heappush(heap, (cost + job.cost, index))
+
+    # Return the bins that have jobs
+    return [jobs_bin for jobs_bin in bins if len(jobs_bin) > 0]
+
+
+####################################################################################################
+# @Job
+####################################################################################################
+class Job:
+    """A job that runs the shell commands of a single morphology file in an array task.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 name,
+                 morphology_file,
+                 shell_commands):
+        """Constructor
+
+        :param name:
+            The name of the job, the morphology label.
+        :param morphology_file:
+            The path to the morphology file.
+        :param shell_commands:
+            A list of the shell commands of the job, executed in sequence.
+        """
+
+        # The job data
+        self.name = name
+        self.morphology_file = morphology_file
+        self.shell_commands = shell_commands
+
+        # The estimated cost of the job, used for the packing
+        self.cost = estimate_job_cost(morphology_file)
+
+        # The index of the array task that runs the job, after the packing
+        self.task = None
+
+
+####################################################################################################
+# @Scheduler
+####################################################################################################
+class Scheduler(abc.ABC):
+    """The base of the schedulers. The jobs are packed into array tasks with balanced costs and
+    every task is written to a shell script that runs its jobs in sequence. A job array script
+    runs the task that is given by the index of the array. The backends submit the array.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 number_tasks,
+                 scripts_directory,
+                 jobs_directory,
+                 logs_directory):
+        """Constructor
+
+        :param number_tasks:
+            The maximum number of array tasks.
+        :param scripts_directory:
+            The directory where the job array script is written.
+        :param jobs_directory:
+            The directory where the scripts of the tasks are written.
+        :param logs_directory:
+            The directory of the logs and the exit codes of the jobs.
+        """
+
+        # The maximum number of array tasks
+        self.number_tasks = number_tasks
+
+        # The directories
+        self.scripts_directory = os.path.abspath(scripts_directory)
+        self.jobs_directory = os.path.abspath(jobs_directory)
+        self.logs_directory = os.path.abspath(logs_directory)
+
+        # All the jobs, and the packed tasks
+        self.jobs = list()
+        self.tasks = list()
+
+        # The job array script, once written
+        self.array_script = None
+
+    ################################################################################################
+    # @add_job
+    ################################################################################################
+    def add_job(self,
+                job):
+        """Adds a job to the scheduler.
+
+        :param job:
+            A Job.
+        """
+
+        self.jobs.append(job)
+
+    ################################################################################################
+    # @get_log_file
+    ################################################################################################
+    def get_log_file(self,
+                     job):
+        """Gets the path to the log file of a job.
+
+        :param job:
+            A Job.
+        :return:
+            The path to the log file.
+        """
+
+        return '%s/%s.log' % (self.logs_directory, job.name)
+
+    ################################################################################################
+    # @get_status_file
+    ################################################################################################
+    def get_status_file(self,
+                        job):
+        """Gets the path to the file where the exit code of a job is written.
+
+        :param job:
+            A Job.
+        :return:
+            The path to the status file.
+        """
+
+        return '%s/%s.status' % (self.logs_directory, job.name)
+
+    ################################################################################################
+    # @get_exit_code
+    ################################################################################################
+    def get_exit_code(self,
+                      job):
+        """Gets the exit code of a job from its status file.
+
+        :param job:
+            A Job.
+        :return:
+            The exit code of the job, or None if it has not finished.
+        """
+
+        try:
+            with open(self.get_status_file(job), 'r') as status_handle:
+                return int(status_handle.read().strip())
+        except (IOError, ValueError):
+            return None
+
+    ################################################################################################
+    # @get_task_script
+    ################################################################################################
+    def get_task_script(self,
+                        task_index):
+        """Gets the path to the script of an array task.
+
+        :param task_index:
+            The index of the task.
+        :return:
+            The path to the script.
+        """
+
+        return '%s/task_%d.sh' % (self.jobs_directory, task_index)
+
+    ################################################################################################
+    # @write_task_script
+    ################################################################################################
+    def write_task_script(self,
+                          task_index,
+                          jobs):
+        """Writes the script of an array task that runs its jobs in sequence. The exit code of
+        every job is written to its status file and the task fails if any of the jobs fails.
+
+        :param task_index:
+            The index of the task.
+        :param jobs:
+            A list of the jobs of the task.
+        """
+
+        # The header
+        script = '#!/bin/bash\n'
+        script += '# VessMorphoVis array task [%d], [%d] jobs, estimated cost [%d]\n\n' % (
+            task_index, len(jobs), sum(job.cost for job in jobs))
+        script += 'number_failed_jobs=0\n\n'
+
+        # The jobs, the previous status file is removed to detect the interrupted jobs
+        for job in jobs:
+            status_file = shlex.quote(self.get_status_file(job))
+            script += 'echo "RUNNING: [%s]"\n' % job.name
+            script += 'rm -f %s\n' % status_file
+            script += '(%s) > %s 2>&1\n' % (
+                ' && '.join(job.shell_commands), shlex.quote(self.get_log_file(job)))
+            script += 'exit_code=$?\n'
+            script += 'echo $exit_code > %s\n' % status_file
+            script += 'echo "FINISHED: [%s] with exit code [$exit_code]"\n' % job.name
+            script += 'if [ $exit_code -ne 0 ]; then\n'
+            script += '    number_failed_jobs=$((number_failed_jobs + 1))\n'
+            script += 'fi\n\n'
+
+        # The task fails if any of its jobs fails
+        script += 'exit $((number_failed_jobs > 0))\n'
+
+        # Write the script
+        with open(self.get_task_script(task_index), 'w') as script_handle:
+            script_handle.write(script)
+
+    ################################################################################################
+    # @write_array_script
+    ################################################################################################
+    def write_array_script(self):
+        """Writes the job array script. The index of the task is taken from the array index of
+        the batch system, SLURM or PBS, or from the first argument of the script if it is run by
+        hand, e.g. 'bash array.sh 0'.
+        """
+
+        # The path to the script
+        self.array_script = '%s/array.sh' % self.scripts_directory
+
+        # The header, with the directives of SLURM
+        script = '#!/bin/bash\n'
+        script += '#SBATCH --job-name=vessmorphovis\n'
+        script += '#SBATCH --array=0-%d\n' % (len(self.tasks) - 1)
+        script += '#SBATCH --ntasks=1\n'
+        script += '#SBATCH --output=%s/array_%%a.out\n' % self.logs_directory
+        script += '#SBATCH --error=%s/array_%%a.err\n\n' % self.logs_directory
+
+        # Run the script of the task
+        script += 'task=${SLURM_ARRAY_TASK_ID:-${PBS_ARRAY_INDEX:-$1}}\n'
+        script += 'if [ -z "$task" ]; then\n'
+        script += '    echo "Usage: $0 <task index in [0, %d]>"\n' % (len(self.tasks) - 1)
+        script += '    exit 1\n'
+        script += 'fi\n'
+        script += 'exec bash %s/task_$task.sh\n' % shlex.quote(self.jobs_directory)
+
+        # Write the script
+        with open(self.array_script, 'w') as script_handle:
+            script_handle.write(script)
+
+    ################################################################################################
+    # @prepare
+    ################################################################################################
+    def prepare(self):
+        """Packs the jobs into array tasks and writes their scripts and the job array script.
+        """
+
+        # Remove the status files of any previous submission, they are written by this one only
+        for job in self.jobs:
+            if os.path.isfile(self.get_status_file(job)):
+                os.remove(self.get_status_file(job))
+
+        # Pack the jobs
+        self.tasks = pack_jobs(self.jobs, self.number_tasks)
+
+        # Write the scripts of the tasks
+        for task_index, jobs in enumerate(self.tasks):
+            for job in jobs:
+                job.task = task_index
+            self.write_task_script(task_index, jobs)
+
+        # Write the job array script
+        self.write_array_script()
+        print('PACKED: [%d] jobs into [%d] array tasks, see [%s]' %
+              (len(self.jobs), len(self.tasks), self.array_script))
+
+    ################################################################################################
+    # @submit
+    ################################################################################################
+    @abc.abstractmethod
+    def submit(self):
+        """Submits the job array, implemented by the backends.
+
+        :return:
+            The number of failed jobs, or None if the jobs do not finish before returning.
+        """
+
+    ################################################################################################
+    # @run
+    ################################################################################################
+    def run(self):
+        """Packs the jobs, writes the scripts and submits the job array.
+
+        :return:
+            The number of failed jobs, or None if the jobs do not finish before returning.
+        """
+
+        # Nothing to run
+        if len(self.jobs) == 0:
+            return 0
+
+        # Prepare and submit
+        self.prepare()
+        return self.submit()
+
+    ################################################################################################
+    # @get_summary
+    ################################################################################################
+    def get_summary(self):
+        """Gets the summary of all the jobs with their array tasks, costs and exit codes.
+
+        :return:
+            A dictionary of the summary, that is written to the manifest.
+        """
+
+        # Return the summary
+        return {'backend': self.__class__.__name__,
+                'array_script': self.array_script,
+                'number_tasks': len(self.tasks),
+                'tasks_costs': [sum(job.cost for job in jobs) for jobs in self.tasks],
+                'jobs': [{'name': job.name,
+                          'morphology_file': job.morphology_file,
+                          'estimated_cost': job.cost,
+                          'task': job.task,
+                          'exit_code': self.get_exit_code(job),
+                          'log_file': self.get_log_file(job)} for job in self.jobs]}
+
+    ################################################################################################
+    # @write_manifest
+    ################################################################################################
+    def write_manifest(self,
+                       manifest_file):
+        """Writes a summary manifest of all the jobs with their array tasks, costs and exit codes.
+
+        :param manifest_file:
+            The path to the .json manifest file.
+        """
+
+        # Write the manifest
+        with open(manifest_file, 'w') as manifest_handle:
+            json.dump(self.get_summary(), manifest_handle, indent=4)
+
+
+####################################################################################################
+# @LocalScheduler
+####################################################################################################
+class LocalScheduler(Scheduler):
+    """Runs the array tasks on the local node in a pool of processes, i.e. the same scripts that
+    are submitted to a cluster but without a batch system.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 number_tasks,
+                 scripts_directory,
+                 jobs_directory,
+                 logs_directory,
+                 number_workers=None):
+        """Constructor
+
+        :param number_tasks:
+            The maximum number of array tasks.
+        :param scripts_directory:
+            The directory where the job array script is written.
+        :param jobs_directory:
+            The directory where the scripts of the tasks are written.
+        :param logs_directory:
+            The directory of the logs and the exit codes of the jobs.
+        :param number_workers:
+            The maximum number of tasks that run at the same time. If None, the number of cores.
+        """
+
+        # The base
+        Scheduler.__init__(self, number_tasks, scripts_directory, jobs_directory, logs_directory)
+
+        # The size of the pool
+        self.number_workers = number_workers if number_workers else (os.cpu_count() or 1)
+
+    ################################################################################################
+    # @start_task
+    ################################################################################################
+    def start_task(self,
+                   task_index):
+        """Starts an array task in a new process.
+
+        :param task_index:
+            The index of the task.
+        :return:
+            A tuple of the task index, the process, its log handle and its starting time.
+        """
+
+        # Run the job array script with the index of the task, as the batch system does
+        log_handle = open('%s/array_%d.out' % (self.logs_directory, task_index), 'w')
+        process = subprocess.Popen(['bash', self.array_script, str(task_index)],
+                                   stdout=log_handle, stderr=subprocess.STDOUT)
+        print('RUNNING: array task [%d]' % task_index)
+        return task_index, process, log_handle, time.time()
+
+    ################################################################################################
+    # @submit
+    ################################################################################################
+    def submit(self):
+        """Runs all the array tasks in the pool and waits until they are finished.
+
+        :return:
+            The number of failed jobs.
+        """
+
+        # The tasks that are waiting for a free worker, and the running ones
+        pending_tasks = list(range(len(self.tasks)))
+        processes = list()
+
+        # Run the tasks
+        while len(pending_tasks) > 0 or len(processes) > 0:
+
+            # Fill the free workers
+            while len(pending_tasks) > 0 and len(processes) < self.number_workers:
+                processes.append(self.start_task(pending_tasks.pop(0)))
+
+            # Wait and collect the finished tasks
+            time.sleep(POLLING_INTERVAL)
+            for task_index, process, log_handle, start_time in list(processes):
+                if process.poll() is None:
+                    continue
+                log_handle.close()
+                processes.remove((task_index, process, log_handle, start_time))
+                print('FINISHED: array task [%d] with exit code [%d] in [%f] seconds' %
+                      (task_index, process.returncode, time.time() - start_time))
+
+        # Return the number of failed jobs
+        return len([job for job in self.jobs if self.get_exit_code(job) != 0])
+
+
+####################################################################################################
+# @BatchScriptScheduler
+####################################################################################################
+class BatchScriptScheduler(Scheduler):
+    """Submits the job array script to a batch system, e.g. SLURM with 'sbatch'. If the submission
+    command is not available, the scripts are only written to be submitted by hand.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 number_tasks,
+                 scripts_directory,
+                 jobs_directory,
+                 logs_directory,
+                 submit_command='sbatch'):
+        """Constructor
+
+        :param number_tasks:
+            The maximum number of array tasks.
+        :param scripts_directory:
+            The directory where the job array script is written.
+        :param jobs_directory:
+            The directory where the scripts of the tasks are written.
+        :param logs_directory:
+            The directory of the logs and the exit codes of the jobs.
+        :param submit_command:
+            The command that submits the job array script.
+        """
+
+        # The base
+        Scheduler.__init__(self, number_tasks, scripts_directory, jobs_directory, logs_directory)
+
+        # The submission command
+        self.submit_command = submit_command
+
+    ################################################################################################
+    # @submit
+    ################################################################################################
+    def submit(self):
+        """Submits the job array script.
+
+        :return:
+            None, as the jobs run on the cluster after returning, or the number of the jobs if
+            the submission failed.
+        """
+
+        # The submission command is not available, e.g. on a workstation
+        command = shlex.split(self.submit_command) if self.submit_command else list()
+        if len(command) == 0 or shutil.which(command[0]) is None:
+            print('WARNING: The command [%s] is not available, submit [%s] by hand or run the '
+                  'tasks locally with: for i in $(seq 0 %d); do bash %s $i; done' %
+                  (self.submit_command, self.array_script, len(self.tasks) - 1,
+                   self.array_script))
+            return None
+
+        # Submit the job array
+        print('SUBMITTING: ' + ' '.join(command + [self.array_script]))
+        if subprocess.call(command + [self.array_script]) != 0:
+            print('ERROR: The submission of [%s] failed' % self.array_script)
+            return len(self.jobs)
+        return None
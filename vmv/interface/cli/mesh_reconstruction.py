@@ -43,21 +43,42 @@ import vmv.rendering
 import vmv.scene
 
 
+####################################################################################################
+# @is_ply_exported_from_arrays
+####################################################################################################
+def is_ply_exported_from_arrays(cli_options):
+    """Checks if the .PLY file of the mesh is written directly from the arrays of the builder,
+    which is the case for the implicit surfaces that are not decimated in Blender.
+
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    :return:
+        True if the .PLY file is written by the builder, otherwise False.
+    """
+
+    return cli_options.mesh.meshing_technique == vmv.enums.Meshing.Technique.IMPLICIT_SURFACE \
+        and not 0.01 < cli_options.mesh.tessellation_level < 1.0
+
+
 ####################################################################################################
 # @reconstruct_vascular_mesh
 ####################################################################################################
 def reconstruct_vascular_mesh(cli_morphology,
-                            cli_options):
+                              cli_options,
+                              clear_scene=True):
     """Vascular mesh reconstruction and visualization operations.
 
     :param cli_morphology:
         The morphology loaded from the command line interface (CLI).
     :param cli_options:
         System options parsed from the command line interface (CLI).
+    :param clear_scene:
+        Clear the scene before building the mesh. The pipeline keeps the skeleton in the scene.
     """
 
     # Clear the scene
-    vmv.scene.ops.clear_scene()
+    if clear_scene:
+        vmv.scene.ops.clear_scene()
 
     # PiecewiseWatertightBuilder
     if cli_options.mesh.meshing_technique == vmv.enums.Meshing.Technique.PIECEWISE_WATERTIGHT:
@@ -68,7 +89,17 @@ def reconstruct_vascular_mesh(cli_morphology,
     # MetaBall builder
     elif cli_options.mesh.meshing_technique == vmv.enums.Meshing.Technique.META_BALLS:
         builder = vmv.builders.MetaBuilder(cli_morphology, cli_options)
+        return builder.build_mesh() is not None
+
+    # Implicit surface builder
+    elif cli_options.mesh.meshing_technique == vmv.enums.Meshing.Technique.IMPLICIT_SURFACE:
+        builder = vmv.builders.ImplicitBuilder(cli_morphology, cli_options)
         builder.build_mesh()
+
+        # Write the .PLY file directly from the arrays of the mesh, without the Blender exporter,
+        # with the same name that the exporter uses
+        if cli_options.mesh.export_ply and is_ply_exported_from_arrays(cli_options):
+            builder.export_mesh_to_ply(cli_options.io.meshes_directory, cli_morphology.name)
         return True
 
     else:
@@ -103,17 +134,22 @@ def export_neuron_mesh(cli_morphology,
         return
 
     elif len(mesh_objects) == 1:
-        mesh_object = mesh_objects
+        mesh_object = mesh_objects[0]
 
     else:
         mesh_object = vmv.mesh.join_mesh_objects(mesh_objects, cli_morphology.name)
 
-    # OBJ
-    if cli_options.mesh.export_obj:
-        vmv.file.export_mesh_object(
-            mesh_object, cli_options.io.meshes_directory, cli_morphology.name,
-        cli_options.mesh.export_obj, cli_options.mesh.export_ply, cli_options.mesh.export_stl,
-        cli_options.mesh.export_blend)
+    # Export the mesh to every requested format, the .PLY file of the implicit surface is written
+    # by the builder
+    for export_flag, file_format in [
+            (cli_options.mesh.export_obj, vmv.enums.Meshing.ExportFormat.OBJ),
+            (cli_options.mesh.export_ply and not is_ply_exported_from_arrays(cli_options),
+             vmv.enums.Meshing.ExportFormat.PLY),
+            (cli_options.mesh.export_stl, vmv.enums.Meshing.ExportFormat.STL),
+            (cli_options.mesh.export_blend, vmv.enums.Meshing.ExportFormat.BLEND)]:
+        if export_flag:
+            vmv.file.export_mesh_object(
+                mesh_object, cli_options.io.meshes_directory, cli_morphology.name, file_format)
 
 
 ####################################################################################################
@@ -127,6 +163,8 @@ def render_vascular_mesh_to_static_frame(cli_morphology,
         CLI options.
     :param cli_morphology:
         Original morphology.
+    :return:
+        True if the image is rendered, otherwise False.
     """
 
     # Header
@@ -160,17 +198,20 @@ def render_vascular_mesh_to_static_frame(cli_morphology,
             image_resolution=cli_options.mesh.full_view_resolution,
             image_name='MESH_%s_%s' % (view_prefix, cli_options.morphology.label),
             image_directory=cli_options.io.images_directory)
+        return True
 
     # Render at a specific scale factor
     else:
 
         # Render the image
-        vmv.rendering.render_to_scale(
+        return vmv.rendering.render_to_scale(
             bounding_box=bounding_box,
             camera_view=cli_options.mesh.camera_view,
             image_scale_factor=cli_options.mesh.resolution_scale_factor,
             image_name='MESH_%s_%s' % (view_prefix, cli_options.morphology.label),
-            image_directory=cli_options.io.images_directory)
+            image_directory=cli_options.io.images_directory,
+            tile_size=cli_options.mesh.rendering_tile_size,
+            number_workers=cli_options.mesh.rendering_workers)
 
 
 ####################################################################################################
@@ -184,6 +225,8 @@ def render_vascular_mesh_360(cli_options,
         CLI options.
     :param cli_morphology:
         The original morphology.
+    :return:
+        True if all the frames were rendered, otherwise False.
     """
 
     # Header
@@ -191,76 +234,43 @@ def render_vascular_mesh_360(cli_options,
 
     # Create the sequences directory if it does not exist
     if not vmv.file.ops.path_exists(cli_options.io.sequences_directory):
-        vmv.file.ops.clean_and_create_directory(cli_options.io.sequences_directory)
+        vmv.file.ops.create_output_tree(cli_options.io.output_directory)
 
     # Render a 360 sequence
     if cli_options.mesh.render_360:
 
-        # Compute the bounding box for a close up view
-        if cli_options.mesh.rendering_view == vmv.enums.Meshing.Rendering.View.CLOSE_UP_VIEW:
-
-            # Compute the bounding box for a close up view
-            bounding_box = vmv.bbox.compute_unified_extent_bounding_box(
-                extent=cli_options.mesh.close_up_dimensions)
-
-        # Compute the bounding box for a mid shot view
-        elif cli_options.mesh.rendering_view == vmv.enums.Meshing.Rendering.View.MID_SHOT_VIEW:
-
-            # Compute the bounding box for the available meshes only
-            bounding_box = vmv.bbox.compute_scene_bounding_box_for_meshes()
-
-        # Compute the bounding box for the wide shot view that correspond to whole morphology
-        else:
-
-            # Compute the full morphology bounding box
-            bounding_box = vmv.skeleton.compute_full_morphology_bounding_box(
-                morphology=cli_morphology)
+        # Compute the bounding box for the available meshes only, as in the meshing panel
+        bounding_box = vmv.bbox.compute_scene_bounding_box_for_meshes()
 
         # Compute a 360 bounding box to fit the arbors
-        bounding_box_360 = vmv.bbox.compute_360_bounding_box(bounding_box,
-                                                             cli_morphology.soma.centroid)
+        bounding_box_360 = vmv.bbox.compute_360_bounding_box(bounding_box, bounding_box.center)
 
         # Stretch the bounding box by few microns
         bounding_box_360.extend_bbox(delta=vmv.consts.Image.GAP_DELTA)
 
-        # Create a specific directory for this mesh
+        # Create a specific directory for this mesh, the existing frames are kept to resume
         output_directory = '%s/%s_mesh_360' % (
             cli_options.io.sequences_directory, cli_options.morphology.label)
-        vmv.file.ops.clean_and_create_directory(output_directory)
-
-        # Get a list of all the meshes in the scene
-        scene_meshes = vmv.scene.get_list_of_meshes_in_scene()
-
-        # Render 360
-        for i in range(360):
-
-            # Set the frame name
-            image_name = '%s/%s' % (output_directory, '{0:05d}'.format(i))
-
-            # Render at a specific resolution
-            if cli_options.mesh.resolution_basis == \
-                    vmv.enums.Meshing.Rendering.Resolution.FIXED_RESOLUTION:
-
-                # Render the image
-                vmv.rendering.renderer.render_at_angle(
-                    scene_objects=scene_meshes,
-                    angle=i,
-                    bounding_box=bounding_box_360,
-                    camera_view=vmv.enums.Camera.View.FRONT_360,
-                    image_resolution=cli_options.mesh.full_view_resolution,
-                    image_name=image_name)
-
-            # Render at a specific scale factor
-            else:
-
-                # Render the image
-                vmv.rendering.renderer.render_at_angle_to_scale(
-                    scene_objects=scene_meshes,
-                    angle=i,
-                    bounding_box=bounding_box_360,
-                    camera_view=vmv.enums.Camera.View.FRONT_360,
-                    image_scale_factor=cli_options.mesh.resolution_scale_facto,
-                    image_name=image_name)
+        if not vmv.file.ops.path_exists(output_directory):
+            vmv.file.ops.create_directory(output_directory)
+
+        # Render at a specific scale factor, otherwise at a specific resolution
+        image_scale_factor = None
+        if cli_options.mesh.resolution_basis == vmv.enums.Rendering.Resolution.TO_SCALE:
+            image_scale_factor = cli_options.mesh.resolution_scale_factor
+
+        # Render the sequence, split across the workers if more than one is given
+        sequence_renderer = vmv.rendering.SequenceRenderer(
+            scene_objects=vmv.scene.get_list_of_meshes_in_scene(),
+            bounding_box=bounding_box_360,
+            output_directory=output_directory,
+            image_resolution=cli_options.mesh.full_view_resolution,
+            image_scale_factor=image_scale_factor,
+            number_workers=cli_options.mesh.rendering_workers)
+        return sequence_renderer.render()
+
+    # Nothing to render
+    return True
 
 
 ####################################################################################################
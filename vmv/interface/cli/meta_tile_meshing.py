@@ -0,0 +1,117 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+import os
+import argparse
+
+# Blender imports
+import bpy
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['vmv']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Internal imports
+import numpy
+import vmv
+import vmv.mesh
+import vmv.scene
+
+
+####################################################################################################
+# @mesh_meta_tile
+####################################################################################################
+def mesh_meta_tile(centers,
+                   radii,
+                   resolution,
+                   p_min,
+                   p_max):
+    """Reconstructs the mesh of a single spatial tile of a meta object and crops it to the tile.
+
+    :param centers:
+        An array of the centers of the meta elements that influence the tile [M, 3].
+    :param radii:
+        An array of the radii of the meta elements [M].
+    :param resolution:
+        The resolution of the meta object, which must be the same for all the tiles.
+    :param p_min:
+        The minimum point of the tile.
+    :param p_max:
+        The maximum point of the tile.
+    :return:
+        A tuple of (vertices, loops, loops totals) of the cropped mesh of the tile.
+    """
+
+    # Clear the scene
+    vmv.scene.ops.clear_scene()
+
+    # Create the meta object at the origin, to keep the polygonization grid of all the tiles aligned
+    meta_skeleton = bpy.data.metaballs.new('meta_tile')
+    meta_object = bpy.data.objects.new('meta_tile', meta_skeleton)
+    bpy.context.scene.collection.objects.link(meta_object)
+    meta_skeleton.resolution = resolution
+
+    # Create all the elements in bulk
+    for _ in range(len(radii)):
+        meta_skeleton.elements.new()
+    meta_skeleton.elements.foreach_set('co', centers.astype(numpy.float32).ravel())
+    meta_skeleton.elements.foreach_set('radius', radii.astype(numpy.float32))
+
+    # Convert the meta object into a mesh
+    vmv.scene.ops.deselect_all()
+    meta_object.select_set(True)
+    bpy.context.view_layer.objects.active = meta_object
+    bpy.ops.object.convert(target='MESH')
+    mesh_object = bpy.context.view_layer.objects.active
+
+    # Crop the mesh to the tile
+    vmv.mesh.crop_mesh_object_to_bounds(mesh_object=mesh_object, p_min=p_min, p_max=p_max)
+
+    # Return the arrays of the mesh
+    return vmv.mesh.get_mesh_object_arrays(mesh_object)
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--") + 1:]
+
+    # Parse the arguments of the tile
+    parser = argparse.ArgumentParser(description='Meshes a single tile of a meta object')
+    parser.add_argument('--tile', action='store', required=True,
+                        help='An .npz file with the meta elements and the bounds of the tile')
+    parser.add_argument('--output', action='store', required=True,
+                        help='An .npz file where the mesh of the tile will be written')
+    arguments = parser.parse_args()
+
+    # Load the tile
+    tile = numpy.load(arguments.tile)
+
+    # Mesh the tile
+    vertices, loops, loops_totals = mesh_meta_tile(
+        centers=tile['centers'], radii=tile['radii'], resolution=float(tile['resolution']),
+        p_min=tile['p_min'], p_max=tile['p_max'])
+
+    # Write the mesh of the tile
+    numpy.savez(arguments.output, vertices=vertices, loops=loops, loops_totals=loops_totals)
@@ -30,6 +30,7 @@ for import_path in import_paths:
 
 # Internal imports
 import vmv
+import vmv.analysis
 import vmv.builders
 import vmv.consts
 import vmv.enums
@@ -53,25 +54,31 @@ def analyze_morphology_skeleton(cli_morphology,
         System options parsed from the command line interface (CLI).
     """
 
-    # Register the analysis components, apply the kernel functions and update the UI
+    # Header
+    vmv.logger.header('Analyzing morphology')
+
+    # Analyze the morphology
     morphology_analysis_flag, analysis_string = vmv.analysis.analyze_morphology(cli_morphology)
 
-    print('Done')
-    # Export the analysis result 
+    # Export the analysis result
     if morphology_analysis_flag:
-        
+
         # Create the analysis directory if it does not exist
         if not vmv.file.ops.path_exists(cli_options.io.analysis_directory):
-            vmv.file.ops.vmv.file.ops.create_output_tree(cli_options.io.output_directory)
+            vmv.file.ops.create_output_tree(cli_options.io.output_directory)
 
         # Export the analysis results
-        #vmv.interface.ui.export_analysis_results(
-        #    morphology=cli_morphology, directory=cli_options.io.analysis_directory)
+        with open('%s/%s.txt' % (cli_options.io.analysis_directory,
+                                 cli_options.morphology.label), 'w') as analysis_file:
+            analysis_file.write(analysis_string)
 
     else:
         vmv.logger.log('ERROR: Cannot analyze the morphology file [%s]' %
                        cli_options.morphology.label)
 
+    # Return the analysis flag
+    return morphology_analysis_flag
+
 
 ####################################################################################################
 # @ Run the main function if invoked from the command line.
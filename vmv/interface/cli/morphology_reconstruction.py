@@ -100,6 +100,112 @@ def build_skeleton(cli_morphology,
         return False
 
 
+####################################################################################################
+# @export_vascular_morphology
+####################################################################################################
+def export_vascular_morphology(cli_morphology,
+                               cli_options):
+    """Exports the reconstructed morphology skeleton to a .BLEND file.
+
+    :param cli_morphology:
+        The morphology loaded from the command line interface (CLI).
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    """
+
+    # Export the morphology to a .BLEND file, None indicates all components the scene
+    vmv.file.export_mesh_object(
+        None, cli_options.io.morphologies_directory, cli_options.morphology.label,
+        vmv.enums.Meshing.ExportFormat.BLEND)
+
+
+####################################################################################################
+# @render_vascular_morphology_to_static_frame
+####################################################################################################
+def render_vascular_morphology_to_static_frame(cli_morphology,
+                                               cli_options):
+    """Renders a static frame of the reconstructed morphology skeleton.
+
+    :param cli_morphology:
+        The morphology loaded from the command line interface (CLI).
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    :return:
+        True if the image is rendered, otherwise False.
+    """
+
+    # Render at a specific resolution
+    if cli_options.morphology.resolution_basis == \
+            vmv.enums.Rendering.Resolution.FIXED_RESOLUTION:
+        vmv.rendering.render(
+            bounding_box=cli_morphology.bounding_box,
+            camera_view=cli_options.morphology.camera_view,
+            camera_projection=cli_options.morphology.camera_projection,
+            image_resolution=cli_options.morphology.full_view_resolution,
+            image_name='MORPHOLOGY_FRONT_%s' % cli_morphology.name,
+            image_directory=cli_options.io.images_directory)
+        return True
+
+    # Render at a specific scale factor
+    else:
+        return vmv.rendering.render_to_scale(
+            bounding_box=cli_morphology.bounding_box,
+            camera_view=cli_options.morphology.camera_view,
+            image_scale_factor=cli_options.morphology.resolution_scale_factor,
+            image_name='MORPHOLOGY_FRONT_%s' % cli_morphology.name,
+            image_directory=cli_options.io.images_directory,
+            tile_size=cli_options.morphology.rendering_tile_size,
+            number_workers=cli_options.morphology.rendering_workers)
+
+
+####################################################################################################
+# @render_vascular_morphology_360
+####################################################################################################
+def render_vascular_morphology_360(cli_morphology,
+                                   cli_options):
+    """Renders a 360 sequence of the reconstructed morphology skeleton.
+
+    :param cli_morphology:
+        The morphology loaded from the command line interface (CLI).
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    :return:
+        True if all the frames were rendered, otherwise False.
+    """
+
+    # Create the sequences directory if it does not exist
+    if not vmv.file.ops.path_exists(cli_options.io.sequences_directory):
+        vmv.file.ops.create_output_tree(cli_options.io.output_directory)
+
+    # Compute a 360 bounding box to fit the skeleton
+    bounding_box = vmv.bbox.compute_scene_bounding_box_for_curves()
+    bounding_box_360 = vmv.bbox.compute_360_bounding_box(bounding_box, bounding_box.center)
+
+    # Stretch the bounding box by few microns
+    bounding_box_360.extend_bbox(delta=vmv.consts.Image.GAP_DELTA)
+
+    # Create a specific directory for this morphology, the existing frames are kept to resume
+    output_directory = '%s/%s_morphology_360' % (
+        cli_options.io.sequences_directory, cli_options.morphology.label)
+    if not vmv.file.ops.path_exists(output_directory):
+        vmv.file.ops.create_directory(output_directory)
+
+    # Render at a specific scale factor, otherwise at a specific resolution
+    image_scale_factor = None
+    if cli_options.morphology.resolution_basis == vmv.enums.Rendering.Resolution.TO_SCALE:
+        image_scale_factor = cli_options.morphology.resolution_scale_factor
+
+    # Render the sequence, split across the workers if more than one is given
+    sequence_renderer = vmv.rendering.SequenceRenderer(
+        scene_objects=vmv.scene.get_list_of_curves_in_scene(),
+        bounding_box=bounding_box_360,
+        output_directory=output_directory,
+        image_resolution=cli_options.morphology.full_view_resolution,
+        image_scale_factor=image_scale_factor,
+        number_workers=cli_options.morphology.rendering_workers)
+    return sequence_renderer.render()
+
+
 ####################################################################################################
 # @reconstruct_vascular_morphology
 ####################################################################################################
@@ -125,39 +231,16 @@ def reconstruct_vascular_morphology(cli_morphology,
 
     # Export to .BLEND file
     if cli_options.morphology.export_blend:
-
-        # Export the morphology to a .BLEND file, None indicates all components the scene
-        vmv.file.export_mesh_object(
-            None, cli_options.io.morphologies_directory, cli_morphology.label,
-            blend=cli_options.morphology.export_blend)
+        export_vascular_morphology(cli_morphology=cli_morphology, cli_options=cli_options)
 
     # Render a static image of the reconstructed morphology skeleton
     if cli_options.morphology.render:
-
-        # Render at a specific resolution
-        if cli_options.morphology.resolution_basis == \
-                vmv.enums.Rendering.Resolution.FIXED_RESOLUTION:
-            vmv.rendering.render(
-                bounding_box=cli_morphology.bounding_box,
-                camera_view=cli_options.morphology.camera_view,
-                camera_projection=cli_options.morphology.camera_projection,
-                image_resolution=cli_options.morphology.full_view_resolution,
-                image_name='MORPHOLOGY_FRONT_%s' % cli_morphology.name,
-                image_directory=cli_options.io.images_directory)
-
-        # Render at a specific scale factor
-        else:
-            vmv.rendering.render_to_scale(
-                bounding_box=cli_morphology.bounding_box,
-                camera_view=cli_options.morphology.camera_view,
-                image_scale_factor=cli_options.morphology.resolution_scale_factor,
-                image_name='MORPHOLOGY_FRONT_%s' % cli_morphology.name,
-                image_directory=vmv.interface.options.io.images_directory)
+        render_vascular_morphology_to_static_frame(
+            cli_morphology=cli_morphology, cli_options=cli_options)
 
     # Render a 360 sequence of the reconstructed morphology skeleton
     if cli_options.morphology.render_360:
-        # TODO: implement this option
-        pass
+        render_vascular_morphology_360(cli_morphology=cli_morphology, cli_options=cli_options)
 
 
 ####################################################################################################
@@ -0,0 +1,274 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+import os
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['vmv']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Internal imports
+import vmv
+import vmv.file
+import vmv.interface
+import vmv.options
+import vmv.scene
+import vmv.utilities
+from vmv.interface.cli import morphology_analysis
+from vmv.interface.cli import morphology_reconstruction
+from vmv.interface.cli import mesh_reconstruction
+
+
+####################################################################################################
+# @run_pipeline_stage
+####################################################################################################
+def run_pipeline_stage(stage_name,
+                       stage_function,
+                       stages_timings,
+                       **stage_arguments):
+    """Runs a single stage of the pipeline and records how long it took.
+
+    :param stage_name:
+        The name of the stage, used in the log and in the timings report.
+    :param stage_function:
+        The function that runs the stage.
+    :param stages_timings:
+        A list of (stage name, duration) tuples where the timing of the stage is appended.
+    :param stage_arguments:
+        The arguments that are given to the stage function.
+    :return:
+        The result of the stage function.
+    """
+
+    # Header
+    vmv.logger.header(stage_name)
+
+    # Run the stage
+    stage_timer = vmv.utilities.Timer()
+    stage_timer.start()
+    result = stage_function(**stage_arguments)
+    stage_timer.end()
+
+    # Record the timing of the stage
+    stages_timings.append((stage_name, stage_timer.duration()))
+    vmv.logger.info('%s done in [%f] seconds' % (stage_name, stage_timer.duration()))
+
+    # Return the result of the stage
+    return result
+
+
+####################################################################################################
+# @load_morphology
+####################################################################################################
+def load_morphology(cli_options):
+    """Loads the morphology file once for all the stages of the pipeline.
+
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    :return:
+        The loaded morphology, or None if the file could not be loaded.
+    """
+
+    # Read the morphology file
+    loading_flag, cli_morphology = vmv.file.read_morphology_from_file(options=cli_options)
+
+    # Return the morphology if loaded
+    return cli_morphology if loading_flag else None
+
+
+####################################################################################################
+# @hide_skeleton_from_rendering
+####################################################################################################
+def hide_skeleton_from_rendering():
+    """Hides the reconstructed skeleton from the renderings of the mesh. The skeleton is kept in
+    the scene to be exported with the scene if requested.
+    """
+
+    # Hide all the curves in the scene
+    for skeleton_object in vmv.scene.get_list_of_curves_in_scene():
+        skeleton_object.hide_render = True
+
+
+####################################################################################################
+# @run_pipeline
+####################################################################################################
+def run_pipeline(cli_options):
+    """Loads the morphology once and runs all the requested stages in sequence in this Blender
+    session: analysis, skeleton reconstruction, rendering, mesh reconstruction and export.
+
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    :return:
+        A tuple of (True if all the stages succeeded, otherwise False, a list of (stage name,
+        duration) tuples). A stage fails if it returns False, and the stages that depend on a
+        failed stage are skipped.
+    """
+
+    # The timings and the failed stages
+    stages_timings = list()
+    failed_stages = list()
+
+    # Load the morphology
+    cli_morphology = run_pipeline_stage(
+        'Loading morphology', load_morphology, stages_timings, cli_options=cli_options)
+    if cli_morphology is None:
+        vmv.logger.log('ERROR: Cannot load the morphology file [%s]. Terminating!' %
+                       str(cli_options.morphology.morphology_file_path))
+        return False, stages_timings
+
+    # All the stages share the same morphology and scene
+    morphology_arguments = {'cli_morphology': cli_morphology, 'cli_options': cli_options}
+
+    # Start from a clean scene
+    vmv.scene.ops.clear_scene()
+
+    # Morphology analysis
+    if cli_options.morphology.analyze:
+        if not run_pipeline_stage('Morphology analysis',
+                                  morphology_analysis.analyze_morphology_skeleton,
+                                  stages_timings, **morphology_arguments):
+            failed_stages.append('Morphology analysis')
+
+    # Skeleton reconstruction, required for any of the morphology outputs
+    if cli_options.morphology.reconstruct_morphology or cli_options.morphology.render or \
+       cli_options.morphology.render_360 or cli_options.morphology.export_blend:
+
+        # The skeleton outputs
+        stages = list()
+        if cli_options.morphology.export_blend:
+            stages.append(('Skeleton export',
+                           morphology_reconstruction.export_vascular_morphology))
+        if cli_options.morphology.render:
+            stages.append(('Skeleton rendering',
+                           morphology_reconstruction.render_vascular_morphology_to_static_frame))
+        if cli_options.morphology.render_360:
+            stages.append(('Skeleton 360 rendering',
+                           morphology_reconstruction.render_vascular_morphology_360))
+
+        # Build the skeleton, the outputs are skipped if it is not built
+        if not run_pipeline_stage('Skeleton reconstruction',
+                                  morphology_reconstruction.build_skeleton,
+                                  stages_timings, **morphology_arguments):
+            vmv.logger.log('ERROR: The morphology skeleton was NOT built')
+            failed_stages.append('Skeleton reconstruction')
+
+        # Export and render the skeleton
+        else:
+            for stage_name, stage_function in stages:
+                if run_pipeline_stage(stage_name, stage_function, stages_timings,
+                                      **morphology_arguments) is False:
+                    failed_stages.append(stage_name)
+
+    # Mesh reconstruction, required for any of the mesh outputs
+    if cli_options.mesh.reconstruct_vascular_mesh or cli_options.mesh.render or \
+       cli_options.mesh.render_360 or cli_options.mesh.export_ply or \
+       cli_options.mesh.export_obj or cli_options.mesh.export_stl or \
+       cli_options.mesh.export_blend:
+
+        # The skeleton, if any, is not rendered with the mesh
+        hide_skeleton_from_rendering()
+
+        # The mesh outputs
+        stages = list()
+        if cli_options.mesh.render:
+            stages.append(('Mesh rendering',
+                           mesh_reconstruction.render_vascular_mesh_to_static_frame))
+        if cli_options.mesh.render_360:
+            stages.append(('Mesh 360 rendering', mesh_reconstruction.render_vascular_mesh_360))
+        if cli_options.mesh.export_ply or cli_options.mesh.export_obj or \
+           cli_options.mesh.export_stl or cli_options.mesh.export_blend:
+            stages.append(('Mesh export', mesh_reconstruction.export_neuron_mesh))
+
+        # Build the mesh in the same scene, the outputs are skipped if it is not built
+        if not run_pipeline_stage('Mesh reconstruction',
+                                  mesh_reconstruction.reconstruct_vascular_mesh,
+                                  stages_timings, clear_scene=False, **morphology_arguments):
+            vmv.logger.log('ERROR: The vascular mesh was NOT built')
+            failed_stages.append('Mesh reconstruction')
+
+        # Render and export the mesh
+        else:
+            for stage_name, stage_function in stages:
+                if run_pipeline_stage(stage_name, stage_function, stages_timings,
+                                      **morphology_arguments) is False:
+                    failed_stages.append(stage_name)
+
+    # Report the failed stages
+    for stage_name in failed_stages:
+        vmv.logger.log('ERROR: The stage [%s] FAILED' % stage_name)
+
+    # Return the status and the timings of the stages
+    return len(failed_stages) == 0, stages_timings
+
+
+####################################################################################################
+# @report_pipeline_timings
+####################################################################################################
+def report_pipeline_timings(stages_timings):
+    """Reports the timings of the stages of the pipeline.
+
+    :param stages_timings:
+        A list of (stage name, duration) tuples.
+    """
+
+    # Header
+    vmv.logger.header('Pipeline timings')
+
+    # Report every stage and the total
+    for stage_name, duration in stages_timings:
+        vmv.logger.info('%s: [%f] seconds' % (stage_name, duration))
+    vmv.logger.info('Total: [%f] seconds' % sum(duration for _, duration in stages_timings))
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = [args[0]] + args[args.index("--") + 1:]
+
+    # Parse the command line arguments, filter them and report the errors
+    arguments = vmv.interface.cli.parse_command_line_arguments()
+
+    # Verify the output directory before screwing things !
+    if not vmv.file.ops.path_exists(arguments.output_directory):
+        vmv.logger.log('ERROR: Please set the output directory to a valid path')
+        exit(0)
+    else:
+        print('      * Output will be generated to [%s]' % arguments.output_directory)
+
+    # Only morphology files are supported
+    if arguments.input != 'file':
+        vmv.logger.log('ERROR: Invalid input option')
+        exit(0)
+
+    # Get the options from the CLI arguments
+    cli_options = vmv.options.VessMorphoVisOptions()
+
+    # Convert the CLI arguments to system options
+    cli_options.consume_arguments(arguments=arguments)
+
+    # Run the pipeline and report the timings, the exit code is 1 if any of the stages failed
+    pipeline_status, pipeline_timings = run_pipeline(cli_options=cli_options)
+    report_pipeline_timings(pipeline_timings)
+    if not pipeline_status:
+        exit(1)
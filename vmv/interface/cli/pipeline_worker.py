@@ -0,0 +1,124 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+import json
+import socket
+import argparse
+import traceback
+import os
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['vmv']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Blender imports
+import bpy
+
+# Internal imports
+import vmv
+import vmv.interface
+import vmv.options
+from vmv.interface.cli import pipeline
+
+
+####################################################################################################
+# @reset_blender_session
+####################################################################################################
+def reset_blender_session():
+    """Reloads the startup file of Blender, as a new Blender process does. This resets the scene,
+    the render and the world settings, and removes the images, the materials and any other data
+    that a previous job left in the session.
+    """
+
+    # Reload the startup file, the scripts are not reloaded and vmv stays imported
+    bpy.ops.wm.read_homefile(load_ui=False)
+
+
+####################################################################################################
+# @run_job
+####################################################################################################
+def run_job(job):
+    """Runs the pipeline of a single job in a clean Blender session, so the outputs are the same
+    as if the job was run in a new Blender process.
+
+    :param job:
+        A dictionary with the 'name' of the job and the CLI 'arguments' of the pipeline.
+    :return:
+        A dictionary with the 'exit_code', the 'timings' of the stages and the 'error', if any.
+    """
+
+    # Report the job in the log of the worker
+    vmv.logger.header('Job [%s]' % job['name'])
+
+    try:
+
+        # Start from the state of a new Blender process
+        reset_blender_session()
+
+        # Parse the arguments of the job
+        arguments = vmv.interface.cli.parse_command_line_arguments(job['arguments'])
+
+        # Convert the arguments to system options
+        cli_options = vmv.options.VessMorphoVisOptions()
+        cli_options.consume_arguments(arguments=arguments)
+
+        # Run the pipeline, which starts from a clean scene
+        pipeline_status, stages_timings = pipeline.run_pipeline(cli_options=cli_options)
+        pipeline.report_pipeline_timings(stages_timings)
+        if not pipeline_status:
+            return {'exit_code': 1, 'error': 'Some stages of the pipeline failed, see the log',
+                    'timings': stages_timings}
+
+        # Done
+        return {'exit_code': 0, 'error': None, 'timings': stages_timings}
+
+    # Any failure, including an exit() in one of the stages, fails this job only
+    except (Exception, SystemExit):
+        traceback.print_exc()
+        return {'exit_code': 1, 'error': traceback.format_exc(), 'timings': list()}
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = [args[0]] + args[args.index("--") + 1:]
+
+    # The port of the pool
+    parser = argparse.ArgumentParser(description='VessMorphoVis persistent pipeline worker')
+    parser.add_argument('--port', action='store', type=int, required=True,
+                        help='The local port where the pool listens to this worker')
+    worker_arguments = parser.parse_args()
+
+    # Connect to the pool
+    connection = socket.create_connection(('127.0.0.1', worker_arguments.port))
+    stream = connection.makefile('rw')
+
+    # Run the jobs until the pool closes the connection
+    for line in stream:
+        result = run_job(json.loads(line))
+        stream.write(json.dumps(result) + '\n')
+        stream.flush()
+
+    # Done
+    connection.close()
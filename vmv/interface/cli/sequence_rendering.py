@@ -0,0 +1,128 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+import argparse
+
+# Blender imports
+import bpy
+from mathutils import Vector
+
+import os
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['vmv']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Internal imports
+import vmv
+import vmv.bbox
+import vmv.consts
+import vmv.rendering
+
+
+####################################################################################################
+# @parse_worker_arguments
+####################################################################################################
+def parse_worker_arguments():
+    """Parses the arguments that are given to a sequence rendering worker by the SequenceRenderer.
+
+    :return:
+        The parsed arguments.
+    """
+
+    # Create an argument parser
+    parser = argparse.ArgumentParser(description='VessMorphoVis sequence rendering worker')
+
+    # The directory of the sequence
+    parser.add_argument('--output-directory', action='store', required=True,
+                        help='The directory where the frames are written')
+
+    # The frames of this worker
+    parser.add_argument('--frames', action='store', required=True,
+                        help='A comma-separated list of the frames rendered by this worker')
+
+    # The number of frames in a full rotation
+    parser.add_argument('--number-frames', action='store', type=int, default=360,
+                        help='The number of frames in a full rotation')
+
+    # The rotation pivot
+    parser.add_argument('--pivot', action='store',
+                        default=vmv.rendering.ROTATION_PIVOT_NAME,
+                        help='The name of the empty that the rendered objects are parented to')
+
+    # The bounding box of the sequence
+    parser.add_argument('--bounding-box', action='store', type=float, nargs=6, required=True,
+                        help='The 360 bounding box of the sequence: x0 y0 z0 x1 y1 z1')
+
+    # The resolution of the frames
+    parser.add_argument('--image-resolution', action='store', type=int,
+                        default=vmv.consts.Image.DEFAULT_RESOLUTION,
+                        help='The resolution of the frames')
+
+    # The scale factor of the frames, if rendered to scale
+    parser.add_argument('--image-scale-factor', action='store', type=float, default=None,
+                        help='The scale factor of the frames, if rendered to scale')
+
+    # Parse the arguments
+    return parser.parse_args()
+
+
+####################################################################################################
+# @render_frames
+####################################################################################################
+def render_frames(arguments):
+    """Renders the frames of the worker that are not rendered yet, in the scene that was loaded
+    from the .blend file given to Blender.
+
+    :param arguments:
+        The arguments of the worker.
+    """
+
+    # The rotation pivot that was saved with the scene
+    pivot = bpy.data.objects[arguments.pivot]
+
+    # The bounding box of the sequence
+    bounding_box = vmv.bbox.BoundingBox(
+        p_min=Vector(arguments.bounding_box[:3]), p_max=Vector(arguments.bounding_box[3:]))
+
+    # Create the camera once for all the frames
+    camera = vmv.rendering.create_sequence_camera(
+        bounding_box=bounding_box, image_resolution=arguments.image_resolution,
+        image_scale_factor=arguments.image_scale_factor)
+
+    # Render the frames that do not exist
+    frames = [int(frame) for frame in arguments.frames.split(',')]
+    for frame in vmv.rendering.get_missing_frames(arguments.output_directory, frames):
+        vmv.rendering.render_frame_with_rotation_pivot(
+            camera=camera, pivot=pivot, frame=frame, output_directory=arguments.output_directory,
+            number_frames=arguments.number_frames)
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = [args[0]] + args[args.index("--") + 1:]
+
+    # Render the frames of this worker
+    render_frames(parse_worker_arguments())
@@ -0,0 +1,88 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+import argparse
+
+# Blender imports
+import bpy
+
+import os
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['vmv']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Internal imports
+import vmv
+import vmv.consts
+import vmv.rendering
+
+
+####################################################################################################
+# @parse_worker_arguments
+####################################################################################################
+def parse_worker_arguments():
+    """Parses the arguments that are given to a tile rendering worker by render_tiles_to_scale.
+
+    :return:
+        The parsed arguments.
+    """
+
+    # Create an argument parser
+    parser = argparse.ArgumentParser(description='VessMorphoVis tile rendering worker')
+
+    # The directory of the tiles
+    parser.add_argument('--tiles-directory', action='store', required=True,
+                        help='The directory where the tiles are written')
+
+    # The tiles of this worker
+    parser.add_argument('--tiles', action='store', required=True,
+                        help='A comma-separated list of the tiles rendered by this worker')
+
+    # The size of the tiles
+    parser.add_argument('--tile-size', action='store', type=int,
+                        default=vmv.consts.Image.DEFAULT_TILE_SIZE,
+                        help='The maximum width and height of a tile in pixels')
+
+    # Parse the arguments
+    return parser.parse_args()
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = [args[0]] + args[args.index("--") + 1:]
+
+    # Parse the arguments
+    arguments = parse_worker_arguments()
+
+    # The tiles of the image, where the camera and the resolution are saved with the scene
+    tiles = vmv.rendering.compute_image_tiles(
+        bpy.context.scene.render.resolution_x, bpy.context.scene.render.resolution_y,
+        arguments.tile_size)
+
+    # Render the tiles of this worker
+    vmv.rendering.render_tiles(
+        tiles=tiles, tile_indices=[int(tile) for tile in arguments.tiles.split(',')],
+        tiles_directory=arguments.tiles_directory)
@@ -0,0 +1,378 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import json
+import time
+import queue
+import socket
+import threading
+import subprocess
+
+# The time to wait for a worker to start Blender and connect to the pool, in seconds
+WORKER_CONNECTION_TIMEOUT = 300.0
+
+
+####################################################################################################
+# @PersistentWorker
+####################################################################################################
+class PersistentWorker:
+    """A headless Blender process that imports vmv once and runs the jobs that are sent to it over
+    a local socket, one JSON message per line, until it is closed.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 blender,
+                 worker_id,
+                 log_file):
+        """Constructor
+
+        :param blender:
+            The path to the Blender executable.
+        :param worker_id:
+            The index of the worker in the pool.
+        :param log_file:
+            The path to the log file of the worker.
+        """
+
+        # The worker data
+        self.blender = blender
+        self.worker_id = worker_id
+        self.log_file = log_file
+
+        # The process, its log and its connection, while running
+        self.process = None
+        self.log_handle = None
+        self.connection = None
+        self.stream = None
+
+    ################################################################################################
+    # @start
+    ################################################################################################
+    def start(self):
+        """Starts the Blender process and waits until it connects to the pool.
+
+        :return:
+            True if the worker is connected, otherwise False.
+        """
+
+        # Every worker has its own listening socket, so its connection cannot be mixed up
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        server.settimeout(1.0)
+
+        # The worker script
+        worker_script = '%s/pipeline_worker.py' % os.path.dirname(os.path.realpath(__file__))
+
+        # Start Blender, the log file is appended if the worker is restarted
+        self.log_handle = open(self.log_file, 'a')
+        try:
+            self.process = subprocess.Popen(
+                [self.blender, '-b', '--verbose', '0', '--python', worker_script, '--',
+                 '--port', str(server.getsockname()[1])],
+                stdout=self.log_handle, stderr=subprocess.STDOUT)
+
+        # Blender could not be started, e.g. a missing or an invalid executable
+        except (OSError, subprocess.SubprocessError) as error:
+            self.log_handle.write('ERROR: Blender [%s] could NOT be started: %s\n' %
+                                  (self.blender, error))
+            server.close()
+            self.stop()
+            return False
+
+        # Wait for the connection, unless the process dies
+        starting_time = time.time()
+        while self.connection is None:
+            try:
+                self.connection, _ = server.accept()
+            except socket.timeout:
+                if self.process.poll() is not None or \
+                        time.time() - starting_time > WORKER_CONNECTION_TIMEOUT:
+                    break
+        server.close()
+
+        # Failed to connect
+        if self.connection is None:
+            self.stop()
+            return False
+
+        # Exchange the messages line by line
+        self.connection.settimeout(None)
+        self.stream = self.connection.makefile('rw')
+        return True
+
+    ################################################################################################
+    # @run_job
+    ################################################################################################
+    def run_job(self,
+                job):
+        """Sends a job to the worker and waits for its result.
+
+        :param job:
+            A dictionary with the 'name' of the job and the CLI 'arguments' of the pipeline.
+        :return:
+            A dictionary with the result of the job, or None if the worker died.
+        """
+
+        # Send the job
+        try:
+            self.stream.write(json.dumps(job) + '\n')
+            self.stream.flush()
+
+            # Wait for the result
+            line = self.stream.readline()
+
+        # The connection is broken
+        except (OSError, ValueError):
+            return None
+
+        # The worker died during the job
+        if len(line) == 0:
+            return None
+
+        # Return the result
+        return json.loads(line)
+
+    ################################################################################################
+    # @stop
+    ################################################################################################
+    def stop(self):
+        """Closes the connection, which terminates the worker, and waits for the process.
+        """
+
+        # Close the connection
+        if self.stream is not None:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+            self.stream = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+        # Wait for the process, or kill it if it does not exit
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+        # Close the log
+        if self.log_handle is not None:
+            self.log_handle.close()
+            self.log_handle = None
+
+
+####################################################################################################
+# @PersistentWorkerPool
+####################################################################################################
+class PersistentWorkerPool:
+    """A pool of persistent Blender workers. The Blender startup and the import of vmv are paid once
+    per worker, then the jobs are dispatched to the idle workers. If a worker dies during a job,
+    the job is reported as failed and the worker is restarted.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 blender,
+                 number_workers,
+                 logs_directory):
+        """Constructor
+
+        :param blender:
+            The path to the Blender executable.
+        :param number_workers:
+            The number of workers. If 0 or None, the number of cores.
+        :param logs_directory:
+            The directory where the logs of the workers are written.
+        """
+
+        # The pool data
+        self.blender = blender
+        self.number_workers = number_workers if number_workers else (os.cpu_count() or 1)
+        self.logs_directory = logs_directory
+
+        # The jobs and their results, in the same order
+        self.jobs = list()
+        self.results = list()
+
+        # The time when the jobs were started and finished
+        self.start_time = None
+        self.end_time = None
+
+    ################################################################################################
+    # @add_job
+    ################################################################################################
+    def add_job(self,
+                name,
+                morphology_file,
+                arguments):
+        """Adds a job to the pool.
+
+        :param name:
+            The name of the job, the morphology label.
+        :param morphology_file:
+            The path to the morphology file.
+        :param arguments:
+            A list of the CLI arguments of the pipeline for this file.
+        """
+
+        # Add the job
+        self.jobs.append({'name': name, 'morphology_file': morphology_file,
+                          'arguments': arguments})
+
+    ################################################################################################
+    # @run_worker
+    ################################################################################################
+    def run_worker(self,
+                   worker_id,
+                   jobs_queue):
+        """Runs the jobs in the queue on a single worker until the queue is empty.
+
+        :param worker_id:
+            The index of the worker.
+        :param jobs_queue:
+            A queue of (index, job) tuples that is shared by all the workers.
+        """
+
+        # Start the worker
+        worker = PersistentWorker(
+            self.blender, worker_id, '%s/worker_%d.log' % (self.logs_directory, worker_id))
+        connected = worker.start()
+
+        # Run the jobs
+        while True:
+
+            # Get the next job
+            try:
+                index, job = jobs_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            # Run the job, if the worker is alive
+            starting_time = time.time()
+            result = worker.run_job(job) if connected else None
+            runtime = time.time() - starting_time
+
+            # The worker could not be started or died, report the job and restart the worker
+            if result is None:
+                result = {'exit_code': -1, 'error': 'The worker [%d] died' % worker_id
+                          if connected else 'The worker [%d] could NOT be started' % worker_id,
+                          'timings': list()}
+                worker.stop()
+                connected = worker.start()
+
+            # Keep the result
+            result.update({'name': job['name'], 'morphology_file': job['morphology_file'],
+                           'runtime': runtime, 'worker': worker_id,
+                           'log_file': worker.log_file})
+            self.results[index] = result
+            print('FINISHED: [%s] with exit code [%d] in [%f] seconds' %
+                  (job['name'], result['exit_code'], runtime))
+
+        # Stop the worker
+        worker.stop()
+
+    ################################################################################################
+    # @run
+    ################################################################################################
+    def run(self):
+        """Runs all the jobs on the workers and waits until they are finished.
+
+        :return:
+            The number of failed jobs.
+        """
+
+        # The queue of the jobs
+        jobs_queue = queue.Queue()
+        for index, job in enumerate(self.jobs):
+            jobs_queue.put((index, job))
+        self.results = [None] * len(self.jobs)
+
+        # A thread per worker
+        self.start_time = time.time()
+        threads = [threading.Thread(target=self.run_worker, args=(worker_id, jobs_queue))
+                   for worker_id in range(min(self.number_workers, len(self.jobs)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.end_time = time.time()
+
+        # Return the number of failed jobs
+        return self.get_number_failed_jobs()
+
+    ################################################################################################
+    # @get_number_failed_jobs
+    ################################################################################################
+    def get_number_failed_jobs(self):
+        """Gets the number of the jobs that failed, where a job without a result was not run and
+        is counted as failed.
+
+        :return:
+            The number of failed jobs.
+        """
+
+        # Count the failed jobs
+        return len([result for result in self.results
+                    if result is None or result['exit_code'] != 0])
+
+    ################################################################################################
+    # @get_summary
+    ################################################################################################
+    def get_summary(self):
+        """Gets the summary of all the jobs with their exit codes and runtimes.
+
+        :return:
+            A dictionary of the summary, that is written to the manifest.
+        """
+
+        # Return the summary
+        return {'number_workers': self.number_workers,
+                'number_jobs': len(self.jobs),
+                'number_failed_jobs': self.get_number_failed_jobs(),
+                'runtime': self.end_time - self.start_time
+                if self.start_time is not None and self.end_time is not None else None,
+                'jobs': [result if result is not None else
+                         {'name': job['name'], 'morphology_file': job['morphology_file'],
+                          'exit_code': -1, 'error': 'The job was NOT run', 'timings': list()}
+                         for job, result in zip(self.jobs, self.results)]}
+
+    ################################################################################################
+    # @write_manifest
+    ################################################################################################
+    def write_manifest(self,
+                       manifest_file):
+        """Writes a summary manifest of all the jobs with their exit codes and runtimes.
+
+        :param manifest_file:
+            The path to the .json manifest file.
+        """
+
+        # Write the manifest
+        with open(manifest_file, 'w') as manifest_handle:
+            json.dump(self.get_summary(), manifest_handle, indent=4)
@@ -212,67 +212,63 @@ class VMVAnalyzeMorphology(bpy.types.Operator):
         vmv.logger.header('Analyzing morphology')
         analysis_stated = time.time()
 
+        # The cached metrics of the morphology
+        metrics = vmv.interface.ui.ui_morphology.get_metrics()
+
         # Morphology total length
         vmv.logger.info('Total length')
-        morphology_total_length = vmv.analysis.compute_total_morphology_length(
-            vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.MorphologyTotalLength = morphology_total_length
+        context.scene.MorphologyTotalLength = float(metrics.sections_lengths.sum())
 
         # Total number of samples
         vmv.logger.info('Samples')
-        total_number_samples = vmv.analysis.compute_total_number_samples_from_sections_list(
-            vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.NumberSamples = total_number_samples
+        context.scene.NumberSamples = metrics.get_number_samples()
 
         # Total number of segments
         vmv.logger.info('Segments')
-        context.scene.NumberSegments = total_number_samples - 1
+        context.scene.NumberSegments = metrics.get_number_segments()
 
         # Total number of sections
         vmv.logger.info('Sections')
-        total_number_sections = vmv.analysis.compute_total_number_sections(
-            vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.NumberSections = total_number_sections
+        context.scene.NumberSections = len(metrics.sections_number_samples)
 
         # Sections with two samples
         vmv.logger.info('Sections with two samples')
-        number_section_with_two_samples = vmv.analysis.compute_number_of_sections_with_two_samples(
-            vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.NumberSectionsWithTwoSamples = number_section_with_two_samples
+        context.scene.NumberSectionsWithTwoSamples = \
+            int((metrics.sections_number_samples == 2).sum())
 
-        # Number of short sections
+        # Number of short sections, i.e. shorter than the sum of their terminal diameters
         vmv.logger.info('Short sections')
-        number_short_sections = vmv.analysis.compute_number_of_short_sections(
-            vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.NumberShortSections = number_short_sections
+        non_empty = metrics.sections_number_samples > 1
+        diameters_sums = 2.0 * (metrics.radii[metrics.offsets[:-1][non_empty]] +
+                                metrics.radii[metrics.offsets[1:][non_empty] - 1])
+        context.scene.NumberShortSections = \
+            int((metrics.sections_lengths[non_empty] < diameters_sums).sum())
 
         # Samples radius stats.
         vmv.logger.info('Radii')
-        minimum_sample_radius, maximum_sample_radius, average_sample_radius, zero_radii_sample = \
-            vmv.analysis.analyze_samples_radii(vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.MinimumSampleRadius = minimum_sample_radius
-        context.scene.MaximumSampleRadius = maximum_sample_radius
-        context.scene.AverageSampleRadius = average_sample_radius
-        context.scene.NumberZeroRadiusSamples = zero_radii_sample
+        context.scene.MinimumSampleRadius = float(metrics.radii.min())
+        context.scene.MaximumSampleRadius = float(metrics.radii.max())
+        context.scene.AverageSampleRadius = float(metrics.radii.mean())
+        context.scene.NumberZeroRadiusSamples = int((metrics.radii < 0.0001).sum())
 
         vmv.logger.info('Repair Zero-radii')
         vmv.analysis.correct_samples_with_zero_radii(vmv.interface.ui.ui_morphology.sections_list)
 
+        # The radii might have been updated
+        vmv.interface.ui.ui_morphology.invalidate_cached_data()
+        metrics = vmv.interface.ui.ui_morphology.get_metrics()
+
         # Segments length stats.
         vmv.logger.info('Segments lengths')
-        minimum_segment_length, maximum_segment_length, average_segment_length = \
-            vmv.analysis.analyze_segments_length(vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.MinimumSegmentLength = minimum_segment_length
-        context.scene.MaximumSegmentLength = maximum_segment_length
-        context.scene.AverageSegmentLength = average_segment_length
+        context.scene.MinimumSegmentLength = float(metrics.segments_lengths.min())
+        context.scene.MaximumSegmentLength = float(metrics.segments_lengths.max())
+        context.scene.AverageSegmentLength = float(metrics.segments_lengths.mean())
 
         # Section length stats.
         vmv.logger.info('Sections lengths')
-        minimum_section_length, maximum_section_length, average_section_length = \
-            vmv.analysis.analyze_sections_length(vmv.interface.ui.ui_morphology.sections_list)
-        context.scene.MinimumSectionLength = minimum_section_length
-        context.scene.MaximumSectionLength = maximum_section_length
-        context.scene.AverageSectionLength = average_section_length
+        context.scene.MinimumSectionLength = float(metrics.sections_lengths.min())
+        context.scene.MaximumSectionLength = float(metrics.sections_lengths.max())
+        context.scene.AverageSectionLength = float(metrics.sections_lengths.mean())
 
         vmv.logger.info('Loops')
         number_loops = vmv.analysis.compute_number_of_loops(
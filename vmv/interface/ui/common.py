@@ -208,7 +208,9 @@ def render_morphology_image(panel_object,
             image_scale_factor=context_scene.MorphologyFrameScaleFactor,
             image_name='MORPHOLOGY_%s_%s' % (view_prefix, vmv.interface.options.morphology.label),
             image_directory=vmv.interface.options.io.images_directory,
-            keep_camera_in_scene=context_scene.KeepMeshCameras)
+            keep_camera_in_scene=context_scene.KeepMeshCameras,
+            tile_size=context_scene.MorphologyRenderingTileSize,
+            number_workers=context_scene.MorphologyRenderingWorkers)
 
     # Report the process termination in the UI
     panel_object.report({'INFO'}, 'Rendering Done')
@@ -282,7 +284,9 @@ def render_mesh_image(panel_object,
             camera_view=rendering_view,
             image_scale_factor=context_scene.MeshFrameScaleFactor,
             image_name='MESH_%s_%s' % (view_prefix, vmv.interface.options.morphology.label),
-            image_directory=vmv.interface.options.io.images_directory)
+            image_directory=vmv.interface.options.io.images_directory,
+            tile_size=context_scene.MeshRenderingTileSize,
+            number_workers=context_scene.MeshRenderingWorkers)
 
     # Report the process termination in the UI
     panel_object.report({'INFO'}, 'Rendering Done')
@@ -89,6 +89,20 @@ class VMVMeshingPanel(bpy.types.Panel):
             else:
                 meta_resolution_row.enabled = True
 
+            # Meta-ball tiles
+            meta_tiles_row = self.layout.row()
+            meta_tiles_row.prop(context.scene, 'MetaBallTiles', icon='MESH_GRID')
+            vmv.options.mesh.meta_tiles = context.scene.MetaBallTiles
+
+        # Implicit surface options
+        if context.scene.MeshingTechnique == vmv.enums.Meshing.Technique.IMPLICIT_SURFACE:
+
+            # Voxel size
+            implicit_voxel_size_row = self.layout.row()
+            implicit_voxel_size_row.prop(context.scene, 'ImplicitVoxelSize',
+                                         icon='OUTLINER_OB_EMPTY')
+            vmv.options.mesh.implicit_voxel_size = context.scene.ImplicitVoxelSize
+
         # Tessellation parameters
         tess_level_row = self.layout.row()
         tess_level_row.prop(context.scene, 'TessellateMesh')
@@ -207,6 +221,12 @@ class VMVMeshingPanel(bpy.types.Panel):
             scale_factor_row.prop(context.scene, 'MeshFrameScaleFactor')
             scale_factor_row.enabled = True
 
+            # Tiles option
+            tile_size_row = layout.row()
+            tile_size_row.label(text='Tiles:')
+            tile_size_row.prop(context.scene, 'MeshRenderingTileSize')
+            tile_size_row.prop(context.scene, 'MeshRenderingWorkers')
+
         # Rendering view column
         view_row = layout.column()
         view_row.prop(context.scene, 'MeshRenderingView', icon='AXIS_FRONT')
@@ -245,6 +265,7 @@ class VMVMeshingPanel(bpy.types.Panel):
         render_animation_row = layout.row()
         render_animation_row.label(text='Render Animation:', icon='CAMERA_DATA')
         render_animations_buttons_row = layout.row(align=True)
+        render_animations_buttons_row.prop(context.scene, 'MeshRenderingWorkers')
         render_animations_buttons_row.operator('render_mesh.360', icon='FORCE_MAGNETIC')
         render_animations_buttons_row.enabled = True
 
@@ -347,6 +368,11 @@ class VMVReconstructMesh(bpy.types.Operator):
             builder = vmv.builders.MetaBuilder(morphology=vmv.interface.ui.ui_morphology,
                                                options=vmv.interface.ui.options)
 
+        # Implicit surface builder
+        elif context.scene.MeshingTechnique == vmv.enums.Meshing.Technique.IMPLICIT_SURFACE:
+            builder = vmv.builders.ImplicitBuilder(
+                morphology=vmv.interface.ui.ui_morphology, options=vmv.interface.ui.options)
+
         # Using the piece-wise
         else:
             builder = vmv.builders.PolylineBuilder(
@@ -439,7 +465,9 @@ class VMVRenderMeshImage(bpy.types.Operator):
                 camera_view=vmv.options.mesh.camera_view,
                 image_scale_factor=context.scene.MeshFrameScaleFactor,
                 image_name=image_name,
-                image_directory=vmv.interface.options.io.images_directory)
+                image_directory=vmv.interface.options.io.images_directory,
+                tile_size=context.scene.MeshRenderingTileSize,
+                number_workers=context.scene.MeshRenderingWorkers)
 
         # Report the process termination in the UI
         self.report({'INFO'}, 'Rendering Morphology Done')
@@ -460,13 +488,9 @@ class VMVRenderMesh360(bpy.types.Operator):
 
     # Timer parameters
     event_timer = None
-    timer_limits = 0
-
-    # 360 bounding box
-    bounding_box_360 = None
 
-    # Output data
-    output_directory = None
+    # The renderer of the sequence
+    sequence_renderer = None
 
     ################################################################################################
     # @modal
@@ -475,18 +499,17 @@ class VMVRenderMesh360(bpy.types.Operator):
         """
         Threading and non-blocking handling.
 
-        :param context: Panel context.
-        :param event: A given event for the panel.
+        :param context:
+            Panel context.
+        :param event:
+            A given event for the panel.
         """
 
-        # Get a reference to the scene
-        scene = context.scene
+        # Cancelling event, the rendered frames are kept and skipped if the sequence is resumed
+        if event.type in {'RIGHTMOUSE', 'ESC'}:
 
-        # Cancelling event, if using right click or exceeding the time limit of the simulation
-        if event.type in {'RIGHTMOUSE', 'ESC'} or self.timer_limits > 360:
-
-            # Reset the timer limits
-            self.timer_limits = 0
+            # Stop the rendering
+            self.sequence_renderer.finish(cancel=True)
 
             # Refresh the panel context
             self.cancel(context)
@@ -494,46 +517,30 @@ class VMVRenderMesh360(bpy.types.Operator):
             # Done
             return {'FINISHED'}
 
-        # Timer event, where the function is executed here on a per-frame basis
+        # Timer event, where a frame is rendered, or the workers are checked
         if event.type == 'TIMER':
 
-            # Set the frame name
-            image_name = '%s/%s' % (
-                self.output_directory, '{0:05d}'.format(self.timer_limits))
-
-            # Render at a specific resolution
-            if context.scene.MeshRenderingResolution == \
-                    vmv.enums.Rendering.Resolution.FIXED_RESOLUTION:
+            # Render the next frame
+            done = self.sequence_renderer.step()
 
-                # Render the image
-                vmv.rendering.render_at_angle(
-                    scene_objects=vmv.get_list_of_meshes_in_scene(),
-                    angle=self.timer_limits,
-                    bounding_box=self.bounding_box_360,
-                    camera_view=vmv.enums.Rendering.View.FRONT_360,
-                    image_resolution=context.scene.MeshFrameResolution,
-                    image_name=image_name)
+            # Update the progress shell
+            progress = self.sequence_renderer.get_progress()
+            vmv.utilities.show_progress('Rendering', int(360 * progress), 360)
 
-            # Render at a specific scale factor
-            else:
+            # Update the progress bar
+            context.scene.MeshRenderingProgress = int(100 * progress)
 
-                # Render the image
-                vmv.rendering.render_at_angle_to_scale(
-                    scene_objects=vmv.get_list_of_meshes_in_scene(),
-                    angle=self.timer_limits,
-                    bounding_box=self.bounding_box_360,
-                    camera_view=vmv.enums.Rendering.View.FRONT_360,
-                    image_scale_factor=context.scene.MeshFrameScaleFactor,
-                    image_name=image_name)
+            # All the frames are rendered
+            if done:
 
-            # Update the progress shell
-            vmv.utilities.show_progress('Rendering', self.timer_limits, 360)
+                # Restore the scene
+                self.sequence_renderer.finish()
 
-            # Update the progress bar
-            context.scene.MeshRenderingProgress = int(100 * self.timer_limits / 360.0)
+                # Refresh the panel context
+                self.cancel(context)
 
-            # Upgrade the timer limits
-            self.timer_limits += 1
+                # Done
+                return {'FINISHED'}
 
         # Next frame
         return {'PASS_THROUGH'}
@@ -562,23 +569,43 @@ class VMVRenderMesh360(bpy.types.Operator):
             vmv.file.ops.clean_and_create_directory(
                 vmv.interface.options.io.sequences_directory)
 
+        # The rendered objects
+        scene_objects = vmv.get_list_of_meshes_in_scene()
+
         # A reference to the bounding box that will be used for the rendering
         rendering_bbox = vmv.bbox.compute_scene_bounding_box_for_meshes()
 
         # Compute a 360 bounding box to fit the arbors
-        self.bounding_box_360 = vmv.bbox.compute_360_bounding_box(
+        bounding_box_360 = vmv.bbox.compute_360_bounding_box(
             rendering_bbox, rendering_bbox.center)
 
         # Stretch the bounding box by few microns
-        self.bounding_box_360.extend_bbox(delta=vmv.consts.Image.GAP_DELTA)
+        bounding_box_360.extend_bbox(delta=vmv.consts.Image.GAP_DELTA)
 
-        # Create a specific directory for this mesh
-        self.output_directory = '%s/%s_mesh_360' % (
+        # Create a specific directory for this mesh, the existing frames are kept to resume
+        output_directory = '%s/%s_mesh_360' % (
             vmv.interface.options.io.sequences_directory,
             vmv.interface.ui.ui_morphology.name)
-        vmv.file.ops.clean_and_create_directory(self.output_directory)
+        if not vmv.file.ops.path_exists(output_directory):
+            vmv.file.ops.create_directory(output_directory)
+
+        # The resolution of the frames
+        image_scale_factor = None
+        if context.scene.MeshRenderingResolution == vmv.enums.Rendering.Resolution.TO_SCALE:
+            image_scale_factor = context.scene.MeshFrameScaleFactor
+
+        # Render the frames in this process or across the workers
+        self.sequence_renderer = vmv.rendering.SequenceRenderer(
+            scene_objects=scene_objects, bounding_box=bounding_box_360,
+            output_directory=output_directory,
+            image_resolution=context.scene.MeshFrameResolution,
+            image_scale_factor=image_scale_factor,
+            number_workers=context.scene.MeshRenderingWorkers)
+        if self.sequence_renderer.start() == 0:
+            self.report({'INFO'}, 'All the frames are already rendered')
+            return {'FINISHED'}
 
-        # Use the event timer to update the UI during the soma building
+        # Use the event timer to update the UI during the rendering
         wm = context.window_manager
         self.event_timer = wm.event_timer_add(time_step=0.01, window=context.window)
         wm.modal_handler_add(self)
@@ -590,7 +617,8 @@ class VMVRenderMesh360(bpy.types.Operator):
     # @cancel
     ################################################################################################
     def cancel(self, context):
-        """Cancel the panel processing and return to the interaction mode.
+        """
+        Cancel the panel processing and return to the interaction mode.
 
         :param context: Panel context.
         """
@@ -600,7 +628,7 @@ class VMVRenderMesh360(bpy.types.Operator):
         wm.event_timer_remove(self.event_timer)
 
         # Report the process termination in the UI
-        self.report({'INFO'}, 'Morphology Rendering Done')
+        self.report({'INFO'}, 'Mesh Rendering Done')
 
         # Confirm operation done
         return {'FINISHED'}
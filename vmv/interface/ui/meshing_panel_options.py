@@ -57,6 +57,21 @@ bpy.types.Scene.MetaBallResolution = bpy.props.FloatProperty(
     max=vmv.consts.Meshing.MAX_META_BALL_RESOLUTION,
     description="The resolution of the meta object")
 
+# Meta-ball tiles
+bpy.types.Scene.MetaBallTiles = bpy.props.IntProperty(
+    name="Tiles",
+    default=1, min=1, max=vmv.consts.Meshing.MAX_META_BALL_TILES,
+    description="Number of spatial tiles along each axis of the meta object. Each tile is meshed "
+                "in a separate Blender process to use all the cores and bound the memory. "
+                "Use 1 to mesh the whole object at once")
+
+# Implicit surface voxel size
+bpy.types.Scene.ImplicitVoxelSize = bpy.props.FloatProperty(
+    name="Voxel Size",
+    default=0.0, min=0.0, max=vmv.consts.Meshing.MAX_IMPLICIT_VOXEL_SIZE,
+    description="The voxel size of the implicit surface grid. Use 0 to set it automatically to "
+                "half the radius of the smallest sample")
+
 # Rendering resolution
 bpy.types.Scene.MeshRenderingResolution = bpy.props.EnumProperty(
     items=vmv.enums.Rendering.Resolution.RESOLUTION_ITEMS,
@@ -111,6 +126,22 @@ bpy.types.Scene.MeshFrameScaleFactor = bpy.props.FloatProperty(
     max=vmv.consts.Image.MAX_IMAGE_SCALE_FACTOR,
     description="The scale factor for rendering a mesh to scale")
 
+# The number of workers that render the 360 sequence
+bpy.types.Scene.MeshRenderingWorkers = bpy.props.IntProperty(
+    name="Workers",
+    default=vmv.consts.Image.DEFAULT_RENDERING_WORKERS,
+    min=1, max=vmv.consts.Image.MAX_RENDERING_WORKERS,
+    description="The number of headless Blender processes that render the frames of the 360 "
+                "sequence in parallel. If set to 1, the frames are rendered in this session")
+
+# The size of the tiles of the images rendered to scale
+bpy.types.Scene.MeshRenderingTileSize = bpy.props.IntProperty(
+    name="Tile Size",
+    default=0, min=0, max=vmv.consts.Image.MAX_RESOLUTION,
+    description="Renders the mesh image to scale in tiles of this size that are rendered by "
+                "the workers and stitched into a single image. If set to 0, the image is rendered "
+                "at once")
+
 # Reconstruction time
 bpy.types.Scene.MeshReconstructionTime = bpy.props.FloatProperty(
     name="Reconstruction Time (Sec)",
@@ -21,7 +21,6 @@ import copy
 
 # Blender imports
 import bpy
-from mathutils import Vector
 
 # Internal imports
 import vmv
@@ -36,6 +35,55 @@ import vmv.rendering
 import vmv.shading
 
 
+####################################################################################################
+# @recolor_morphology_skeleton
+####################################################################################################
+def recolor_morphology_skeleton(context):
+    """Updates the colors of the morphology skeleton in the scene without rebuilding it. This is
+    only possible if the skeleton was built by a builder that can recolor it, with the current
+    reconstruction method, for the loaded morphology.
+
+    :param context:
+        Blender context.
+    :return:
+        True if the skeleton was recolored, or False if it must be rebuilt.
+    """
+
+    # The builder that built the skeleton and the skeleton itself
+    builder = vmv.interface.ui.morphology_builder
+    skeleton_object = vmv.interface.ui.morphology_skeleton
+    if builder is None or skeleton_object is None:
+        return False
+
+    # The skeleton could have been deleted from the scene
+    try:
+        if skeleton_object.name not in context.scene.objects:
+            return False
+    except ReferenceError:
+        return False
+
+    # The builders that can recolor the skeleton of each reconstruction method
+    builders = {
+        vmv.enums.Morphology.ReconstructionMethod.DISCONNECTED_SEGMENTS:
+            vmv.builders.DisconnectedSegmentsBuilder,
+        vmv.enums.Morphology.ReconstructionMethod.DISCONNECTED_SECTIONS:
+            vmv.builders.DisconnectedSectionsBuilder,
+        vmv.enums.Morphology.ReconstructionMethod.CONNECTED_SECTIONS:
+            vmv.builders.ConnectedSectionsBuilder}
+
+    # The builder must match the current method, the loaded morphology and the level of detail,
+    # the builder holds a simplified copy of the morphology at the levels above zero
+    builder_class = builders.get(vmv.interface.ui.options.morphology.reconstruction_method)
+    if builder_class is None or not isinstance(builder, builder_class) or \
+            builder.source_morphology is not vmv.interface.ui.ui_morphology or \
+            builder.level_of_detail != vmv.interface.ui.options.morphology.level_of_detail:
+        return False
+
+    # Update the material indices and the materials of the skeleton, and the values of the
+    # color-map in the UI
+    return builder.recolor_skeleton(skeleton_object, context=context)
+
+
 ####################################################################################################
 # @VMVColorMapOperator
 ####################################################################################################
@@ -60,26 +108,14 @@ class VMVColorMapOperator(bpy.types.Operator):
         for i in range(vmv.consts.Color.NUMBER_COLORS_UI):
             setattr(context.scene, 'Color%d' % i, colors[i])
 
-        if vmv.interface.ui.morphology_skeleton is not None:
+        # Send the new colors to VMV parameters
+        vmv.interface.ui.options.morphology.color_map_colors.clear()
+        vmv.interface.ui.options.morphology.color_map_colors.extend(
+            [colors[i] for i in range(vmv.consts.Color.NUMBER_COLORS_UI)])
 
-            # Interpolate
-            colors = vmv.utilities.create_color_map_from_color_list(
-                vmv.interface.ui.options.morphology.color_map_colors,
-                number_colors=vmv.interface.ui.options.morphology.color_map_resolution)
-
-            for i in range(len(vmv.interface.ui.morphology_skeleton.material_slots)):
-                vmv.interface.ui.morphology_skeleton.active_material_index = i
-
-                if bpy.context.scene.render.engine == 'CYCLES':
-                    material_nodes = vmv.interface.ui.morphology_skeleton.active_material.node_tree
-                    color_1 = material_nodes.nodes['ColorRamp'].color_ramp.elements[0].color
-                    color_2 = material_nodes.nodes['ColorRamp'].color_ramp.elements[1].color
-                    for j in range(3):
-                        color_1[j] = colors[i][j]
-                        color_2[j] = 0.5 * colors[i][j]
-                else:
-                    vmv.interface.ui.morphology_skeleton.active_material.diffuse_color = \
-                        Vector((colors[i][0], colors[i][1], colors[i][2], 1.0))
+        # Recolor the skeleton in place, the materials are shared and cannot be edited in place
+        if vmv.interface.ui.morphology_skeleton is not None:
+            recolor_morphology_skeleton(context)
 
     # A list of all the color maps available in VessMorphoVis
     # Note that once a new colormap is selected, the corresponding colors will be set in the UI
@@ -135,6 +171,12 @@ class VMVColorMapOperator(bpy.types.Operator):
         color_map_resolution.prop(context.scene, 'ColorMapResolution')
         vmv.interface.ui.options.morphology.color_map_resolution = \
             context.scene.ColorMapResolution - 1
+
+        # How the values are mapped to the color map
+        color_map_normalization = layout.row()
+        color_map_normalization.prop(context.scene, 'ColorMapNormalization')
+        vmv.interface.ui.options.morphology.color_map_normalization = \
+            context.scene.ColorMapNormalization
         
         # Clear the color map passed to VMV if it is full 
         if len(vmv.interface.ui.options.morphology.color_map_colors) > 0:
@@ -250,6 +292,28 @@ class VMVMorphologyPanel(bpy.types.Panel):
         tube_quality_row.prop(context.scene, 'TubeQuality')
         vmv.interface.ui.options.morphology.bevel_object_sides = context.scene.TubeQuality
 
+        # Level of detail
+        level_of_detail_row = self.layout.row()
+        level_of_detail_row.label(text='Level of Detail:')
+        level_of_detail_row.prop(context.scene, 'LevelOfDetail')
+        vmv.interface.ui.options.morphology.level_of_detail = context.scene.LevelOfDetail
+
+        # Samples instancing
+        if context.scene.ReconstructionMethod == \
+                vmv.enums.Morphology.ReconstructionMethod.SAMPLES:
+            instance_samples_row = self.layout.row()
+            instance_samples_row.prop(context.scene, 'InstanceSamples')
+            vmv.interface.ui.options.morphology.samples_instancing = \
+                context.scene.InstanceSamples
+
+        # Segments as a mesh
+        if context.scene.ReconstructionMethod == \
+                vmv.enums.Morphology.ReconstructionMethod.DISCONNECTED_SEGMENTS:
+            segments_as_mesh_row = self.layout.row()
+            segments_as_mesh_row.prop(context.scene, 'SegmentsAsMesh')
+            vmv.interface.ui.options.morphology.segments_as_mesh = \
+                context.scene.SegmentsAsMesh
+
         # Morphology reconstruction techniques option
         # skeleton_style_row = self.layout.row()
         # skeleton_style_row.prop(context.scene, 'ArborsStyle', icon='WPAINT_HLT')
@@ -423,10 +487,36 @@ class VMVMorphologyPanel(bpy.types.Panel):
         reconstruction_row = self.layout.row()
         reconstruction_row.label(text='Morphology Reconstruction:', icon='PARTICLE_POINT')
 
+        # Progressive build
+        progressive_build_row = self.layout.row()
+        progressive_build_row.prop(context.scene, 'BuildProgressively')
+
+        # The chunk size of the progressive build
+        if context.scene.BuildProgressively:
+            progressive_build_row.prop(context.scene, 'ProgressiveBuildChunkSize')
+            vmv.interface.ui.options.morphology.progressive_build_chunk_size = \
+                context.scene.ProgressiveBuildChunkSize
+        else:
+            vmv.interface.ui.options.morphology.progressive_build_chunk_size = 0
+
         # Morphology reconstruction options
         morphology_reconstruction_row = self.layout.row()
         morphology_reconstruction_row.operator('reconstruct.morphology', icon='MESH_DATA')
 
+        # Update the colors of the reconstructed skeleton without rebuilding it
+        if vmv.interface.ui.morphology_skeleton is not None:
+            morphology_reconstruction_row.operator('recolor.morphology', icon='COLOR')
+
+            # Refine a coarse skeleton to the next finer level of detail
+            if context.scene.LevelOfDetail > 0:
+                morphology_reconstruction_row.operator('refine.morphology', icon='ZOOM_IN')
+
+        # Reconstruction progress bar
+        if context.scene.BuildProgressively:
+            reconstruction_progress_row = self.layout.row()
+            reconstruction_progress_row.prop(context.scene, 'MorphologyReconstructionProgress')
+            reconstruction_progress_row.enabled = False
+
         # If the morphology is loaded only, print the performance stats.
         if vmv.interface.ui_morphology_loaded:
 
@@ -482,6 +572,14 @@ class VMVMorphologyPanel(bpy.types.Panel):
             vmv.interface.ui.options.morphology.resolution_scale_factor = \
                 context.scene.MorphologyFrameScaleFactor
 
+            # Tiles option
+            tile_size_row = self.layout.row()
+            tile_size_row.label(text='Tiles:')
+            tile_size_row.prop(context.scene, 'MorphologyRenderingTileSize')
+            tile_size_row.prop(context.scene, 'MorphologyRenderingWorkers')
+            vmv.interface.ui.options.morphology.rendering_tile_size = \
+                context.scene.MorphologyRenderingTileSize
+
         # Rendering view column
         view_row = self.layout.column()
         view_row.prop(context.scene, 'MorphologyRenderingViews', icon='AXIS_FRONT')
@@ -520,6 +618,7 @@ class VMVMorphologyPanel(bpy.types.Panel):
         render_animation_row = self.layout.row()
         render_animation_row.label(text='Render Animation:', icon='CAMERA_DATA')
         render_animations_buttons_row = self.layout.row(align=True)
+        render_animations_buttons_row.prop(context.scene, 'MorphologyRenderingWorkers')
         render_animations_buttons_row.operator('render_morphology.360', icon='FORCE_MAGNETIC')
 
         # Rendering progress bar
@@ -593,6 +692,106 @@ class VMVReconstructMorphology(bpy.types.Operator):
     # The builder that will be used to build the morphology
     morphology_builder = None
 
+    # The progressive builder, if the skeleton is built progressively
+    progressive_builder = None
+
+    # Timer parameters
+    event_timer = None
+
+    # The start time of the reconstruction
+    start_reconstruction = 0
+
+    ################################################################################################
+    # @finish_reconstruction
+    ################################################################################################
+    def finish_reconstruction(self,
+                              context):
+        """Updates the reconstruction time in the UI after the skeleton is built. The values of
+        the color-map are updated by the builder.
+
+        :param context:
+            Operator context.
+        """
+
+        # Reconstruction timer
+        reconstruction_done = time.time()
+        context.scene.MorphologyReconstructionTime = \
+            reconstruction_done - self.start_reconstruction
+
+    ################################################################################################
+    # @modal
+    ################################################################################################
+    def modal(self, context, event):
+        """Draws a chunk of the skeleton per timer event and keeps the UI responsive.
+
+        :param context:
+            Operator context.
+        :param event:
+            A given event for the panel.
+        """
+
+        # Cancelling event, the chunks that are already drawn are kept
+        if event.type == 'ESC':
+
+            # Stop the timer
+            self.stop_progressive_build(context)
+
+            # Report the cancellation in the UI
+            self.report({'WARNING'}, 'Morphology Reconstruction Cancelled')
+
+            # Cancelled
+            return {'CANCELLED'}
+
+        # Timer event, where a chunk is drawn
+        if event.type == 'TIMER':
+
+            # Draw the next chunk
+            done = self.progressive_builder.step()
+
+            # Update the progress shell
+            vmv.utilities.show_progress(
+                'Drawing', self.progressive_builder.next_poly_line,
+                self.progressive_builder.poly_lines_batch.get_number_poly_lines())
+
+            # Update the progress bar
+            progress = int(100 * self.progressive_builder.get_progress())
+            context.scene.MorphologyReconstructionProgress = progress
+            context.window_manager.progress_update(progress)
+
+            # All the chunks are drawn
+            if done:
+
+                # Stop the timer
+                self.stop_progressive_build(context)
+
+                # Update the UI
+                self.finish_reconstruction(context)
+
+                # Done
+                return {'FINISHED'}
+
+        # Next chunk
+        return {'PASS_THROUGH'}
+
+    ################################################################################################
+    # @stop_progressive_build
+    ################################################################################################
+    def stop_progressive_build(self,
+                               context):
+        """Stops the timer of the progressive build and keeps the drawn object.
+
+        :param context:
+            Operator context.
+        """
+
+        # Remove the timer
+        wm = context.window_manager
+        wm.event_timer_remove(self.event_timer)
+        wm.progress_end()
+
+        # The drawn object
+        vmv.interface.ui.morphology_skeleton = self.progressive_builder.object
+
     ################################################################################################
     # @execute
     ################################################################################################
@@ -611,7 +810,7 @@ class VMVReconstructMorphology(bpy.types.Operator):
         vmv.scene.ops.clear_scene()
 
         # Starting the reconstruction timer
-        start_reconstruction = time.time()
+        self.start_reconstruction = time.time()
 
         # Make sure that the morphology isn loaded and valid in memory
         if not vmv.interface.ui_morphology_loaded:
@@ -649,23 +848,116 @@ class VMVReconstructMorphology(bpy.types.Operator):
         else:
             return {'FINISHED'}
 
+        # Keep a reference to the builder to be able to recolor the skeleton later
+        vmv.interface.ui.morphology_builder = self.morphology_builder
+
+        # Build the skeleton progressively if the builder draws poly-lines
+        chunk_size = vmv.interface.ui.options.morphology.progressive_build_chunk_size
+        if chunk_size > 0 and hasattr(self.morphology_builder, 'prepare_poly_lines') and \
+                not vmv.interface.ui.options.morphology.segments_as_mesh:
+
+            # Prepare the poly-lines and create the object
+            self.progressive_builder = vmv.builders.ProgressiveBuilder(
+                builder=self.morphology_builder, chunk_size=chunk_size)
+            self.progressive_builder.start(context=context)
+            context.scene.MorphologyReconstructionProgress = 0
+
+            # Use the event timer to draw a chunk per event
+            wm = context.window_manager
+            wm.progress_begin(0, 100)
+            self.event_timer = wm.event_timer_add(time_step=0.01, window=context.window)
+            wm.modal_handler_add(self)
+
+            # Running
+            return {'RUNNING_MODAL'}
+
         # Build the morphology skeleton directly
         # NOTE: each builder must have this function @build_skeleton() implemented in it
         vmv.interface.ui.morphology_skeleton = self.morphology_builder.build_skeleton(context=context)
 
-        # Interpolations
-        color_map_range = \
-            float(context.scene.MaximumValue) - float(context.scene.MinimumValue)
-        delta = color_map_range / float(vmv.consts.Color.NUMBER_COLORS_UI - 1)
+        # Update the UI
+        self.finish_reconstruction(context)
 
-        # Fill the list of colors
-        for i in range(vmv.consts.Color.NUMBER_COLORS_UI):
-            value = float(context.scene.MinimumValue) + (i * delta)
-            setattr(context.scene, 'Value%d' % i, value)
+        # Done, return {'FINISHED'}
+        return {'FINISHED'}
 
-        # Reconstruction timer
-        reconstruction_done = time.time()
-        context.scene.MorphologyReconstructionTime = reconstruction_done - start_reconstruction
+
+####################################################################################################
+# @VMVRecolorMorphology
+####################################################################################################
+class VMVRecolorMorphology(bpy.types.Operator):
+    """Updates the colors of the reconstructed morphology without rebuilding it"""
+
+    # Operator parameters
+    bl_idname = "recolor.morphology"
+    bl_label = "Update Colors"
+    bl_options = {'REGISTER'}
+
+    ################################################################################################
+    # @execute
+    ################################################################################################
+    def execute(self,
+                context):
+        """Executes the operator
+
+        Keyword arguments:
+        :param context:
+            Operator context.
+        :return:
+            {'FINISHED'}
+        """
+
+        # Recolor the skeleton in place
+        if recolor_morphology_skeleton(context):
+            return {'FINISHED'}
+
+        # The skeleton cannot be recolored, then rebuild it
+        self.report({'INFO'}, 'The skeleton cannot be recolored, rebuilding it')
+        bpy.ops.reconstruct.morphology()
+
+        # Done, return {'FINISHED'}
+        return {'FINISHED'}
+
+
+####################################################################################################
+# @VMVRefineMorphology
+####################################################################################################
+class VMVRefineMorphology(bpy.types.Operator):
+    """Rebuilds the reconstructed morphology at the next finer level of detail"""
+
+    # Operator parameters
+    bl_idname = "refine.morphology"
+    bl_label = "Refine"
+    bl_options = {'REGISTER'}
+
+    ################################################################################################
+    # @execute
+    ################################################################################################
+    def execute(self,
+                context):
+        """Executes the operator
+
+        Keyword arguments:
+        :param context:
+            Operator context.
+        :return:
+            {'FINISHED'}
+        """
+
+        # The original skeleton is the finest level
+        if context.scene.LevelOfDetail == 0:
+            self.report({'INFO'}, 'The skeleton is already at the full level of detail')
+            return {'FINISHED'}
+
+        # Select the level below the one that is shown, the pyramid may have fewer levels than
+        # requested. The finer levels are already built, since each level is derived from them
+        level_of_detail = vmv.interface.ui.ui_morphology.get_level_of_detail(
+            level=context.scene.LevelOfDetail)
+        context.scene.LevelOfDetail = max(0, level_of_detail.level - 1)
+        vmv.interface.ui.options.morphology.level_of_detail = context.scene.LevelOfDetail
+
+        # Rebuild the skeleton at this level
+        bpy.ops.reconstruct.morphology()
 
         # Done, return {'FINISHED'}
         return {'FINISHED'}
@@ -749,7 +1041,9 @@ class VMVRenderMorphologyImage(bpy.types.Operator):
                 camera_view=vmv.options.morphology.camera_view,
                 image_scale_factor=context.scene.MorphologyFrameScaleFactor,
                 image_name=image_name,
-                image_directory=vmv.interface.options.io.images_directory)
+                image_directory=vmv.interface.options.io.images_directory,
+                tile_size=context.scene.MorphologyRenderingTileSize,
+                number_workers=context.scene.MorphologyRenderingWorkers)
 
         # Report the process termination in the UI
         self.report({'INFO'}, 'Rendering Morphology Done')
@@ -769,13 +1063,9 @@ class VMVRenderMorphology360(bpy.types.Operator):
 
     # Timer parameters
     event_timer = None
-    timer_limits = 0
-
-    # 360 bounding box
-    bounding_box_360 = None
 
-    # Output data
-    output_directory = None
+    # The renderer of the sequence
+    sequence_renderer = None
 
     ################################################################################################
     # @modal
@@ -790,14 +1080,11 @@ class VMVRenderMorphology360(bpy.types.Operator):
             A given event for the panel.
         """
 
-        # Get a reference to the scene
-        scene = context.scene
+        # Cancelling event, the rendered frames are kept and skipped if the sequence is resumed
+        if event.type in {'RIGHTMOUSE', 'ESC'}:
 
-        # Cancelling event, if using right click or exceeding the time limit of the simulation
-        if event.type in {'RIGHTMOUSE', 'ESC'} or self.timer_limits > 360:
-
-            # Reset the timer limits
-            self.timer_limits = 0
+            # Stop the rendering
+            self.sequence_renderer.finish(cancel=True)
 
             # Refresh the panel context
             self.cancel(context)
@@ -805,46 +1092,30 @@ class VMVRenderMorphology360(bpy.types.Operator):
             # Done
             return {'FINISHED'}
 
-        # Timer event, where the function is executed here on a per-frame basis
+        # Timer event, where a frame is rendered, or the workers are checked
         if event.type == 'TIMER':
 
-            # Set the frame name
-            image_name = '%s/%s' % (
-                self.output_directory, '{0:05d}'.format(self.timer_limits))
-
-            # Render at a specific resolution
-            if context.scene.MorphologyRenderingResolution == \
-                    vmv.enums.Rendering.Resolution.FIXED_RESOLUTION:
+            # Render the next frame
+            done = self.sequence_renderer.step()
 
-                # Render the image
-                vmv.rendering.render_at_angle(
-                    scene_objects=vmv.get_list_of_curves_in_scene(),
-                    angle=self.timer_limits,
-                    bounding_box=self.bounding_box_360,
-                    camera_view=vmv.enums.Rendering.View.FRONT_360,
-                    image_resolution=context.scene.MorphologyFrameResolution,
-                    image_name=image_name)
+            # Update the progress shell
+            progress = self.sequence_renderer.get_progress()
+            vmv.utilities.show_progress('Rendering', int(360 * progress), 360)
 
-            # Render at a specific scale factor
-            else:
+            # Update the progress bar
+            context.scene.MorphologyRenderingProgress = int(100 * progress)
 
-                # Render the image
-                vmv.rendering.render_at_angle_to_scale(
-                    scene_objects=vmv.get_list_of_curves_in_scene(),
-                    angle=self.timer_limits,
-                    bounding_box=self.bounding_box_360,
-                    camera_view=vmv.enums.Rendering.View.FRONT_360,
-                    image_scale_factor=context.scene.MorphologyFrameResolution,
-                    image_name=image_name)
+            # All the frames are rendered
+            if done:
 
-            # Update the progress shell
-            vmv.utilities.show_progress('Rendering', self.timer_limits, 360)
+                # Restore the scene
+                self.sequence_renderer.finish()
 
-            # Update the progress bar
-            context.scene.MorphologyRenderingProgress = int(100 * self.timer_limits / 360.0)
+                # Refresh the panel context
+                self.cancel(context)
 
-            # Upgrade the timer limits
-            self.timer_limits += 1
+                # Done
+                return {'FINISHED'}
 
         # Next frame
         return {'PASS_THROUGH'}
@@ -873,23 +1144,43 @@ class VMVRenderMorphology360(bpy.types.Operator):
             vmv.file.ops.clean_and_create_directory(
                 vmv.interface.options.io.sequences_directory)
 
+        # The rendered objects
+        scene_objects = vmv.get_list_of_curves_in_scene()
+
         # A reference to the bounding box that will be used for the rendering
         rendering_bbox = vmv.bbox.compute_scene_bounding_box_for_curves()
 
         # Compute a 360 bounding box to fit the arbors
-        self.bounding_box_360 = vmv.bbox.compute_360_bounding_box(
+        bounding_box_360 = vmv.bbox.compute_360_bounding_box(
             rendering_bbox, rendering_bbox.center)
 
         # Stretch the bounding box by few microns
-        self.bounding_box_360.extend_bbox(delta=vmv.consts.Image.GAP_DELTA)
+        bounding_box_360.extend_bbox(delta=vmv.consts.Image.GAP_DELTA)
 
-        # Create a specific directory for this mesh
-        self.output_directory = '%s/%s_mesh_360' % (
+        # Create a specific directory for this mesh, the existing frames are kept to resume
+        output_directory = '%s/%s_mesh_360' % (
             vmv.interface.options.io.sequences_directory,
             vmv.interface.options.morphology.label)
-        vmv.file.ops.clean_and_create_directory(self.output_directory)
+        if not vmv.file.ops.path_exists(output_directory):
+            vmv.file.ops.create_directory(output_directory)
+
+        # The resolution of the frames
+        image_scale_factor = None
+        if context.scene.MorphologyRenderingResolution == vmv.enums.Rendering.Resolution.TO_SCALE:
+            image_scale_factor = context.scene.MorphologyFrameScaleFactor
+
+        # Render the frames in this process or across the workers
+        self.sequence_renderer = vmv.rendering.SequenceRenderer(
+            scene_objects=scene_objects, bounding_box=bounding_box_360,
+            output_directory=output_directory,
+            image_resolution=context.scene.MorphologyFrameResolution,
+            image_scale_factor=image_scale_factor,
+            number_workers=context.scene.MorphologyRenderingWorkers)
+        if self.sequence_renderer.start() == 0:
+            self.report({'INFO'}, 'All the frames are already rendered')
+            return {'FINISHED'}
 
-        # Use the event timer to update the UI during the soma building
+        # Use the event timer to update the UI during the rendering
         wm = context.window_manager
         self.event_timer = wm.event_timer_add(time_step=0.01, window=context.window)
         wm.modal_handler_add(self)
@@ -1036,6 +1327,12 @@ def register_panel():
     # Mesh reconstruction button
     bpy.utils.register_class(VMVReconstructMorphology)
 
+    # Recoloring button
+    bpy.utils.register_class(VMVRecolorMorphology)
+
+    # Refinement button
+    bpy.utils.register_class(VMVRefineMorphology)
+
     # Mesh rendering buttons
     bpy.utils.register_class(VMVRenderMorphologyImage)
     bpy.utils.register_class(VMVRenderMorphology360)
@@ -1059,6 +1356,12 @@ def unregister_panel():
     # Mesh reconstruction button
     bpy.utils.unregister_class(VMVReconstructMorphology)
 
+    # Recoloring button
+    bpy.utils.unregister_class(VMVRecolorMorphology)
+
+    # Refinement button
+    bpy.utils.unregister_class(VMVRefineMorphology)
+
     # Mesh rendering buttons
     bpy.utils.unregister_class(VMVRenderMorphologyImage)
     bpy.utils.unregister_class(VMVRenderMorphology360)
@@ -26,6 +26,12 @@ bpy.types.Scene.ColorMapResolution = bpy.props.IntProperty(
     name="Resolution", default=vmv.consts.Color.COLOR_MAP_RESOLUTION, min=4, max=128,
     description="The resolution of the color-map. Range [4 - 128] samples.")
 
+# How the values are mapped to the color-map
+bpy.types.Scene.ColorMapNormalization = bpy.props.EnumProperty(
+    items=vmv.enums.ColorMapNormalization.NORMALIZATION_ITEMS,
+    name='Normalization',
+    default=vmv.enums.ColorMapNormalization.LINEAR)
+
 # Center morphology at the origin
 bpy.types.Scene.CenterMorphology = bpy.props.BoolProperty(
     name="Center Morphology at Origin",
@@ -98,6 +104,22 @@ bpy.types.Scene.MorphologyFrameScaleFactor = bpy.props.FloatProperty(
     name="Scale", default=1.0, min=1.0, max=100.0,
     description="The scale factor for rendering a morphology to scale")
 
+# The number of workers that render the 360 sequence
+bpy.types.Scene.MorphologyRenderingWorkers = bpy.props.IntProperty(
+    name="Workers",
+    default=vmv.consts.Image.DEFAULT_RENDERING_WORKERS,
+    min=1, max=vmv.consts.Image.MAX_RENDERING_WORKERS,
+    description="The number of headless Blender processes that render the frames of the 360 "
+                "sequence in parallel. If set to 1, the frames are rendered in this session")
+
+# The size of the tiles of the images rendered to scale
+bpy.types.Scene.MorphologyRenderingTileSize = bpy.props.IntProperty(
+    name="Tile Size",
+    default=0, min=0, max=vmv.consts.Image.MAX_RESOLUTION,
+    description="Renders the morphology image to scale in tiles of this size that are rendered by "
+                "the workers and stitched into a single image. If set to 0, the image is rendered "
+                "at once")
+
 # Reconstruction progress bar
 bpy.types.Scene.ReconstructionProgress = bpy.props.IntProperty(
     name="Progress",
@@ -111,6 +133,48 @@ bpy.types.Scene.TubeQuality = bpy.props.IntProperty(
                 "closeups and low value is sufficient for far-away visualizations",
     default=8, min=4, max=128)
 
+# Level of detail
+bpy.types.Scene.LevelOfDetail = bpy.props.IntProperty(
+    name="Level",
+    description="The level of detail of the skeleton, where 0 is the original skeleton and each "
+                "following level has almost half the number of samples of the previous one. "
+                "Coarse levels are useful to preview large networks interactively, and the "
+                "reconstructed skeleton can be refined level by level afterwards",
+    default=0, min=0, max=vmv.consts.Skeleton.LOD_NUMBER_LEVELS)
+
+# Samples instancing
+bpy.types.Scene.InstanceSamples = bpy.props.BoolProperty(
+    name="Instance Samples",
+    description="Instance a single sphere on all the samples instead of creating a sphere per "
+                "sample. This option is much faster and uses less memory for large networks",
+    default=True)
+
+# Progressive build
+bpy.types.Scene.BuildProgressively = bpy.props.BoolProperty(
+    name="Build Progressively",
+    description="Draw the skeleton in chunks to keep the interface responsive. The build can be "
+                "cancelled with ESC",
+    default=False)
+
+# The number of poly-lines per step of the progressive build
+bpy.types.Scene.ProgressiveBuildChunkSize = bpy.props.IntProperty(
+    name="Chunk Size",
+    description="The number of poly-lines that are drawn per step of the progressive build",
+    default=vmv.consts.Skeleton.PROGRESSIVE_BUILD_CHUNK_SIZE, min=1,
+    max=vmv.consts.Skeleton.MAX_PROGRESSIVE_BUILD_CHUNK_SIZE)
+
+# Reconstruction progress
+bpy.types.Scene.MorphologyReconstructionProgress = bpy.props.IntProperty(
+    name="Reconstruction Progress",
+    default=0, min=0, max=100, subtype='PERCENTAGE')
+
+# Segments as a mesh
+bpy.types.Scene.SegmentsAsMesh = bpy.props.BoolProperty(
+    name="Segments as Mesh",
+    description="Draw all the segments as a single tube mesh colored per segment instead of a "
+                "spline per segment. This option is much faster for large networks",
+    default=False)
+
 # Section radius
 bpy.types.Scene.SectionsRadii = bpy.props.EnumProperty(
     items=[(vmv.enums.Morphology.Radii.AS_SPECIFIED,
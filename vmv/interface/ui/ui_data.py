@@ -23,6 +23,9 @@ ui_morphology = None
 
 morphology_skeleton = None
 
+# The builder that built the morphology skeleton, used to recolor it without rebuilding it
+morphology_builder = None
+
 # All the icons loaded for the UI
 ui_icons = None
 
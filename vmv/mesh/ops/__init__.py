@@ -17,4 +17,8 @@
 
 from .mesh_face_ops import *
 from .mesh_object_ops import *
-from .mesh_vertex_ops import *
\ No newline at end of file
+from .mesh_vertex_ops import *
+from .mesh_instancing_ops import *
+from .mesh_arrays_ops import *
+from .implicit_surface_ops import *
+from .tube_mesh_ops import *
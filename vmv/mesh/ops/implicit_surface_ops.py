@@ -0,0 +1,526 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import concurrent.futures
+import numpy
+
+
+# The corners of a cell, where the index of the corner [i, j, k] is 4 * i + 2 * j + k
+CELL_CORNERS = numpy.array([[i, j, k] for i in (0, 1) for j in (0, 1) for k in (0, 1)])
+
+# The edges of a cell, as pairs of corners
+CELL_EDGES = [(a, b) for a in range(8) for b in range(a + 1, 8)
+              if numpy.abs(CELL_CORNERS[a] - CELL_CORNERS[b]).sum() == 1]
+
+# The maximum number of surface patches in a cell
+MAXIMUM_CELL_PATCHES = 4
+
+
+####################################################################################################
+# @compute_cell_tables
+####################################################################################################
+def compute_cell_tables():
+    """Computes the surface patches of the cells for all the 256 configurations of the inside
+    corners, as in marching cubes with disambiguated faces.
+
+    The crossed edges of a cell are linked across the faces of the cell into segments. A face with
+    two crossed edges links them, and an ambiguous face with four crossed edges links the two
+    edges of each inside corner, i.e. the inside corners are always separated on the face. The
+    rule depends only on the face, so the two cells that share a face have the same segments on
+    it. Every crossed edge is in two segments, so the segments of a cell form closed cycles, one
+    per surface patch. Each segment is oriented with the inside corners on its right when the
+    face is seen from outside the cell, so the cycles are consistently oriented and the normals of
+    their triangles point outwards.
+
+    :return:
+        A tuple of (the patch of every edge per configuration [256, 12], where -1 is not crossed,
+        the number of patches per configuration [256], the oriented segments per configuration as
+        (patch, first edge, second edge) [256, 12, 3], the number of segments per configuration
+        [256]).
+    """
+
+    # The edges of every face of the cell and the outward normal of the face
+    faces_edges = list()
+    faces_normals = list()
+    for axis in range(3):
+        for value in (0, 1):
+            faces_edges.append([e for e, (a, b) in enumerate(CELL_EDGES)
+                                if CELL_CORNERS[a][axis] == value and
+                                CELL_CORNERS[b][axis] == value])
+            normal = numpy.zeros(3)
+            normal[axis] = 1.0 if value else -1.0
+            faces_normals.append(normal)
+
+    # The midpoints of the edges
+    midpoints = [0.5 * (CELL_CORNERS[a] + CELL_CORNERS[b]) for a, b in CELL_EDGES]
+
+    # The tables
+    patches_table = numpy.full((256, len(CELL_EDGES)), -1, dtype=numpy.int64)
+    patches_counts = numpy.zeros(256, dtype=numpy.int64)
+    segments_table = numpy.full((256, len(CELL_EDGES), 3), -1, dtype=numpy.int64)
+    segments_counts = numpy.zeros(256, dtype=numpy.int64)
+    for configuration in range(256):
+        inside = [(configuration >> corner) & 1 for corner in range(8)]
+        crossed = [inside[a] != inside[b] for a, b in CELL_EDGES]
+
+        # The segments of every face, each with an inside corner on its side
+        segments = list()
+        for face_edges, normal in zip(faces_edges, faces_normals):
+            face_crossed = [e for e in face_edges if crossed[e]]
+            face_corners = set(c for e in face_edges for c in CELL_EDGES[e])
+            if len(face_crossed) == 2:
+                corner = [c for c in face_corners if inside[c]][0]
+                segments.append((face_crossed[0], face_crossed[1], corner, normal))
+            elif len(face_crossed) == 4:
+                for corner in face_corners:
+                    if inside[corner]:
+                        corner_edges = [e for e in face_edges if corner in CELL_EDGES[e]]
+                        segments.append((corner_edges[0], corner_edges[1], corner, normal))
+
+        # Union-find on the crossed edges along the segments
+        parents = list(range(len(CELL_EDGES)))
+
+        def find(e):
+            while parents[e] != e:
+                parents[e] = parents[parents[e]]
+                e = parents[e]
+            return e
+
+        for first_edge, second_edge, _, _ in segments:
+            parents[find(first_edge)] = find(second_edge)
+
+        # Label the patches
+        labels = dict()
+        for e in range(len(CELL_EDGES)):
+            if crossed[e]:
+                patches_table[configuration, e] = labels.setdefault(find(e), len(labels))
+        patches_counts[configuration] = len(labels)
+
+        # Orient the segments with the inside corner on the right
+        for i, (first_edge, second_edge, corner, normal) in enumerate(segments):
+            direction = numpy.cross(midpoints[second_edge] - midpoints[first_edge],
+                                    CELL_CORNERS[corner] - midpoints[first_edge])
+            if numpy.dot(direction, normal) > 0.0:
+                first_edge, second_edge = second_edge, first_edge
+            segments_table[configuration, i] = [
+                patches_table[configuration, first_edge], first_edge, second_edge]
+        segments_counts[configuration] = len(segments)
+
+    # Return the tables
+    return patches_table, patches_counts, segments_table, segments_counts
+
+
+# The patch of every edge of a cell, the number of patches, the oriented segments of the patches
+# and the number of segments, per configuration
+CELL_PATCHES_TABLE, CELL_PATCHES_COUNTS, CELL_SEGMENTS_TABLE, CELL_SEGMENTS_COUNTS = \
+    compute_cell_tables()
+
+
+####################################################################################################
+# @compute_capsules_arrays
+####################################################################################################
+def compute_capsules_arrays(points,
+                            radii,
+                            offsets):
+    """Computes the capsules (or truncated cones with rounded ends) that correspond to all the
+    segments of the morphology.
+
+    :param points:
+        An array of the positions of the samples [N, 3].
+    :param radii:
+        An array of the radii of the samples [N].
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :return:
+        A tuple of (first points [C, 3], second points [C, 3], first radii [C], second radii [C]).
+    """
+
+    # Each section with N samples has N - 1 segments
+    segments_counts = numpy.maximum(numpy.diff(offsets) - 1, 0)
+
+    # The indices of the first samples of the segments
+    segments = numpy.arange(segments_counts.sum(), dtype=numpy.int64) + numpy.repeat(
+        offsets[:-1] - (numpy.cumsum(segments_counts) - segments_counts), segments_counts)
+
+    # Return the capsules
+    return points[segments], points[segments + 1], radii[segments], radii[segments + 1]
+
+
+####################################################################################################
+# @evaluate_capsules_distance_field
+####################################################################################################
+def evaluate_capsules_distance_field(nodes,
+                                     p0,
+                                     p1,
+                                     r0,
+                                     r1,
+                                     chunk_size=64):
+    """Evaluates the signed distance field of the union of a group of capsules at given nodes,
+    where the field is negative inside the capsules and positive outside them.
+
+    :param nodes:
+        An array of the positions where the field is evaluated [K, 3].
+    :param p0:
+        The first points of the capsules [C, 3].
+    :param p1:
+        The second points of the capsules [C, 3].
+    :param r0:
+        The first radii of the capsules [C].
+    :param r1:
+        The second radii of the capsules [C].
+    :param chunk_size:
+        The number of capsules that are evaluated at once to bound the memory.
+    :return:
+        An array of the field values at the nodes [K].
+    """
+
+    # Initially, all the nodes are outside
+    field = numpy.full(len(nodes), numpy.inf)
+
+    # Evaluate the capsules chunk by chunk
+    for i in range(0, len(p0), chunk_size):
+
+        # The axes of the capsules in the chunk
+        a = p0[i:i + chunk_size]
+        d = p1[i:i + chunk_size] - a
+        d_squared = numpy.maximum(numpy.einsum('ij,ij->i', d, d), 1e-12)
+
+        # The projection of every node on the axis of every capsule, clamped to the segment
+        x = nodes[:, None, :] - a[None, :, :]
+        t = numpy.clip(numpy.einsum('kcj,cj->kc', x, d) / d_squared, 0.0, 1.0)
+
+        # The distance to the axis minus the interpolated radius
+        distances = numpy.linalg.norm(x - t[:, :, None] * d[None, :, :], axis=2) - \
+            (r0[i:i + chunk_size] + t * (r1[i:i + chunk_size] - r0[i:i + chunk_size]))
+
+        # Union
+        numpy.minimum(field, distances.min(axis=1), out=field)
+
+    # Return the field
+    return field
+
+
+####################################################################################################
+# @get_active_blocks
+####################################################################################################
+def get_active_blocks(capsules_min,
+                      capsules_max,
+                      origin,
+                      block_extent,
+                      grid_blocks):
+    """Finds the blocks of the voxel grid that are touched by the bounding boxes of the capsules,
+    and the capsules that touch every block.
+
+    :param capsules_min:
+        The minimum points of the bounding boxes of the capsules, including any margin [C, 3].
+    :param capsules_max:
+        The maximum points of the bounding boxes of the capsules, including any margin [C, 3].
+    :param origin:
+        The origin of the voxel grid.
+    :param block_extent:
+        The extent of a single block.
+    :param grid_blocks:
+        The number of blocks along each axis of the grid.
+    :return:
+        A tuple of (blocks [K, 3], capsules offsets [K + 1], capsules [P]), where the capsules
+        that touch the i-th block are in the range [offsets[i], offsets[i + 1]) of the capsules.
+    """
+
+    # The range of the blocks that are touched by every capsule along each axis
+    first_blocks = numpy.clip(numpy.floor((capsules_min - origin) / block_extent).astype(
+        numpy.int64), 0, grid_blocks - 1)
+    last_blocks = numpy.clip(numpy.floor((capsules_max - origin) / block_extent).astype(
+        numpy.int64), 0, grid_blocks - 1)
+
+    # All the (block, capsule) pairs
+    blocks_keys = list()
+    capsules = list()
+    spans = (last_blocks - first_blocks).max(axis=0) + 1
+    for di in range(spans[0]):
+        for dj in range(spans[1]):
+            for dk in range(spans[2]):
+                blocks = first_blocks + numpy.array([di, dj, dk])
+                touched = numpy.nonzero((blocks <= last_blocks).all(axis=1))[0]
+                blocks = blocks[touched]
+                blocks_keys.append(
+                    (blocks[:, 0] * grid_blocks[1] + blocks[:, 1]) * grid_blocks[2] + blocks[:, 2])
+                capsules.append(touched)
+
+    # Group the pairs by block
+    blocks_keys = numpy.concatenate(blocks_keys)
+    capsules = numpy.concatenate(capsules)
+    order = numpy.argsort(blocks_keys, kind='stable')
+    blocks_keys = blocks_keys[order]
+    capsules = capsules[order]
+    unique_keys, starts = numpy.unique(blocks_keys, return_index=True)
+    capsules_offsets = numpy.append(starts, len(blocks_keys))
+
+    # The indices of the blocks
+    blocks = numpy.stack([unique_keys // (grid_blocks[1] * grid_blocks[2]),
+                          (unique_keys // grid_blocks[2]) % grid_blocks[1],
+                          unique_keys % grid_blocks[2]], axis=1)
+
+    # Return the blocks and their capsules
+    return blocks, capsules_offsets, capsules
+
+
+####################################################################################################
+# @mesh_implicit_surface_block
+####################################################################################################
+def mesh_implicit_surface_block(block,
+                                origin,
+                                voxel_size,
+                                block_size,
+                                grid_cells,
+                                p0,
+                                p1,
+                                r0,
+                                r1):
+    """Extracts the implicit surface within the cells of a single block of the grid.
+
+    Every crossed edge of the grid has a vertex at the crossing point of the surface, and every
+    patch of a crossed cell, see @compute_cell_tables, has a vertex at the average of the
+    crossing points of its edges. Every oriented segment of a patch creates a triangle between
+    the vertex of the patch and the vertices of the two edges of the segment. The vertices are
+    identified by global keys, so the blocks can be merged.
+
+    :param block:
+        The index of the block along each axis.
+    :param origin:
+        The origin of the voxel grid.
+    :param voxel_size:
+        The size of a single voxel.
+    :param block_size:
+        The number of voxels of the block along each axis.
+    :param grid_cells:
+        The number of cells of the entire grid along each axis.
+    :param p0:
+        The first points of the capsules that touch the block [C, 3].
+    :param p1:
+        The second points of the capsules that touch the block [C, 3].
+    :param r0:
+        The first radii of the capsules that touch the block [C].
+    :param r1:
+        The second radii of the capsules that touch the block [C].
+    :return:
+        A tuple of (edges keys [E], edges vertices [E, 3], patches keys [P], patches vertices
+        [P, 3], triangles patches keys [T], triangles edges keys [T, 2]). The key of an edge is
+        the key of its first node times three plus its axis, and the key of a patch is the key
+        of its cell times MAXIMUM_CELL_PATCHES plus its index in the cell.
+    """
+
+    # The first node of the block
+    first_node = numpy.asarray(block) * block_size
+
+    # The nodes of the block, including the nodes on its upper borders
+    n = block_size + 1
+    local = numpy.stack(numpy.meshgrid(
+        numpy.arange(n), numpy.arange(n), numpy.arange(n), indexing='ij'), axis=-1)
+    nodes = origin + (first_node + local.reshape(-1, 3)) * voxel_size
+
+    # Evaluate the field at the nodes
+    field = evaluate_capsules_distance_field(nodes, p0, p1, r0, r1).reshape(n, n, n)
+    inside = field < 0.0
+
+    # The configuration of the inside corners of every cell
+    b = block_size
+    configurations = numpy.zeros((b, b, b), dtype=numpy.int64)
+    for corner, c in enumerate(CELL_CORNERS):
+        configurations |= inside[c[0]:c[0] + b, c[1]:c[1] + b, c[2]:c[2] + b].astype(
+            numpy.int64) << corner
+
+    # The crossed cells
+    cells = numpy.argwhere(CELL_PATCHES_COUNTS[configurations] > 0)
+    cells_configurations = configurations[tuple(cells.T)]
+    global_cells = first_node + cells
+    cells_keys = (global_cells[:, 0] * grid_cells[1] + global_cells[:, 1]) * grid_cells[2] + \
+        global_cells[:, 2]
+
+    # The crossing points along the edges of the crossed cells, and their sums per patch
+    grid_nodes = grid_cells + 1
+    edges_keys = numpy.zeros((len(cells), len(CELL_EDGES)), dtype=numpy.int64)
+    edges_vertices = numpy.zeros((len(cells), len(CELL_EDGES), 3))
+    crossing_sum = numpy.zeros((len(cells), MAXIMUM_CELL_PATCHES, 3))
+    crossing_count = numpy.zeros((len(cells), MAXIMUM_CELL_PATCHES))
+    for edge, (a_corner, b_corner) in enumerate(CELL_EDGES):
+
+        # The values at the two ends of the edge of every cell
+        ca = CELL_CORNERS[a_corner]
+        cb = CELL_CORNERS[b_corner]
+        fa = field[tuple((cells + ca).T)]
+        fb = field[tuple((cells + cb).T)]
+
+        # The crossing points, in local units
+        crossed = (fa < 0.0) != (fb < 0.0)
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            t = numpy.where(crossed, fa / (fa - fb), 0.0)
+        crossing = cells + ca + t[:, None] * (cb - ca)
+        edges_vertices[:, edge] = origin + (first_node + crossing) * voxel_size
+
+        # The global key of the edge
+        start = global_cells + ca
+        edges_keys[:, edge] = ((start[:, 0] * grid_nodes[1] + start[:, 1]) * grid_nodes[2] +
+                               start[:, 2]) * 3 + int(numpy.argmax(cb - ca))
+
+        # Add the crossing point to the patch of the edge
+        patches = CELL_PATCHES_TABLE[cells_configurations, edge]
+        rows = numpy.nonzero(crossed)[0]
+        numpy.add.at(crossing_sum, (rows, patches[rows]), crossing[rows])
+        numpy.add.at(crossing_count, (rows, patches[rows]), 1.0)
+
+    # The vertices of the patches
+    patches = numpy.argwhere(crossing_count > 0)
+    patches_keys = cells_keys[patches[:, 0]] * MAXIMUM_CELL_PATCHES + patches[:, 1]
+    patches_vertices = origin + (first_node + crossing_sum[tuple(patches.T)] /
+                                 crossing_count[tuple(patches.T)][:, None]) * voxel_size
+
+    # A triangle per oriented segment of every cell
+    segments_counts = CELL_SEGMENTS_COUNTS[cells_configurations]
+    triangles_cells = numpy.repeat(numpy.arange(len(cells)), segments_counts)
+    triangles_segments = numpy.arange(len(triangles_cells)) - numpy.repeat(
+        numpy.cumsum(segments_counts) - segments_counts, segments_counts)
+    segments = CELL_SEGMENTS_TABLE[cells_configurations[triangles_cells], triangles_segments]
+    triangles_patches_keys = cells_keys[triangles_cells] * MAXIMUM_CELL_PATCHES + segments[:, 0]
+    triangles_edges_keys = numpy.stack([edges_keys[triangles_cells, segments[:, 1]],
+                                        edges_keys[triangles_cells, segments[:, 2]]], axis=1)
+
+    # The vertices of the crossed edges only
+    crossed_edges = CELL_PATCHES_TABLE[cells_configurations] >= 0
+    edges_keys = edges_keys[crossed_edges]
+    edges_vertices = edges_vertices[crossed_edges]
+
+    # Return the data of the block
+    return edges_keys, edges_vertices, patches_keys, patches_vertices, \
+        triangles_patches_keys, triangles_edges_keys
+
+
+####################################################################################################
+# @mesh_implicit_surface_block_task
+####################################################################################################
+def mesh_implicit_surface_block_task(arguments):
+    """A wrapper around @mesh_implicit_surface_block that takes a tuple of arguments, to be used
+    with a process pool.
+
+    :param arguments:
+        A tuple of the arguments of @mesh_implicit_surface_block.
+    :return:
+        The data of the block.
+    """
+
+    return mesh_implicit_surface_block(*arguments)
+
+
+####################################################################################################
+# @mesh_capsules_implicit_surface
+####################################################################################################
+def mesh_capsules_implicit_surface(points,
+                                   radii,
+                                   offsets,
+                                   voxel_size,
+                                   block_size=16,
+                                   workers=1):
+    """Reconstructs a watertight mesh of the implicit surface of the union of the capsules of all
+    the segments of a morphology.
+
+    The signed distance field is evaluated on a block-sparse voxel grid, where only the blocks
+    that are touched by the capsules are processed, and each block only evaluates the capsules
+    that touch it. The surface is extracted with marching cubes, where the ambiguous faces are
+    resolved consistently and every patch of a cell is triangulated around its centroid, see
+    @compute_cell_tables. Every segment on a face is shared by the two patches on both sides
+    of the face, so the surface is a closed and oriented 2-manifold. The blocks are independent
+    and can be processed in parallel in a process pool.
+
+    :param points:
+        An array of the positions of the samples [N, 3].
+    :param radii:
+        An array of the radii of the samples [N].
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :param voxel_size:
+        The size of a voxel, which defines the resolution of the mesh.
+    :param block_size:
+        The number of voxels of a block along each axis.
+    :param workers:
+        The number of processes that mesh the blocks in parallel, 1 runs in this process.
+    :return:
+        A tuple of (vertices [V, 3], faces [F, 3]).
+    """
+
+    # The capsules of the segments
+    p0, p1, r0, r1 = compute_capsules_arrays(points, radii, offsets)
+    if len(p0) == 0:
+        return numpy.zeros((0, 3)), numpy.zeros((0, 3), dtype=numpy.int64)
+
+    # The bounding boxes of the capsules, extended by a margin of two voxels
+    margin = 2.0 * voxel_size
+    capsules_min = numpy.minimum(p0 - r0[:, None], p1 - r1[:, None]) - margin
+    capsules_max = numpy.maximum(p0 + r0[:, None], p1 + r1[:, None]) + margin
+
+    # The voxel grid, in blocks
+    origin = capsules_min.min(axis=0) - margin
+    block_extent = block_size * voxel_size
+    grid_blocks = numpy.ceil(
+        (capsules_max.max(axis=0) + margin - origin) / block_extent).astype(numpy.int64)
+    grid_cells = grid_blocks * block_size
+
+    # The active blocks and their capsules
+    blocks, capsules_offsets, capsules = get_active_blocks(
+        capsules_min, capsules_max, origin, block_extent, grid_blocks)
+
+    # The tasks of the blocks
+    tasks = list()
+    for i, block in enumerate(blocks):
+        block_capsules = capsules[capsules_offsets[i]:capsules_offsets[i + 1]]
+        tasks.append((block, origin, voxel_size, block_size, grid_cells, p0[block_capsules],
+                      p1[block_capsules], r0[block_capsules], r1[block_capsules]))
+
+    # Mesh the blocks
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(mesh_implicit_surface_block_task, tasks, chunksize=16))
+    else:
+        results = [mesh_implicit_surface_block_task(task) for task in tasks]
+
+    # Gather the vertices and the triangles of all the blocks
+    edges_keys = numpy.concatenate([result[0] for result in results])
+    edges_vertices = numpy.concatenate([result[1] for result in results])
+    patches_keys = numpy.concatenate([result[2] for result in results])
+    patches_vertices = numpy.concatenate([result[3] for result in results])
+    triangles_patches_keys = numpy.concatenate([result[4] for result in results])
+    triangles_edges_keys = numpy.concatenate([result[5] for result in results])
+    if len(patches_keys) == 0:
+        return numpy.zeros((0, 3)), numpy.zeros((0, 3), dtype=numpy.int64)
+
+    # The edges on the borders of the blocks are shared, keep a single vertex per edge
+    edges_keys, unique_edges = numpy.unique(edges_keys, return_index=True)
+    edges_vertices = edges_vertices[unique_edges]
+
+    # The patches belong to a single block
+    order = numpy.argsort(patches_keys)
+    patches_keys = patches_keys[order]
+    patches_vertices = patches_vertices[order]
+
+    # The vertices of the edges first, then the vertices of the patches
+    vertices = numpy.concatenate([edges_vertices, patches_vertices])
+    faces = numpy.stack([
+        len(edges_keys) + numpy.searchsorted(patches_keys, triangles_patches_keys),
+        numpy.searchsorted(edges_keys, triangles_edges_keys[:, 0]),
+        numpy.searchsorted(edges_keys, triangles_edges_keys[:, 1])], axis=1)
+
+    # Return the mesh
+    return vertices, faces
@@ -0,0 +1,181 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Blender imports
+import bpy
+
+
+####################################################################################################
+# @get_mesh_object_arrays
+####################################################################################################
+def get_mesh_object_arrays(mesh_object):
+    """Gets the geometry of a given mesh object as flat arrays.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        A tuple of (vertices [V, 3], loops [L], loops totals [F]), where the vertex indices of the
+        i-th face are the next loops totals[i] entries in the loops array.
+    """
+
+    # Mesh data
+    mesh_data = mesh_object.data
+
+    # Vertices
+    vertices = numpy.zeros(3 * len(mesh_data.vertices), dtype=numpy.float32)
+    mesh_data.vertices.foreach_get('co', vertices)
+
+    # Loops
+    loops = numpy.zeros(len(mesh_data.loops), dtype=numpy.int32)
+    mesh_data.loops.foreach_get('vertex_index', loops)
+
+    # Faces
+    loops_totals = numpy.zeros(len(mesh_data.polygons), dtype=numpy.int32)
+    mesh_data.polygons.foreach_get('loop_total', loops_totals)
+
+    # Return the arrays
+    return vertices.reshape(-1, 3), loops, loops_totals
+
+
+####################################################################################################
+# @create_mesh_object_from_arrays
+####################################################################################################
+def create_mesh_object_from_arrays(name,
+                                   vertices,
+                                   loops,
+                                   loops_totals,
+                                   smooth_shading=False,
+                                   material_indices=None):
+    """Creates a mesh object from flat arrays and links it to the scene. The mesh data are
+    created in bulk.
+
+    :param name:
+        The name of the mesh object.
+    :param vertices:
+        An array of vertices [V, 3].
+    :param loops:
+        An array of the vertex indices of the faces [L].
+    :param loops_totals:
+        An array of the number of vertices of every face [F].
+    :param smooth_shading:
+        Shade the faces of the mesh smoothly.
+    :param material_indices:
+        An optional array of the material indices of the faces [F].
+    :return:
+        A reference to the created mesh object.
+    """
+
+    # Create the mesh data
+    mesh_data = bpy.data.meshes.new(name)
+
+    # Allocate the vertices, loops and faces
+    mesh_data.vertices.add(len(vertices))
+    mesh_data.loops.add(len(loops))
+    mesh_data.polygons.add(len(loops_totals))
+
+    # The start of every face in the loops array
+    loops_starts = numpy.zeros(len(loops_totals), dtype=numpy.int32)
+    numpy.cumsum(loops_totals[:-1], out=loops_starts[1:])
+
+    # Update the data in bulk
+    mesh_data.vertices.foreach_set(
+        'co', numpy.ascontiguousarray(vertices, dtype=numpy.float32).ravel())
+    mesh_data.loops.foreach_set('vertex_index', numpy.asarray(loops, dtype=numpy.int32))
+    mesh_data.polygons.foreach_set('loop_start', loops_starts)
+    mesh_data.polygons.foreach_set('loop_total', numpy.asarray(loops_totals, dtype=numpy.int32))
+
+    # Smooth shading
+    if smooth_shading:
+        mesh_data.polygons.foreach_set('use_smooth', numpy.ones(len(loops_totals), dtype=bool))
+
+    # Material indices
+    if material_indices is not None:
+        mesh_data.polygons.foreach_set(
+            'material_index', numpy.asarray(material_indices, dtype=numpy.int32))
+
+    # Update the mesh
+    mesh_data.update(calc_edges=True)
+    mesh_data.validate()
+
+    # Create the mesh object and link it to the scene
+    mesh_object = bpy.data.objects.new(name, mesh_data)
+    bpy.context.scene.collection.objects.link(mesh_object)
+
+    # Return a reference to the mesh object
+    return mesh_object
+
+
+####################################################################################################
+# @set_mesh_faces_material_indices
+####################################################################################################
+def set_mesh_faces_material_indices(mesh_object,
+                                    material_indices):
+    """Updates the material indices of all the faces of an existing mesh object in a single step,
+    without changing the geometry.
+
+    :param mesh_object:
+        A mesh object in the scene.
+    :param material_indices:
+        An array of material indices, one per face in the mesh [F].
+    :return:
+        True if the indices were updated, or False if the object is not a mesh or the number of
+        indices does not match the number of faces.
+    """
+
+    # The object must be a mesh with a face per index
+    if mesh_object.type != 'MESH' or len(mesh_object.data.polygons) != len(material_indices):
+        return False
+
+    # Update the indices in bulk
+    mesh_object.data.polygons.foreach_set(
+        'material_index', numpy.ascontiguousarray(material_indices, dtype=numpy.int32))
+
+    # Update the mesh
+    mesh_object.data.update()
+
+    # Done
+    return True
+
+
+####################################################################################################
+# @concatenate_mesh_arrays
+####################################################################################################
+def concatenate_mesh_arrays(meshes_arrays):
+    """Concatenates the arrays of multiple meshes into the arrays of a single mesh.
+
+    :param meshes_arrays:
+        A list of tuples (vertices, loops, loops totals).
+    :return:
+        A tuple of (vertices, loops, loops totals) of the concatenated mesh.
+    """
+
+    # The first vertex of every mesh in the concatenated vertices
+    vertices_offsets = numpy.cumsum([0] + [len(arrays[0]) for arrays in meshes_arrays])
+
+    # Concatenate the arrays and shift the vertex indices of the loops
+    vertices = numpy.concatenate(
+        [numpy.zeros((0, 3), dtype=numpy.float32)] + [arrays[0] for arrays in meshes_arrays])
+    loops = numpy.concatenate([numpy.zeros(0, dtype=numpy.int32)] + [
+        arrays[1] + offset for arrays, offset in zip(meshes_arrays, vertices_offsets)])
+    loops_totals = numpy.concatenate(
+        [numpy.zeros(0, dtype=numpy.int32)] + [arrays[2] for arrays in meshes_arrays])
+
+    # Return the arrays
+    return vertices, loops.astype(numpy.int32), loops_totals.astype(numpy.int32)
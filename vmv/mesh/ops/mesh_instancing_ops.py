@@ -0,0 +1,138 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Blender imports
+import bpy
+
+
+####################################################################################################
+# @get_instancing_faces_vertices
+####################################################################################################
+def get_instancing_faces_vertices(points,
+                                  scales):
+    """Computes the vertices of a triangle per point, such that the triangle is centered at the
+    point and its area is the square of the scale of the point.
+
+    NOTE: When the faces of a mesh are used to instance another object with the face scaling
+    enabled, the instance is placed at the center of the face and scaled by the square root of
+    its area. A triangle per point is therefore sufficient to encode a per-point position and
+    scale with only three vertices, irrespective to the complexity of the instanced object.
+
+    :param points:
+        An array of points [N, 3].
+    :param scales:
+        An array of the scales of the points [N].
+    :return:
+        An array of the vertices of the triangles [3 * N, 3].
+    """
+
+    # A right-angled isosceles triangle with an area of scale^2 has legs of scale * sqrt(2)
+    legs = numpy.sqrt(2.0) * numpy.asarray(scales, dtype=numpy.float32)
+
+    # The offsets of the three vertices of the triangle with respect to its centroid
+    offsets = numpy.array([[-1.0, -1.0, 0.0],
+                           [2.0, -1.0, 0.0],
+                           [-1.0, 2.0, 0.0]], dtype=numpy.float32) / 3.0
+
+    # Vertices of all the triangles
+    vertices = numpy.asarray(points, dtype=numpy.float32)[:, None, :] + \
+        legs[:, None, None] * offsets[None, :, :]
+
+    # Return a flat array of the vertices
+    return vertices.reshape(-1, 3)
+
+
+####################################################################################################
+# @create_instancing_mesh_object
+####################################################################################################
+def create_instancing_mesh_object(name,
+                                  points,
+                                  scales):
+    """Creates a mesh object that has a single triangle per point, to be used to instance a
+    shared object at each point with a specific scale. The mesh data are created in bulk.
+
+    :param name:
+        The name of the mesh object.
+    :param points:
+        An array of points [N, 3].
+    :param scales:
+        An array of the scales of the points [N].
+    :return:
+        A reference to the created mesh object.
+    """
+
+    # Vertices of all the triangles
+    vertices = get_instancing_faces_vertices(points=points, scales=scales)
+
+    # Number of points
+    number_points = len(vertices) // 3
+
+    # Create the mesh data
+    mesh_data = bpy.data.meshes.new(name)
+
+    # Allocate the vertices, loops and faces
+    mesh_data.vertices.add(len(vertices))
+    mesh_data.loops.add(len(vertices))
+    mesh_data.polygons.add(number_points)
+
+    # Update the data in bulk, each triangle uses three consecutive vertices
+    mesh_data.vertices.foreach_set('co', vertices.ravel())
+    mesh_data.loops.foreach_set('vertex_index', numpy.arange(len(vertices), dtype=numpy.int32))
+    mesh_data.polygons.foreach_set(
+        'loop_start', numpy.arange(0, len(vertices), 3, dtype=numpy.int32))
+    mesh_data.polygons.foreach_set('loop_total', numpy.full(number_points, 3, dtype=numpy.int32))
+
+    # Update the mesh
+    mesh_data.update(calc_edges=True)
+    mesh_data.validate()
+
+    # Create the mesh object and link it to the scene
+    mesh_object = bpy.data.objects.new(name, mesh_data)
+    bpy.context.scene.collection.objects.link(mesh_object)
+
+    # Return a reference to the mesh object
+    return mesh_object
+
+
+####################################################################################################
+# @instance_object_on_faces
+####################################################################################################
+def instance_object_on_faces(instancing_object,
+                             instanced_object):
+    """Instances a given object on the faces of the instancing object, where each instance is
+    scaled by the size of its face.
+
+    :param instancing_object:
+        The mesh object that has the faces where the instances will be placed.
+    :param instanced_object:
+        The object that will be instanced on the faces, for example a unit sphere.
+    """
+
+    # Parent the instanced object to the instancing one
+    instanced_object.parent = instancing_object
+
+    # Instance the object on the faces and scale it by the size of the faces
+    instancing_object.instance_type = 'FACES'
+    instancing_object.use_instance_faces_scale = True
+    instancing_object.instance_faces_scale = 1.0
+
+    # Only the instances are visible, not the faces of the instancing object
+    instancing_object.show_instancer_for_viewport = False
+    instancing_object.show_instancer_for_render = False
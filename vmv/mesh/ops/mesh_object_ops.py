@@ -642,3 +642,44 @@ def join_mesh_objects(mesh_list,
 
     # Return a reference to the resulting mesh
     return result_mesh
+
+
+####################################################################################################
+# @crop_mesh_object_to_bounds
+####################################################################################################
+def crop_mesh_object_to_bounds(mesh_object,
+                               p_min,
+                               p_max):
+    """Crops a given mesh object to an axis-aligned box, removing all the geometry outside it.
+
+    :param mesh_object:
+        A given mesh object to crop.
+    :param p_min:
+        The minimum point of the box.
+    :param p_max:
+        The maximum point of the box.
+    """
+
+    # Get a bmesh from the mesh object
+    bmesh_object = bmesh.new()
+    bmesh_object.from_mesh(mesh_object.data)
+
+    # Cut the mesh by the six planes of the box and remove the geometry outside it
+    for axis in range(3):
+        for point, sign in ((p_min, -1.0), (p_max, 1.0)):
+
+            # The plane of the box, its normal points outside the box
+            plane_co = [0.0, 0.0, 0.0]
+            plane_co[axis] = point[axis]
+            plane_no = [0.0, 0.0, 0.0]
+            plane_no[axis] = sign
+
+            # Bisect
+            geometry = bmesh_object.verts[:] + bmesh_object.edges[:] + bmesh_object.faces[:]
+            bmesh.ops.bisect_plane(bmesh_object, geom=geometry, dist=1e-6,
+                                   plane_co=plane_co, plane_no=plane_no, clear_outer=True)
+
+    # Update the mesh object
+    bmesh_object.to_mesh(mesh_object.data)
+    bmesh_object.free()
+    mesh_object.data.update()
@@ -0,0 +1,257 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# @normalize_vectors
+####################################################################################################
+def normalize_vectors(vectors):
+    """Normalizes an array of vectors, leaving the zero vectors as they are.
+
+    :param vectors:
+        An array of vectors [N, 3].
+    :return:
+        An array of unit vectors [N, 3].
+    """
+
+    # The lengths of the vectors
+    lengths = numpy.linalg.norm(vectors, axis=1)
+
+    # Normalize
+    return vectors / numpy.where(lengths > 1e-12, lengths, 1.0)[:, None]
+
+
+####################################################################################################
+# @compute_samples_tangents
+####################################################################################################
+def compute_samples_tangents(points,
+                             offsets):
+    """Computes the unit tangents of all the samples of the sections at once, where the tangent of
+    an inner sample bisects its two segments.
+
+    :param points:
+        An array of the positions of the samples [N, 3].
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :return:
+        An array of the tangents [N, 3].
+    """
+
+    # The direction of the segment that starts at every sample, the last sample of every section
+    # does not start a segment
+    directions = numpy.zeros_like(points)
+    directions[:-1] = normalize_vectors(points[1:] - points[:-1])
+    last = offsets[1:] - 1
+    last = last[last >= 0]
+    directions[last] = 0.0
+
+    # The direction of the segment that ends at every sample
+    previous_directions = numpy.zeros_like(points)
+    previous_directions[1:] = directions[:-1]
+    previous_directions[offsets[:-1][offsets[:-1] < len(points)]] = 0.0
+
+    # Average the two directions
+    tangents = normalize_vectors(directions + previous_directions)
+
+    # Fall back to the segment direction if the two directions cancel each other
+    degenerate = numpy.linalg.norm(tangents, axis=1) < 0.5
+    tangents[degenerate] = numpy.where(
+        numpy.linalg.norm(directions[degenerate], axis=1)[:, None] > 0.5,
+        directions[degenerate], previous_directions[degenerate])
+
+    # Any remaining degenerate tangent, for example along zero-length sections, is set to Z
+    degenerate = numpy.linalg.norm(tangents, axis=1) < 0.5
+    tangents[degenerate] = (0.0, 0.0, 1.0)
+
+    # Return the tangents
+    return tangents
+
+
+####################################################################################################
+# @compute_parallel_transport_frames
+####################################################################################################
+def compute_parallel_transport_frames(points,
+                                      tangents,
+                                      offsets):
+    """Computes rotation-minimizing (parallel transport) normals along all the sections, using the
+    double reflection method. The sections are processed together, sample index by sample index.
+
+    :param points:
+        An array of the positions of the samples [N, 3].
+    :param tangents:
+        An array of the unit tangents of the samples [N, 3].
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :return:
+        An array of the unit normals [N, 3], perpendicular to the tangents.
+    """
+
+    # The normals
+    normals = numpy.zeros_like(points)
+
+    # The non-empty sections
+    counts = numpy.diff(offsets)
+    starts = offsets[:-1][counts > 0]
+    counts = counts[counts > 0]
+    if len(starts) == 0:
+        return normals
+
+    # The initial normal of every section is perpendicular to its first tangent
+    t = tangents[starts]
+    helper = numpy.zeros_like(t)
+    helper[numpy.arange(len(t)), numpy.argmin(numpy.abs(t), axis=1)] = 1.0
+    normals[starts] = normalize_vectors(numpy.cross(t, helper))
+
+    # Transport the normals sample by sample, for all the sections that are long enough
+    for j in range(1, counts.max()):
+
+        # The sections that have the j-th sample
+        active = starts[counts > j]
+        i0 = active + j - 1
+        i1 = active + j
+
+        # First reflection, across the plane bisecting the two samples
+        v1 = points[i1] - points[i0]
+        c1 = numpy.maximum(numpy.einsum('ij,ij->i', v1, v1), 1e-24)
+        r_l = normals[i0] - (2.0 / c1 * numpy.einsum('ij,ij->i', v1, normals[i0]))[:, None] * v1
+        t_l = tangents[i0] - (2.0 / c1 * numpy.einsum('ij,ij->i', v1, tangents[i0]))[:, None] * v1
+
+        # Second reflection, to align the reflected tangent with the next tangent
+        v2 = tangents[i1] - t_l
+        c2 = numpy.maximum(numpy.einsum('ij,ij->i', v2, v2), 1e-24)
+        transported = r_l - (2.0 / c2 * numpy.einsum('ij,ij->i', v2, r_l))[:, None] * v2
+
+        # Remove any drift and normalize
+        transported -= numpy.einsum('ij,ij->i', transported, tangents[i1])[:, None] * tangents[i1]
+        normals[i1] = normalize_vectors(transported)
+
+    # Return the normals
+    return normals
+
+
+####################################################################################################
+# @compute_swept_tubes_arrays
+####################################################################################################
+def compute_swept_tubes_arrays(points,
+                               radii,
+                               offsets,
+                               sides=16,
+                               caps=True):
+    """Sweeps a circular profile along all the sections at once and returns the mesh arrays of
+    the resulting tubes, where each section is a closed tube if the caps are added.
+
+    :param points:
+        An array of the positions of the samples [N, 3].
+    :param radii:
+        An array of the radii of the samples [N].
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :param sides:
+        The number of sides of the circular profile.
+    :param caps:
+        Close the two ends of every section with a polygon.
+    :return:
+        A tuple of (vertices [V, 3], loops [L], loops totals [F]).
+    """
+
+    # Only the sections that have at least two samples are swept
+    counts = numpy.diff(offsets)
+    valid = counts >= 2
+    samples = numpy.repeat(valid, counts)
+    points = points[samples]
+    radii = radii[samples]
+    counts = counts[valid]
+    offsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=offsets[1:])
+
+    # The frames of the samples
+    tangents = compute_samples_tangents(points, offsets)
+    normals = compute_parallel_transport_frames(points, tangents, offsets)
+    binormals = numpy.cross(tangents, normals)
+
+    # The profile
+    angles = 2.0 * numpy.pi * numpy.arange(sides) / sides
+    cosines = numpy.cos(angles)
+    sines = numpy.sin(angles)
+
+    # A ring of vertices per sample
+    vertices = points[:, None, :] + radii[:, None, None] * (
+        cosines[None, :, None] * normals[:, None, :] + sines[None, :, None] * binormals[:, None, :])
+    vertices = vertices.reshape(-1, 3)
+
+    # A quad between every two consecutive rings of the same section
+    rings = numpy.arange(len(points), dtype=numpy.int64)
+    rings = rings[numpy.isin(rings, offsets[1:] - 1, invert=True)]
+    k = numpy.arange(sides, dtype=numpy.int64)
+    k_next = (k + 1) % sides
+    first = rings[:, None] * sides
+    second = (rings[:, None] + 1) * sides
+    quads = numpy.stack([first + k, first + k_next, second + k_next, second + k], axis=2)
+    loops = [quads.reshape(-1)]
+    loops_totals = [numpy.full(len(rings) * sides, 4, dtype=numpy.int32)]
+
+    # The caps, oriented to point outside the tube
+    if caps:
+        first_rings = offsets[:-1][:, None] * sides + k[::-1]
+        last_rings = (offsets[1:] - 1)[:, None] * sides + k
+        loops.extend([first_rings.reshape(-1), last_rings.reshape(-1)])
+        loops_totals.append(numpy.full(2 * len(counts), sides, dtype=numpy.int32))
+
+    # Return the arrays
+    return vertices, numpy.concatenate(loops).astype(numpy.int32), \
+        numpy.concatenate(loops_totals).astype(numpy.int32)
+
+
+####################################################################################################
+# @get_swept_tubes_faces_segments
+####################################################################################################
+def get_swept_tubes_faces_segments(offsets,
+                                   sides=16,
+                                   caps=True):
+    """Gets the index of the segment that every face of the tubes created by
+    compute_swept_tubes_arrays belongs to, where the segments are numbered along the sections
+    in order. Every cap belongs to the first or the last segment of its section.
+
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :param sides:
+        The number of sides of the circular profile.
+    :param caps:
+        The tubes were closed with caps.
+    :return:
+        An array of segment indices [F].
+    """
+
+    # The number of segments of the sections that are swept
+    counts = numpy.diff(offsets)
+    segments_counts = counts[counts >= 2] - 1
+    segments_offsets = numpy.zeros(len(segments_counts) + 1, dtype=numpy.int64)
+    numpy.cumsum(segments_counts, out=segments_offsets[1:])
+
+    # The sides of every segment
+    faces_segments = [numpy.repeat(numpy.arange(segments_offsets[-1], dtype=numpy.int64), sides)]
+
+    # The caps at the first and the last segment of every section
+    if caps:
+        faces_segments.extend([segments_offsets[:-1], segments_offsets[1:] - 1])
+
+    # Return the indices
+    return numpy.concatenate(faces_segments)
+
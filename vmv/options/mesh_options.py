@@ -58,6 +58,18 @@ class MeshOptions:
         # Automatically detect the resolution of the meta ball object
         self.meta_auto_resolution = True
 
+        # Number of spatial tiles along each axis of the meta object, 1 meshes it as a single tile
+        self.meta_tiles = 1
+
+        # Number of the processes that mesh the tiles in parallel, 0 uses all the available cores
+        self.meta_tiles_workers = 0
+
+        # Voxel size of the implicit surface grid, 0 sets it automatically from the smallest radius
+        self.implicit_voxel_size = 0.0
+
+        # Number of the processes that mesh the implicit surface, 0 uses all the available cores
+        self.implicit_workers = 0
+
         # Export in circuit coordinates, by default no unless there is a circuit file given
         self.global_coordinates = False
 
@@ -96,6 +108,12 @@ class MeshOptions:
         # The scale factor used to scale the morphology rendering frame, default 1.0
         self.resolution_scale_factor = 1.0
 
+        # The number of Blender workers that render the 360 sequence in parallel
+        self.rendering_workers = vmv.consts.Image.DEFAULT_RENDERING_WORKERS
+
+        # The size of the tiles of the images rendered to scale, 0 renders a single image
+        self.rendering_tile_size = 0
+
         # MESH EXPORT ##############################################################################
         # Save the reconstructed mesh as a .ply file to the output directory
         self.export_ply = False
@@ -44,6 +44,9 @@ class MorphologyOptions:
         # Morphology label, based on the morphology file name
         self.label = None
 
+        # Analyze the morphology skeleton and export the results
+        self.analyze = False
+
         # The method used to build the morphology skeleton object in the scene from the raw file
         self.reconstruction_method = vmv.enums.Morphology.ReconstructionMethod.DISCONNECTED_SECTIONS
 
@@ -72,6 +75,19 @@ class MorphologyOptions:
         # Adaptive resampling of the sections to reduce the number of samples
         self.adaptive_resampling = False
 
+        # The level in the levels-of-detail pyramid of the skeleton, where 0 is the original one
+        self.level_of_detail = 0
+
+        # Instance a single shared sphere on the samples instead of creating a sphere per sample
+        self.samples_instancing = False
+
+        # Draw the segments as a single tube mesh instead of a spline per segment
+        self.segments_as_mesh = False
+
+        # The number of poly-lines drawn per step when the skeleton is built progressively in the
+        # UI, or 0 to build the skeleton at once
+        self.progressive_build_chunk_size = 0
+
         # Number of sides of the bevel object used to scale the sections
         # This parameter controls the quality of the reconstructed morphology
         self.bevel_object_sides = vmv.consts.Bevel.BEVEL_OBJECT_SIDES
@@ -88,6 +104,9 @@ class MorphologyOptions:
         # The resolution of the colormap (number of samples)
         self.color_map_resolution = vmv.consts.Color.COLOR_MAP_RESOLUTION
 
+        # How the values are mapped to the color-map, linear, log or quantile
+        self.color_map_normalization = vmv.enums.ColorMapNormalization.LINEAR
+
         # Morphology color-map colors (this is probably set from the GUI)
         self.color_map_colors = list()
 
@@ -116,6 +135,12 @@ class MorphologyOptions:
         # The scale factor used to scale the morphology rendering frame, default 1.0
         self.resolution_scale_factor = 1.0
 
+        # The number of Blender workers that render the 360 sequence in parallel
+        self.rendering_workers = vmv.consts.Image.DEFAULT_RENDERING_WORKERS
+
+        # The size of the tiles of the images rendered to scale, 0 renders a single image
+        self.rendering_tile_size = 0
+
         # Export the morphology to .H5 file
         self.export_h5 = False
 
@@ -95,6 +95,9 @@ class VessMorphoVisOptions:
         # Morphology reconstruction flag
         self.morphology.reconstruct_morphology = arguments.reconstruct_morphology_skeleton
 
+        # Morphology analysis flag
+        self.morphology.analyze = arguments.analyze_morphology
+
         # Morphology reconstruction method
         self.morphology.reconstruction_method = vmv.enums.Morphology.ReconstructionMethod.get_enum(
            argument=arguments.morphology_reconstruction_algorithm)
@@ -117,6 +120,15 @@ class VessMorphoVisOptions:
         # Bevel object sides used for the branches reconstruction
         self.morphology.bevel_object_sides = arguments.bevel_sides
 
+        # Level of detail of the skeleton
+        self.morphology.level_of_detail = arguments.level_of_detail
+
+        # Instance the samples
+        self.morphology.samples_instancing = arguments.instance_samples
+
+        # Draw the segments as a mesh
+        self.morphology.segments_as_mesh = arguments.segments_as_mesh
+
         # Sections radii
         self.morphology.radii = vmv.enums.Morphology.Radii.get_enum(arguments.sections_radii)
 
@@ -152,6 +164,12 @@ class VessMorphoVisOptions:
         # Resolution scale factor
         self.morphology.resolution_scale_factor = arguments.resolution_scale_factor
 
+        # The number of workers that render the 360 sequence
+        self.morphology.rendering_workers = arguments.rendering_workers
+
+        # The size of the tiles of the images rendered to scale
+        self.morphology.rendering_tile_size = arguments.rendering_tile_size
+
         # Export the morphology to .h5 file
         self.morphology.export_h5 = arguments.export_morphology_h5
 
@@ -195,6 +213,14 @@ class VessMorphoVisOptions:
             # Set the value of the MetaBalls resolution as per given by the user
             self.mesh.meta_resolution = float(arguments.meta_balls_resolution)
 
+        # MetaBalls tiles
+        self.mesh.meta_tiles = arguments.meta_balls_tiles
+        self.mesh.meta_tiles_workers = arguments.meta_balls_tiles_workers
+
+        # Implicit surface
+        self.mesh.implicit_voxel_size = arguments.implicit_surface_voxel_size
+        self.mesh.implicit_workers = arguments.implicit_surface_workers
+
         # Edges of the meshes, either hard or smooth
         self.mesh.edges = vmv.enums.Meshing.Edges.get_enum(arguments.edges)
 
@@ -227,6 +253,12 @@ class VessMorphoVisOptions:
         # Full view image resolution
         self.mesh.full_view_resolution = arguments.full_view_resolution
 
+        # The number of workers that render the 360 sequence
+        self.mesh.rendering_workers = arguments.rendering_workers
+
+        # The size of the tiles of the images rendered to scale
+        self.mesh.rendering_tile_size = arguments.rendering_tile_size
+
         # Mesh material
         self.mesh.material = vmv.enums.Shader.get_enum(arguments.shader)
 
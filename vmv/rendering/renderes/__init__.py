@@ -17,3 +17,5 @@
 
 
 from .renderer import *
+from .sequence_renderer import *
+from .tiled_renderer import *
@@ -75,7 +75,9 @@ def render_to_scale(bounding_box,
                     image_scale_factor=vmv.consts.Image.DEFAULT_IMAGE_SCALE_FACTOR,
                     image_name='image',
                     image_directory=None,
-                    keep_camera_in_scene=True):
+                    keep_camera_in_scene=True,
+                    tile_size=0,
+                    number_workers=1):
     """Render the reconstructed mesh to scale to a .PNG image.
 
     :param bounding_box:
@@ -91,8 +93,25 @@ def render_to_scale(bounding_box,
         then the prefix is included in @image_name.
     :param keep_camera_in_scene:
         Keep the camera used to do the rendering after the rendering is done.
+    :param tile_size:
+        If non-zero, the image is rendered in tiles of this size that are stitched afterwards.
+    :param number_workers:
+        The number of Blender workers that render the tiles, if the image is tiled.
+    :return:
+        True if the image is rendered, otherwise False if any of its tiles is not rendered.
     """
 
+    # Render the image in tiles
+    if tile_size > 0:
+        return vmv.rendering.render_tiles_to_scale(bounding_box=bounding_box,
+                                            camera_view=camera_view,
+                                            image_scale_factor=image_scale_factor,
+                                            image_name=image_name,
+                                            image_directory=image_directory,
+                                            tile_size=tile_size,
+                                            number_workers=number_workers,
+                                            keep_camera_in_scene=keep_camera_in_scene)
+
     # Create a camera
     skeleton_camera = vmv.rendering.Camera('MeshCamera_%s' % camera_view)
 
@@ -107,6 +126,9 @@ def render_to_scale(bounding_box,
                                           image_name=image_prefix,
                                           keep_camera_in_scene=keep_camera_in_scene)
 
+    # Done
+    return True
+
 
 ################################################################################################
 # @render_at_angle
@@ -0,0 +1,503 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import math
+import time
+import shutil
+import tempfile
+import subprocess
+
+# Blender imports
+import bpy
+
+# Internal imports
+import vmv
+import vmv.consts
+import vmv.enums
+import vmv.rendering
+import vmv.scene
+import vmv.utilities
+
+
+# The name of the empty object that all the rendered objects are parented to, and rotated
+ROTATION_PIVOT_NAME = 'VMVRotationPivot'
+
+
+####################################################################################################
+# @get_frame_image_prefix
+####################################################################################################
+def get_frame_image_prefix(output_directory,
+                           frame):
+    """Gets the path of the image of a frame in a sequence, without the .png extension.
+
+    :param output_directory:
+        The directory of the sequence.
+    :param frame:
+        The index of the frame.
+    :return:
+        The image path prefix of the frame.
+    """
+
+    return '%s/%s' % (output_directory, '{0:05d}'.format(frame))
+
+
+####################################################################################################
+# @get_missing_frames
+####################################################################################################
+def get_missing_frames(output_directory,
+                       frames):
+    """Gets the frames of a sequence that are not rendered yet, i.e. their images do not exist in
+    the output directory. This allows resuming an interrupted sequence, since the frames are
+    renamed to their final names only once they are written completely.
+
+    :param output_directory:
+        The directory of the sequence.
+    :param frames:
+        A list of the indices of the frames.
+    :return:
+        A list of the indices of the frames that are not rendered.
+    """
+
+    return [frame for frame in frames
+            if not os.path.isfile('%s.png' % get_frame_image_prefix(output_directory, frame))]
+
+
+####################################################################################################
+# @split_frames_across_workers
+####################################################################################################
+def split_frames_across_workers(frames,
+                                number_workers):
+    """Splits the frames of a sequence across a number of workers, where every worker takes every
+    N-th frame to balance the rendering time between the workers.
+
+    :param frames:
+        A list of the indices of the frames.
+    :param number_workers:
+        The number of workers.
+    :return:
+        A list of lists of frames, one per worker with at least one frame.
+    """
+
+    # Split the frames
+    chunks = [frames[i::max(1, number_workers)] for i in range(max(1, number_workers))]
+
+    # Ignore the workers without frames
+    return [chunk for chunk in chunks if len(chunk) > 0]
+
+
+####################################################################################################
+# @launch_blender_worker
+####################################################################################################
+def launch_blender_worker(blend_file,
+                          worker_script,
+                          arguments,
+                          log_file_path):
+    """Launches a headless Blender process that loads a saved scene and runs one of the worker
+    scripts in vmv/interface/cli on it.
+
+    :param blend_file:
+        The .blend file of the scene that is loaded by the worker.
+    :param worker_script:
+        The name of the worker script in vmv/interface/cli, e.g. 'sequence_rendering.py'.
+    :param arguments:
+        A list of the arguments that are given to the worker script.
+    :param log_file_path:
+        The path of the file where the output of the worker is written.
+    :return:
+        A tuple of the worker process and its opened log file, that is closed by the caller.
+    """
+
+    # The path to the worker script
+    worker_script_path = '%s/interface/cli/%s' % (
+        os.path.dirname(os.path.realpath(vmv.__file__)), worker_script)
+
+    # The command of the worker, that exits with an error if the script fails
+    command = [bpy.app.binary_path, '-b', blend_file, '--python-exit-code', '1',
+               '--python', worker_script_path, '--']
+    command += arguments
+
+    # Start the worker and keep its log
+    log_file = open(log_file_path, 'w')
+    return subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT), log_file
+
+
+####################################################################################################
+# @create_rotation_pivot
+####################################################################################################
+def create_rotation_pivot(scene_objects,
+                          name=ROTATION_PIVOT_NAME):
+    """Creates an empty object at the origin and parents the given objects to it, so rotating the
+    pivot rotates all of them as a single object.
+
+    :param scene_objects:
+        A list of the objects that will be rotated.
+    :param name:
+        The name of the pivot.
+    :return:
+        A reference to the pivot.
+    """
+
+    # Create the empty object and link it to the scene
+    pivot = bpy.data.objects.new(name, None)
+    bpy.context.scene.collection.objects.link(pivot)
+
+    # The pivot is at the origin without rotation, so the objects are not moved. The objects
+    # that have a parent are rotated with it
+    for scene_object in scene_objects:
+        if scene_object.parent is None:
+            scene_object.parent = pivot
+
+    # Return a reference to the pivot
+    return pivot
+
+
+####################################################################################################
+# @remove_rotation_pivot
+####################################################################################################
+def remove_rotation_pivot(pivot):
+    """Removes a rotation pivot from the scene and restores the objects that are parented to it.
+
+    :param pivot:
+        A reference to the pivot.
+    """
+
+    # Reset the rotation and un-parent the objects
+    pivot.rotation_euler[1] = 0.0
+    for scene_object in pivot.children:
+        scene_object.parent = None
+
+    # Delete the pivot
+    bpy.data.objects.remove(pivot, do_unlink=True)
+
+
+####################################################################################################
+# @create_sequence_camera
+####################################################################################################
+def create_sequence_camera(bounding_box,
+                           image_resolution=vmv.consts.Image.DEFAULT_RESOLUTION,
+                           image_scale_factor=None):
+    """Creates a camera that is used to render all the frames of a 360 sequence.
+
+    :param bounding_box:
+        The 360 bounding box of the sequence.
+    :param image_resolution:
+        The resolution of the frames, if not rendered to scale.
+    :param image_scale_factor:
+        The scale factor of the frames if rendered to scale, otherwise None.
+    :return:
+        A reference to the camera.
+    """
+
+    # Create the camera
+    camera = vmv.rendering.Camera('VMVCamera_%s' % vmv.enums.Rendering.View.FRONT_360)
+    camera.setup_camera_for_scene(bounding_box, vmv.enums.Rendering.View.FRONT_360)
+
+    # Update the camera resolution
+    if image_scale_factor is not None:
+        camera.update_camera_resolution_to_scale(
+            scale_factor=image_scale_factor, camera_view=vmv.enums.Rendering.View.FRONT_360,
+            bounds=bounding_box.bounds)
+    else:
+        camera.update_camera_resolution(
+            resolution=image_resolution, camera_view=vmv.enums.Rendering.View.FRONT_360,
+            bounds=bounding_box.bounds)
+
+    # Set the film transparency
+    bpy.context.scene.render.film_transparent = True
+
+    # Return a reference to the camera
+    return camera
+
+
+####################################################################################################
+# @render_frame_with_rotation_pivot
+####################################################################################################
+def render_frame_with_rotation_pivot(camera,
+                                     pivot,
+                                     frame,
+                                     output_directory,
+                                     number_frames=360):
+    """Rotates the pivot to the angle of a given frame and renders the frame.
+
+    :param camera:
+        The camera of the sequence.
+    :param pivot:
+        The rotation pivot of the rendered objects.
+    :param frame:
+        The index of the frame.
+    :param output_directory:
+        The directory of the sequence.
+    :param number_frames:
+        The number of frames in a full rotation.
+    """
+
+    # Rotate the pivot around the y axis
+    pivot.rotation_euler[1] = math.radians(frame * 360.0 / number_frames)
+
+    # Render the frame to a temporary image and rename it once it is complete, so an interrupted
+    # frame is never taken as rendered when the sequence is resumed
+    image_prefix = get_frame_image_prefix(output_directory, frame)
+    camera.render_image(image_name='%s_tmp' % image_prefix)
+    os.replace('%s_tmp.png' % image_prefix, '%s.png' % image_prefix)
+
+
+####################################################################################################
+# @SequenceRenderer
+####################################################################################################
+class SequenceRenderer:
+    """Renders a 360 sequence of the objects in the scene, where the objects are parented to a
+    single pivot that is rotated per frame. The frames can be rendered in this process one frame
+    per step, or split across several headless Blender workers that load the scene once from a
+    saved .blend file. The frames that already exist in the output directory are skipped, so an
+    interrupted sequence can be resumed.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 scene_objects,
+                 bounding_box,
+                 output_directory,
+                 image_resolution=vmv.consts.Image.DEFAULT_RESOLUTION,
+                 image_scale_factor=None,
+                 number_frames=360,
+                 number_workers=1):
+        """Constructor
+
+        :param scene_objects:
+            A list of the objects that will be rotated.
+        :param bounding_box:
+            The 360 bounding box of the sequence.
+        :param output_directory:
+            The directory where the frames will be written.
+        :param image_resolution:
+            The resolution of the frames, if not rendered to scale.
+        :param image_scale_factor:
+            The scale factor of the frames if rendered to scale, otherwise None.
+        :param number_frames:
+            The number of frames in a full rotation.
+        :param number_workers:
+            The number of Blender workers, or 1 to render the frames in this process.
+        """
+
+        # The rendered objects
+        self.scene_objects = scene_objects
+
+        # The bounding box of the sequence
+        self.bounding_box = bounding_box
+
+        # The output directory
+        self.output_directory = output_directory
+
+        # The resolution
+        self.image_resolution = image_resolution
+        self.image_scale_factor = image_scale_factor
+
+        # The number of frames in a full rotation
+        self.number_frames = number_frames
+
+        # The number of workers
+        self.number_workers = max(1, int(number_workers))
+
+        # The frames that are not rendered yet, updated when the rendering starts
+        self.frames = list()
+
+        # The index of the next frame that is rendered in this process
+        self.next_frame = 0
+
+        # The rotation pivot and the camera, if the frames are rendered in this process
+        self.pivot = None
+        self.camera = None
+
+        # The worker processes and their temporary directory
+        self.workers = list()
+        self.workers_directory = None
+
+    ################################################################################################
+    # @start
+    ################################################################################################
+    def start(self):
+        """Prepares the scene and starts the workers, if any.
+
+        :return:
+            The number of frames that will be rendered.
+        """
+
+        # Skip the frames that are already rendered
+        self.frames = get_missing_frames(self.output_directory, list(range(self.number_frames)))
+        self.next_frame = 0
+        if len(self.frames) == 0:
+            return 0
+
+        # Parent the objects to the rotation pivot
+        self.pivot = create_rotation_pivot(self.scene_objects)
+
+        # Render in this process
+        if self.number_workers == 1:
+            self.camera = create_sequence_camera(
+                self.bounding_box, self.image_resolution, self.image_scale_factor)
+            return len(self.frames)
+
+        # Save the scene with the pivot to be loaded once by every worker
+        self.workers_directory = tempfile.mkdtemp(prefix='vmv_sequence_')
+        blend_file = '%s/scene.blend' % self.workers_directory
+        bpy.ops.wm.save_as_mainfile(filepath=blend_file, copy=True)
+
+        # The objects are restored in this scene, the workers use the saved one
+        remove_rotation_pivot(self.pivot)
+        self.pivot = None
+
+        # Launch a worker per chunk of frames
+        p_min, p_max = self.bounding_box.p_min, self.bounding_box.p_max
+        for i, frames in enumerate(split_frames_across_workers(self.frames, self.number_workers)):
+
+            # The arguments of the worker
+            arguments = ['--output-directory', self.output_directory,
+                         '--frames', ','.join(str(frame) for frame in frames),
+                         '--number-frames', str(self.number_frames),
+                         '--pivot', ROTATION_PIVOT_NAME,
+                         '--bounding-box'] + [str(v) for v in (*p_min[:3], *p_max[:3])]
+            if self.image_scale_factor is not None:
+                arguments += ['--image-scale-factor', str(self.image_scale_factor)]
+            else:
+                arguments += ['--image-resolution', str(self.image_resolution)]
+
+            # Start the worker and keep its log
+            self.workers.append(launch_blender_worker(
+                blend_file, 'sequence_rendering.py', arguments,
+                '%s/worker_%d.log' % (self.workers_directory, i)))
+
+        # Return the number of frames
+        return len(self.frames)
+
+    ################################################################################################
+    # @step
+    ################################################################################################
+    def step(self):
+        """Renders the next frame in this process, or checks the workers.
+
+        :return:
+            True if all the frames are rendered, otherwise False.
+        """
+
+        # Check the workers
+        if len(self.workers) > 0:
+            return all(worker.poll() is not None for worker, _ in self.workers)
+
+        # All the frames are rendered
+        if self.next_frame >= len(self.frames):
+            return True
+
+        # Render the next frame
+        render_frame_with_rotation_pivot(
+            self.camera, self.pivot, self.frames[self.next_frame], self.output_directory,
+            self.number_frames)
+        self.next_frame += 1
+
+        # Done if this was the last frame
+        return self.next_frame >= len(self.frames)
+
+    ################################################################################################
+    # @get_progress
+    ################################################################################################
+    def get_progress(self):
+        """Gets the progress of the rendering.
+
+        :return:
+            The ratio of the frames that are rendered in the range [0, 1].
+        """
+
+        # Nothing to render
+        if len(self.frames) == 0:
+            return 1.0
+
+        # Rendered in this process
+        if len(self.workers) == 0:
+            return self.next_frame / len(self.frames)
+
+        # Rendered by the workers, count the written frames
+        missing = get_missing_frames(self.output_directory, self.frames)
+        return 1.0 - len(missing) / len(self.frames)
+
+    ################################################################################################
+    # @finish
+    ################################################################################################
+    def finish(self,
+               cancel=False):
+        """Stops the workers, if cancelled, and restores the scene.
+
+        :param cancel:
+            Terminate the running workers. The rendered frames are kept to be resumed later.
+        :return:
+            True if all the frames are rendered, otherwise False.
+        """
+
+        # Stop or wait for the workers
+        for worker, log_file in self.workers:
+            if cancel and worker.poll() is None:
+                worker.terminate()
+            worker.wait()
+            log_file.close()
+
+        # Remove the camera and restore the objects
+        if self.camera is not None:
+            vmv.scene.ops.delete_object_in_scene(self.camera.camera)
+            self.camera = None
+        if self.pivot is not None:
+            remove_rotation_pivot(self.pivot)
+            self.pivot = None
+
+        # Check the rendered frames
+        missing = get_missing_frames(self.output_directory, self.frames)
+        if len(missing) > 0 and len(self.workers) > 0:
+            vmv.logger.log('WARNING: %d frames were not rendered, see the logs in [%s]' %
+                           (len(missing), self.workers_directory))
+
+        # Remove the temporary files if all the frames are rendered
+        elif self.workers_directory is not None:
+            shutil.rmtree(self.workers_directory, ignore_errors=True)
+        self.workers = list()
+
+        # Done
+        return len(missing) == 0
+
+    ################################################################################################
+    # @render
+    ################################################################################################
+    def render(self):
+        """Renders all the frames of the sequence and waits until they are rendered.
+
+        :return:
+            True if all the frames are rendered, otherwise False.
+        """
+
+        # Start the rendering
+        if self.start() == 0:
+            return True
+
+        # Render the frames in this process or wait for the workers
+        while not self.step():
+            if len(self.workers) > 0:
+                time.sleep(1.0)
+            vmv.utilities.show_progress(
+                'Rendering', int(self.number_frames * self.get_progress()), self.number_frames)
+
+        # Restore the scene
+        return self.finish()
@@ -0,0 +1,418 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import zlib
+import shutil
+import struct
+import tempfile
+
+# External imports
+import numpy
+
+# Blender imports
+import bpy
+
+# Internal imports
+import vmv
+import vmv.consts
+import vmv.enums
+import vmv.rendering
+import vmv.scene
+
+
+####################################################################################################
+# @compute_image_tiles
+####################################################################################################
+def compute_image_tiles(resolution_x,
+                        resolution_y,
+                        tile_size):
+    """Splits an image into a grid of tiles, row by row starting from the top left corner.
+
+    :param resolution_x:
+        The width of the image in pixels.
+    :param resolution_y:
+        The height of the image in pixels.
+    :param tile_size:
+        The maximum width and height of a tile in pixels.
+    :return:
+        A list of the tiles, each defined by its pixel bounds [x0, y0, x1, y1] measured from the
+        top left corner of the image.
+    """
+
+    # The tiles
+    tiles = list()
+    for y0 in range(0, resolution_y, tile_size):
+        for x0 in range(0, resolution_x, tile_size):
+            tiles.append([x0, y0, min(x0 + tile_size, resolution_x),
+                          min(y0 + tile_size, resolution_y)])
+
+    # Return the tiles
+    return tiles
+
+
+####################################################################################################
+# @get_tile_image_prefix
+####################################################################################################
+def get_tile_image_prefix(tiles_directory,
+                          tile_index):
+    """Gets the path of the image of a tile, without the .png extension.
+
+    :param tiles_directory:
+        The directory of the tiles.
+    :param tile_index:
+        The index of the tile.
+    :return:
+        The image path prefix of the tile.
+    """
+
+    return '%s/tile_%s' % (tiles_directory, '{0:05d}'.format(tile_index))
+
+
+####################################################################################################
+# @set_render_border
+####################################################################################################
+def set_render_border(tile,
+                      resolution_x,
+                      resolution_y):
+    """Limits the rendering of the scene to the border region of a given tile, and crops the
+    rendered image to this region.
+
+    :param tile:
+        The pixel bounds of the tile [x0, y0, x1, y1] from the top left corner of the image.
+    :param resolution_x:
+        The width of the full image in pixels.
+    :param resolution_y:
+        The height of the full image in pixels.
+    """
+
+    # Blender measures the border from the bottom left corner in normalized coordinates. A quarter
+    # of a pixel is added to avoid losing a pixel when Blender truncates the border to pixels
+    x0, y0, x1, y1 = tile
+    render = bpy.context.scene.render
+    render.use_border = True
+    render.use_crop_to_border = True
+    render.border_min_x = min(1.0, (x0 + 0.25) / resolution_x)
+    render.border_max_x = min(1.0, (x1 + 0.25) / resolution_x)
+    render.border_min_y = min(1.0, (resolution_y - y1 + 0.25) / resolution_y)
+    render.border_max_y = min(1.0, (resolution_y - y0 + 0.25) / resolution_y)
+
+
+####################################################################################################
+# @clear_render_border
+####################################################################################################
+def clear_render_border():
+    """Restores rendering the full frame of the camera.
+    """
+
+    # Disable the border
+    bpy.context.scene.render.use_border = False
+    bpy.context.scene.render.use_crop_to_border = False
+
+
+####################################################################################################
+# @render_tiles
+####################################################################################################
+def render_tiles(tiles,
+                 tile_indices,
+                 tiles_directory):
+    """Renders the given tiles of the image that are not rendered yet with the active camera of the
+    scene, each to a separate image.
+
+    :param tiles:
+        A list of all the tiles of the image.
+    :param tile_indices:
+        The indices of the tiles that will be rendered.
+    :param tiles_directory:
+        The directory where the images of the tiles are written.
+    """
+
+    # The resolution of the full image
+    resolution_x = bpy.context.scene.render.resolution_x
+    resolution_y = bpy.context.scene.render.resolution_y
+
+    # Render the tiles
+    for tile_index in tile_indices:
+
+        # Skip the tiles that are already rendered
+        image_prefix = get_tile_image_prefix(tiles_directory, tile_index)
+        if os.path.isfile('%s.png' % image_prefix):
+            continue
+
+        # Limit the rendering to the tile
+        set_render_border(tiles[tile_index], resolution_x, resolution_y)
+
+        # Render the tile
+        bpy.context.scene.render.filepath = '%s.png' % image_prefix
+        bpy.ops.render.render(write_still=True)
+
+    # Render the full frame again
+    clear_render_border()
+
+
+####################################################################################################
+# @read_tile_pixels
+####################################################################################################
+def read_tile_pixels(image_path,
+                     width,
+                     height):
+    """Reads the pixels of a rendered tile into an RGBA array of a given size, ordered from the top
+    row. If the size of the tile does not match, the missing pixels are transparent.
+
+    :param image_path:
+        The path to the .png image of the tile.
+    :param width:
+        The expected width of the tile.
+    :param height:
+        The expected height of the tile.
+    :return:
+        A uint8 array of the shape (height, width, 4).
+    """
+
+    # The pixels of the tile, transparent by default
+    tile_pixels = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+
+    # Load the image and read its pixels at once, the image is removed directly afterwards
+    image = bpy.data.images.load(image_path)
+    image_width, image_height = image.size[0], image.size[1]
+    pixels = numpy.empty(image_width * image_height * 4, dtype=numpy.float32)
+    try:
+        image.pixels.foreach_get(pixels)
+    except AttributeError:
+        pixels[:] = image.pixels[:]
+    bpy.data.images.remove(image)
+
+    # Blender stores the rows from the bottom
+    pixels = numpy.round(pixels * 255.0).astype(numpy.uint8)
+    pixels = pixels.reshape((image_height, image_width, 4))[::-1]
+
+    # Copy the overlapping region
+    rows, columns = min(height, image_height), min(width, image_width)
+    tile_pixels[:rows, :columns] = pixels[:rows, :columns]
+
+    # Return the pixels
+    return tile_pixels
+
+
+####################################################################################################
+# @write_png_chunk
+####################################################################################################
+def write_png_chunk(png_file,
+                    chunk_type,
+                    data):
+    """Writes a chunk to a .png file.
+
+    :param png_file:
+        The opened .png file.
+    :param chunk_type:
+        The type of the chunk, e.g. b'IDAT'.
+    :param data:
+        The data of the chunk.
+    """
+
+    # Length, type, data and the CRC of the type and the data
+    png_file.write(struct.pack('>I', len(data)))
+    png_file.write(chunk_type)
+    png_file.write(data)
+    png_file.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+
+####################################################################################################
+# @stitch_tiles
+####################################################################################################
+def stitch_tiles(tiles,
+                 tiles_directory,
+                 image_path,
+                 resolution_x,
+                 resolution_y):
+    """Stitches the rendered tiles into a single RGBA .png image. The image is compressed and
+    written one row of tiles at a time, so only a single row of tiles is in memory.
+
+    :param tiles:
+        A list of all the tiles of the image.
+    :param tiles_directory:
+        The directory of the images of the tiles.
+    :param image_path:
+        The path to the stitched .png image.
+    :param resolution_x:
+        The width of the stitched image in pixels.
+    :param resolution_y:
+        The height of the stitched image in pixels.
+    """
+
+    # Group the tiles into rows by their top edge
+    rows = dict()
+    for tile_index, tile in enumerate(tiles):
+        rows.setdefault(tile[1], list()).append(tile_index)
+
+    # A single stream compresses all the scan lines
+    compressor = zlib.compressobj(6)
+
+    with open(image_path, 'wb') as png_file:
+
+        # The signature and the header of an 8-bit RGBA image
+        png_file.write(b'\x89PNG\r\n\x1a\n')
+        write_png_chunk(png_file, b'IHDR', struct.pack(
+            '>IIBBBBB', resolution_x, resolution_y, 8, 6, 0, 0, 0))
+
+        # Stitch a row of tiles at a time
+        for y0 in sorted(rows.keys()):
+
+            # The band of the image covered by this row
+            y1 = tiles[rows[y0][0]][3]
+            band = numpy.zeros((y1 - y0, 1 + resolution_x * 4), dtype=numpy.uint8)
+
+            # Copy the tiles into the band, the first byte of each scan line is the filter (none)
+            for tile_index in rows[y0]:
+                x0, _, x1, _ = tiles[tile_index]
+                tile_pixels = read_tile_pixels(
+                    '%s.png' % get_tile_image_prefix(tiles_directory, tile_index),
+                    x1 - x0, y1 - y0)
+                band[:, 1 + x0 * 4:1 + x1 * 4] = tile_pixels.reshape((y1 - y0, -1))
+
+            # Compress the band and write the available data
+            data = compressor.compress(band.tobytes())
+            if len(data) > 0:
+                write_png_chunk(png_file, b'IDAT', data)
+
+        # Write the remaining data and close the image
+        write_png_chunk(png_file, b'IDAT', compressor.flush())
+        write_png_chunk(png_file, b'IEND', b'')
+
+
+####################################################################################################
+# @render_tiles_to_scale
+####################################################################################################
+def render_tiles_to_scale(bounding_box,
+                          camera_view=vmv.enums.Rendering.View.FRONT,
+                          image_scale_factor=vmv.consts.Image.DEFAULT_IMAGE_SCALE_FACTOR,
+                          image_name='image',
+                          image_directory=None,
+                          tile_size=vmv.consts.Image.DEFAULT_TILE_SIZE,
+                          number_workers=1,
+                          keep_camera_in_scene=True):
+    """Renders the scene to scale as a grid of tiles, rendered in this process or split across
+    headless Blender workers, and stitches them into a single .png image. If the image fits into
+    a single tile, it is rendered directly.
+
+    :param bounding_box:
+        The bounding box of the view requested to be rendered.
+    :param camera_view:
+        The view of the camera, by default FRONT.
+    :param image_scale_factor:
+        The factor used to scale the resolution of the image the image, by default 1.
+    :param image_name:
+        The name of the image, by default 'image'.
+    :param image_directory:
+        The directory where the image will be rendered. If the directory is set to None,
+        then the prefix is included in @image_name.
+    :param tile_size:
+        The maximum width and height of a tile in pixels.
+    :param number_workers:
+        The number of Blender workers, or 1 to render the tiles in this process.
+    :param keep_camera_in_scene:
+        Keep the camera used to do the rendering after the rendering is done.
+    :return:
+        True if the image is rendered, otherwise False.
+    """
+
+    # Image path prefix, i.e. w/o extension which will be added later
+    image_prefix = '%s/%s' % (
+        image_directory, image_name) if image_directory is not None else image_name
+
+    # Setup the camera and the resolution of the full image
+    camera = vmv.rendering.Camera('MeshCamera_%s' % camera_view)
+    camera.setup_camera_for_scene(bounding_box, camera_view)
+    camera.update_camera_resolution_to_scale(
+        scale_factor=image_scale_factor, camera_view=camera_view, bounds=bounding_box.bounds)
+    bpy.context.scene.render.resolution_percentage = 100
+    resolution_x = bpy.context.scene.render.resolution_x
+    resolution_y = bpy.context.scene.render.resolution_y
+
+    # Deselect all the object in the scene and activate the camera
+    vmv.scene.ops.deselect_all()
+    camera.set_active()
+
+    # The image fits into a single tile
+    tiles = compute_image_tiles(resolution_x, resolution_y, tile_size)
+    if len(tiles) == 1:
+        camera.render_image(image_name=image_prefix)
+        success = os.path.isfile('%s.png' % image_prefix)
+
+    # Render the tiles and stitch them
+    else:
+
+        # A temporary directory for the tiles
+        tiles_directory = tempfile.mkdtemp(prefix='vmv_tiles_')
+
+        # Render the tiles in this process
+        tile_indices = list(range(len(tiles)))
+        number_failed_workers = 0
+        if number_workers <= 1:
+            render_tiles(tiles, tile_indices, tiles_directory)
+
+        # Save the scene with the camera and render the tiles in the workers
+        else:
+            blend_file = '%s/scene.blend' % tiles_directory
+            bpy.ops.wm.save_as_mainfile(filepath=blend_file, copy=True)
+
+            # Launch a worker per chunk of tiles
+            workers = list()
+            for i, indices in enumerate(vmv.rendering.split_frames_across_workers(
+                    tile_indices, number_workers)):
+                log_file_path = '%s/worker_%d.log' % (tiles_directory, i)
+                worker, log_file = vmv.rendering.launch_blender_worker(
+                    blend_file, 'tile_rendering.py',
+                    ['--tiles-directory', tiles_directory,
+                     '--tiles', ','.join(str(index) for index in indices),
+                     '--tile-size', str(tile_size)], log_file_path)
+                workers.append((worker, log_file, log_file_path))
+
+            # Wait for the workers and report the failed ones
+            for worker, log_file, log_file_path in workers:
+                worker.wait()
+                log_file.close()
+                if worker.returncode != 0:
+                    number_failed_workers += 1
+                    vmv.logger.log('ERROR: A tile rendering worker failed with the exit code '
+                                   '[%d], see [%s]' % (worker.returncode, log_file_path))
+
+        # The image is stitched only if all the tiles are rendered, a failed worker could have
+        # left an incomplete tile
+        missing_tiles = [tile_index for tile_index in tile_indices if not os.path.isfile(
+            '%s.png' % get_tile_image_prefix(tiles_directory, tile_index))]
+        success = len(missing_tiles) == 0 and number_failed_workers == 0
+        if not success:
+            vmv.logger.log('ERROR: The image [%s] is NOT stitched, %d tiles are missing, the '
+                           'tiles and the logs are kept in [%s]' %
+                           (image_name, len(missing_tiles), tiles_directory))
+
+        # Stitch the tiles and remove them
+        else:
+            vmv.logger.info('Stitching %d tiles into a %dx%d image' %
+                            (len(tiles), resolution_x, resolution_y))
+            stitch_tiles(tiles, tiles_directory, '%s.png' % image_prefix, resolution_x,
+                         resolution_y)
+            shutil.rmtree(tiles_directory, ignore_errors=True)
+
+    # Keep the camera in the scene or delete it after the rendering
+    if not keep_camera_in_scene:
+        vmv.scene.ops.delete_object_in_scene(camera.camera)
+
+    # Done
+    return success
@@ -334,15 +334,91 @@ def clear_default_scene():
             vmv.utilities.enable_std_output()
 
 
+####################################################################################################
+# @get_kept_datablocks_pointers
+####################################################################################################
+def get_kept_datablocks_pointers(keep):
+    """Gets the pointers of the datablocks that must be kept when the scene is cleared. The data
+    of every kept object, for example the curve of a bevel object, is kept as well.
+
+    :param keep:
+        A list of datablocks (objects, meshes, curves, materials, ...) or None.
+    :return:
+        A set of the pointers of all the kept datablocks.
+    """
+
+    # Nothing is kept
+    if keep is None:
+        return set()
+
+    # The datablocks themselves
+    pointers = {datablock.as_pointer() for datablock in keep}
+
+    # The data of the kept objects
+    for datablock in keep:
+        if isinstance(datablock, bpy.types.Object) and datablock.data is not None:
+            pointers.add(datablock.data.as_pointer())
+
+    # Return the pointers
+    return pointers
+
+
+####################################################################################################
+# @clear_scene_in_bulk
+####################################################################################################
+def clear_scene_in_bulk(keep=None,
+                        keep_reusable_materials=True):
+    """Removes all the objects, meshes, curves, metaballs and materials with a single call to
+    bpy.data.batch_remove, which is much faster than removing them one by one.
+
+    :param keep:
+        An optional list of reusable datablocks, for example bevel objects or materials, that
+        will not be removed.
+    :param keep_reusable_materials:
+        Keep the cached materials and the shader templates to reuse them in the next build.
+    """
+
+    # The datablocks that will be kept
+    keep = list() if keep is None else list(keep)
+    if keep_reusable_materials:
+        keep.extend(vmv.shading.get_reusable_materials())
+    kept_pointers = get_kept_datablocks_pointers(keep)
+
+    # Collect all the datablocks that will be removed
+    datablocks = [datablock
+                  for collection in (bpy.data.objects, bpy.data.meshes, bpy.data.curves,
+                                     bpy.data.metaballs, bpy.data.materials)
+                  for datablock in collection
+                  if datablock.as_pointer() not in kept_pointers]
+
+    # Remove them at once
+    vmv.utilities.disable_std_output()
+    bpy.data.batch_remove(ids=datablocks)
+    vmv.utilities.enable_std_output()
+
+
 ####################################################################################################
 # @clear_scene
 ####################################################################################################
-def clear_scene():
+def clear_scene(keep=None,
+                keep_reusable_materials=True):
     """Clear a scene and remove all the existing objects in it and unlink their references.
 
     NOTE: This function targets clearing meshes, curve, objects and materials.
+
+    :param keep:
+        An optional list of reusable datablocks, for example bevel objects or materials, that
+        will not be removed. This is only supported if bpy.data.batch_remove is available.
+    :param keep_reusable_materials:
+        Keep the cached materials and the shader templates to reuse them in the next build. This
+        is only supported if bpy.data.batch_remove is available.
     """
 
+    # Remove all the datablocks in a single call if the Blender version supports it
+    if hasattr(bpy.data, 'batch_remove'):
+        clear_scene_in_bulk(keep=keep, keep_reusable_materials=keep_reusable_materials)
+        return
+
     # Adjust the clipping planes in case of perspective projection
     # bpy.context.space_data.clip_start = 0.01
     # bpy.context.space_data.clip_end = 10000
@@ -429,11 +505,19 @@ def clear_scene_materials():
     NOTE: This function is called every time a scene is being drawn to avoid overloading the memory.
     """
 
+    # The skeleton materials
+    materials = [material for material in bpy.data.materials
+                 if 'morphology_skeleton' in material.name]
+
+    # Remove them in a single call if the Blender version supports it
+    if hasattr(bpy.data, 'batch_remove'):
+        bpy.data.batch_remove(ids=materials)
+        return
+
     # Clear all the materials that are already present in the scene
-    for material in bpy.data.materials:
-        if 'morphology_skeleton' in material.name:
-            material.user_clear()
-            bpy.data.materials.remove(material)
+    for material in materials:
+        material.user_clear()
+        bpy.data.materials.remove(material)
 
 
 ####################################################################################################
@@ -18,3 +18,4 @@
 
 from .illumination import *
 from .materials import *
+from .materials_cache import *
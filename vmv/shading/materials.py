@@ -37,21 +37,38 @@ import vmv.utilities
 def import_shader(shader_name):
     """Import a shader from  the NeuroMorphoVis shading library.
 
+    The shader is loaded from the library only once and kept as a template material with a fake
+    user, and every call returns a copy of the template. This avoids reading the .blend file of
+    the shader again for every material.
+
     :param shader_name:
         The name of the shader file in the library.
     :return:
         A reference to the shader after being loaded into blender.
     """
 
-    # Get the path of this file
-    current_file = os.path.dirname(os.path.realpath(__file__))
-    shaders_directory = '%s/shaders/%s.blend/Material' % (current_file, shader_name)
+    # The name of the template of the shader
+    template_name = 'vmv_shader_template_%s' % shader_name
+
+    # Load the template if it is not loaded yet
+    template = bpy.data.materials.get(template_name)
+    if template is None:
+
+        # Get the path of this file
+        current_file = os.path.dirname(os.path.realpath(__file__))
+        shaders_directory = '%s/shaders/%s.blend/Material' % (current_file, shader_name)
+
+        # Import the material
+        bpy.ops.wm.append(filename='material', directory=shaders_directory)
 
-    # Import the material
-    bpy.ops.wm.append(filename='material', directory=shaders_directory)
+        # Keep the imported material as a template
+        template = bpy.data.materials['material']
+        template.name = template_name
+        template.use_fake_user = True
 
-    # Get a reference to the material
-    material_reference = bpy.data.materials['material']
+    # Get a reference to a copy of the template
+    material_reference = template.copy()
+    material_reference.use_fake_user = False
 
     # Return a reference to the material
     return material_reference
@@ -0,0 +1,229 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Blender imports
+import bpy
+
+# Internal imports
+import vmv
+import vmv.scene
+import vmv.utilities
+
+
+# The names of the cached materials, keyed on (material type, color)
+MATERIALS_CACHE = dict()
+
+# The scene settings that were applied when the first material of each type was created
+MATERIALS_SCENE_SETTINGS = dict()
+
+# The name of the custom property that tags a cached material with its key
+CACHE_KEY_PROPERTY = 'vmv_material_cache_key'
+
+
+####################################################################################################
+# @get_material_cache_key
+####################################################################################################
+def get_material_cache_key(material_type,
+                           color):
+    """Gets the key of a material in the cache.
+
+    :param material_type:
+        Material type.
+    :param color:
+        Material color.
+    :return:
+        A tuple of (material type, (R, G, B)).
+    """
+
+    return material_type, tuple(round(float(color[i]), 6) for i in range(3))
+
+
+####################################################################################################
+# @get_material_scene_settings
+####################################################################################################
+def get_material_scene_settings():
+    """Gets the scene settings that the creation of a material may change, i.e. the rendering
+    engine, the color management, the workbench display and the viewport shading.
+
+    :return:
+        A dictionary of the settings.
+    """
+
+    # A reference to the scene
+    scene = bpy.context.scene
+
+    # Scene settings
+    settings = {'engine': scene.render.engine,
+                'samples': scene.cycles.samples,
+                'view_transform': scene.view_settings.view_transform,
+                'light': scene.display.shading.light,
+                'studio_light': scene.display.shading.studio_light,
+                'show_xray': scene.display.shading.show_xray}
+
+    # The shading of the first 3D viewport
+    if vmv.utilities.is_blender_280():
+        for area in bpy.context.workspace.screens[0].areas:
+            for space in area.spaces:
+                if space.type == 'VIEW_3D':
+                    settings['viewport_shading'] = space.shading.type
+                    settings['viewport_show_xray'] = space.shading.show_xray
+                    return settings
+
+    # Return the settings
+    return settings
+
+
+####################################################################################################
+# @set_material_scene_settings
+####################################################################################################
+def set_material_scene_settings(settings):
+    """Applies the scene settings that were recorded when a material was created.
+
+    :param settings:
+        A dictionary of the settings, see get_material_scene_settings.
+    """
+
+    # A reference to the scene
+    scene = bpy.context.scene
+
+    # Scene settings
+    scene.render.engine = settings['engine']
+    scene.cycles.samples = settings['samples']
+    scene.view_settings.view_transform = settings['view_transform']
+    scene.display.shading.light = settings['light']
+    scene.display.shading.studio_light = settings['studio_light']
+    scene.display.shading.show_xray = settings['show_xray']
+
+    # The shading of the 3D viewports
+    if 'viewport_shading' in settings:
+        vmv.scene.switch_scene_shading(settings['viewport_shading'])
+        for area in bpy.context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.spaces.active.shading.show_xray = settings['viewport_show_xray']
+
+
+####################################################################################################
+# @get_cached_material
+####################################################################################################
+def get_cached_material(name,
+                        color,
+                        material_type):
+    """Gets a material of a given type and color from the cache, or creates it and adds it to the
+    cache if it does not exist. Reusing the material avoids creating its node tree again.
+
+    :param name:
+        Material name, only used if the material is created.
+    :param color:
+        Material color.
+    :param material_type:
+        Material type.
+    :return:
+        A reference to the material.
+    """
+
+    # The key of the material
+    key = get_material_cache_key(material_type, color)
+
+    # Reuse the material if it still exists with the same key
+    material = bpy.data.materials.get(MATERIALS_CACHE.get(key, ''))
+    if material is not None and material.get(CACHE_KEY_PROPERTY) == repr(key):
+
+        # Apply the scene settings of the material type
+        set_material_scene_settings(MATERIALS_SCENE_SETTINGS[material_type])
+
+        # Return a reference to the cached material
+        return material
+
+    # Create the material
+    material = vmv.shading.create_material(name=name, color=color, material_type=material_type)
+
+    # Tag and cache the material
+    material[CACHE_KEY_PROPERTY] = repr(key)
+    MATERIALS_CACHE[key] = material.name
+
+    # Record the scene settings of the material type
+    MATERIALS_SCENE_SETTINGS[material_type] = get_material_scene_settings()
+
+    # Return a reference to the material
+    return material
+
+
+####################################################################################################
+# @get_cached_materials
+####################################################################################################
+def get_cached_materials():
+    """Gets all the cached materials that still exist.
+
+    :return:
+        A list of materials.
+    """
+
+    # The cached materials
+    materials = list()
+    for key, material_name in MATERIALS_CACHE.items():
+        material = bpy.data.materials.get(material_name)
+        if material is not None and material.get(CACHE_KEY_PROPERTY) == repr(key):
+            materials.append(material)
+
+    # Return the list
+    return materials
+
+
+####################################################################################################
+# @get_reusable_materials
+####################################################################################################
+def get_reusable_materials():
+    """Gets the materials that can be reused across builds, i.e. the cached materials and the
+    templates of the shaders that were imported from the library.
+
+    :return:
+        A list of materials.
+    """
+
+    # The templates of the shaders
+    templates = [material for material in bpy.data.materials
+                 if material.name.startswith('vmv_shader_template_')]
+
+    # Return the list
+    return get_cached_materials() + templates
+
+
+####################################################################################################
+# @set_object_color_map_materials
+####################################################################################################
+def set_object_color_map_materials(scene_object,
+                                   color_map,
+                                   material_type):
+    """Replaces the materials of a given object with the cached materials of a color-map, where
+    the i-th material of the object has the i-th color of the map. The material indices of the
+    geometry are not changed.
+
+    :param scene_object:
+        A curve or a mesh object in the scene.
+    :param color_map:
+        A list of colors.
+    :param material_type:
+        Material type.
+    """
+
+    # Remove the current materials of the object
+    scene_object.data.materials.clear()
+
+    # Add the materials of the color-map
+    for i, color in enumerate(color_map):
+        scene_object.data.materials.append(get_cached_material(
+            name='%s_color_%d' % ('material', i), color=color, material_type=material_type))
@@ -16,9 +16,14 @@
 ####################################################################################################
 
 # Internal imports 
-from .segments_construction_ops import *
-from .sections_construction_ops import *
+from .meta_elements_ops import *
+from .polylines_batch_ops import *
+from .skeleton_arrays_ops import *
 from .skeleton_drawing_ops import *
 from .skeleton_coloring_ops import *
 from .skeleton_geometry_ops import *
+from .skeleton_lod_ops import *
+from .skeleton_metrics_ops import *
+from .skeleton_paths_ops import *
+from .skeleton_radii_ops import *
 from .skeleton_reconstruction_ops import *
@@ -0,0 +1,224 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import vmv.skeleton
+
+
+####################################################################################################
+# @compute_meta_elements_arrays
+####################################################################################################
+def compute_meta_elements_arrays(points,
+                                 radii,
+                                 offsets):
+    """Computes the centers and the radii of all the meta elements that are placed along the
+    segments of the morphology in a single pass.
+
+    Along each segment, the meta elements are placed by stepping half the radius of the current
+    element and interpolating the radius linearly along the segment. The radii of the consecutive
+    elements along a segment therefore form a geometric sequence r1 * q^k, where
+    q = 1 + 0.5 * (r2 - r1) / length, and the number of elements along each segment is given in
+    closed form, without iterating.
+
+    :param points:
+        An array of the positions of the samples [N, 3].
+    :param radii:
+        An array of the radii of the samples [N], after applying the radius policy.
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :return:
+        A tuple of (centers [M, 3], radii [M], smallest radius), where the smallest radius is
+        None if the morphology has no valid segments.
+    """
+
+    # All the segments of the morphology
+    segments, _ = vmv.skeleton.ops.get_segments_arrays(offsets)
+
+    # Segments vectors and lengths
+    p1 = points[segments]
+    deltas = points[segments + 1] - p1
+    lengths = numpy.linalg.norm(deltas, axis=1)
+
+    # Ignore the segments with zero length
+    valid = lengths >= 0.001
+    p1 = p1[valid]
+    deltas = deltas[valid]
+    lengths = lengths[valid]
+
+    # Verify the radii, or fix them
+    r1 = numpy.maximum(radii[segments[valid]], 0.001 * lengths)
+    r2 = numpy.maximum(radii[segments[valid] + 1], 0.001 * lengths)
+
+    # Empty morphology
+    if len(lengths) == 0:
+        return numpy.zeros((0, 3), dtype=points.dtype), numpy.zeros(0, dtype=radii.dtype), None
+
+    # The radius of the smallest sample
+    smallest_radius = float(min(r1.min(), r2.min()))
+
+    # The ratio between the radii of two consecutive elements along each segment
+    dr = r2 - r1
+    ratios = 1.0 + 0.5 * dr / lengths
+
+    # Segments with constant radii
+    constant = numpy.abs(dr) < 1e-6 * r1
+
+    # Segments where the first element covers the entire segment
+    covered = ratios <= 1e-6
+
+    # Number of elements per segment, such that the travelled distance is less than the length
+    counts = numpy.ones(len(lengths), dtype=numpy.int64)
+    regular = ~(constant | covered)
+    counts[regular] = numpy.ceil(
+        numpy.log(r2[regular] / r1[regular]) / numpy.log(ratios[regular]))
+    counts[constant] = numpy.ceil(lengths[constant] / (0.5 * r1[constant]))
+    counts = numpy.maximum(counts, 1)
+
+    # The segment and the local step of every element
+    elements_segments = numpy.repeat(numpy.arange(len(lengths)), counts)
+    steps = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+
+    # The radii of the elements
+    elements_r1 = r1[elements_segments]
+    elements_radii = elements_r1 * numpy.power(ratios[elements_segments], steps)
+
+    # The distances travelled along the segments
+    distances = numpy.where(
+        constant[elements_segments], 0.5 * elements_r1 * steps,
+        (elements_radii - elements_r1) * lengths[elements_segments] /
+        numpy.where(constant, 1.0, dr)[elements_segments])
+
+    # The centers of the elements
+    centers = p1[elements_segments] + deltas[elements_segments] * \
+        (distances / lengths[elements_segments])[:, None]
+
+    # The first element along each segment is slightly smaller
+    elements_radii[steps == 0] *= 0.9
+
+    # Return the elements
+    return centers, elements_radii, smallest_radius
+
+
+####################################################################################################
+# @compute_meta_tiles_bounds
+####################################################################################################
+def compute_meta_tiles_bounds(centers,
+                              radii,
+                              number_tiles,
+                              resolution):
+    """Partitions the bounding box of the meta elements into a regular grid of spatial tiles.
+
+    The borders of the tiles are snapped to the planes of the polygonization lattice of the meta
+    object, that Blender places at (i - 0.5) * resolution for every integer i. The neighbouring
+    tiles therefore sample the field at the same lattice points, and their surfaces meet exactly
+    at the shared borders.
+
+    :param centers:
+        An array of the centers of the elements [M, 3].
+    :param radii:
+        An array of the radii of the elements [M].
+    :param number_tiles:
+        The number of tiles along each axis.
+    :param resolution:
+        The resolution of the meta object.
+    :return:
+        A list of tuples (p_min, p_max) of the bounds of the non-empty tiles.
+    """
+
+    # The bounding box of all the elements
+    p_min = (centers - radii[:, None]).min(axis=0)
+    p_max = (centers + radii[:, None]).max(axis=0)
+
+    # The borders of the tiles along each axis, snapped to the lattice planes (i - 0.5) * resolution
+    borders = list()
+    for axis in range(3):
+        axis_borders = numpy.linspace(p_min[axis], p_max[axis], number_tiles + 1)
+        axis_borders[1:-1] = (numpy.floor(axis_borders[1:-1] / resolution) + 0.5) * resolution
+        axis_borders[0] -= resolution
+        axis_borders[-1] += resolution
+        borders.append(numpy.unique(axis_borders))
+
+    # The range of the tiles that are touched by every element along each axis
+    first_tiles = list()
+    last_tiles = list()
+    for axis in range(3):
+        number_axis_tiles = len(borders[axis]) - 1
+        first_tiles.append(numpy.clip(numpy.searchsorted(
+            borders[axis], centers[:, axis] - radii) - 1, 0, number_axis_tiles - 1))
+        last_tiles.append(numpy.clip(numpy.searchsorted(
+            borders[axis], centers[:, axis] + radii) - 1, 0, number_axis_tiles - 1))
+
+    # Mark the tiles that are touched by at least a single element, i.e. the non-empty tiles
+    occupied = numpy.zeros([len(borders[axis]) - 1 for axis in range(3)], dtype=bool)
+    spans = [int((last_tiles[axis] - first_tiles[axis]).max()) + 1 for axis in range(3)]
+    for di in range(spans[0]):
+        for dj in range(spans[1]):
+            for dk in range(spans[2]):
+                i = first_tiles[0] + di
+                j = first_tiles[1] + dj
+                k = first_tiles[2] + dk
+                touched = (i <= last_tiles[0]) & (j <= last_tiles[1]) & (k <= last_tiles[2])
+                occupied[i[touched], j[touched], k[touched]] = True
+
+    # The bounds of the non-empty tiles
+    tiles_bounds = list()
+    for i, j, k in zip(*numpy.nonzero(occupied)):
+        tiles_bounds.append(
+            (numpy.array([borders[0][i], borders[1][j], borders[2][k]]),
+             numpy.array([borders[0][i + 1], borders[1][j + 1], borders[2][k + 1]])))
+
+    # Return the bounds of the tiles
+    return tiles_bounds
+
+
+####################################################################################################
+# @get_meta_tile_elements_indices
+####################################################################################################
+def get_meta_tile_elements_indices(centers,
+                                   radii,
+                                   p_min,
+                                   p_max,
+                                   margin):
+    """Gets the indices of all the meta elements that have an influence on a given tile.
+
+    Each element influences the field only within its radius, therefore all the elements that
+    intersect the tile extended by the margin are selected, and the field within the extended tile
+    is identical to the field of the entire meta object.
+
+    :param centers:
+        An array of the centers of the elements [M, 3].
+    :param radii:
+        An array of the radii of the elements [M].
+    :param p_min:
+        The minimum point of the tile.
+    :param p_max:
+        The maximum point of the tile.
+    :param margin:
+        The margin by which the tile is extended.
+    :return:
+        An array of the indices of the elements of the tile.
+    """
+
+    # The distance between each element and the extended tile
+    distances = numpy.linalg.norm(
+        centers - numpy.clip(centers, p_min - margin, p_max + margin), axis=1)
+
+    # The elements that intersect the extended tile
+    return numpy.nonzero(distances <= radii)[0]
@@ -0,0 +1,204 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import vmv.consts
+import vmv.enums
+import vmv.skeleton
+import vmv.utilities
+
+
+####################################################################################################
+# @compute_color_map_indices
+####################################################################################################
+def compute_color_map_indices(values,
+                              minimum,
+                              maximum,
+                              color_map_resolution=vmv.consts.Color.COLOR_MAP_RESOLUTION,
+                              normalization=vmv.enums.ColorMapNormalization.LINEAR):
+    """Computes the color-map indices of an array of values in one step.
+
+    :param values:
+        An array of values, for example from the cached metrics of the morphology.
+    :param minimum:
+        The minimum value of the color-map.
+    :param maximum:
+        The maximum value of the color-map.
+    :param color_map_resolution:
+        The number of colors in the color-map.
+    :param normalization:
+        How the values are mapped to the color-map, linear, log or quantile.
+    :return:
+        An array of color indices, clamped to the range of the color-map.
+    """
+
+    return vmv.utilities.map_values_to_color_map_indices(
+        values=values, color_map_resolution=color_map_resolution, minimum=minimum,
+        maximum=maximum, normalization=normalization)
+
+
+####################################################################################################
+# @get_sections_poly_lines_batch
+####################################################################################################
+def get_sections_poly_lines_batch(morphology,
+                                  material_indices):
+    """Constructs a batch of poly-lines, one per section, directly from the flat samples arrays of
+    the morphology.
+
+    :param morphology:
+        A given morphology.
+    :param material_indices:
+        An array of material indices, one per section in the sections list of the morphology.
+    :return:
+        A PolyLinesBatch. Empty sections are skipped.
+    """
+
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
+
+    # Homogeneous coordinates
+    co = numpy.ones((metrics.get_number_samples(), 4), dtype=numpy.float32)
+    co[:, 0:3] = metrics.points
+
+    # Skip the empty sections
+    non_empty = metrics.sections_number_samples > 0
+    offsets = numpy.zeros(int(non_empty.sum()) + 1, dtype=numpy.int64)
+    numpy.cumsum(metrics.sections_number_samples[non_empty], out=offsets[1:])
+
+    # Construct the batch
+    return vmv.skeleton.PolyLinesBatch(
+        co=co, radius=metrics.radii, offsets=offsets,
+        material_indices=numpy.asarray(material_indices)[non_empty])
+
+
+####################################################################################################
+# @get_segments_poly_lines_batch
+####################################################################################################
+def get_segments_poly_lines_batch(morphology,
+                                  material_indices):
+    """Constructs a batch of poly-lines, one per segment, directly from the flat samples arrays of
+    the morphology.
+
+    :param morphology:
+        A given morphology.
+    :param material_indices:
+        An array of material indices, one per segment in the cached metrics of the morphology.
+    :return:
+        A PolyLinesBatch.
+    """
+
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
+
+    # The two samples of every segment, interleaved
+    samples = numpy.empty(2 * metrics.get_number_segments(), dtype=numpy.int64)
+    samples[0::2] = metrics.segments
+    samples[1::2] = metrics.segments + 1
+
+    # Homogeneous coordinates
+    co = numpy.ones((len(samples), 4), dtype=numpy.float32)
+    co[:, 0:3] = metrics.points[samples]
+
+    # Every poly-line has two samples
+    offsets = numpy.arange(0, len(samples) + 1, 2, dtype=numpy.int64)
+
+    # Construct the batch
+    return vmv.skeleton.PolyLinesBatch(
+        co=co, radius=metrics.radii[samples], offsets=offsets, material_indices=material_indices)
+
+
+####################################################################################################
+# @get_connected_paths_poly_lines_batch
+####################################################################################################
+def get_connected_paths_poly_lines_batch(morphology,
+                                         material_index=0):
+    """Constructs a batch of poly-lines, one per connected path from the roots to the leaves,
+    directly from the flat samples arrays of the morphology.
+
+    :param morphology:
+        A given morphology.
+    :param material_index:
+        The material index of all the poly-lines.
+    :return:
+        A PolyLinesBatch. Empty paths are skipped.
+    """
+
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
+
+    # Get the connected paths and the indices of their samples
+    paths_sections, paths_offsets = vmv.skeleton.ops.get_connected_paths_arrays(
+        metrics.children, metrics.children_offsets, seeds=metrics.roots)
+    samples, paths_offsets = vmv.skeleton.ops.get_paths_samples_indices(
+        paths_sections, paths_offsets, metrics.offsets)
+
+    # Skip the empty paths
+    counts = numpy.diff(paths_offsets)
+    offsets = numpy.zeros(int(numpy.count_nonzero(counts)) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts[counts > 0], out=offsets[1:])
+
+    # Homogeneous coordinates
+    co = numpy.ones((len(samples), 4), dtype=numpy.float32)
+    co[:, 0:3] = metrics.points[samples]
+
+    # Construct the batch
+    return vmv.skeleton.PolyLinesBatch(
+        co=co, radius=metrics.radii[samples], offsets=offsets,
+        material_indices=numpy.full(len(offsets) - 1, material_index, dtype=numpy.int32))
+
+
+####################################################################################################
+# @get_poly_lines_batch_from_poly_lines_data
+####################################################################################################
+def get_poly_lines_batch_from_poly_lines_data(poly_lines_data):
+    """Converts a list of PolyLine objects into a PolyLinesBatch.
+
+    :param poly_lines_data:
+        A list of PolyLine objects, where the samples are in the format [(X, Y, Z, 1), R].
+    :return:
+        A PolyLinesBatch.
+    """
+
+    # The number of samples per poly-line
+    counts = numpy.fromiter((len(poly_line.samples) for poly_line in poly_lines_data),
+                            dtype=numpy.int64, count=len(poly_lines_data))
+
+    # The offsets of the poly-lines
+    offsets = numpy.zeros(len(poly_lines_data) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=offsets[1:])
+    number_samples = int(offsets[-1])
+
+    # Flatten the coordinates and the radii
+    co = numpy.fromiter(
+        (coordinate for poly_line in poly_lines_data for sample in poly_line.samples
+         for coordinate in sample[0]),
+        dtype=numpy.float32, count=4 * number_samples).reshape(number_samples, 4)
+    radius = numpy.fromiter(
+        (sample[1] for poly_line in poly_lines_data for sample in poly_line.samples),
+        dtype=numpy.float32, count=number_samples)
+
+    # The material indices
+    material_indices = numpy.fromiter(
+        (poly_line.color_index for poly_line in poly_lines_data),
+        dtype=numpy.int32, count=len(poly_lines_data))
+
+    # Construct the batch
+    return vmv.skeleton.PolyLinesBatch(
+        co=co, radius=radius, offsets=offsets, material_indices=material_indices)
@@ -0,0 +1,91 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# @get_sections_samples_arrays
+####################################################################################################
+def get_sections_samples_arrays(sections_list):
+    """Flattens the samples of a given list of sections into contiguous arrays.
+
+    The samples of the i-th section are stored in the range [offsets[i], offsets[i + 1]) of the
+    returned points and radii arrays.
+
+    :param sections_list:
+        A list of sections.
+    :return:
+        A tuple of three arrays (points [N, 3], radii [N], offsets [S + 1]).
+    """
+
+    # The number of samples per section
+    counts = numpy.fromiter((len(section.samples) for section in sections_list),
+                            dtype=numpy.int64, count=len(sections_list))
+
+    # The offsets of the sections into the flat arrays
+    offsets = numpy.zeros(len(sections_list) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=offsets[1:])
+
+    # The total number of samples
+    number_samples = int(offsets[-1])
+
+    # Collect the points and the radii in a single pass
+    points = numpy.fromiter(
+        (coordinate for section in sections_list for sample in section.samples
+         for coordinate in (sample.point[0], sample.point[1], sample.point[2])),
+        dtype=numpy.float64, count=3 * number_samples).reshape(number_samples, 3)
+    radii = numpy.fromiter(
+        (sample.radius for section in sections_list for sample in section.samples),
+        dtype=numpy.float64, count=number_samples)
+
+    # Return the arrays
+    return points, radii, offsets
+
+
+####################################################################################################
+# @get_samples_sections_indices
+####################################################################################################
+def get_samples_sections_indices(offsets):
+    """Returns the index of the section that owns every sample in the flat arrays.
+
+    :param offsets:
+        The offsets of the sections into the flat arrays, with S + 1 entries.
+    :return:
+        An array of N section indices.
+    """
+
+    # Repeat the index of each section by its number of samples
+    return numpy.repeat(numpy.arange(len(offsets) - 1, dtype=numpy.int64), numpy.diff(offsets))
+
+
+####################################################################################################
+# @get_samples_local_indices
+####################################################################################################
+def get_samples_local_indices(offsets):
+    """Returns the index of every sample in the flat arrays with respect to its own section.
+
+    :param offsets:
+        The offsets of the sections into the flat arrays, with S + 1 entries.
+    :return:
+        An array of N local indices.
+    """
+
+    # Subtract the offset of the parent section from the global index
+    return numpy.arange(offsets[-1], dtype=numpy.int64) - \
+        numpy.repeat(offsets[:-1], numpy.diff(offsets))
@@ -16,7 +16,6 @@
 ####################################################################################################
 
 # System imports
-import copy
 import math 
 
 # Blender imports
@@ -153,46 +152,6 @@ def get_connected_sections_poly_lines(section):
     return poly_lines
 
 
-####################################################################################################
-# @get_connected_sections_from_root_to_leaf
-####################################################################################################
-def get_connected_sections_from_root_to_leaf(section,
-                                             poly_line,
-                                             poly_lines):
-
-    # If the section has been traversed, then simply return
-    if section.traversed:
-        return
-
-    # Get the section samples
-    poly_line.extend(get_section_poly_line(section))
-
-    # If this is the last section (a leaf node) or all the children sections have been traversed
-    if section.is_leaf() or section.all_children_traversed():
-
-        # Copy the single poly-line to the poly-lines list
-        poly_lines.append([copy.deepcopy(poly_line), 0])
-
-        # Clear the poly line
-        poly_line.clear()
-
-        # Terminate the loop
-        return
-
-    # Arrange the children based on a specific criteria
-
-    # Iterate over the children
-    for child in section.children:
-
-        get_connected_sections_from_root_to_leaf(child, poly_line, poly_lines)
-
-
-
-
-
-
-
-
 ####################################################################################################
 # @get_section_poly_line_and_append_disconnections
 ####################################################################################################
@@ -360,118 +319,31 @@ def get_connectivity_poly_line_from_section_to_child(section,
 # @get_connectivity_poly_line_from_this_section_to_leaf
 ####################################################################################################
 def get_connectivity_poly_lines_from_this_section_to_leaf(section,
-                                                          poly_line_data=[],
-                                                          poly_lines_data=[],
+                                                          poly_lines_data=None,
                                                           center=Vector((0.0, 0.0, 0.0))):
+    """Gets the poly-lines of all the connected paths from a given section to the leaves, where
+    every section is added to a single path only.
 
-    # If the section is a root node, append its samples
-    if section.is_root():
-
-        # An array containing the data of the section arranged in blender poly-line format
-        poly_line = list()
-
-        # Section samples
-        for i in range(len(section.samples) - 1):
-
-            # Get the coordinates of the sample
-            point = section.samples[i].point - center
-
-            # Get the radius of the sample
-            radius = section.samples[i].radius
-
-            # Use the actual radius of the samples reported in the morphology file
-            poly_line.append([(point[0], point[1], point[2], 1), radius])
-
-        # Update the traversal state
-        section.traversed = True
-
-        # Append the data to the global polyline
-        poly_line_data.extend(poly_line)
-
-    # If the section is a leaf node
-    elif section.is_leaf():
-
-        # If the section was not traversed before
-        if not section.traversed:
-
-            # An array containing the data of the section arranged in blender poly-line format
-            poly_line = list()
-
-            # Section samples
-            for i in range(len(section.samples) - 1):
-
-                # Get the coordinates of the sample
-                point = section.samples[i].point - center
-
-                # Get the radius of the sample
-                radius = section.samples[i].radius
-
-                # Use the actual radius of the samples reported in the morphology file
-                poly_line.append([(point[0], point[1], point[2], 1), radius])
-
-            # Update the traversal state
-            section.traversed = True
-
-            # Append the data to the global polyline
-            poly_line_data.extend(poly_line)
-
-            # Append the poly-line data to the poly-lines data list
-            poly_lines_data.append(copy.deepcopy(poly_line_data))
-
-            # Clear all the items in the poly-line data
-            poly_line_data.clear()
-
-        else:
-
-            # Append the poly-line data to the poly-lines data list
-            poly_lines_data.append(copy.deepcopy(poly_line_data))
-
-            # Clear all the items in the poly-line data
-            poly_line_data.clear()
-
-    # Stem section
-    else:
-
-        # If the section was not traversed before
-        if not section.traversed:
-
-            # An array containing the data of the section arranged in blender poly-line format
-            poly_line = list()
-
-            # Section samples
-            for i in range(len(section.samples) - 1):
-
-                # Get the coordinates of the sample
-                point = section.samples[i].point - center
-
-                # Get the radius of the sample
-                radius = section.samples[i].radius
-
-                # Use the actual radius of the samples reported in the morphology file
-                poly_line.append([(point[0], point[1], point[2], 1), radius])
-
-            # Update the traversal state
-            section.traversed = True
-
-            # Append the data to the global polyline
-            poly_line_data.extend(poly_line)
-
-        else:
-
-            # Append the poly-line data to the poly-lines data list
-            poly_lines_data.append(copy.deepcopy(poly_line_data))
+    :param section:
+        The first section of the paths.
+    :param poly_lines_data:
+        An optional list that will be extended with the poly-lines.
+    :param center:
+        The center of the morphology, that is subtracted from all the samples.
+    :return:
+        A list of poly-lines, where the samples are in the format [(X, Y, Z, 1), R].
+    """
 
-            # Clear all the items in the poly-line data
-            poly_line_data.clear()
+    # Create a new list if none is given
+    if poly_lines_data is None:
+        poly_lines_data = list()
 
-    # Traverse the children
-    for child in section.children:
+    # Get the data of all the paths
+    poly_lines_data.extend(vmv.skeleton.ops.get_connected_paths_poly_lines_from_section(
+        section=section, center=center))
 
-        # Extend the poly-line and get the connectivity of the children
-        get_connectivity_poly_lines_from_this_section_to_leaf(section=child,
-                                                              poly_line_data=poly_line_data,
-                                                              poly_lines_data=poly_lines_data,
-                                                              center=center)
+    # Return the list
+    return poly_lines_data
 
 
 ####################################################################################################
@@ -569,106 +441,50 @@ def draw_section_from_poly_line_data(data,
 ####################################################################################################
 # @draw_connected_sections
 ####################################################################################################
-def draw_connected_sections(section, name='sample',
-                            poly_line_data=[],
-                            sections_objects=[],
-                            secondary_sections=[],
-                            branching_level=0,
+def draw_connected_sections(section,
+                            name='sample',
+                            sections_objects=None,
                             bevel_object=None,
                             caps=False):
-    """Draw a list of sections connected together as a poly-line.
+    """Draws the connected paths from a given section to the leaves, with one poly-line object
+    per path.
 
     :param section:
         Section root.
-    :param poly_line_data:
-        A list of lists containing the data of the poly-line format.
-    :param sections_objects:
-        A list that should contain all the drawn section objects.
-    :param secondary_sections:
-        A list of the secondary sections along the arbor.
-    :param branching_level:
-        Current branching level.
-    :param max_branching_level:
-        Maximum branching level the section can grow up to, infinity.
     :param name:
         Section name.
-    :param material_list:
-        A list of materials for random coloring of the section.
+    :param sections_objects:
+        An optional list that will be extended with the drawn section objects.
     :param bevel_object:
         A given bevel object to scale the section.
-    :param fixed_radius:
-        A fixed radius for each sample in the section, or None.
-    :param transform:
-        Transform from local and circuit coordinates.
-    :param repair_morphology:
-        Apply some filters to repair the morphology during the poly-line construction.
     :param caps:
         A flag to close the section caps or not.
-    :param render_frame:
-        A flag to render a progressive frame.
-    :param frame_destination:
-        The directory where the frame will be dumped.
-    :param camera:
-        A given camera to render the frame.
-    :param ignore_branching_samples:
-        Ignore fetching the branching samples from the morphology skeleton.
-    :param roots_connection:
-        How the root sections are connected to the soma.
+    :return:
+        A list of all the drawn section objects.
     """
 
+    # Create a new list if none is given
+    if sections_objects is None:
+        sections_objects = list()
+
     # Ignore the drawing if the section is None
     if section is None:
-        return
-
-    # Increment the branching level
-    branching_level += 1
+        return sections_objects
 
-    # Verify if this is the last section along the arbor or not
-    is_last_section = False
-    if not section.has_children():
-        is_last_section = True
+    # Draw every path
+    for i, poly_line_data in enumerate(
+            vmv.skeleton.ops.get_connected_paths_poly_lines_from_section(section=section)):
 
-    # Verify if this a continuous section or not
-    is_continuous = True
-    if len(poly_line_data) == 0:
-        is_continuous = False
-        secondary_sections.append(section)
-
-    # Get a list of all the poly-line that corresponds to the given section
-    section_data = get_section_poly_line(section=section)
-
-    # Extend the polyline samples for final mesh building
-    poly_line_data.extend(section_data)
-
-    # If the section does not have any children, then draw the section and clean the
-    # poly_line_data list
-    if not section.has_children():
-
-        # Section name
-        section_name = '%s_%d' % (name, section.index)
-
-        # Draw the section
+        # Draw the path
         section_object = draw_section_from_poly_line_data(
-            data=poly_line_data, name=section_name,
+            data=poly_line_data, name='%s_%d_%d' % (name, section.index, i),
             bevel_object=bevel_object, caps=caps)
 
         # Add the section object to the sections_objects list
         sections_objects.append(section_object)
 
-        # Clean the polyline samples list
-        poly_line_data[:] = []
-
-        # If no more branching is required, then exit the loop
-        return
-
-    # Iterate over the children sections and draw them, if any
-    for child in section.children:
-
-        # Draw the children sections
-        draw_connected_sections(
-            section=child, name=name, poly_line_data=poly_line_data,
-            sections_objects=sections_objects, secondary_sections=secondary_sections,
-            branching_level=branching_level, bevel_object=bevel_object, caps=caps)
+    # Return the list
+    return sections_objects
 
 
 ####################################################################################################
@@ -44,6 +44,9 @@ def set_skeleton_radii_to_fixed_value(morphology,
         for sample in section.samples:
             sample.radius = fixed_radius_value
 
+    # The radii have changed
+    morphology.invalidate_cached_data()
+
 
 ####################################################################################################
 # @set_skeleton_radii_to_scaled_value
@@ -62,29 +65,8 @@ def set_skeleton_radii_to_scaled_value(morphology,
         for sample in section.samples:
             sample.radius = sample.radius * scale_factor
 
-
-####################################################################################################
-# @update_skeleton_radii
-####################################################################################################
-def update_skeleton_radii(morphology,
-                          options):
-    """Update the radii of the arbors of a given morphology skeleton.
-
-    :param morphology:
-        A given morphology skeleton.
-    :param options:
-        Morphology options as set by the user.
-    """
-
-    if options.morphology.radii == vmv.enums.Morphology.Radii.FIXED:
-        set_skeleton_radii_to_fixed_value(
-            morphology=morphology, fixed_radius_value=options.morphology.sections_fixed_radii_value)
-
-    elif options.morphology.radii == vmv.enums.Morphology.Radii.SCALED:
-        set_skeleton_radii_to_scaled_value(
-            morphology=morphology, scale_factor=options.morphology.sections_radii_scale)
-    else:
-        pass
+    # The radii have changed
+    morphology.invalidate_cached_data()
 
 
 ####################################################################################################
@@ -100,7 +82,7 @@ def set_poly_line_radii_to_fixed_value(poly_line,
     """
 
     # Poly-line samples
-    poly_line_samples = poly_line[0]
+    poly_line_samples = poly_line.samples
 
     # Update the radii of all the samples. Note that [0] is the coordinate and [1] is the radius
     for poly_line_sample in poly_line_samples:
@@ -120,7 +102,7 @@ def set_poly_line_radii_to_scaled_value(poly_line,
     """
 
     # Poly-line samples
-    poly_line_samples = poly_line[0]
+    poly_line_samples = poly_line.samples
 
     # Update the radii of all the samples. Note that [0] is the coordinate and [1] is the radius
     for poly_line_sample in poly_line_samples:
@@ -139,15 +121,13 @@ def update_poly_line_radii(poly_line,
     :return:
     """
 
-    if options.morphology.radii == vmv.enums.Morphology.Radii.FIXED:
-        set_poly_line_radii_to_fixed_value(
-            poly_line=poly_line, fixed_radius_value=options.morphology.sections_fixed_radii_value)
+    # Apply the policy to all the radii of the poly-line at once
+    radii = vmv.skeleton.ops.apply_morphology_radii_policy(
+        radii=[sample[1] for sample in poly_line.samples], options=options).tolist()
 
-    elif options.morphology.radii == vmv.enums.Morphology.Radii.SCALED:
-        set_poly_line_radii_to_scaled_value(
-            poly_line=poly_line, scale_factor=options.morphology.sections_radii_scale)
-    else:
-        pass
+    # Write the radii back. Note that [0] is the coordinate and [1] is the radius
+    for sample, radius in zip(poly_line.samples, radii):
+        sample[1] = radius
 
 ####################################################################################################
 # @compute_segment_surface_area
@@ -196,12 +176,11 @@ def compute_section_average_radius(section):
 ####################################################################################################
 def get_minumum_and_maximum_sections_average_radii(morphology):
 
-    # Get a list of radii 
-    radii = [compute_section_average_radius(section=section) 
-        for section in morphology.sections_list]
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-    # Return the minimum and maximum 
-    return min(radii), max(radii)
+    # Return the minimum and maximum
+    return float(metrics.sections_average_radii.min()), float(metrics.sections_average_radii.max())
 
 
 ####################################################################################################
@@ -209,12 +188,11 @@ def get_minumum_and_maximum_sections_average_radii(morphology):
 ####################################################################################################
 def get_minumum_and_maximum_sections_lengths(morphology):
 
-    # Get a list of lengths 
-    sections_lengths = [compute_section_length(section=section) 
-        for section in morphology.sections_list]
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
     # Return the minimum and maximum
-    return min(sections_lengths), max(sections_lengths)
+    return float(metrics.sections_lengths.min()), float(metrics.sections_lengths.max())
 
 
 ####################################################################################################
@@ -222,19 +200,11 @@ def get_minumum_and_maximum_sections_lengths(morphology):
 ####################################################################################################
 def get_minumum_and_maximum_samples_radii(morphology):
 
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-    minimum = vmv.consts.Math.INFINITY  
-    maximum = -vmv.consts.Math.INFINITY
-
-    for section in morphology.sections_list:
-
-        for sample in section.samples:
-            if sample.radius < minimum:
-                minimum = sample.radius
-            if sample.radius > maximum:
-                maximum = sample.radius
-    
-    return minimum, maximum
+    # Return the minimum and maximum
+    return float(metrics.radii.min()), float(metrics.radii.max())
 
 
 ###################################################################################################
@@ -242,21 +212,11 @@ def get_minumum_and_maximum_samples_radii(morphology):
 ####################################################################################################
 def get_minumum_and_maximum_segments_length(morphology):
 
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-    minimum = vmv.consts.Math.INFINITY  
-    maximum = -vmv.consts.Math.INFINITY
-
-    for section in morphology.sections_list:
-
-        for i in range(len(section.samples) - 1):
-
-            segment_length = (section.samples[i + 1].point - section.samples[i].point).length
-            if segment_length < minimum:
-                minimum = segment_length
-            if segment_length > maximum:
-                maximum = segment_length
-    
-    return minimum, maximum
+    # Return the minimum and maximum
+    return float(metrics.segments_lengths.min()), float(metrics.segments_lengths.max())
 
 
 
@@ -438,15 +398,11 @@ def compute_sections_surface_areas_from_segments(section,
 ####################################################################################################
 def get_minumum_and_maximum_segments_surface_area(morphology):
 
-    
-    segments_surface_areas = list()
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-    for section in morphology.sections_list:
-
-        compute_segments_surface_areas_in_section(
-            section=section, segments_surface_areas=segments_surface_areas)
-            
-    return min(segments_surface_areas), max(segments_surface_areas)
+    # Return the minimum and maximum
+    return float(metrics.segments_surface_areas.min()), float(metrics.segments_surface_areas.max())
 
 
 ###################################################################################################
@@ -454,15 +410,11 @@ def get_minumum_and_maximum_segments_surface_area(morphology):
 ####################################################################################################
 def get_minumum_and_maximum_segments_volume(morphology):
 
-    
-    segments_volumes = list()
-
-    for section in morphology.sections_list:
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-        compute_segments_volumes_in_section(
-            section=section, segments_volumes=segments_volumes)
-            
-    return min(segments_volumes), max(segments_volumes)
+    # Return the minimum and maximum
+    return float(metrics.segments_volumes.min()), float(metrics.segments_volumes.max())
 
 
 
@@ -471,12 +423,11 @@ def get_minumum_and_maximum_segments_volume(morphology):
 ####################################################################################################
 def get_minumum_and_maximum_sections_surface_areas(morphology):
 
-    sections_surface_area = list()
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-    for section in morphology.sections_list:
-        sections_surface_area.append(compute_section_surface_area(section=section))
-            
-    return min(sections_surface_area), max(sections_surface_area)
+    # Return the minimum and maximum
+    return float(metrics.sections_surface_areas.min()), float(metrics.sections_surface_areas.max())
 
 
 ###################################################################################################
@@ -484,14 +435,11 @@ def get_minumum_and_maximum_sections_surface_areas(morphology):
 ####################################################################################################
 def get_minumum_and_maximum_sections_volumes(morphology):
 
-    
-    sections_volumes = list()
-
-    for section in morphology.sections_list:
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-        sections_volumes.append(compute_section_volume(section=section))
-            
-    return min(sections_volumes), max(sections_volumes)
+    # Return the minimum and maximum
+    return float(metrics.sections_volumes.min()), float(metrics.sections_volumes.max())
 
 
 ###################################################################################################
@@ -499,14 +447,11 @@ def get_minumum_and_maximum_sections_volumes(morphology):
 ####################################################################################################
 def get_minumum_and_maximum_sections_number_samples(morphology):
 
-    
-    sections_number_samples = list()
-
-    for section in morphology.sections_list:
+    # Get the cached metrics of the morphology
+    metrics = morphology.get_metrics()
 
-        sections_number_samples.append(len(section.samples))
-            
-    return min(sections_number_samples), max(sections_number_samples)
+    # Return the minimum and maximum
+    return int(metrics.sections_number_samples.min()), int(metrics.sections_number_samples.max())
 
 
 
@@ -521,13 +466,41 @@ def update_poly_lines_radii(poly_lines,
     """
 
     # Save the processing time
-    if options.morphology.radii == vmv.enums.Morphology.Radii.FIXED or \
-            options.morphology.radii == vmv.enums.Morphology.Radii.SCALED:
-        for poly_line in poly_lines:
-            update_poly_line_radii(poly_line=poly_line, options=options)
+    if options.morphology.radii == vmv.enums.Morphology.Radii.AS_SPECIFIED:
+        return
+
+    # Apply the policy to the radii of all the poly-lines at once
+    radii = vmv.skeleton.ops.apply_morphology_radii_policy(
+        radii=[sample[1] for poly_line in poly_lines for sample in poly_line.samples],
+        options=options).tolist()
+
+    # Write the radii back. Note that [0] is the coordinate and [1] is the radius
+    i = 0
+    for poly_line in poly_lines:
+        for sample in poly_line.samples:
+            sample[1] = radii[i]
+            i += 1
+
+
 
 
 
+####################################################################################################
+# @update_poly_lines_batch_radii
+####################################################################################################
+def update_poly_lines_batch_radii(poly_lines_batch,
+                                  options):
+    """Updates the radii of all the samples of a poly-lines batch at once.
+
+    :param poly_lines_batch:
+        A given PolyLinesBatch.
+    :param options:
+        Morphology options as set by the user.
+    """
+
+    # Apply the policy to all the radii in place
+    poly_lines_batch.radius[:] = vmv.skeleton.ops.apply_morphology_radii_policy(
+        radii=poly_lines_batch.radius, options=options)
 
 
 def resample_poly_line_adaptively(poly_line):
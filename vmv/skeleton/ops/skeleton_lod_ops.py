@@ -0,0 +1,101 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import vmv.consts
+import vmv.skeleton
+
+
+####################################################################################################
+# @simplify_samples_arrays
+####################################################################################################
+def simplify_samples_arrays(points,
+                            radii,
+                            offsets,
+                            radius_tolerance=vmv.consts.Skeleton.LOD_RADIUS_TOLERANCE):
+    """Simplifies a flat skeleton by halving the number of samples along every section.
+
+    The first and last samples of each section are always kept to preserve the connectivity.
+    Every other interior sample is dropped, unless its radius deviates from the mean radius of its
+    two neighbours by more than the given relative tolerance, to keep narrowings and bulges.
+
+    :param points:
+        An array of N points.
+    :param radii:
+        An array of N radii.
+    :param offsets:
+        The offsets of the sections into the flat arrays, with S + 1 entries.
+    :param radius_tolerance:
+        The relative radius deviation above which an interior sample is always kept.
+    :return:
+        A tuple of three arrays (points, radii, offsets) of the simplified skeleton.
+    """
+
+    # The number of samples in each section, and the section of every sample
+    counts = numpy.diff(offsets)
+    sections_indices = vmv.skeleton.ops.get_samples_sections_indices(offsets)
+    local_indices = vmv.skeleton.ops.get_samples_local_indices(offsets)
+
+    # The last sample of each section
+    last_samples = local_indices == (counts[sections_indices] - 1)
+
+    # Keep the even samples and the terminal ones
+    keep = (local_indices % 2 == 0) | last_samples
+
+    # Interior samples that are candidates for removal
+    interior = numpy.nonzero((local_indices > 0) & ~last_samples & ~keep)[0]
+
+    # Keep the interior samples that are significantly different from their neighbours
+    predicted_radii = 0.5 * (radii[interior - 1] + radii[interior + 1])
+    deviation = numpy.abs(radii[interior] - predicted_radii)
+    keep[interior[deviation > radius_tolerance * numpy.maximum(predicted_radii, 1e-6)]] = True
+
+    # Recompute the offsets of the simplified sections
+    simplified_offsets = numpy.zeros_like(offsets)
+    numpy.cumsum(numpy.bincount(sections_indices[keep], minlength=len(counts)),
+                 out=simplified_offsets[1:])
+
+    # Return the simplified arrays
+    return points[keep], radii[keep], simplified_offsets
+
+
+####################################################################################################
+# @build_level_of_detail
+####################################################################################################
+def build_level_of_detail(previous_level,
+                          radius_tolerance=vmv.consts.Skeleton.LOD_RADIUS_TOLERANCE):
+    """Builds the next level of detail of a skeleton from the previous level.
+
+    :param previous_level:
+        The previous LevelOfDetail in the pyramid.
+    :param radius_tolerance:
+        The relative radius deviation above which an interior sample is always kept.
+    :return:
+        A new LevelOfDetail with roughly half the number of samples.
+    """
+
+    # Simplify the previous level
+    points, radii, offsets = simplify_samples_arrays(
+        points=previous_level.points, radii=previous_level.radii, offsets=previous_level.offsets,
+        radius_tolerance=radius_tolerance)
+
+    # Construct the level
+    return vmv.skeleton.LevelOfDetail(
+        level=previous_level.level + 1, points=points, radii=radii, offsets=offsets)
@@ -0,0 +1,149 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import math
+import numpy
+
+
+####################################################################################################
+# @get_segments_arrays
+####################################################################################################
+def get_segments_arrays(offsets):
+    """Returns the indices of the first samples of all the segments in the flat samples arrays,
+    and the offsets of the segments of every section.
+
+    The segments of the i-th section are in the range [offsets[i], offsets[i + 1]) of the returned
+    segments array, and the j-th segment connects the samples [j] and [j + 1].
+
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :return:
+        A tuple of two arrays (segments [M], segments offsets [S + 1]).
+    """
+
+    # Each section with N samples has N - 1 segments
+    segments_counts = numpy.maximum(numpy.diff(offsets) - 1, 0)
+
+    # The offsets of the segments of the sections
+    segments_offsets = numpy.zeros_like(offsets)
+    numpy.cumsum(segments_counts, out=segments_offsets[1:])
+
+    # Shift the index of every segment by the difference between the offsets of its section
+    segments = numpy.arange(segments_offsets[-1], dtype=numpy.int64) + numpy.repeat(
+        offsets[:-1] - segments_offsets[:-1], segments_counts)
+
+    # Return the arrays
+    return segments, segments_offsets
+
+
+####################################################################################################
+# @compute_segments_lengths_array
+####################################################################################################
+def compute_segments_lengths_array(points,
+                                   segments):
+    """Computes the lengths of all the segments at once.
+
+    :param points:
+        An array of N points.
+    :param segments:
+        The indices of the first samples of the segments.
+    :return:
+        An array of the lengths of the segments.
+    """
+
+    return numpy.linalg.norm(points[segments + 1] - points[segments], axis=1)
+
+
+####################################################################################################
+# @compute_segments_lateral_areas_array
+####################################################################################################
+def compute_segments_lateral_areas_array(radii,
+                                         segments,
+                                         segments_lengths):
+    """Computes the lateral areas of all the segments at once, similar to
+    @compute_segment_surface_area.
+
+    :param radii:
+        An array of N radii.
+    :param segments:
+        The indices of the first samples of the segments.
+    :param segments_lengths:
+        The lengths of the segments.
+    :return:
+        An array of the lateral areas of the segments.
+    """
+
+    # The radii of the two samples of every segment
+    r0 = radii[segments]
+    r1 = radii[segments + 1]
+
+    # Compute the lateral area
+    return math.pi * (r0 + r1) * numpy.sqrt((r0 - r1) * (r0 - r1) + segments_lengths)
+
+
+####################################################################################################
+# @compute_segments_volumes_array
+####################################################################################################
+def compute_segments_volumes_array(radii,
+                                   segments,
+                                   segments_lengths):
+    """Computes the volumes of all the segments at once, where each segment is approximated by a
+    tapered cylinder, similar to @compute_segment_volume.
+
+    :param radii:
+        An array of N radii.
+    :param segments:
+        The indices of the first samples of the segments.
+    :param segments_lengths:
+        The lengths of the segments.
+    :return:
+        An array of the volumes of the segments.
+    """
+
+    # The radii of the two samples of every segment
+    r0 = radii[segments]
+    r1 = radii[segments + 1]
+
+    # Compute the volume
+    return (1.0 / 3.0) * math.pi * segments_lengths * (r0 * r0 + r0 * r1 + r1 * r1)
+
+
+####################################################################################################
+# @sum_segments_values_per_section
+####################################################################################################
+def sum_segments_values_per_section(values,
+                                    segments_offsets):
+    """Accumulates the values of the segments per section.
+
+    :param values:
+        An array of values, one per segment.
+    :param segments_offsets:
+        The offsets of the segments of the sections, with S + 1 entries.
+    :return:
+        An array of S sums, where sections without segments have zero.
+    """
+
+    # The number of sections
+    number_sections = len(segments_offsets) - 1
+
+    # The section of every segment
+    sections_indices = numpy.repeat(numpy.arange(number_sections, dtype=numpy.int64),
+                                    numpy.diff(segments_offsets))
+
+    # Accumulate
+    return numpy.bincount(sections_indices, weights=values, minlength=number_sections)
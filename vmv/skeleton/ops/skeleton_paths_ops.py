@@ -0,0 +1,274 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import vmv.skeleton
+
+
+####################################################################################################
+# @get_sections_adjacency_index
+####################################################################################################
+def get_sections_adjacency_index(sections_list):
+    """Constructs an index of the children of every section in a given list of sections.
+
+    The children of the i-th section are in the range [children_offsets[i], children_offsets[i + 1])
+    of the returned children array, as indices into the sections list. Children that are not in
+    the list are ignored.
+
+    :param sections_list:
+        A list of sections.
+    :return:
+        A tuple of two arrays (children [E], children_offsets [S + 1]).
+    """
+
+    # Map every section to its index in the list
+    positions = {id(section): i for i, section in enumerate(sections_list)}
+
+    # The children of all the sections, in order
+    children = [positions[id(child)] for section in sections_list for child in section.children
+                if id(child) in positions]
+
+    # The number of children per section
+    counts = numpy.fromiter(
+        (sum(1 for child in section.children if id(child) in positions)
+         for section in sections_list), dtype=numpy.int64, count=len(sections_list))
+
+    # The offsets of the children of every section
+    children_offsets = numpy.zeros(len(sections_list) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=children_offsets[1:])
+
+    # Return the index
+    return numpy.array(children, dtype=numpy.int64), children_offsets
+
+
+####################################################################################################
+# @get_roots_indices
+####################################################################################################
+def get_roots_indices(sections_list):
+    """Gets the indices of the root sections, i.e. the sections that have no parents.
+
+    :param sections_list:
+        A list of sections.
+    :return:
+        An array of indices into the sections list.
+    """
+
+    # Sections without parents
+    return numpy.fromiter((i for i, section in enumerate(sections_list)
+                           if len(section.parents) == 0), dtype=numpy.int64)
+
+
+####################################################################################################
+# @get_reachable_sections
+####################################################################################################
+def get_reachable_sections(section):
+    """Gets all the sections that can be reached from a given section along its children.
+
+    :param section:
+        A given section.
+    :return:
+        A list of sections, starting with the given one.
+    """
+
+    # The identifiers of the sections that were already found
+    found = {id(section)}
+
+    # The reachable sections
+    sections = [section]
+
+    # Traverse with an explicit stack
+    stack = [section]
+    while stack:
+        for child in stack.pop().children:
+            if id(child) not in found:
+                found.add(id(child))
+                sections.append(child)
+                stack.append(child)
+
+    # Return the list
+    return sections
+
+
+####################################################################################################
+# @get_connected_paths_arrays
+####################################################################################################
+def get_connected_paths_arrays(children,
+                               children_offsets,
+                               seeds):
+    """Splits a graph of sections into connected paths that run from the seeds to the leaves,
+    where every section belongs to exactly one path.
+
+    The graph is traversed with an explicit stack, so deep trees do not hit the recursion limit.
+    A path continues into the first child that has not been visited yet, and every other child
+    starts a new path. A visited bitmask stops the traversal along cycles, and sections that
+    cannot be reached from any seed are appended as extra paths.
+
+    :param children:
+        The children of all the sections, see get_sections_adjacency_index.
+    :param children_offsets:
+        The offsets of the children of every section, with S + 1 entries.
+    :param seeds:
+        The indices of the sections where the traversal starts, usually the roots.
+    :return:
+        A tuple of two arrays (paths sections [S], paths offsets [P + 1]), where the sections of
+        the i-th path are in the range [paths_offsets[i], paths_offsets[i + 1]).
+    """
+
+    # The number of sections
+    number_sections = len(children_offsets) - 1
+
+    # Plain lists are faster than arrays for scalar access
+    children = children.tolist()
+    children_offsets = children_offsets.tolist()
+
+    # The visiting state of every section
+    visited = bytearray(number_sections)
+
+    # The sections of all the paths, and the offsets of the paths
+    paths_sections = list()
+    paths_offsets = [0]
+
+    # Start from the seeds, then pick up any section that was not reached
+    for seed in list(seeds) + list(range(number_sections)):
+
+        # Sections that start new paths
+        stack = [seed]
+
+        while stack:
+
+            # The first section of the path
+            current = stack.pop()
+
+            # Already a part of another path
+            if visited[current]:
+                continue
+
+            # Extend the path as long as there is an unvisited child
+            while current >= 0:
+
+                # Add the section to the path
+                visited[current] = 1
+                paths_sections.append(current)
+
+                # Continue into the first unvisited child and defer the others
+                following = -1
+                for i in range(children_offsets[current], children_offsets[current + 1]):
+                    child = children[i]
+                    if visited[child]:
+                        continue
+                    if following < 0:
+                        following = child
+                    else:
+                        stack.append(child)
+                current = following
+
+            # Close the path
+            paths_offsets.append(len(paths_sections))
+
+    # Return the arrays
+    return numpy.array(paths_sections, dtype=numpy.int64), \
+        numpy.array(paths_offsets, dtype=numpy.int64)
+
+
+####################################################################################################
+# @get_paths_samples_indices
+####################################################################################################
+def get_paths_samples_indices(paths_sections,
+                              paths_offsets,
+                              offsets):
+    """Gets the indices of the samples of a list of connected paths in the flat arrays.
+
+    Consecutive sections share the branching sample, so the last sample of every section except
+    the last one along the path is skipped.
+
+    :param paths_sections:
+        The sections of all the paths, see get_connected_paths_arrays.
+    :param paths_offsets:
+        The offsets of the paths into the paths sections, with P + 1 entries.
+    :param offsets:
+        The offsets of the sections into the flat samples arrays, with S + 1 entries.
+    :return:
+        A tuple of two arrays (samples indices [M], samples offsets [P + 1]), where the samples of
+        the i-th path are in the range [samples_offsets[i], samples_offsets[i + 1]).
+    """
+
+    # The ranges of the samples of every section
+    starts = offsets[paths_sections]
+    stops = offsets[paths_sections + 1].copy()
+
+    # Skip the shared samples of all but the last section along every path
+    is_last = numpy.zeros(len(paths_sections), dtype=bool)
+    is_last[paths_offsets[1:] - 1] = True
+    stops[~is_last] -= 1
+    counts = numpy.maximum(stops - starts, 0)
+
+    # Expand the ranges into indices
+    ranges_offsets = numpy.zeros(len(paths_sections) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=ranges_offsets[1:])
+    samples = numpy.arange(ranges_offsets[-1], dtype=numpy.int64) + \
+        numpy.repeat(starts - ranges_offsets[:-1], counts)
+
+    # Return the indices and the offsets of the paths
+    return samples, ranges_offsets[paths_offsets]
+
+
+####################################################################################################
+# @get_connected_paths_poly_lines_from_section
+####################################################################################################
+def get_connected_paths_poly_lines_from_section(section,
+                                                center=None):
+    """Gets the data of the connected paths from a given section to the leaves in poly-line
+    format, with one poly-line per path.
+
+    :param section:
+        The first section of the paths.
+    :param center:
+        An optional center that is subtracted from all the samples.
+    :return:
+        A list of poly-lines, where the samples are in the format [(X, Y, Z, 1), R].
+    """
+
+    # The sections that can be reached from this one, with a local index
+    sections_list = get_reachable_sections(section)
+    children, children_offsets = get_sections_adjacency_index(sections_list)
+
+    # The flat samples arrays of the reachable sections
+    points, radii, offsets = vmv.skeleton.ops.get_sections_samples_arrays(sections_list)
+    if center is not None:
+        points -= numpy.array((center[0], center[1], center[2]))
+
+    # The paths and their samples
+    paths_sections, paths_offsets = get_connected_paths_arrays(
+        children, children_offsets, seeds=[0])
+    samples, samples_offsets = get_paths_samples_indices(paths_sections, paths_offsets, offsets)
+
+    # Plain lists are faster than arrays for scalar access
+    points = points.tolist()
+    radii = radii.tolist()
+    samples = samples.tolist()
+
+    # Convert the samples of every path into poly-line format
+    poly_lines = list()
+    for i in range(len(samples_offsets) - 1):
+        poly_lines.append([[(points[j][0], points[j][1], points[j][2], 1), radii[j]]
+                           for j in samples[samples_offsets[i]:samples_offsets[i + 1]]])
+
+    # Return the poly-lines
+    return poly_lines
@@ -0,0 +1,85 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import vmv.enums
+
+
+####################################################################################################
+# @apply_radii_policy
+####################################################################################################
+def apply_radii_policy(radii,
+                       radii_policy,
+                       fixed_radius=1.0,
+                       scale_factor=1.0,
+                       minimum_radius=0.0):
+    """Applies a radius policy to a whole array of radii in a single expression.
+
+    :param radii:
+        An array of radii.
+    :param radii_policy:
+        The radius policy, see enums:Morphology.Radii.
+    :param fixed_radius:
+        The value of the radius in the FIXED policy.
+    :param scale_factor:
+        The scale factor in the SCALED policy.
+    :param minimum_radius:
+        The minimum radius in the MINIMUM policy.
+    :return:
+        A new array of radii, or the given one if the radii are used as specified.
+    """
+
+    # Fixed radii
+    if radii_policy == vmv.enums.Morphology.Radii.FIXED:
+        return numpy.full(numpy.shape(radii), fixed_radius, dtype=numpy.asarray(radii).dtype)
+
+    # Scaled radii
+    elif radii_policy == vmv.enums.Morphology.Radii.SCALED:
+        return numpy.asarray(radii) * scale_factor
+
+    # Minimum threshold
+    elif radii_policy == vmv.enums.Morphology.Radii.MINIMUM:
+        return numpy.maximum(radii, minimum_radius)
+
+    # As specified in the morphology
+    else:
+        return numpy.asarray(radii)
+
+
+####################################################################################################
+# @apply_morphology_radii_policy
+####################################################################################################
+def apply_morphology_radii_policy(radii,
+                                  options):
+    """Applies the radius policy that is selected in the morphology options to an array of radii.
+
+    :param radii:
+        An array of radii.
+    :param options:
+        System options.
+    :return:
+        A new array of radii, or the given one if the radii are used as specified.
+    """
+
+    return apply_radii_policy(
+        radii=radii, radii_policy=options.morphology.radii,
+        fixed_radius=options.morphology.sections_fixed_radii_value,
+        scale_factor=options.morphology.sections_radii_scale,
+        minimum_radius=options.morphology.sections_radii_minimum)
@@ -16,8 +16,11 @@
 ####################################################################################################
 
 # Internal imports
+from .level_of_detail import *
 from .morphology import *
+from .morphology_metrics import *
 from .polyline import * 
+from .polylines_batch import *
 from .sample import *
 from .section import *
 
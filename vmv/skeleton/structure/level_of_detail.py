@@ -0,0 +1,75 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# LevelOfDetail
+####################################################################################################
+class LevelOfDetail:
+    """A compact level in the multi-resolution pyramid of a morphology skeleton.
+
+    The samples of all the sections are stored in flat arrays, where the samples of the i-th
+    section are in the range [offsets[i], offsets[i + 1]). The sections are stored in the same
+    order of the sections list of the morphology.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 level,
+                 points,
+                 radii,
+                 offsets):
+        """Constructor
+
+        :param level:
+            The index of the level in the pyramid, where 0 is the original skeleton.
+        :param points:
+            An array of N points.
+        :param radii:
+            An array of N radii.
+        :param offsets:
+            The offsets of the sections into the flat arrays, with S + 1 entries.
+        """
+
+        # Level index
+        self.level = level
+
+        # Samples points, in single precision to keep the pyramid compact
+        self.points = numpy.asarray(points, dtype=numpy.float32)
+
+        # Samples radii
+        self.radii = numpy.asarray(radii, dtype=numpy.float32)
+
+        # Sections offsets
+        self.offsets = numpy.asarray(offsets, dtype=numpy.int64)
+
+    ################################################################################################
+    # @get_number_samples
+    ################################################################################################
+    def get_number_samples(self):
+        """Returns the total number of samples in this level.
+
+        :return:
+            The number of samples in this level.
+        """
+
+        return len(self.radii)
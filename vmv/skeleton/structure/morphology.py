@@ -21,6 +21,7 @@ from mathutils import Vector
 # Internal imports
 import vmv.bbox
 import vmv.consts
+import vmv.skeleton
 
 
 ####################################################################################################
@@ -74,6 +75,15 @@ class Morphology:
         if bounding_box is None:
             self.bounding_box = self.compute_bounding_box()
 
+        # The cached metrics of the sections and segments, computed on demand
+        self.metrics = None
+
+        # The levels of the multi-resolution pyramid of the skeleton, built on demand
+        self.levels_of_detail = list()
+
+        # The morphologies reconstructed from the levels of the pyramid, indexed by their level
+        self.levels_of_detail_morphologies = dict()
+
     ################################################################################################
     # @get_center
     ################################################################################################
@@ -130,23 +140,6 @@ class Morphology:
         # Return the bounding box
         return self.bounding_box
 
-    ################################################################################################
-    # @reset_traversal_states
-    ################################################################################################
-    def reset_traversal_states(self):
-        """Resets the traversal state of every section in the morphology tree after the construct
-        of the tree.
-        """
-
-        # The sections list must not be empty
-        if self.sections_list is not None:
-
-            # For every section
-            for section in self.sections_list:
-
-                # Reset the traversal list
-                section.traversed = False
-
     ################################################################################################
     # @average_terminal_samples_radii
     ################################################################################################
@@ -163,3 +156,176 @@ class Morphology:
         # Update the radii values
         for section in self.sections_list:
             section.update_terminals_radii()
+
+        # The radii have changed
+        self.invalidate_cached_data()
+
+    ################################################################################################
+    # @get_metrics
+    ################################################################################################
+    def get_metrics(self):
+        """Returns the metrics of the sections and segments of the morphology. The metrics are
+        computed once and cached until the morphology is modified.
+
+        :return:
+            A MorphologyMetrics object.
+        """
+
+        # Compute the metrics if they are not cached
+        if self.metrics is None:
+            self.metrics = vmv.skeleton.MorphologyMetrics(self.sections_list)
+
+        # Return the cached metrics
+        return self.metrics
+
+    ################################################################################################
+    # @invalidate_cached_data
+    ################################################################################################
+    def invalidate_cached_data(self):
+        """Discards all the data that are derived from the samples of the morphology, i.e. the
+        metrics and the levels-of-detail pyramid. This function must be called after modifying the
+        samples of the morphology.
+        """
+
+        # Discard the metrics
+        self.metrics = None
+
+        # Discard the pyramid
+        self.reset_levels_of_detail()
+
+    ################################################################################################
+    # @reset_levels_of_detail
+    ################################################################################################
+    def reset_levels_of_detail(self):
+        """Discards the levels-of-detail pyramid of the morphology. This function must be called
+        if the samples of the morphology are modified after the pyramid has been built.
+        """
+
+        # Clear the levels
+        self.levels_of_detail.clear()
+
+        # Clear the reconstructed morphologies
+        self.levels_of_detail_morphologies.clear()
+
+    ################################################################################################
+    # @get_level_of_detail
+    ################################################################################################
+    def get_level_of_detail(self,
+                            level):
+        """Returns a given level of the levels-of-detail pyramid of the morphology.
+
+        The pyramid is built incrementally, where each missing level is simplified from the
+        previous one. The building stops earlier if a level cannot be simplified any further.
+
+        :param level:
+            The requested level, where 0 is the original skeleton.
+        :return:
+            The requested LevelOfDetail, or the coarsest available one.
+        """
+
+        # Clamp the level to the maximum number of levels
+        level = max(0, min(level, vmv.consts.Skeleton.LOD_NUMBER_LEVELS))
+
+        # Build the original level from the sections
+        if len(self.levels_of_detail) == 0:
+            points, radii, offsets = vmv.skeleton.ops.get_sections_samples_arrays(
+                self.sections_list)
+            self.levels_of_detail.append(vmv.skeleton.LevelOfDetail(
+                level=0, points=points, radii=radii, offsets=offsets))
+
+        # Build the missing levels from the previous ones
+        while len(self.levels_of_detail) <= level:
+
+            # Simplify the last available level
+            previous_level = self.levels_of_detail[-1]
+            next_level = vmv.skeleton.ops.build_level_of_detail(previous_level)
+
+            # No more simplification is possible
+            if next_level.get_number_samples() == previous_level.get_number_samples():
+                break
+
+            # Append the level to the pyramid
+            self.levels_of_detail.append(next_level)
+
+        # Return the requested level, or the coarsest one
+        return self.levels_of_detail[min(level, len(self.levels_of_detail) - 1)]
+
+    ################################################################################################
+    # @build_levels_of_detail
+    ################################################################################################
+    def build_levels_of_detail(self,
+                               number_levels=vmv.consts.Skeleton.LOD_NUMBER_LEVELS):
+        """Precomputes the levels-of-detail pyramid of the morphology.
+
+        :param number_levels:
+            The number of simplified levels to be built.
+        :return:
+            A list of all the levels in the pyramid.
+        """
+
+        # Build the coarsest level, and all the intermediate ones on the way
+        self.get_level_of_detail(level=number_levels)
+
+        # Return the pyramid
+        return self.levels_of_detail
+
+    ################################################################################################
+    # @get_level_of_detail_morphology
+    ################################################################################################
+    def get_level_of_detail_morphology(self,
+                                       level):
+        """Returns a morphology object that is reconstructed from a given level of detail to be
+        used by the builders. The sections have the same indices and connectivity of the original
+        ones.
+
+        :param level:
+            The requested level, where 0 is the original skeleton.
+        :return:
+            A reference to the simplified morphology, or to this morphology if the level is 0.
+        """
+
+        # Get the level, it might be coarser or finer than requested
+        level_of_detail = self.get_level_of_detail(level=level)
+
+        # The original morphology
+        if level_of_detail.level == 0:
+            return self
+
+        # Already reconstructed
+        if level_of_detail.level in self.levels_of_detail_morphologies:
+            return self.levels_of_detail_morphologies[level_of_detail.level]
+
+        # Reconstruct the sections from the flat arrays
+        sections_list = list()
+        offsets = level_of_detail.offsets
+        for i, section in enumerate(self.sections_list):
+
+            # Construct the samples of the section
+            samples = [vmv.skeleton.Sample(
+                point=Vector(level_of_detail.points[j]), radius=float(level_of_detail.radii[j]))
+                for j in range(offsets[i], offsets[i + 1])]
+
+            # Construct the section with the same index
+            sections_list.append(vmv.skeleton.Section(index=section.index, samples=samples))
+
+        # Map the original sections to their positions in the list to copy the connectivity
+        sections_positions = {id(section): i for i, section in enumerate(self.sections_list)}
+        for section, simplified_section in zip(self.sections_list, sections_list):
+            simplified_section.parents = [
+                sections_list[sections_positions[id(parent)]] for parent in section.parents]
+            simplified_section.children = [
+                sections_list[sections_positions[id(child)]] for child in section.children]
+
+        # The roots of the simplified morphology
+        roots = [section for section in sections_list if section.is_root()]
+
+        # Construct the morphology, the bounding box is shared with the original one
+        morphology = Morphology(
+            morphology_name=self.name, morphology_file_path=self.morphology_file_path,
+            sections_list=sections_list, roots=roots, bounding_box=self.bounding_box)
+
+        # Cache it for later use
+        self.levels_of_detail_morphologies[level_of_detail.level] = morphology
+
+        # Return the simplified morphology
+        return morphology
@@ -0,0 +1,128 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import math
+import numpy
+
+# Internal imports
+import vmv.skeleton
+
+
+####################################################################################################
+# MorphologyMetrics
+####################################################################################################
+class MorphologyMetrics:
+    """The geometric metrics of all the sections and segments of a morphology, computed once in
+    flat arrays and shared between the color-coding, the builders and the analysis.
+
+    The i-th entry of each sections array corresponds to the i-th section in the sections list of
+    the morphology. The segments of the i-th section are in the range
+    [segments_offsets[i], segments_offsets[i + 1]) of each segments array.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 sections_list):
+        """Constructor
+
+        :param sections_list:
+            A list of all the sections in the morphology.
+        """
+
+        # SAMPLES ##################################################################################
+        # The samples of all the sections in flat arrays
+        self.points, self.radii, self.offsets = \
+            vmv.skeleton.ops.get_sections_samples_arrays(sections_list)
+
+        # SECTIONS GRAPH ###########################################################################
+        # The indices of the children of every section and their offsets
+        self.children, self.children_offsets = \
+            vmv.skeleton.ops.get_sections_adjacency_index(sections_list)
+
+        # The indices of the root sections
+        self.roots = vmv.skeleton.ops.get_roots_indices(sections_list)
+
+        # SEGMENTS #################################################################################
+        # The indices of the first samples of the segments and the offsets of every section
+        self.segments, self.segments_offsets = vmv.skeleton.ops.get_segments_arrays(self.offsets)
+
+        # The lengths of the segments
+        self.segments_lengths = vmv.skeleton.ops.compute_segments_lengths_array(
+            self.points, self.segments)
+
+        # The average radii of the segments
+        self.segments_average_radii = \
+            0.5 * (self.radii[self.segments] + self.radii[self.segments + 1])
+
+        # The lateral surface areas of the segments
+        self.segments_surface_areas = vmv.skeleton.ops.compute_segments_lateral_areas_array(
+            self.radii, self.segments, self.segments_lengths)
+
+        # The volumes of the segments
+        self.segments_volumes = vmv.skeleton.ops.compute_segments_volumes_array(
+            self.radii, self.segments, self.segments_lengths)
+
+        # SECTIONS #################################################################################
+        # The number of samples per section
+        self.sections_number_samples = numpy.diff(self.offsets)
+
+        # The lengths of the sections
+        self.sections_lengths = vmv.skeleton.ops.sum_segments_values_per_section(
+            self.segments_lengths, self.segments_offsets)
+
+        # The average radii of the sections, zero for the empty ones
+        radii_sums = numpy.bincount(
+            vmv.skeleton.ops.get_samples_sections_indices(self.offsets), weights=self.radii,
+            minlength=len(self.sections_number_samples))
+        self.sections_average_radii = radii_sums / numpy.maximum(self.sections_number_samples, 1)
+
+        # The surface areas of the sections, including the caps of every segment similar to
+        # @compute_section_surface_area
+        caps_areas = math.pi * (self.radii[self.segments] ** 2 + self.radii[self.segments + 1] ** 2)
+        self.sections_surface_areas = vmv.skeleton.ops.sum_segments_values_per_section(
+            self.segments_surface_areas + caps_areas, self.segments_offsets)
+
+        # The volumes of the sections
+        self.sections_volumes = vmv.skeleton.ops.sum_segments_values_per_section(
+            self.segments_volumes, self.segments_offsets)
+
+    ################################################################################################
+    # @get_number_samples
+    ################################################################################################
+    def get_number_samples(self):
+        """Returns the total number of samples in the morphology.
+
+        :return:
+            The total number of samples in the morphology.
+        """
+
+        return len(self.radii)
+
+    ################################################################################################
+    # @get_number_segments
+    ################################################################################################
+    def get_number_segments(self):
+        """Returns the total number of segments in the morphology.
+
+        :return:
+            The total number of segments in the morphology.
+        """
+
+        return len(self.segments)
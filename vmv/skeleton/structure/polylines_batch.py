@@ -0,0 +1,125 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# PolyLinesBatch
+####################################################################################################
+class PolyLinesBatch:
+    """A batch of poly-lines stored in flat arrays to be drawn in bulk without creating any Python
+    objects per sample.
+
+    The samples of the i-th poly-line are in the range [offsets[i], offsets[i + 1]) of the co and
+    radius arrays.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 co,
+                 radius,
+                 offsets,
+                 material_indices):
+        """Constructor
+
+        :param co:
+            An array of N homogeneous coordinates (X, Y, Z, 1).
+        :param radius:
+            An array of N radii.
+        :param offsets:
+            The offsets of the poly-lines into the samples arrays, with P + 1 entries.
+        :param material_indices:
+            An array of P material (or color) indices, one per poly-line.
+        """
+
+        # Samples coordinates
+        self.co = numpy.ascontiguousarray(co, dtype=numpy.float32)
+
+        # Samples radii
+        self.radius = numpy.ascontiguousarray(radius, dtype=numpy.float32)
+
+        # Poly-lines offsets
+        self.offsets = numpy.asarray(offsets, dtype=numpy.int64)
+
+        # Poly-lines material indices
+        self.material_indices = numpy.ascontiguousarray(material_indices, dtype=numpy.int32)
+
+    ################################################################################################
+    # @get_number_poly_lines
+    ################################################################################################
+    def get_number_poly_lines(self):
+        """Returns the number of poly-lines in the batch.
+
+        :return:
+            The number of poly-lines in the batch.
+        """
+
+        return len(self.offsets) - 1
+
+    ################################################################################################
+    # @get_number_samples
+    ################################################################################################
+    def get_number_samples(self):
+        """Returns the total number of samples in the batch.
+
+        :return:
+            The total number of samples in the batch.
+        """
+
+        return len(self.radius)
+
+    ################################################################################################
+    # @get_poly_lines_counts
+    ################################################################################################
+    def get_poly_lines_counts(self):
+        """Returns the number of samples of every poly-line in the batch.
+
+        :return:
+            An array of P samples counts.
+        """
+
+        return numpy.diff(self.offsets)
+
+    ################################################################################################
+    # @get_poly_lines_range
+    ################################################################################################
+    def get_poly_lines_range(self,
+                             first,
+                             last):
+        """Returns a batch of the poly-lines in the range [first, last) of this batch. The arrays
+        of the returned batch are views on the arrays of this one, so nothing is copied.
+
+        :param first:
+            The index of the first poly-line in the range.
+        :param last:
+            The index after the last poly-line in the range.
+        :return:
+            A PolyLinesBatch.
+        """
+
+        # The range of the samples
+        start = self.offsets[first]
+        stop = self.offsets[last]
+
+        return PolyLinesBatch(co=self.co[start:stop], radius=self.radius[start:stop],
+                              offsets=self.offsets[first:last + 1] - start,
+                              material_indices=self.material_indices[first:last])
+
@@ -53,10 +53,6 @@ class Section:
         # Children sections, initially empty list till the reconstruction of the entire data set
         self.children = list()
 
-        # A flag that indicates whether the section is traversed during the construction of the
-        # tree or not. This flag is reset after each traversal to False.
-        self.traversed = False
-
         # The average radius of the first sample w.r.t to pre-connected-sections
         self.first_sample_average_radius = 0
 
@@ -119,20 +115,6 @@ class Section:
             return True
         return False
 
-    ################################################################################################
-    # @all_children_traversed
-    ################################################################################################
-    def all_children_traversed(self):
-        """Checks if all the children sections have been traversed or not.
-
-        :return:
-            True or False
-        """
-
-        for child in self.children:
-            if not child.traversed:
-                return False
-
     ################################################################################################
     # @has_single_parent
     ################################################################################################
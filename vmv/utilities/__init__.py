@@ -22,4 +22,5 @@ from .interface import *
 from .time_line import *
 from .timer import *
 from .version import *
-from .math import *
\ No newline at end of file
+from .math import *
+from .color_map_lut import *
@@ -0,0 +1,238 @@
+####################################################################################################
+# Copyright (c) 2019 - 2020, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import vmv
+import vmv.enums
+
+
+# The color-maps that were already created, keyed by their colors and resolution
+COLOR_MAP_LUTS = dict()
+
+
+####################################################################################################
+# @create_color_map_lut
+####################################################################################################
+def create_color_map_lut(color_list,
+                         number_colors):
+    """Creates a look-up table (LUT) of a given number of colors that are interpolated linearly
+    from a list of colors. The table is created once per list of colors and resolution and then
+    reused from the cache.
+
+    :param color_list:
+        A list of RGB colors, for example the colors of the color-map in the UI.
+    :param number_colors:
+        The number of colors in the table, i.e. the resolution of the color-map.
+    :return:
+        A read-only array of the colors of the table [number_colors, 3].
+    """
+
+    # The key of the table
+    key = (tuple(tuple(float(c) for c in color[:3]) for color in color_list), int(number_colors))
+
+    # Reuse the table if it already exists
+    lut = COLOR_MAP_LUTS.get(key)
+    if lut is not None:
+        return lut
+
+    # The given colors
+    colors = numpy.array(key[0], dtype=numpy.float64).reshape(-1, 3)
+
+    # The positions of the interpolated colors along the given colors
+    positions = numpy.linspace(0.0, len(colors) - 1, int(number_colors))
+
+    # Interpolate the three channels at once
+    lut = numpy.empty((int(number_colors), 3), dtype=numpy.float64)
+    for channel in range(3):
+        lut[:, channel] = numpy.interp(positions, numpy.arange(len(colors)), colors[:, channel])
+
+    # The table is shared, so it cannot be modified
+    lut.flags.writeable = False
+
+    # Cache the table
+    COLOR_MAP_LUTS[key] = lut
+
+    # Return the table
+    return lut
+
+
+####################################################################################################
+# @normalize_color_map_values
+####################################################################################################
+def normalize_color_map_values(values,
+                               minimum,
+                               maximum,
+                               normalization=None):
+    """Maps an array of values to the range [0, 1] of the color-map, where the values out of the
+    range [minimum, maximum] are clamped.
+
+    :param values:
+        An array of values.
+    :param minimum:
+        The minimum value of the color-map.
+    :param maximum:
+        The maximum value of the color-map.
+    :param normalization:
+        The normalization mode, LINEAR by default.
+    :return:
+        An array of the normalized values in the range [0, 1].
+    """
+
+    # Clamp the values to the range of the color-map
+    values = numpy.clip(numpy.asarray(values, dtype=numpy.float64), minimum, maximum)
+
+    # If all the values are the same, they have the first color
+    color_map_range = float(maximum) - float(minimum)
+    if len(values) == 0 or color_map_range <= 0.0:
+        return numpy.zeros(len(values), dtype=numpy.float64)
+
+    # Log, the values are shifted to start from zero to support zero and negative values
+    if normalization == vmv.enums.ColorMapNormalization.LOG:
+        return numpy.log1p(values - minimum) / numpy.log1p(color_map_range)
+
+    # Quantile, the rank of every value among all the values
+    elif normalization == vmv.enums.ColorMapNormalization.QUANTILE:
+        if len(values) == 1:
+            return numpy.zeros(1, dtype=numpy.float64)
+        ranks = numpy.searchsorted(numpy.sort(values), values, side='left')
+        return ranks / float(len(values) - 1)
+
+    # Linear
+    else:
+        return (values - minimum) / color_map_range
+
+
+####################################################################################################
+# @map_values_to_color_map_indices
+####################################################################################################
+def map_values_to_color_map_indices(values,
+                                    color_map_resolution,
+                                    minimum=None,
+                                    maximum=None,
+                                    normalization=None):
+    """Maps an array of values to the indices of the colors in a color-map in one step.
+
+    :param values:
+        An array of values, for example from the cached metrics of the morphology.
+    :param color_map_resolution:
+        The number of colors in the color-map.
+    :param minimum:
+        The minimum value of the color-map, the minimum of the values if None.
+    :param maximum:
+        The maximum value of the color-map, the maximum of the values if None.
+    :param normalization:
+        The normalization mode, LINEAR by default.
+    :return:
+        An array of color indices in the range [0, color_map_resolution - 1].
+    """
+
+    # The values
+    values = numpy.asarray(values, dtype=numpy.float64)
+    if len(values) == 0:
+        return numpy.zeros(0, dtype=numpy.int32)
+
+    # The range of the color-map
+    minimum = float(values.min()) if minimum is None else float(minimum)
+    maximum = float(values.max()) if maximum is None else float(maximum)
+
+    # Normalize the values
+    normalized_values = normalize_color_map_values(values, minimum, maximum, normalization)
+
+    # Compute the indices and clamp them, the maximum has the last color
+    indices = numpy.floor(normalized_values * color_map_resolution).astype(numpy.int32)
+    return numpy.clip(indices, 0, max(int(color_map_resolution) - 1, 0), out=indices)
+
+
+####################################################################################################
+# @compute_color_map_index
+####################################################################################################
+def compute_color_map_index(value,
+                            minimum,
+                            maximum,
+                            color_map_resolution):
+    """Maps a single value to the index of its color in a color-map with a linear normalization.
+
+    :param value:
+        A given value.
+    :param minimum:
+        The minimum value of the color-map.
+    :param maximum:
+        The maximum value of the color-map.
+    :param color_map_resolution:
+        The number of colors in the color-map.
+    :return:
+        The color index in the range [0, color_map_resolution - 1].
+    """
+
+    # If all the values are the same, they have the first color
+    if maximum <= minimum:
+        return 0
+
+    # Compute the index and clamp it
+    index = int((value - minimum) / (maximum - minimum) * color_map_resolution)
+    return min(max(index, 0), max(int(color_map_resolution) - 1, 0))
+
+
+####################################################################################################
+# @compute_color_map_values
+####################################################################################################
+def compute_color_map_values(values,
+                             number_values,
+                             minimum=None,
+                             maximum=None,
+                             normalization=None):
+    """Computes the values at evenly spaced positions along a color-map, for example to label the
+    colors of the color-map in the UI.
+
+    :param values:
+        An array of values that are mapped to the color-map.
+    :param number_values:
+        The number of the evenly spaced positions.
+    :param minimum:
+        The minimum value of the color-map, the minimum of the values if None.
+    :param maximum:
+        The maximum value of the color-map, the maximum of the values if None.
+    :param normalization:
+        The normalization mode, LINEAR by default.
+    :return:
+        An array of values, one per position.
+    """
+
+    # The values
+    values = numpy.asarray(values, dtype=numpy.float64)
+
+    # The range of the color-map
+    minimum = float(values.min()) if minimum is None else float(minimum)
+    maximum = float(values.max()) if maximum is None else float(maximum)
+
+    # The positions along the color-map
+    positions = numpy.linspace(0.0, 1.0, int(number_values))
+
+    # Log
+    if normalization == vmv.enums.ColorMapNormalization.LOG:
+        return minimum + numpy.expm1(positions * numpy.log1p(max(maximum - minimum, 0.0)))
+
+    # Quantile
+    elif normalization == vmv.enums.ColorMapNormalization.QUANTILE and len(values) > 0:
+        return numpy.quantile(numpy.clip(values, minimum, maximum), positions)
+
+    # Linear
+    else:
+        return minimum + positions * (maximum - minimum)
@@ -19,6 +19,9 @@
 # Imports 
 from mathutils import Vector
 
+# Internal imports
+import vmv
+
 
 ####################################################################################################
 # @interpolate_list
@@ -52,32 +55,11 @@ def hex_to_rgb(hex_color):
 ####################################################################################################
 def create_color_map_from_color_list(color_list, number_colors):
 
-    # RGB lists 
-    r_list = list()
-    g_list = list()
-    b_list = list()
-    
-    # Color list 
-    for color in color_list:
-        r_list.append(color[0])
-        g_list.append(color[1])
-        b_list.append(color[2])
-    
-    # Delta 
-    delta = (len(color_list) - 1) / (number_colors - 1)
-        
-    # Interpolated lists 
-    interpolated_r_list = [interpolate_list(r_list, i * delta) for i in range(number_colors)]
-    interpolated_g_list = [interpolate_list(g_list, i * delta) for i in range(number_colors)]
-    interpolated_b_list = [interpolate_list(b_list, i * delta) for i in range(number_colors)]
-    
-    # Interpolated colors 
-    interpolated_colors = list()
-    for i in range(len(interpolated_r_list)):
-        interpolated_colors.append(
-            Vector((interpolated_r_list[i], interpolated_g_list[i], interpolated_b_list[i])))
-                
-    return interpolated_colors
+    # Get the interpolated colors from the cached look-up table
+    lut = vmv.utilities.create_color_map_lut(color_list, number_colors)
+
+    # Interpolated colors
+    return [Vector((color[0], color[1], color[2])) for color in lut]
 
 
 ####################################################################################################